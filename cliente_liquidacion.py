@@ -0,0 +1,66 @@
+# cliente_liquidacion.py
+"""
+Cliente liviano del servicio de liquidación (src/core/worker_daemon.py).
+
+Reenvía sus argumentos al servicio por el socket Unix e imprime el resultado.
+Solo importa módulos de la biblioteca estándar para arrancar rápido; si el
+servicio no está corriendo, ejecuta el comando en este mismo proceso.
+
+Ejemplos:
+    python cliente_liquidacion.py dias 2024-01-01 2024-12-31
+    python cliente_liquidacion.py liquidacion 2000000 2024-01-01 2024-12-31 --conceptos cesantias,intereses
+"""
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+# Misma regla que src.core.worker_daemon.ruta_socket_por_defecto() (sin crear el directorio)
+RUTA_SOCKET = os.environ.get("LIQUIDACIONES_SOCKET") or os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"liquidaciones-{os.getuid()}"),
+    "liquidaciones.sock"
+)
+
+
+def socket_es_propio(ruta):
+    """Misma regla que src.core.worker_daemon.socket_es_propio(): socket Unix del usuario actual."""
+    try:
+        estado = os.lstat(ruta)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(estado.st_mode) and estado.st_uid == os.getuid()
+
+
+def main():
+    argv = sys.argv[1:]
+    try:
+        # Un socket de otro usuario podría suplantar al servicio: no se usa
+        if not socket_es_propio(RUTA_SOCKET):
+            raise OSError(f"{RUTA_SOCKET} no es un socket del usuario actual")
+        conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conexion.connect(RUTA_SOCKET)
+    except OSError:
+        # Sin servicio: se ejecuta localmente (paga el costo de importación)
+        from src.core.worker_daemon import ejecutar_comando
+        codigo, salida, error = ejecutar_comando(argv)
+    else:
+        with conexion:
+            conexion.sendall(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+            with conexion.makefile("rb") as lector:
+                linea = lector.readline()
+        if not linea:
+            print("Error: el servicio cerró la conexión sin responder.", file=sys.stderr)
+            sys.exit(3)
+        respuesta = json.loads(linea.decode("utf-8"))
+        codigo, salida, error = respuesta["codigo"], respuesta["salida"], respuesta["error"]
+    if salida:
+        print(salida)
+    if error:
+        print(f"Error: {error}", file=sys.stderr)
+    sys.exit(codigo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+config/parameter_snapshot.py
+
+Parámetros legales por año (SMMLV y auxilio de transporte) cargados desde un
+archivo de datos versionado (config/parametros_legales.json) en una
+"instantánea" inmutable.
+
+Los procesos de larga duración pueden recargar el archivo y cambiar a la nueva
+instantánea sin reiniciar. El cambio es atómico: la instantánea vigente es una
+sola referencia global que se reemplaza de una vez, así que la lectura
+(snapshot_actual()) no necesita bloqueos y un cálculo que tomó la instantánea
+al empezar la usa completa hasta terminar, aunque otra la reemplace mientras
+tanto. Solo las recargas se serializan entre sí.
+
+Una instantánea instalada en memoria con instalar_snapshot() queda vigente
+hasta una recarga explícita (recargar()): recargar_si_cambio() no la reemplaza
+aunque el archivo cambie.
+
+Formato del archivo:
+    {
+      "version": "2025.1",
+      "anios": {"2024": {"smmlv": 1300000, "auxilio_transporte": 162000}, ...}
+    }
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+# Archivo de parámetros por defecto (junto a este módulo)
+RUTA_PARAMETROS: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parametros_legales.json")
+
+
+@dataclass(frozen=True)
+class SnapshotParametros:
+    """Parámetros por año de una versión del archivo de datos (inmutable)."""
+    version: str
+    huella: str  # SHA-256 del contenido (distingue ediciones que no cambiaron la versión)
+    salarios_minimos: Mapping[int, int]
+    auxilios_transporte: Mapping[int, int]
+
+    @property
+    def identificador(self) -> str:
+        """Versión y huella, para claves de caché."""
+        return f"{self.version}+{self.huella[:16]}"
+
+    def smmlv(self, anio: int) -> int:
+        """SMMLV del año (0 si no está configurado)."""
+        return self.salarios_minimos.get(anio, 0)
+
+    def auxilio_transporte(self, anio: int) -> int:
+        """Auxilio de transporte del año (0 si no está configurado)."""
+        return self.auxilios_transporte.get(anio, 0)
+
+    def __reduce__(self):
+        # MappingProxyType no se serializa con pickle: se envían copias de los diccionarios
+        return _reconstruir_snapshot, (self.version, self.huella,
+                                       dict(self.salarios_minimos), dict(self.auxilios_transporte))
+
+
+def _reconstruir_snapshot(version: str, huella: str, salarios: Dict[int, int], auxilios: Dict[int, int]) -> SnapshotParametros:
+    return SnapshotParametros(version, huella, MappingProxyType(salarios), MappingProxyType(auxilios))
+
+
+def compilar_snapshot(contenido: bytes) -> SnapshotParametros:
+    """
+    Construye una instantánea a partir del contenido del archivo de parámetros.
+
+    Raises:
+        ValueError: Si el contenido no es válido.
+    """
+    try:
+        datos = json.loads(contenido.decode("utf-8"))
+        version = str(datos["version"])
+        anios = datos["anios"]
+        salarios, auxilios = {}, {}
+        for anio, valores in anios.items():
+            smmlv = int(valores["smmlv"])
+            auxilio = int(valores["auxilio_transporte"])
+            if smmlv <= 0 or auxilio <= 0:
+                raise ValueError(f"valores no positivos para el año {anio}")
+            salarios[int(anio)] = smmlv
+            auxilios[int(anio)] = auxilio
+    except (KeyError, TypeError, AttributeError, UnicodeDecodeError, json.JSONDecodeError, ValueError) as e:
+        raise ValueError(f"Archivo de parámetros inválido: {e}")
+    return SnapshotParametros(
+        version=version,
+        huella=hashlib.sha256(contenido).hexdigest(),
+        salarios_minimos=MappingProxyType(dict(sorted(salarios.items()))),
+        auxilios_transporte=MappingProxyType(dict(sorted(auxilios.items()))),
+    )
+
+
+def cargar_snapshot(ruta: str = RUTA_PARAMETROS) -> SnapshotParametros:
+    """Lee y compila el archivo de parámetros (ValueError si no es válido)."""
+    with open(ruta, "rb") as archivo:
+        return compilar_snapshot(archivo.read())
+
+
+def _estado(ruta: str) -> Tuple[str, int, int]:
+    estado = os.stat(ruta)
+    return ruta, estado.st_mtime_ns, estado.st_size
+
+# ==============================================================================
+# Instantánea vigente
+# ==============================================================================
+
+# El estado del archivo se toma antes de leerlo: si cambia durante la lectura,
+# la siguiente comprobación ve la diferencia y vuelve a cargarlo.
+_estado_archivo: Optional[Tuple[str, int, int]] = _estado(RUTA_PARAMETROS)  # (ruta, mtime_ns, tamaño)
+_snapshot: SnapshotParametros = cargar_snapshot()
+_snapshot_instalado = False  # True si la vigente viene de instalar_snapshot()
+_bloqueo_recarga = threading.Lock()
+
+
+def snapshot_actual() -> SnapshotParametros:
+    """Instantánea vigente. Tómela una vez por cálculo y use siempre la misma."""
+    return _snapshot
+
+
+def recargar(ruta: str = RUTA_PARAMETROS) -> SnapshotParametros:
+    """
+    Carga el archivo y lo deja como instantánea vigente.
+
+    Si el archivo no es válido se lanza ValueError y la instantánea vigente no cambia.
+    """
+    global _snapshot, _estado_archivo, _snapshot_instalado
+    with _bloqueo_recarga:
+        estado = _estado(ruta)  # Antes de leer (ver _estado_archivo)
+        nuevo = cargar_snapshot(ruta)
+        _snapshot = nuevo  # Reemplazo atómico de la referencia
+        _estado_archivo = estado
+        _snapshot_instalado = False
+    return nuevo
+
+
+def recargar_si_cambio(ruta: str = RUTA_PARAMETROS) -> SnapshotParametros:
+    """
+    Recarga solo si el archivo cambió desde la última carga (un stat por llamada).
+
+    Un archivo inválido se reporta con print y se conserva la instantánea vigente.
+    Una instantánea instalada con instalar_snapshot() se conserva siempre.
+    """
+    if _snapshot_instalado:
+        return _snapshot
+    try:
+        if _estado(ruta) == _estado_archivo:
+            return _snapshot
+        return recargar(ruta)
+    except (OSError, ValueError) as e:
+        print(f"ADVERTENCIA: No se pudieron recargar los parámetros desde {ruta}: {e}")
+        return _snapshot
+
+
+def instalar_snapshot(snapshot: SnapshotParametros) -> None:
+    """
+    Deja como vigente una instantánea construida en memoria (por ejemplo en pruebas).
+
+    Queda vigente hasta la siguiente llamada a recargar() o instalar_snapshot().
+    """
+    global _snapshot, _estado_archivo, _snapshot_instalado
+    with _bloqueo_recarga:
+        _snapshot = snapshot
+        _estado_archivo = None
+        _snapshot_instalado = True
@@ -13,9 +13,11 @@ la precisión de los cálculos. La fuente oficial suele ser el Ministerio
 del Trabajo de Colombia o los decretos presidenciales correspondientes.
 """
 
-from typing import Dict, Final
+from typing import Any, Final
 import datetime
 
+from config.parameter_snapshot import snapshot_actual
+
 # --- Año Actual (Para fácil acceso a los valores vigentes) ---
 # Obtenemos el año actual basado en la fecha del sistema al momento de correr el script.
 # Si la aplicación corre en diferentes momentos, esto dará el año en curso.
@@ -23,47 +25,33 @@ import datetime
 # basarse en las fechas de inicio/fin del contrato, no sólo en este valor.
 CURRENT_YEAR: Final[int] = datetime.datetime.now().year 
 
-# --- Datos Históricos del Salario Mínimo Mensual Legal Vigente (SMMLV) ---
-# Fuente: Decretos anuales del Gobierno de Colombia.
-# Valores en pesos colombianos (COP), sin puntos ni comas.
-SALARIOS_MINIMOS_HISTORICOS: Final[Dict[int, int]] = {
-    2020: 877803,
-    2021: 908526,
-    2022: 1000000,
-    2023: 1160000,
-    2024: 1300000,
-    # Valor 2025: Decretado a finales de 2024. 
-    # Usando el valor correspondiente al año actual (2025) según la fecha del sistema.
-    2025: 1423500, # Ejemplo basado en la fecha actual del sistema (02 May 2025) - ¡VERIFICAR VALOR OFICIAL DECRETADO! 
-}
-
-# --- Datos Históricos del Auxilio de Transporte ---
+# --- Datos Históricos del SMMLV y del Auxilio de Transporte ---
 # Fuente: Decretos anuales del Gobierno de Colombia.
-# Valores en pesos colombianos (COP), sin puntos ni comas.
-# Nota: Aplica para trabajadores que devenguen hasta 2 SMMLV.
-AUXILIOS_TRANSPORTE_HISTORICOS: Final[Dict[int, int]] = {
-    2020: 102854,
-    2021: 106454,
-    2022: 117172,
-    2023: 140606,
-    2024: 162000,
-    # Valor 2025: Decretado a finales de 2024.
-    # Usando el valor correspondiente al año actual (2025) según la fecha del sistema.
-    2025: 200000, # Ejemplo basado en la fecha actual del sistema (02 May 2025) - ¡VERIFICAR VALOR OFICIAL DECRETADO!
-}
-
-# --- Valores Vigentes (para el año actual detectado) ---
-# Se obtienen directamente de los diccionarios históricos para consistencia.
-# La lógica de cálculo debería usar el año relevante del periodo a liquidar.
-try:
-    SALARIO_MINIMO_VIGENTE: Final[int] = SALARIOS_MINIMOS_HISTORICOS.get(CURRENT_YEAR, 0)
-    AUXILIO_TRANSPORTE_VIGENTE: Final[int] = AUXILIOS_TRANSPORTE_HISTORICOS.get(CURRENT_YEAR, 0)
-except KeyError:
-    # Manejo por si el año actual no está en el diccionario (improbable si se actualiza)
-    print(f"ADVERTENCIA: No se encontraron datos para el año {CURRENT_YEAR} en config/settings.py. Usando $0.")
-    SALARIO_MINIMO_VIGENTE = 0
-    AUXILIO_TRANSPORTE_VIGENTE = 0
+# Los valores viven en config/parametros_legales.json (versionado) y se cargan en
+# una instantánea inmutable (config/parameter_snapshot.py) que se puede recargar
+# sin reiniciar. SALARIOS_MINIMOS_HISTORICOS, AUXILIOS_TRANSPORTE_HISTORICOS,
+# SALARIO_MINIMO_VIGENTE y AUXILIO_TRANSPORTE_VIGENTE se derivan de la instantánea
+# vigente en cada acceso (ver __getattr__), así que nunca quedan desactualizados
+# tras una recarga. Para un año concreto use obtener_smmlv() y
+# obtener_auxilio_transporte().
+# Nota: El auxilio aplica para trabajadores que devenguen hasta 2 SMMLV.
+
+def __getattr__(nombre: str) -> Any:
+    """Valores derivados de la instantánea de parámetros vigente."""
+    snapshot = snapshot_actual()
+    if nombre == "SALARIOS_MINIMOS_HISTORICOS":
+        return dict(snapshot.salarios_minimos)
+    if nombre == "AUXILIOS_TRANSPORTE_HISTORICOS":
+        return dict(snapshot.auxilios_transporte)
+    # --- Valores Vigentes (para el año actual detectado) ---
+    # La lógica de cálculo debería usar el año relevante del periodo a liquidar.
+    if nombre == "SALARIO_MINIMO_VIGENTE":
+        return snapshot.smmlv(CURRENT_YEAR)
+    if nombre == "AUXILIO_TRANSPORTE_VIGENTE":
+        return snapshot.auxilio_transporte(CURRENT_YEAR)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
     
+
 # --- Otros Parámetros Configurables (Ejemplos) ---
 
 # Porcentaje de Intereses sobre Cesantías (Fijo por ley)
@@ -84,20 +72,20 @@ def obtener_smmlv(anio: int) -> int:
     Obtiene el Salario Mínimo Mensual Legal Vigente (SMMLV) para un año específico.
     Retorna 0 si el año no se encuentra en el histórico.
     """
-    return SALARIOS_MINIMOS_HISTORICOS.get(anio, 0)
+    return snapshot_actual().smmlv(anio)
 
 def obtener_auxilio_transporte(anio: int) -> int:
     """
     Obtiene el Auxilio de Transporte para un año específico.
     Retorna 0 si el año no se encuentra en el histórico.
     """
-    return AUXILIOS_TRANSPORTE_HISTORICOS.get(anio, 0)
+    return snapshot_actual().auxilio_transporte(anio)
 
 # --- Verificación rápida al cargar el módulo ---
 if __name__ == "__main__":
     print(f"Configuración cargada para el año actual ({CURRENT_YEAR}):")
-    print(f"  - SMMLV {CURRENT_YEAR}: ${SALARIO_MINIMO_VIGENTE:,}")
-    print(f"  - Aux. Transporte {CURRENT_YEAR}: ${AUXILIO_TRANSPORTE_VIGENTE:,}")
+    print(f"  - SMMLV {CURRENT_YEAR}: ${obtener_smmlv(CURRENT_YEAR):,}")
+    print(f"  - Aux. Transporte {CURRENT_YEAR}: ${obtener_auxilio_transporte(CURRENT_YEAR):,}")
     
     # Ejemplo de uso de las funciones
     year_consulta = 2023
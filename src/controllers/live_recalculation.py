@@ -0,0 +1,119 @@
+# src/controllers/live_recalculation.py
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config.parameter_snapshot import snapshot_actual
+
+# Tiempo de inactividad (ms) antes de recalcular
+ESPERA_DEBOUNCE_MS = 150
+# Intervalo (ms) para revisar si el cálculo en segundo plano terminó
+INTERVALO_SONDEO_MS = 15
+# Número de entradas recientes cuyo resultado se conserva
+TAMANO_CACHE_ENTRADAS = 16
+
+
+class RecalculoEnVivo:
+    """
+    Recalcula un resultado a medida que el usuario modifica las entradas.
+
+    - Cada cambio reinicia un temporizador (debounce); el cálculo solo se
+      dispara tras ESPERA_DEBOUNCE_MS de inactividad.
+    - Las entradas se leen en el hilo de Tk y el cálculo se ejecuta en un hilo
+      de trabajo, así la interfaz no se congela mientras se escribe.
+    - Solo se aplica el resultado del cálculo más reciente; los resultados de
+      cálculos anteriores que terminen tarde se descartan.
+    - Si las entradas no cambiaron respecto al último cálculo, o ya se
+      calcularon hace poco, no se vuelve a calcular. La clave incluye la
+      versión de los parámetros legales vigentes, así que tras recargarlos
+      (config/parameter_snapshot.py) las mismas entradas se recalculan.
+
+    Args:
+        widget: Widget de Tk usado para programar callbacks con after()
+        leer_entradas: Lee las entradas de la vista (hilo de Tk). Debe retornar
+                       una tupla hashable; si lanza ValueError el error se aplica
+                       como resultado.
+        calcular: Función pura que recibe la tupla de entradas y retorna el
+                  payload para la vista. Se ejecuta fuera del hilo de Tk.
+        aplicar: Aplica el payload en la vista (hilo de Tk).
+        espera_ms: Tiempo de inactividad antes de recalcular
+    """
+
+    def __init__(
+        self,
+        widget: Any,
+        leer_entradas: Callable[[], Tuple[Hashable, ...]],
+        calcular: Callable[[Tuple[Hashable, ...]], Dict[str, str]],
+        aplicar: Callable[[Dict[str, str]], None],
+        espera_ms: int = ESPERA_DEBOUNCE_MS,
+    ):
+        self.widget = widget
+        self.leer_entradas = leer_entradas
+        self.calcular = calcular
+        self.aplicar = aplicar
+        self.espera_ms = espera_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recalculo")
+        # Clave: (identificador de los parámetros, entradas)
+        self._cache: "OrderedDict[Tuple[str, Tuple[Hashable, ...]], Dict[str, str]]" = OrderedDict()
+        self._id_temporizador: Optional[str] = None
+        self._generacion = 0
+        self._ultima_clave: Optional[Tuple[str, Tuple[Hashable, ...]]] = None
+
+    def notificar_cambio(self, event=None) -> None:
+        """Registra un cambio en las entradas y reinicia el temporizador."""
+        if self._id_temporizador is not None:
+            self.widget.after_cancel(self._id_temporizador)
+        self._id_temporizador = self.widget.after(self.espera_ms, self._disparar)
+
+    def reiniciar(self) -> None:
+        """Olvida las últimas entradas (ej: al limpiar la vista) y descarta cálculos pendientes."""
+        if self._id_temporizador is not None:
+            self.widget.after_cancel(self._id_temporizador)
+            self._id_temporizador = None
+        self._generacion += 1
+        self._ultima_clave = None
+
+    def _disparar(self) -> None:
+        self._id_temporizador = None
+        try:
+            entradas = self.leer_entradas()
+        except ValueError as e:
+            self._generacion += 1
+            self._ultima_clave = None
+            self.aplicar({"error": str(e)})
+            return
+
+        clave = (snapshot_actual().identificador, entradas)
+        if clave == self._ultima_clave:
+            return
+        self._ultima_clave = clave
+        self._generacion += 1
+
+        resultado = self._cache.get(clave)
+        if resultado is not None:
+            self._cache.move_to_end(clave)
+            self.aplicar(resultado)
+            return
+
+        futuro = self._executor.submit(self.calcular, entradas)
+        self._esperar(futuro, self._generacion, clave)
+
+    def _esperar(self, futuro: Future, generacion: int, clave: Tuple[str, Tuple[Hashable, ...]]) -> None:
+        if not futuro.done():
+            self.widget.after(INTERVALO_SONDEO_MS, self._esperar, futuro, generacion, clave)
+            return
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            print(f"Error inesperado en recálculo en vivo: {e}")
+            resultado = {"error": "Ocurrió un error inesperado."}
+            # Un fallo puede ser transitorio: las mismas entradas se vuelven a calcular
+            if self._ultima_clave == clave:
+                self._ultima_clave = None
+        else:
+            self._cache[clave] = resultado
+            if len(self._cache) > TAMANO_CACHE_ENTRADAS:
+                self._cache.popitem(last=False)
+        if generacion == self._generacion:
+            self.aplicar(resultado)
@@ -6,6 +6,8 @@ from src.core import calculator
 from src.core.constants import CONCEPTOS, DIAS_ANIO_COMERCIAL
 from src.core.models import PeriodoLaboral, ResultadoCalculo, ResultadoPrima
 from src.ui.main_window import MainWindow
+from src.controllers.live_recalculation import RecalculoEnVivo
+from src.controllers.roster_results import CargaRoster, ResultadosPorBloques
 from src.utils.validation import validar_valor_numerico, validar_fechas_periodo
 from src.utils.formatting import formatear_moneda, formatear_porcentaje
 from src.utils.date_helpers import calcular_dias_liquidacion
@@ -16,6 +18,7 @@ from src.ui.frames.days_calculator_frame import DaysCalculatorFrame
 from src.ui.frames.cesantias_frame import CesantiasFrame
 from src.ui.frames.intereses_cesantias_frame import InteresesCesantiasFrame
 from src.ui.frames.prima_frame import PrimaFrame
+from src.ui.frames.roster_grid_frame import RosterGridFrame
 from typing import Any, Dict, Optional, Tuple
 
 # --- Configuración de Locale (Importante para formato de moneda) ---
@@ -57,6 +60,15 @@ class MainController:
         self.cesantias_frame: Optional[CesantiasFrame] = view.get_frame("CesantiasFrame")
         self.intereses_frame: Optional[InteresesCesantiasFrame] = view.get_frame("InteresesCesantiasFrame")
         self.prima_frame: Optional[PrimaFrame] = view.get_frame("PrimaFrame")
+        self.roster_grid_frame: Optional[RosterGridFrame] = view.get_frame("RosterGridFrame")
+
+        # Recálculo en vivo (debounce) para los frames que lo soportan
+        self.recalculo_cesantias: Optional[RecalculoEnVivo] = None
+        self.recalculo_prima: Optional[RecalculoEnVivo] = None
+
+        # Resultados del roster cargado en la tabla de nómina completa
+        self.resultados_roster: Optional[ResultadosPorBloques] = None
+        self.carga_roster: Optional[CargaRoster] = None
 
         # Conectar señales para todos los frames existentes usando métodos helper
         if self.main_menu_frame: self._connect_main_menu_signals()
@@ -74,6 +86,9 @@ class MainController:
         if self.prima_frame: self._connect_prima_signals()
         else: print("Error: PrimaFrame no encontrado al inicializar MainController.")
 
+        if self.roster_grid_frame: self._connect_roster_grid_signals()
+        else: print("Error: RosterGridFrame no encontrado al inicializar MainController.")
+
     def _connect_main_menu_signals(self):
         """Conecta los comandos de las tarjetas del menú principal."""
         print("Conectando señales del Menú Principal...")
@@ -82,6 +97,7 @@ class MainController:
         self.main_menu_frame.set_card_command("Cesantias", self.show_cesantias_calculator)
         self.main_menu_frame.set_card_command("Intereses", self.show_intereses_calculator)
         self.main_menu_frame.set_card_command("Prima", self.show_prima_calculator)
+        self.main_menu_frame.set_card_command("RosterGrid", self.show_roster_grid)
         # Conectar otras tarjetas aquí cuando se implementen...
         # self.main_menu_frame.set_card_command("Vacaciones", self.show_vacaciones_calculator)
 
@@ -101,6 +117,15 @@ class MainController:
         self.cesantias_frame.set_calculate_command(self._on_calculate_cesantias_click)
         self.cesantias_frame.set_back_command(self.show_main_menu)
 
+        # Recalcular mientras el usuario escribe o cambia las fechas
+        self.recalculo_cesantias = RecalculoEnVivo(
+            widget=self.cesantias_frame,
+            leer_entradas=self._leer_entradas_cesantias,
+            calcular=self._calcular_payload_cesantias,
+            aplicar=self._aplicar_resultados_cesantias
+        )
+        self.cesantias_frame.set_change_command(self.recalculo_cesantias.notificar_cambio)
+
     def _connect_intereses_signals(self):
         """Conecta los comandos del frame Calculadora de Intereses."""
         print("Conectando señales de Calculadora Intereses...")
@@ -113,6 +138,27 @@ class MainController:
         self.prima_frame.set_calculate_command(self._on_calculate_prima_click)
         self.prima_frame.set_back_command(self.show_main_menu)
 
+        # Recalcular mientras el usuario escribe o cambia las fechas
+        self.recalculo_prima = RecalculoEnVivo(
+            widget=self.prima_frame,
+            leer_entradas=self._leer_entradas_prima,
+            calcular=self._calcular_payload_prima,
+            aplicar=self._aplicar_resultados_prima
+        )
+        self.prima_frame.set_change_command(self.recalculo_prima.notificar_cambio)
+
+    def _connect_roster_grid_signals(self):
+        """Conecta los comandos del frame de nómina completa."""
+        print("Conectando señales de Nómina Completa...")
+        self.roster_grid_frame.set_load_command(self._on_load_roster_click)
+        self.carga_roster = CargaRoster(
+            widget=self.roster_grid_frame,
+            al_cargar=self._on_roster_loaded,
+            al_fallar=self._on_roster_load_error,
+            al_actualizar=self.roster_grid_frame.refresh
+        )
+        self.roster_grid_frame.set_back_command(self.show_main_menu)
+
     # --- Métodos de Navegación ---
     def show_main_menu(self):
         """Muestra el frame del menú principal."""
@@ -132,6 +178,7 @@ class MainController:
         print("Navegando a: CesantiasFrame")
         if self.cesantias_frame:
             # Limpiar ambos resultados anteriores al mostrar
+            if self.recalculo_cesantias: self.recalculo_cesantias.reiniciar()
             self.cesantias_frame.update_results({"cesantias": "Cesantías Calculadas: -", "intereses": "Intereses Cesantías: -"})
             self.view.show_frame("CesantiasFrame")
         else:
@@ -152,6 +199,7 @@ class MainController:
         print("Navegando a: PrimaFrame")
         if self.prima_frame:
             # Limpiar resultados anteriores
+            if self.recalculo_prima: self.recalculo_prima.reiniciar()
             self.prima_frame.update_results({
                 "prima_s1": "Prima Semestre 1: -", 
                 "prima_s2": "Prima Semestre 2: -",
@@ -161,6 +209,14 @@ class MainController:
         else:
             print("Error: PrimaFrame no disponible.")
 
+    def show_roster_grid(self):
+        """Muestra el frame de liquidación de nómina completa."""
+        print("Navegando a: RosterGridFrame")
+        if self.roster_grid_frame:
+            self.view.show_frame("RosterGridFrame")
+        else:
+            print("Error: RosterGridFrame no disponible.")
+
     # --- Métodos de Callback para Cálculos ---
     def _on_calculate_dias_click(self):
         """Calcula los días 30/360 desde DaysCalculatorFrame."""
@@ -197,13 +253,32 @@ class MainController:
         print("Botón Calcular Cesantías e Intereses presionado.")
         if not self.cesantias_frame: return
 
+        try:
+            entradas = self._leer_entradas_cesantias()
+        except ValueError as e:
+            print(f"Error de validación/cálculo Cesantías/Intereses: {e}")
+            results_payload = {"error": str(e)}
+        else:
+            results_payload = self._calcular_payload_cesantias(entradas)
+            if self.recalculo_cesantias:
+                self.recalculo_cesantias.reiniciar()
+
+        self._aplicar_resultados_cesantias(results_payload)
+
+    def _leer_entradas_cesantias(self) -> Tuple[float, datetime.date, datetime.date]:
+        """Lee las entradas de CesantiasFrame como tupla (salario, inicio, fin)."""
+        inputs = self.cesantias_frame.get_inputs()
+        return inputs["salario_mensual"], inputs["fecha_inicio"], inputs["fecha_fin"]
+
+    def _calcular_payload_cesantias(self, entradas: Tuple[float, datetime.date, datetime.date]) -> Dict[str, str]:
+        """
+        Calcula cesantías e intereses y prepara el payload de textos para la UI.
+        No toca widgets, por lo que puede ejecutarse fuera del hilo de Tk.
+        """
         results_payload: Dict[str, str] = {} # Para enviar a la UI
         try:
-            # 1. Obtener y validar entradas de la UI
-            inputs = self.cesantias_frame.get_inputs()
-            salario_basico = inputs["salario_mensual"]
-            fecha_inicio = inputs["fecha_inicio"]
-            fecha_fin = inputs["fecha_fin"]
+            # 1. Validar entradas
+            salario_basico, fecha_inicio, fecha_fin = entradas
             anio = fecha_fin.year # Año para buscar params
             
             # Validar salario usando el módulo de validación
@@ -275,7 +350,10 @@ class MainController:
             print(f"Error inesperado en cálculo cesantías/intereses: {e}")
             results_payload["error"] = "Ocurrió un error inesperado."
 
-        # 8. Actualizar la UI
+        return results_payload
+
+    def _aplicar_resultados_cesantias(self, results_payload: Dict[str, str]):
+        """Actualiza la UI de CesantiasFrame con el payload calculado."""
         if hasattr(self.cesantias_frame, 'update_results'):
              self.cesantias_frame.update_results(results_payload)
         else:
@@ -342,13 +420,32 @@ class MainController:
         print("Botón Calcular Prima presionado.")
         if not self.prima_frame: return
         
+        try:
+            entradas = self._leer_entradas_prima()
+        except ValueError as e:
+            print(f"Error de validación/cálculo Prima: {e}")
+            results_payload = {"error": str(e)}
+        else:
+            results_payload = self._calcular_payload_prima(entradas)
+            if self.recalculo_prima:
+                self.recalculo_prima.reiniciar()
+
+        self._aplicar_resultados_prima(results_payload)
+
+    def _leer_entradas_prima(self) -> Tuple[float, datetime.date, datetime.date]:
+        """Lee las entradas de PrimaFrame como tupla (salario, inicio, fin)."""
+        inputs = self.prima_frame.get_inputs()
+        return inputs["salario_mensual"], inputs["fecha_inicio"], inputs["fecha_fin"]
+
+    def _calcular_payload_prima(self, entradas: Tuple[float, datetime.date, datetime.date]) -> Dict[str, str]:
+        """
+        Calcula la prima y prepara el payload de textos para la UI.
+        No toca widgets, por lo que puede ejecutarse fuera del hilo de Tk.
+        """
         results_payload: Dict[str, str] = {}  # Para enviar a la UI
         try:
-            # 1. Obtener y validar entradas de la UI
-            inputs = self.prima_frame.get_inputs()
-            salario_basico = inputs["salario_mensual"]
-            fecha_inicio = inputs["fecha_inicio"]
-            fecha_fin = inputs["fecha_fin"]
+            # 1. Validar entradas
+            salario_basico, fecha_inicio, fecha_fin = entradas
             anio = fecha_fin.year  # Año para buscar params
             
             # Validar salario
@@ -389,12 +486,42 @@ class MainController:
         except Exception as e:
             print(f"Error inesperado en cálculo prima: {e}")
             results_payload["error"] = f"Ocurrió un error inesperado: {e}"
-            
-        # 5. Actualizar la UI
-        if hasattr(self.prima_frame, 'update_results'):
+
+        return results_payload
+
+    def _aplicar_resultados_prima(self, results_payload: Dict[str, str]):
+        """Actualiza la UI de PrimaFrame con el payload calculado."""
+        if "error" in results_payload and hasattr(self.prima_frame, 'show_error'):
+            self.prima_frame.show_error(results_payload["error"])
+        elif hasattr(self.prima_frame, 'update_results'):
             self.prima_frame.update_results(results_payload)
         else:
             print("Error: PrimaFrame no tiene el método 'update_results'.")
 
+    def _on_load_roster_click(self):
+        """Inicia la carga de un roster (CSV o binario) fuera del hilo de Tk."""
+        print("Botón Cargar Roster presionado.")
+        if not self.roster_grid_frame or not self.carga_roster: return
+
+        ruta = self.roster_grid_frame.ask_roster_path()
+        if not ruta:
+            return
+        self.roster_grid_frame.update_status(f"Cargando {ruta}...")
+        self.carga_roster.cargar(ruta)
+
+    def _on_roster_loaded(self, ruta: str, resultados: ResultadosPorBloques):
+        """Muestra en la tabla virtual un roster ya cargado (primer bloque calculado)."""
+        # Liberar el roster anterior antes de reemplazarlo
+        if self.resultados_roster:
+            self.resultados_roster.cerrar()
+        self.resultados_roster = resultados
+        print(f"Roster cargado: {len(resultados)} empleados desde {ruta}")
+        self.roster_grid_frame.update_status(f"{len(resultados):,} empleados cargados desde {ruta}")
+        self.roster_grid_frame.set_rows(len(resultados), resultados.obtener_fila)
+
+    def _on_roster_load_error(self, ruta: str, mensaje: str):
+        print(f"Error al cargar roster {ruta}: {mensaje}")
+        self.roster_grid_frame.show_error(mensaje)
+
     # --- Otros métodos ---
     # def change_mode(self, mode): ...
\ No newline at end of file
@@ -0,0 +1,200 @@
+# src/controllers/roster_results.py
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.core.batch import ResultadoLote, calcular_liquidacion_lote
+from src.core.roster import MAGIC_ROSTER, Roster, abrir_roster_binario, leer_roster_csv
+from src.utils.formatting import formatear_moneda
+
+# Filas por bloque de cálculo en segundo plano
+TAMANO_BLOQUE = 2048
+# Intervalo (ms) para revisar bloques terminados
+INTERVALO_SONDEO_MS = 30
+
+
+def abrir_roster(ruta: str) -> Roster:
+    """
+    Abre un roster binario o CSV (el formato se detecta por el encabezado).
+
+    Raises:
+        OSError: Si el archivo no se puede leer.
+        ValueError: Si el contenido es inválido.
+    """
+    with open(ruta, "rb") as archivo:
+        es_binario = archivo.read(len(MAGIC_ROSTER)) == MAGIC_ROSTER
+    return abrir_roster_binario(ruta) if es_binario else leer_roster_csv(ruta)
+
+
+def _liquidar_bloque(roster: Roster, bloque: int, tamano_bloque: int) -> Union[ResultadoLote, str]:
+    inicio = bloque * tamano_bloque
+    fin = min(len(roster), inicio + tamano_bloque)
+    try:
+        return calcular_liquidacion_lote(
+            roster["salario"][inicio:fin],
+            roster["serial_inicio"][inicio:fin],
+            roster["serial_fin"][inicio:fin],
+            tipos_contrato=roster["tipo_contrato"][inicio:fin],
+            banderas=roster["banderas"][inicio:fin],
+        )
+    except ValueError as e:
+        return str(e)
+
+
+class ResultadosPorBloques:
+    """
+    Proveedor perezoso de filas de resultados para RosterGridFrame.
+
+    Los resultados se calculan por bloques de TAMANO_BLOQUE filas en un hilo de
+    trabajo, solo cuando la tabla pide una fila de ese bloque (más el bloque
+    siguiente, para que el desplazamiento no muestre filas pendientes). Los
+    textos se formatean únicamente para las filas visibles.
+
+    Args:
+        roster: Roster a liquidar
+        widget: Widget de Tk usado para revisar bloques terminados con after()
+        al_actualizar: Se invoca (hilo de Tk) cuando termina algún bloque
+        bloques_calculados: Bloques ya liquidados (ej: el primero, calculado por CargaRoster)
+    """
+
+    def __init__(
+        self,
+        roster: Roster,
+        widget: Any,
+        al_actualizar: Callable[[], None],
+        tamano_bloque: int = TAMANO_BLOQUE,
+        bloques_calculados: Optional[Dict[int, Union[ResultadoLote, str]]] = None,
+    ):
+        self.roster = roster
+        self.widget = widget
+        self.al_actualizar = al_actualizar
+        self.tamano_bloque = tamano_bloque
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="roster")
+        self._bloques: Dict[int, Union[ResultadoLote, str]] = dict(bloques_calculados or {})  # str = mensaje de error
+        self._pendientes: Dict[int, Future] = {}
+        self._sondeando = False
+
+    def __len__(self) -> int:
+        return len(self.roster)
+
+    @property
+    def bloques_calculados(self) -> int:
+        return len(self._bloques)
+
+    def obtener_fila(self, fila: int) -> Optional[Tuple[str, ...]]:
+        """Textos de la fila para la tabla, o None si su bloque aún no está listo."""
+        bloque, posicion = divmod(fila, self.tamano_bloque)
+        resultado = self._bloques.get(bloque)
+        if resultado is None:
+            self._solicitar(bloque)
+            return None
+        self._solicitar(bloque + 1)  # Precarga del siguiente bloque
+
+        id_empleado = str(self.roster["id_empleado"][fila])
+        if isinstance(resultado, str):
+            return (id_empleado, "", f"Error: {resultado}", "", "", "")
+        return (
+            id_empleado,
+            str(resultado.dias[posicion]),
+            formatear_moneda(resultado.cesantias[posicion]),
+            formatear_moneda(resultado.intereses[posicion]),
+            formatear_moneda(resultado.prima_semestre_1[posicion]),
+            formatear_moneda(resultado.prima_semestre_2[posicion]),
+        )
+
+    def cerrar(self) -> None:
+        """Cancela los cálculos pendientes y libera el roster."""
+        for futuro in self._pendientes.values():
+            futuro.cancel()
+        self._executor.shutdown(wait=True)
+        self._pendientes.clear()
+        self.roster.cerrar()
+
+    # --- Internos ---
+    def _solicitar(self, bloque: int) -> None:
+        if bloque in self._bloques or bloque in self._pendientes:
+            return
+        if bloque * self.tamano_bloque >= len(self.roster):
+            return
+        self._pendientes[bloque] = self._executor.submit(self._calcular_bloque, bloque)
+        if not self._sondeando:
+            self._sondeando = True
+            self.widget.after(INTERVALO_SONDEO_MS, self._revisar)
+
+    def _calcular_bloque(self, bloque: int) -> Union[ResultadoLote, str]:
+        return _liquidar_bloque(self.roster, bloque, self.tamano_bloque)
+
+    def _revisar(self) -> None:
+        terminados = [bloque for bloque, futuro in self._pendientes.items() if futuro.done()]
+        for bloque in terminados:
+            futuro = self._pendientes.pop(bloque)
+            if not futuro.cancelled():
+                self._bloques[bloque] = futuro.result()
+        if self._pendientes:
+            self.widget.after(INTERVALO_SONDEO_MS, self._revisar)
+        else:
+            self._sondeando = False
+        if terminados:
+            self.al_actualizar()
+
+
+class CargaRoster:
+    """
+    Carga un roster fuera del hilo de Tk.
+
+    El archivo se lee y se liquida su primer bloque (el que se ve al mostrar la
+    tabla) en un hilo de trabajo; el hilo de Tk solo revisa con after() si
+    terminó. Si se pide otra carga antes de que termine la anterior, el
+    resultado de la anterior se descarta.
+
+    Args:
+        widget: Widget de Tk usado para revisar la carga con after()
+        al_cargar: Se invoca (hilo de Tk) con la ruta y un ResultadosPorBloques
+                   que ya tiene calculado el primer bloque
+        al_fallar: Se invoca (hilo de Tk) con la ruta y el mensaje de error
+        al_actualizar: Se pasa a ResultadosPorBloques
+    """
+
+    def __init__(
+        self,
+        widget: Any,
+        al_cargar: Callable[[str, ResultadosPorBloques], None],
+        al_fallar: Callable[[str, str], None],
+        al_actualizar: Callable[[], None],
+        tamano_bloque: int = TAMANO_BLOQUE,
+    ):
+        self.widget = widget
+        self.al_cargar = al_cargar
+        self.al_fallar = al_fallar
+        self.al_actualizar = al_actualizar
+        self.tamano_bloque = tamano_bloque
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="carga-roster")
+        self._generacion = 0
+
+    def cargar(self, ruta: str) -> None:
+        """Inicia la carga de ruta; al_cargar o al_fallar se invocan al terminar."""
+        self._generacion += 1
+        futuro = self._executor.submit(self._leer, ruta)
+        self.widget.after(INTERVALO_SONDEO_MS, self._esperar, futuro, self._generacion, ruta)
+
+    def _leer(self, ruta: str) -> Tuple[Roster, Union[ResultadoLote, str]]:
+        roster = abrir_roster(ruta)
+        return roster, _liquidar_bloque(roster, 0, self.tamano_bloque)
+
+    def _esperar(self, futuro: Future, generacion: int, ruta: str) -> None:
+        if not futuro.done():
+            self.widget.after(INTERVALO_SONDEO_MS, self._esperar, futuro, generacion, ruta)
+            return
+        try:
+            roster, primer_bloque = futuro.result()
+        except (OSError, ValueError) as e:
+            if generacion == self._generacion:
+                self.al_fallar(ruta, str(e))
+            return
+        if generacion != self._generacion:
+            roster.cerrar()  # Hubo otra carga después de esta
+            return
+        bloques = {0: primer_bloque} if len(roster) else {}
+        self.al_cargar(ruta, ResultadosPorBloques(roster, self.widget, self.al_actualizar,
+                                                  self.tamano_bloque, bloques_calculados=bloques))
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/advances.py
+
+Libro de anticipos (retiros parciales) de cesantías y su efecto en los intereses.
+
+Un anticipo de valor a retirado en el serial 30/360 s deja de generar intereses
+desde ese día hasta el fin del periodo, de modo que los intereses se calculan
+sobre el saldo ponderado por tiempo:
+
+    Intereses = ((Cesantías * Días) - Σ a * (fin - s + 1 - ausencias[s, fin])) * 0.12 / 360
+
+donde ausencias[s, fin] son los días de licencia/suspensión posteriores al
+anticipo, que ya se descontaron de Días y no pueden descontarse dos veces.
+
+Sin anticipos la fórmula es la de siempre. Los anticipos de cada empleado se
+guardan ordenados por fecha con sus sumas acumuladas de a y de a * (s - s0),
+de modo que Σ a * (fin - s + 1) de cualquier periodo se obtiene con dos
+búsquedas binarias y dos restas, sin recorrer los anticipos; solo el término
+de ausencias, cuando las hay, recorre los anticipos del periodo.
+"""
+
+import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from src.core.intervals import IndiceIntervalos, IndiceIntervalosLote
+from src.utils.date_helpers import fecha_a_serial_360
+
+
+def _acumulados(seriales: Sequence[int], valores: Sequence[float]) -> Tuple[array, array]:
+    """
+    Sumas acumuladas (con un 0 inicial) de los valores y de valor * (serial - serial_0).
+
+    Raises:
+        ValueError: Si algún anticipo no es positivo.
+    """
+    acumulado_valor = array("d", [0.0])
+    acumulado_ponderado = array("d", [0.0])
+    total = ponderado = 0.0
+    for serial, valor in zip(seriales, valores):
+        if valor <= 0:
+            raise ValueError("El valor de un anticipo de cesantías debe ser positivo.")
+        total += valor
+        ponderado += valor * (serial - seriales[0])
+        acumulado_valor.append(total)
+        acumulado_ponderado.append(ponderado)
+    return acumulado_valor, acumulado_ponderado
+
+
+def _descuento(seriales: Sequence[int], acumulado_valor: Sequence[float], acumulado_ponderado: Sequence[float],
+               desde: int, hasta: int, base_acumulado: int,
+               serial_inicio: int, serial_fin: int,
+               dias_ausentes: Optional[Callable[[int, int], int]] = None) -> Tuple[float, float]:
+    """
+    (Σ a, Σ a * días sin intereses) de los anticipos con serial en [inicio, fin].
+
+    Los anticipos del empleado ocupan seriales[desde:hasta] y sus acumulados
+    empiezan en base_acumulado. Los días sin intereses de un anticipo son
+    (fin - s + 1) menos los días ausentes en [s, fin] según dias_ausentes(s, fin).
+    """
+    a = bisect_left(seriales, serial_inicio, desde, hasta)
+    b = bisect_right(seriales, serial_fin, desde, hasta)
+    if a == b:
+        return 0.0, 0.0
+    primero = a
+    a, b = a - desde + base_acumulado, b - desde + base_acumulado
+    total = acumulado_valor[b] - acumulado_valor[a]
+    ponderado = acumulado_ponderado[b] - acumulado_ponderado[a]
+    descuento = (serial_fin - seriales[desde] + 1) * total - ponderado
+    if dias_ausentes is not None:
+        for k in range(a, b):
+            valor = acumulado_valor[k + 1] - acumulado_valor[k]
+            descuento -= valor * dias_ausentes(seriales[primero + k - a], serial_fin)
+    return total, descuento
+
+
+class LibroAnticipos:
+    """
+    Anticipos de cesantías de un empleado.
+
+    Args:
+        anticipos: Pares (fecha, valor) en cualquier orden
+    """
+
+    def __init__(self, anticipos: Iterable[Tuple[datetime.date, float]] = ()):
+        eventos = sorted((fecha_a_serial_360(fecha), float(valor)) for fecha, valor in anticipos)
+        self.seriales = array("i", [serial for serial, _ in eventos])
+        self.valores = array("d", [valor for _, valor in eventos])
+        self.acumulado_valor, self.acumulado_ponderado = _acumulados(self.seriales, self.valores)
+
+    def __len__(self) -> int:
+        return len(self.seriales)
+
+    def descuento_serial(self, serial_inicio: int, serial_fin: int,
+                         ausencias: Optional[IndiceIntervalos] = None) -> Tuple[float, float]:
+        """
+        (Total anticipado, Σ anticipo * días sin intereses) en el periodo [inicio, fin].
+
+        Los días ausentes posteriores a cada anticipo no cuentan como días sin
+        intereses (ya se descontaron de los días trabajados).
+        """
+        return _descuento(self.seriales, self.acumulado_valor, self.acumulado_ponderado,
+                          0, len(self.seriales), 0, serial_inicio, serial_fin,
+                          ausencias.dias_superpuestos_serial if ausencias else None)
+
+    def descuento(self, fecha_inicio: datetime.date, fecha_fin: datetime.date,
+                  ausencias: Optional[IndiceIntervalos] = None) -> Tuple[float, float]:
+        """Igual que descuento_serial, con fechas."""
+        return self.descuento_serial(fecha_a_serial_360(fecha_inicio), fecha_a_serial_360(fecha_fin), ausencias)
+
+
+def validar_descuento(valor_cesantias: float, total_anticipado: float) -> None:
+    """
+    Raises:
+        ValueError: Si los anticipos del periodo superan el valor de las cesantías.
+    """
+    if total_anticipado > valor_cesantias:
+        raise ValueError(
+            f"Los anticipos del periodo ({total_anticipado:,.2f}) superan el valor "
+            f"de las cesantías ({valor_cesantias:,.2f})."
+        )
+
+
+class LibrosAnticiposLote:
+    """
+    Anticipos de todo un roster en formato compacto por filas (CSR).
+
+    Los anticipos del empleado i ocupan [offsets[i], offsets[i+1]) en 'seriales'
+    (ordenados); sus acumulados ocupan [offsets[i] + i, offsets[i+1] + i + 1).
+    """
+
+    def __init__(self, libros: Iterable[Optional[LibroAnticipos]]):
+        self.offsets = array("q", [0])
+        self.seriales = array("i")
+        self.acumulado_valor = array("d")
+        self.acumulado_ponderado = array("d")
+        for libro in libros:
+            if libro is None or len(libro) == 0:
+                self.acumulado_valor.append(0.0)
+                self.acumulado_ponderado.append(0.0)
+            else:
+                self.seriales.extend(libro.seriales)
+                self.acumulado_valor.extend(libro.acumulado_valor)
+                self.acumulado_ponderado.extend(libro.acumulado_ponderado)
+            self.offsets.append(len(self.seriales))
+
+    @classmethod
+    def desde_eventos(
+        cls,
+        n_empleados: int,
+        filas: Sequence[int],
+        seriales: Sequence[int],
+        valores: Sequence[float]
+    ) -> "LibrosAnticiposLote":
+        """
+        Construye los libros a partir de columnas de eventos (fila del roster,
+        serial 30/360 del anticipo, valor) en cualquier orden, con un único
+        ordenamiento de todos los eventos.
+
+        Raises:
+            ValueError: Si una fila está fuera del roster o un valor no es positivo.
+        """
+        if not len(filas) == len(seriales) == len(valores):
+            raise ValueError("Las columnas de anticipos deben tener el mismo número de filas.")
+        orden = sorted(range(len(filas)), key=lambda k: (filas[k], seriales[k]))
+        lote = cls(())
+        lote.offsets = array("q", bytes(8 * (n_empleados + 1)))
+        lote.seriales = array("i", [seriales[k] for k in orden])
+        lote.acumulado_valor = array("d")
+        lote.acumulado_ponderado = array("d")
+        posicion = 0
+        for fila in range(n_empleados):
+            desde = posicion
+            while posicion < len(orden) and filas[orden[posicion]] == fila:
+                posicion += 1
+            acumulado_valor, acumulado_ponderado = _acumulados(
+                lote.seriales[desde:posicion], [valores[k] for k in orden[desde:posicion]]
+            )
+            lote.acumulado_valor.extend(acumulado_valor)
+            lote.acumulado_ponderado.extend(acumulado_ponderado)
+            lote.offsets[fila + 1] = posicion
+        if posicion != len(orden):
+            raise ValueError(f"Anticipo para una fila fuera del roster: {filas[orden[posicion]]}")
+        return lote
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def descuentos_lote(
+        self,
+        valores_cesantias: Sequence[float],
+        serial_inicio: Sequence[int],
+        serial_fin: Sequence[int],
+        filas: Optional[Iterable[int]] = None,
+        ausencias: Optional[IndiceIntervalosLote] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Σ anticipo * días sin intereses de cada empleado con anticipos en su periodo.
+
+        Args:
+            valores_cesantias: Cesantías por empleado (para validar los anticipos)
+            serial_inicio: Seriales 30/360 de las fechas de inicio
+            serial_fin: Seriales 30/360 de las fechas de fin
+            filas: Filas a considerar (por defecto todas)
+            ausencias: Ausencias por empleado; sus días posteriores a cada
+                       anticipo no cuentan como días sin intereses
+
+        Returns:
+            Lista de pares (fila, descuento), solo para filas con anticipos en su periodo
+
+        Raises:
+            ValueError: Si los anticipos de un periodo superan sus cesantías.
+        """
+        if len(valores_cesantias) != len(self):
+            raise ValueError("Los anticipos y el lote deben tener el mismo número de filas.")
+        descuentos = []
+        for fila in (range(len(self)) if filas is None else filas):
+            desde, hasta = self.offsets[fila], self.offsets[fila + 1]
+            if desde == hasta:
+                continue
+            dias_ausentes = None
+            if ausencias is not None:
+                dias_ausentes = lambda inicio, fin, fila=fila: ausencias.dias_superpuestos(fila, inicio, fin)
+            total, descuento = _descuento(self.seriales, self.acumulado_valor, self.acumulado_ponderado,
+                                          desde, hasta, desde + fila, serial_inicio[fila], serial_fin[fila],
+                                          dias_ausentes)
+            if not total:
+                continue
+            try:
+                validar_descuento(valores_cesantias[fila], total)
+            except ValueError as e:
+                raise ValueError(f"Fila {fila}: {e}")
+            descuentos.append((fila, descuento))
+        return descuentos
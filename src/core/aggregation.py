@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/aggregation.py
+
+Totales de nómina agrupados (roll-up) sobre resultados por lotes.
+
+Agrupa las columnas de un ResultadoLote por una o varias claves (centro de
+costo, tipo de contrato, año, semestre) y calcula suma, conteo, promedio y
+máximo por concepto, sin librerías de dataframes y en una sola pasada.
+
+Los agregados son parciales combinables: cada bloque del roster (o cada
+proceso de trabajo) produce su AgregadoParcial y luego se combinan con
+combinar(). El promedio se deriva de suma y conteo al final, así que no
+depende de cómo se haya partido el roster (salvo el redondeo de las sumas).
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from src.core.constants import (
+    CODIGOS_TIPO_CONTRATO,
+    DIAS_ANIO_COMERCIAL,
+    DIAS_SEMESTRE_COMERCIAL,
+    PERIODOS_LIQUIDACION,
+    TIPOS_CONTRATO,
+)
+from src.core.batch import ResultadoLote
+from src.core.roster import Roster
+
+# Conceptos agregados: (nombre, función que extrae la columna del ResultadoLote)
+CONCEPTOS_AGREGADOS: Tuple[Tuple[str, Callable[[ResultadoLote], Sequence[float]]], ...] = (
+    ("cesantias", lambda resultado: resultado.cesantias),
+    ("intereses", lambda resultado: resultado.intereses),
+    ("prima", lambda resultado: resultado.prima_total),
+)
+
+MEDIDAS: Tuple[str, ...] = ("suma", "conteo", "promedio", "maximo")
+
+# Claves de agrupación disponibles
+CLAVES_AGRUPACION: Tuple[str, ...] = ("centro_costo", "tipo_contrato", "anio", "semestre")
+
+# Códigos de semestre (la fecha de fin cae en el semestre 1 o 2 de su año)
+SEMESTRES: Tuple[str, ...] = ("SEMESTRE_1", "SEMESTRE_2")
+
+# ==============================================================================
+# Agregados parciales
+# ==============================================================================
+
+@dataclass
+class AgregadoParcial:
+    """
+    Agregado por grupo: clave (tupla de códigos) -> por concepto [suma, conteo, máximo].
+
+    Args:
+        claves: Nombres de las claves de agrupación, en orden
+        conceptos: Conceptos agregados
+    """
+    claves: Tuple[str, ...]
+    conceptos: Tuple[str, ...]
+    grupos: Dict[Tuple[int, ...], List[List[float]]] = field(default_factory=dict)
+
+    def _acumulador(self, clave: Tuple[int, ...]) -> List[List[float]]:
+        acumulador = self.grupos.get(clave)
+        if acumulador is None:
+            acumulador = [[0.0, 0, float("-inf")] for _ in self.conceptos]
+            self.grupos[clave] = acumulador
+        return acumulador
+
+    def combinar(self, otro: "AgregadoParcial") -> "AgregadoParcial":
+        """Suma a este agregado los grupos de otro (mismas claves y conceptos)."""
+        if otro.claves != self.claves or otro.conceptos != self.conceptos:
+            raise ValueError("Solo se pueden combinar agregados con las mismas claves y conceptos.")
+        for clave, medidas in otro.grupos.items():
+            propio = self._acumulador(clave)
+            for destino, (suma, conteo, maximo) in zip(propio, medidas):
+                destino[0] += suma
+                destino[1] += conteo
+                if maximo > destino[2]:
+                    destino[2] = maximo
+        return self
+
+    def valor(self, clave: Tuple[int, ...], concepto: str, medida: str) -> float:
+        """Valor de una medida ('suma', 'conteo', 'promedio' o 'maximo') de un grupo."""
+        suma, conteo, maximo = self.grupos[clave][self.conceptos.index(concepto)]
+        if medida == "suma":
+            return suma
+        if medida == "conteo":
+            return conteo
+        if medida == "promedio":
+            return suma / conteo if conteo else 0.0
+        if medida == "maximo":
+            return maximo
+        raise ValueError(f"Medida desconocida: {medida}")
+
+    def filas(self) -> Iterator[Tuple]:
+        """
+        Filas del roll-up ordenadas por clave: (etiquetas de las claves...,
+        concepto, suma, conteo, promedio, máximo).
+        """
+        for clave in sorted(self.grupos):
+            etiquetas = tuple(etiqueta_clave(nombre, codigo) for nombre, codigo in zip(self.claves, clave))
+            for concepto, (suma, conteo, maximo) in zip(self.conceptos, self.grupos[clave]):
+                yield etiquetas + (concepto, suma, conteo, suma / conteo if conteo else 0.0, maximo)
+
+
+def combinar_parciales(parciales: Iterable[AgregadoParcial]) -> AgregadoParcial:
+    """Combina los agregados de varios bloques o procesos en uno solo."""
+    iterador = iter(parciales)
+    try:
+        total = next(iterador)
+    except StopIteration:
+        raise ValueError("Se requiere al menos un agregado parcial.")
+    total = AgregadoParcial(total.claves, total.conceptos).combinar(total)
+    for parcial in iterador:
+        total.combinar(parcial)
+    return total
+
+
+def etiqueta_clave(nombre: str, codigo: int) -> str:
+    """Texto legible del código de una clave de agrupación."""
+    if nombre == "tipo_contrato":
+        return TIPOS_CONTRATO[CODIGOS_TIPO_CONTRATO[codigo]]
+    if nombre == "semestre":
+        return PERIODOS_LIQUIDACION[SEMESTRES[codigo]]
+    return str(codigo)
+
+# ==============================================================================
+# Agrupación
+# ==============================================================================
+
+def columnas_clave(roster: Roster, claves: Sequence[str], inicio: int = 0, fin: Optional[int] = None) -> List[Sequence[int]]:
+    """
+    Columnas de códigos de cada clave para las filas [inicio, fin) del roster.
+    El año y el semestre se derivan de la fecha de fin de cada periodo.
+    """
+    fin = len(roster) if fin is None else fin
+    columnas: List[Sequence[int]] = []
+    for nombre in claves:
+        if nombre in ("centro_costo", "tipo_contrato"):
+            if nombre not in roster:
+                raise ValueError(f"El roster no tiene la columna '{nombre}'.")
+            columnas.append(roster[nombre][inicio:fin])
+        elif nombre == "anio":
+            columnas.append([serial // DIAS_ANIO_COMERCIAL for serial in roster["serial_fin"][inicio:fin]])
+        elif nombre == "semestre":
+            columnas.append([
+                (serial % DIAS_ANIO_COMERCIAL) // DIAS_SEMESTRE_COMERCIAL
+                for serial in roster["serial_fin"][inicio:fin]
+            ])
+        else:
+            raise ValueError(f"Clave de agrupación desconocida: {nombre}")
+    return columnas
+
+
+def agrupar(
+    claves: Sequence[str],
+    columnas: Sequence[Sequence[int]],
+    valores: Mapping[str, Sequence[float]],
+    metodo: str = "hash"
+) -> AgregadoParcial:
+    """
+    Agrupa filas por las columnas clave y acumula suma, conteo y máximo por concepto.
+
+    Args:
+        claves: Nombres de las claves (uno por columna)
+        columnas: Columnas de códigos de las claves, todas de la misma longitud
+        valores: Concepto -> columna de valores
+        metodo: 'hash' (diccionario por grupo) u 'orden' (ordena las filas por
+                clave y recorre cada grupo contiguo; útil con muchos grupos)
+
+    Returns:
+        AgregadoParcial combinable con otros
+    """
+    if len(claves) != len(columnas):
+        raise ValueError("Debe haber una columna por cada clave de agrupación.")
+    conceptos = tuple(valores)
+    parcial = AgregadoParcial(tuple(claves), conceptos)
+    columnas_valor = [valores[concepto] for concepto in conceptos]
+    filas_clave = list(zip(*columnas)) if columnas else None
+    n = len(columnas_valor[0]) if columnas_valor else 0
+    if filas_clave is None:
+        filas_clave = [()] * n
+
+    if metodo == "hash":
+        for fila, clave in enumerate(filas_clave):
+            acumulador = parcial._acumulador(clave)
+            for destino, columna in zip(acumulador, columnas_valor):
+                valor = columna[fila]
+                destino[0] += valor
+                destino[1] += 1
+                if valor > destino[2]:
+                    destino[2] = valor
+    elif metodo == "orden":
+        orden = sorted(range(n), key=filas_clave.__getitem__)
+        inicio = 0
+        while inicio < n:
+            clave = filas_clave[orden[inicio]]
+            fin = inicio
+            while fin < n and filas_clave[orden[fin]] == clave:
+                fin += 1
+            acumulador = parcial._acumulador(clave)
+            for destino, columna in zip(acumulador, columnas_valor):
+                grupo = [columna[fila] for fila in orden[inicio:fin]]
+                destino[0] += sum(grupo)
+                destino[1] += len(grupo)
+                destino[2] = max(destino[2], max(grupo))
+            inicio = fin
+    else:
+        raise ValueError(f"Método de agrupación desconocido: {metodo}")
+    return parcial
+
+
+def agrupar_liquidacion(
+    roster: Roster,
+    resultado: ResultadoLote,
+    claves: Sequence[str] = CLAVES_AGRUPACION,
+    inicio: int = 0,
+    metodo: str = "hash"
+) -> AgregadoParcial:
+    """
+    Roll-up de cesantías, intereses y prima de un resultado por lotes.
+
+    Args:
+        roster: Roster liquidado
+        resultado: Resultado de las filas [inicio, inicio + len(resultado)) del roster
+        claves: Claves de agrupación (ver CLAVES_AGRUPACION)
+        inicio: Primera fila del roster a la que corresponde el resultado (para
+                agregar por bloques y combinar los parciales)
+        metodo: 'hash' u 'orden' (ver agrupar)
+
+    Returns:
+        AgregadoParcial por grupo y concepto
+    """
+    fin = inicio + len(resultado)
+    if fin > len(roster):
+        raise ValueError("El resultado tiene más filas que el roster.")
+    valores = {nombre: columna(resultado) for nombre, columna in CONCEPTOS_AGREGADOS}
+    return agrupar(claves, columnas_clave(roster, claves, inicio, fin), valores, metodo)
@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/audit_log.py
+
+Bitácora de auditoría binaria, solo de adición y a prueba de alteraciones,
+de las entradas y salidas de cada cálculo de liquidación.
+
+Cada registro guarda la función llamada, sus entradas, sus salidas, la versión
+de los parámetros legales usados y la marca de tiempo, más un hash encadenado:
+
+    hash_i = SHA-256(hash_{i-1} || longitud || cuerpo_i)
+
+donde hash_0 es el SHA-256 del encabezado del archivo. Modificar, quitar o
+reordenar cualquier registro rompe la cadena desde ese punto, y el verificador
+(verificar_log) lo detecta recorriendo el archivo una sola vez.
+
+Formato (little-endian):
+    Encabezado: magic (8s) | versión (H) | reservado (6x)
+    Registro:   longitud (I) | cuerpo | hash (32s) | longitud (I)
+    Cuerpo:     marca de tiempo en ns (q) | tipo (B) | versión de parámetros (texto)
+                | función (texto) | entradas (secciones) | salidas (secciones)
+    Texto:      largo (H) | UTF-8
+    Secciones:  largo total (I) | [nombre (texto) | formato (1s) | largo (I) | datos]...
+
+El formato de una sección es un typecode de array.array (columnas de un lote,
+guardadas en binario), "r" (un ResultadoCalculo de una llamada escalar, con
+campos de ancho fijo: concepto (texto) | versión (texto) | valor (d) | días (q)
+| fecha de inicio y de fin como ordinales (ii) | detalles en JSON) o "j" (JSON,
+para el resto de valores escalares). La longitud
+repetida al final de cada registro permite ubicar el último registro sin leer
+el archivo completo al reabrirlo para seguir escribiendo.
+
+La cadena de hashes vive en un solo proceso: en un proceso hijo creado con
+fork() la auditoría queda desactivada y las bitácoras heredadas no escriben
+en el archivo. Quien reparte trabajo entre procesos registra los resultados
+desde el proceso principal (ver src/core/parallel.py).
+
+Uso:
+    with BitacoraAuditoria("auditoria.log") as bitacora:
+        activar_auditoria(bitacora)
+        ...  # cada llamada del calculador (escalar o por lotes) queda registrada
+        desactivar_auditoria()
+"""
+
+import dataclasses
+import datetime
+import functools
+import hashlib
+import inspect
+import json
+import os
+import struct
+import threading
+import time
+import weakref
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.models import ResultadoCalculo
+
+MAGIC_AUDITORIA = b"LIQAUDIT"
+VERSION_FORMATO_AUDITORIA = 1
+TAMANO_BUFFER_AUDITORIA = 4 * 1024 * 1024
+
+TIPO_ESCALAR = 1
+TIPO_LOTE = 2
+
+_ENCABEZADO = struct.Struct("<8sH6x")
+_LONGITUD = struct.Struct("<I")
+_CABECERA_CUERPO = struct.Struct("<qB")
+_LARGO_HASH = 32
+_FORMATO_JSON = b"j"
+_FORMATO_RESULTADO = b"r"
+_CAMPOS_RESULTADO = struct.Struct("<dqii")  # valor, días, ordinal de inicio, ordinal de fin
+
+
+def _hash_inicial() -> bytes:
+    return hashlib.sha256(_ENCABEZADO.pack(MAGIC_AUDITORIA, VERSION_FORMATO_AUDITORIA)).digest()
+
+# ==============================================================================
+# Codificación
+# ==============================================================================
+
+def _texto(valor: str) -> bytes:
+    datos = valor.encode("utf-8")
+    return struct.pack("<H", len(datos)) + datos
+
+
+@functools.lru_cache(maxsize=None)
+def _campos(clase: type) -> Tuple[dataclasses.Field, ...]:
+    return dataclasses.fields(clase)
+
+
+def _json_por_defecto(valor: Any) -> Any:
+    if isinstance(valor, datetime.date):
+        return valor.isoformat()
+    if dataclasses.is_dataclass(valor):
+        # Copia superficial: json recorre los valores anidados (asdict los copiaría en profundidad)
+        return {campo.name: getattr(valor, campo.name) for campo in _campos(type(valor))}
+    if isinstance(valor, (array, memoryview)):
+        return list(valor)
+    raise TypeError(f"Valor no serializable para auditoría: {type(valor).__name__}")
+
+
+# Un solo codificador (json.dumps con opciones crea uno por llamada)
+_CODIFICADOR_JSON = json.JSONEncoder(default=_json_por_defecto, sort_keys=True)
+
+
+def _resultado_fijo(resultado: ResultadoCalculo) -> bytes:
+    return b"".join((
+        _texto(resultado.concepto),
+        _texto(resultado.version_parametros or ""),
+        _CAMPOS_RESULTADO.pack(resultado.valor, resultado.dias_calculados,
+                               resultado.fecha_inicio.toordinal(), resultado.fecha_fin.toordinal()),
+        _CODIFICADOR_JSON.encode(resultado.detalles).encode("utf-8") if resultado.detalles else b"{}",
+    ))
+
+
+def _leer_resultado(datos: bytes) -> ResultadoCalculo:
+    concepto, posicion = _leer_texto(datos, 0)
+    version, posicion = _leer_texto(datos, posicion)
+    valor, dias, inicio, fin = _CAMPOS_RESULTADO.unpack_from(datos, posicion)
+    detalles = json.loads(datos[posicion + _CAMPOS_RESULTADO.size:].decode("utf-8"))
+    return ResultadoCalculo(concepto, valor, dias, datetime.date.fromordinal(inicio),
+                            datetime.date.fromordinal(fin), detalles, version or None)
+
+
+def _columna(valor: Any) -> Optional[Tuple[bytes, memoryview]]:
+    """(typecode, datos) si el valor es una columna binaria; None si no."""
+    if isinstance(valor, array):
+        return valor.typecode.encode("ascii"), memoryview(valor).cast("B")
+    if isinstance(valor, memoryview) and len(valor.format) == 1:
+        return valor.format.encode("ascii"), valor.cast("B") if valor.c_contiguous else memoryview(valor.tobytes())
+    return None
+
+
+def _secciones(valores: Dict[str, Any], partes: List[Any]) -> None:
+    """
+    Agrega a partes la codificación de un diccionario de valores como secciones.
+
+    Las columnas (array o memoryview) van en binario y se agregan sin copiarlas;
+    los ResultadoCalculo (solos o en un diccionario por concepto) van con campos
+    de ancho fijo; los objetos con columnas (índices de ausencias, historiales, anticipos por
+    lote, resultados por lote) se descomponen en sus atributos; el resto va como JSON.
+    """
+    indice_largo = len(partes)
+    partes.append(b"")  # Largo total, se completa al final
+    largo_total = 0
+    escalares: Dict[str, Any] = {}
+
+    def agregar_seccion(nombre: str, formato: bytes, datos: Any) -> int:
+        cabecera = _texto(nombre) + formato + _LONGITUD.pack(len(datos))
+        partes.append(cabecera)
+        partes.append(datos)
+        return len(cabecera) + len(datos)
+
+    def agregar(nombre: str, valor: Any) -> int:
+        columna = _columna(valor)
+        if columna is not None:
+            return agregar_seccion(nombre, *columna)
+        if isinstance(valor, ResultadoCalculo):
+            return agregar_seccion(nombre, _FORMATO_RESULTADO, _resultado_fijo(valor))
+        if isinstance(valor, dict) and valor and all(isinstance(v, ResultadoCalculo) for v in valor.values()):
+            return sum(agregar(f"{nombre}.{clave}", contenido) for clave, contenido in valor.items())
+        if hasattr(valor, "__dict__") and any(_columna(v) is not None for v in vars(valor).values()):
+            return sum(agregar(f"{nombre}.{atributo}", contenido) for atributo, contenido in vars(valor).items())
+        escalares[nombre] = valor
+        return 0
+
+    for nombre, valor in valores.items():
+        largo_total += agregar(nombre, valor)
+    if escalares:
+        datos = _CODIFICADOR_JSON.encode(escalares).encode("utf-8")
+        largo_total += agregar_seccion("", _FORMATO_JSON, datos)
+    partes[indice_largo] = _LONGITUD.pack(largo_total)
+
+
+def _leer_texto(datos: bytes, posicion: int) -> Tuple[str, int]:
+    (largo,) = struct.unpack_from("<H", datos, posicion)
+    posicion += 2
+    return datos[posicion:posicion + largo].decode("utf-8"), posicion + largo
+
+
+def _leer_secciones(datos: bytes, posicion: int) -> Tuple[Dict[str, Any], int]:
+    (largo_total,) = _LONGITUD.unpack_from(datos, posicion)
+    posicion += _LONGITUD.size
+    fin = posicion + largo_total
+    valores: Dict[str, Any] = {}
+    while posicion < fin:
+        nombre, posicion = _leer_texto(datos, posicion)
+        formato = datos[posicion:posicion + 1]
+        (largo,) = _LONGITUD.unpack_from(datos, posicion + 1)
+        posicion += 1 + _LONGITUD.size
+        contenido = datos[posicion:posicion + largo]
+        posicion += largo
+        if formato == _FORMATO_JSON:
+            valores.update(json.loads(contenido.decode("utf-8")))
+        elif formato == _FORMATO_RESULTADO:
+            valores[nombre] = _leer_resultado(contenido)
+        else:
+            columna = array(formato.decode("ascii"))
+            columna.frombytes(contenido)
+            valores[nombre] = columna
+    return valores, fin
+
+# ==============================================================================
+# Escritura
+# ==============================================================================
+
+class BitacoraAuditoria:
+    """
+    Bitácora de auditoría abierta para agregar registros.
+
+    Los registros se acumulan en un buffer y se escriben en bloques; llame a
+    sincronizar() para forzarlos a disco (por ejemplo al terminar una corrida)
+    y a cerrar() al terminar. Es segura para usar desde varios hilos.
+
+    Args:
+        ruta: Archivo de la bitácora (se crea si no existe)
+        tamano_buffer: Bytes acumulados en memoria antes de escribir
+
+    Raises:
+        ValueError: Si el archivo no es una bitácora o termina en un registro incompleto.
+    """
+
+    def __init__(self, ruta: str, tamano_buffer: int = TAMANO_BUFFER_AUDITORIA):
+        self.ruta = ruta
+        self._bloqueo = threading.Lock()
+        self._ultimo_hash = self._preparar(ruta)
+        # O_APPEND: cada escritura va al final aunque otro descriptor haya movido la posición
+        self._archivo = open(ruta, "ab", buffering=tamano_buffer)
+        self.registros = 0
+        self._abandonada = False
+        _bitacoras_abiertas.add(self)
+
+    @staticmethod
+    def _preparar(ruta: str) -> bytes:
+        """Crea el archivo con su encabezado, o retorna el último hash si ya existe."""
+        if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+            with open(ruta, "wb") as archivo:
+                archivo.write(_ENCABEZADO.pack(MAGIC_AUDITORIA, VERSION_FORMATO_AUDITORIA))
+            return _hash_inicial()
+        with open(ruta, "rb") as archivo:
+            magic, version = _ENCABEZADO.unpack(archivo.read(_ENCABEZADO.size))
+            if magic != MAGIC_AUDITORIA or version > VERSION_FORMATO_AUDITORIA:
+                raise ValueError(f"{ruta} no es una bitácora de auditoría compatible.")
+            tamano = archivo.seek(0, os.SEEK_END)
+            if tamano == _ENCABEZADO.size:
+                return _hash_inicial()
+            # Último registro: su longitud está repetida en los últimos 4 bytes
+            archivo.seek(tamano - _LONGITUD.size)
+            (longitud,) = _LONGITUD.unpack(archivo.read(_LONGITUD.size))
+            inicio = tamano - (2 * _LONGITUD.size + longitud + _LARGO_HASH)
+            if inicio >= _ENCABEZADO.size:
+                archivo.seek(inicio)
+                (longitud_inicial,) = _LONGITUD.unpack(archivo.read(_LONGITUD.size))
+                if longitud_inicial == longitud:
+                    archivo.seek(inicio + _LONGITUD.size + longitud)
+                    return archivo.read(_LARGO_HASH)
+        raise ValueError(
+            f"La bitácora {ruta} termina en un registro incompleto; verifíquela con verificar_log()."
+        )
+
+    def __enter__(self) -> "BitacoraAuditoria":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cerrar()
+
+    def registrar(self, tipo: int, funcion: str, version_parametros: Optional[str],
+                  entradas: Dict[str, Any], salidas: Dict[str, Any]) -> None:
+        """Agrega un registro con las entradas y salidas indicadas."""
+        partes: List[Any] = [
+            _CABECERA_CUERPO.pack(time.time_ns(), tipo),
+            _texto(version_parametros or ""),
+            _texto(funcion),
+        ]
+        _secciones(entradas, partes)
+        _secciones(salidas, partes)
+        longitud = _LONGITUD.pack(sum(len(parte) for parte in partes))
+        with self._bloqueo:
+            h = hashlib.sha256(self._ultimo_hash)
+            h.update(longitud)
+            for parte in partes:
+                h.update(parte)
+            self._ultimo_hash = h.digest()
+            self._archivo.write(longitud)
+            self._archivo.writelines(partes)
+            self._archivo.write(self._ultimo_hash + longitud)
+            self.registros += 1
+
+    def sincronizar(self) -> None:
+        """Escribe el buffer y fuerza los datos a disco."""
+        with self._bloqueo:
+            self._archivo.flush()
+            if not self._abandonada:
+                os.fsync(self._archivo.fileno())
+
+    def cerrar(self) -> None:
+        if not self._archivo.closed:
+            self.sincronizar()
+            self._archivo.close()
+
+    def _abandonar(self) -> None:
+        """
+        En un proceso hijo: redirige el descriptor heredado a /dev/null para que
+        el buffer copiado del padre (y cualquier registro posterior) no llegue
+        al archivo y rompa la cadena.
+        """
+        self._bloqueo = threading.Lock()  # El del padre pudo quedar tomado al hacer fork()
+        self._abandonada = True
+        if not self._archivo.closed:
+            nulo = os.open(os.devnull, os.O_WRONLY)
+            try:
+                os.dup2(nulo, self._archivo.fileno())
+            finally:
+                os.close(nulo)
+
+# ==============================================================================
+# Registro automático de las llamadas del calculador
+# ==============================================================================
+
+_bitacora_activa: Optional[BitacoraAuditoria] = None
+_bitacoras_abiertas: "weakref.WeakSet[BitacoraAuditoria]" = weakref.WeakSet()
+_estado_hilo = threading.local()
+
+
+def activar_auditoria(bitacora: BitacoraAuditoria) -> None:
+    """Registra desde ahora cada llamada auditada del calculador en la bitácora."""
+    global _bitacora_activa
+    _bitacora_activa = bitacora
+
+
+def desactivar_auditoria() -> None:
+    global _bitacora_activa
+    _bitacora_activa = None
+
+
+def bitacora_activa() -> Optional[BitacoraAuditoria]:
+    """Bitácora activa en este proceso (None si la auditoría está desactivada)."""
+    return _bitacora_activa
+
+
+def _despues_de_fork() -> None:
+    """Un proceso hijo no escribe en las bitácoras del padre (ver el encabezado del módulo)."""
+    desactivar_auditoria()
+    for bitacora in list(_bitacoras_abiertas):
+        bitacora._abandonar()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_despues_de_fork)
+
+
+def _version_salida(resultado: Any) -> Optional[str]:
+    """Versión de parámetros registrada en el resultado, si la tiene."""
+    if isinstance(resultado, dict):
+        resultado = next(iter(resultado.values()), None)
+    return getattr(resultado, "version_parametros", None)
+
+
+def auditado(tipo: int) -> Callable[[Callable], Callable]:
+    """
+    Decorador para funciones del calculador: si hay una bitácora activa, cada
+    llamada exitosa agrega un registro con sus argumentos y su resultado. Las
+    llamadas anidadas (una función auditada que llama a otra) se registran una
+    sola vez, en la llamada externa. Sin bitácora activa solo cuesta una comparación.
+    """
+    def decorador(funcion: Callable) -> Callable:
+        # Nombres de los parámetros posicionales, resueltos una vez (sin Signature.bind por llamada)
+        parametros = inspect.signature(funcion).parameters.values()
+        nombres = tuple(p.name for p in parametros if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+        por_nombre = next((p.name for p in parametros if p.kind is p.VAR_POSITIONAL), None)
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            bitacora = _bitacora_activa
+            if bitacora is None or getattr(_estado_hilo, "activo", False):
+                return funcion(*args, **kwargs)
+            # La instantánea se toma antes de llamar: la que use la función si no
+            # registra su propia versión
+            from config.parameter_snapshot import snapshot_actual
+            snapshot = snapshot_actual()
+            _estado_hilo.activo = True
+            try:
+                resultado = funcion(*args, **kwargs)
+            finally:
+                _estado_hilo.activo = False
+            entradas = dict(zip(nombres, args))
+            if len(args) > len(nombres) and por_nombre is not None:
+                entradas[por_nombre] = args[len(nombres):]
+            entradas.update(kwargs)
+            if dataclasses.is_dataclass(resultado) or isinstance(resultado, (array, memoryview)):
+                salidas = {"resultado": resultado}
+            elif isinstance(resultado, tuple):
+                salidas = {f"resultado_{i}": valor for i, valor in enumerate(resultado)}
+            else:
+                salidas = {"resultado": resultado}
+            version = _version_salida(resultado)
+            bitacora.registrar(tipo, funcion.__name__, version if version is not None else snapshot.version,
+                               entradas, salidas)
+            return resultado
+        return envoltura
+    return decorador
+
+# ==============================================================================
+# Lectura y verificación
+# ==============================================================================
+
+@dataclasses.dataclass
+class RegistroAuditoria:
+    """Un registro leído de la bitácora."""
+    posicion: int
+    marca_tiempo_ns: int
+    tipo: int
+    version_parametros: str
+    funcion: str
+    entradas: Dict[str, Any]
+    salidas: Dict[str, Any]
+    hash: bytes
+
+    @property
+    def fecha_hora(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.marca_tiempo_ns / 1e9)
+
+
+@dataclasses.dataclass
+class ResultadoVerificacion:
+    """Resultado de verificar la cadena de hashes de una bitácora."""
+    valida: bool
+    registros: int
+    posicion_valida: int  # Bytes iniciales del archivo cuya cadena es correcta
+    mensaje: str = ""
+
+
+def _recorrer(ruta: str, tamano_lectura: int = 1 << 20) -> Iterator[Tuple[int, bytes, bytes, bytes]]:
+    """
+    Recorre los registros en streaming.
+
+    Yields:
+        (posición, longitud empaquetada, cuerpo, hash) de cada registro
+
+    Raises:
+        ValueError: Si el archivo no es una bitácora o un registro está truncado.
+    """
+    with open(ruta, "rb", buffering=tamano_lectura) as archivo:
+        encabezado = archivo.read(_ENCABEZADO.size)
+        if len(encabezado) < _ENCABEZADO.size or encabezado[:8] != MAGIC_AUDITORIA:
+            raise ValueError(f"{ruta} no es una bitácora de auditoría.")
+        posicion = _ENCABEZADO.size
+        while True:
+            longitud = archivo.read(_LONGITUD.size)
+            if not longitud:
+                return
+            if len(longitud) < _LONGITUD.size:
+                raise ValueError(f"Registro truncado en la posición {posicion}")
+            (largo,) = _LONGITUD.unpack(longitud)
+            resto = archivo.read(largo + _LARGO_HASH + _LONGITUD.size)
+            if len(resto) < largo + _LARGO_HASH + _LONGITUD.size or resto[-_LONGITUD.size:] != longitud:
+                raise ValueError(f"Registro truncado o dañado en la posición {posicion}")
+            yield posicion, longitud, resto[:largo], resto[largo:largo + _LARGO_HASH]
+            posicion += 2 * _LONGITUD.size + largo + _LARGO_HASH
+
+
+def verificar_log(ruta: str) -> ResultadoVerificacion:
+    """
+    Verifica la cadena de hashes de toda la bitácora en una sola pasada.
+
+    Returns:
+        ResultadoVerificacion; si no es válida, posicion_valida indica hasta dónde
+        el contenido es íntegro y mensaje describe el primer problema.
+    """
+    ultimo_hash = _hash_inicial()
+    registros = 0
+    posicion_valida = _ENCABEZADO.size
+    try:
+        for posicion, longitud, cuerpo, hash_registro in _recorrer(ruta):
+            h = hashlib.sha256(ultimo_hash)
+            h.update(longitud)
+            h.update(cuerpo)
+            ultimo_hash = h.digest()
+            if ultimo_hash != hash_registro:
+                return ResultadoVerificacion(False, registros, posicion,
+                                             f"Hash inválido en el registro {registros} (posición {posicion})")
+            registros += 1
+            posicion_valida = posicion + 2 * _LONGITUD.size + len(cuerpo) + _LARGO_HASH
+    except ValueError as e:
+        return ResultadoVerificacion(False, registros, posicion_valida, str(e))
+    return ResultadoVerificacion(True, registros, posicion_valida)
+
+
+def leer_registros(ruta: str) -> Iterator[RegistroAuditoria]:
+    """Lee y decodifica los registros de la bitácora (sin verificar la cadena)."""
+    for posicion, _, cuerpo, hash_registro in _recorrer(ruta):
+        marca_tiempo, tipo = _CABECERA_CUERPO.unpack_from(cuerpo, 0)
+        puntero = _CABECERA_CUERPO.size
+        version, puntero = _leer_texto(cuerpo, puntero)
+        funcion, puntero = _leer_texto(cuerpo, puntero)
+        entradas, puntero = _leer_secciones(cuerpo, puntero)
+        salidas, puntero = _leer_secciones(cuerpo, puntero)
+        yield RegistroAuditoria(posicion, marca_tiempo, tipo, version, funcion, entradas, salidas, hash_registro)
+
+
+if __name__ == "__main__":
+    import sys
+    for ruta_log in sys.argv[1:]:
+        verificacion = verificar_log(ruta_log)
+        estado = "OK" if verificacion.valida else f"ALTERADA: {verificacion.mensaje}"
+        print(f"{ruta_log}: {verificacion.registros} registros, {estado}")
+        if not verificacion.valida:
+            sys.exit(1)
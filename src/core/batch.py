@@ -0,0 +1,569 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/batch.py
+
+Cálculos de liquidación por lotes. Trabaja sobre columnas (salarios y fechas
+como seriales 30/360) en lugar de un empleado a la vez, de modo que una nómina
+completa se liquida en una sola pasada y con los mismos resultados que las
+funciones escalares de src/core/calculator.py.
+
+Las columnas pueden ser cualquier secuencia indexable: listas, array.array o
+vistas memoryview sobre un roster binario mapeado en memoria.
+"""
+
+import hashlib
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from config.parameter_snapshot import SnapshotParametros, snapshot_actual
+from src.core.constants import (
+    PORCENTAJE_INTERESES_CESANTIAS,
+    MAX_SMMLV_PARA_AUXILIO_TRANSPORTE,
+    DIAS_ANIO_COMERCIAL,
+    DIAS_SEMESTRE_COMERCIAL,
+    CODIGOS_TIPO_CONTRATO,
+    BANDERA_SALARIO_INTEGRAL,
+    BANDERA_APRENDIZ,
+)
+from src.core.intervals import IndiceIntervalosLote
+from src.core.salary_history import HistorialesSalarialesLote
+from src.core.advances import LibrosAnticiposLote
+from src.core.audit_log import TIPO_LOTE, auditado
+
+# ==============================================================================
+# Resultados
+# ==============================================================================
+
+@dataclass
+class ResultadoLote:
+    """Resultados de liquidación por lotes, una posición por empleado del roster."""
+    dias: array
+    cesantias: array
+    intereses: array
+    prima_semestre_1: array
+    prima_semestre_2: array
+    dias_semestre_1: array
+    dias_semestre_2: array
+    version_parametros: Optional[str] = None  # Versión de los parámetros legales usados
+
+    def __len__(self) -> int:
+        return len(self.dias)
+
+    @property
+    def prima_total(self) -> array:
+        """Prima total por empleado (semestre 1 + semestre 2)."""
+        return array("d", [s1 + s2 for s1, s2 in zip(self.prima_semestre_1, self.prima_semestre_2)])
+
+# ==============================================================================
+# Parámetros por año
+# ==============================================================================
+
+def obtener_parametros_anios(
+    anios: Iterable[int],
+    snapshot: Optional[SnapshotParametros] = None
+) -> Dict[int, Tuple[int, int]]:
+    """
+    Obtiene el SMMLV y el auxilio de transporte de cada año presente en el lote.
+
+    Args:
+        anios: Años a consultar (puede tener repetidos)
+        snapshot: Instantánea de parámetros a usar (por defecto la vigente)
+
+    Returns:
+        Diccionario {anio: (smmlv, auxilio_transporte)}
+
+    Raises:
+        ValueError: Si falta configuración para alguno de los años.
+    """
+    snapshot = snapshot or snapshot_actual()
+    parametros = {}
+    for anio in set(anios):
+        smmlv_anio = snapshot.smmlv(anio)
+        auxilio_transporte_anio = snapshot.auxilio_transporte(anio)
+        if smmlv_anio <= 0 or auxilio_transporte_anio <= 0:
+            raise ValueError(f"No se encontró configuración de SMMLV/Aux. Transporte para el año {anio}")
+        parametros[anio] = (smmlv_anio, auxilio_transporte_anio)
+    return parametros
+
+
+def _validar_columnas(serial_inicio: Sequence[int], serial_fin: Sequence[int], *otras: Sequence) -> int:
+    """Verifica que las columnas tengan el mismo largo y que los periodos sean válidos."""
+    n = len(serial_inicio)
+    if len(serial_fin) != n or any(len(columna) != n for columna in otras):
+        raise ValueError("Todas las columnas del lote deben tener el mismo número de filas.")
+    for fila, (inicio, fin) in enumerate(zip(serial_inicio, serial_fin)):
+        if fin < inicio:
+            raise ValueError(f"Fila {fila}: la fecha de fin no puede ser anterior a la fecha de inicio")
+    return n
+
+# ==============================================================================
+# Reglas por tipo de contrato y banderas
+# ==============================================================================
+
+# Conceptos que se pueden liquidar por lotes
+CONCEPTOS_LOTE: FrozenSet[str] = frozenset({"cesantias", "intereses", "prima"})
+
+
+@dataclass(frozen=True)
+class ReglaLiquidacion:
+    """
+    Regla de liquidación: a qué empleados aplica (según código de tipo de
+    contrato y banderas) y qué conceptos se les liquidan.
+    """
+    nombre: str
+    aplica: Callable[[int, int], bool]  # (código tipo_contrato, banderas) -> bool
+    conceptos: FrozenSet[str]
+
+
+# Reglas en orden de prioridad: cada empleado queda en la primera que le aplica
+REGLAS_LIQUIDACION: List[ReglaLiquidacion] = [
+    # Prestación de servicios: no es contrato laboral, no genera prestaciones
+    ReglaLiquidacion(
+        "servicios",
+        lambda tipo, banderas: CODIGOS_TIPO_CONTRATO[tipo] == "SERVICIOS",
+        frozenset(),
+    ),
+    # Aprendices SENA: reciben apoyo de sostenimiento, no salario (Ley 789 de 2002)
+    ReglaLiquidacion("aprendiz", lambda tipo, banderas: bool(banderas & BANDERA_APRENDIZ), frozenset()),
+    # Salario integral: ya incluye cesantías, intereses y prima (Art. 132 CST)
+    ReglaLiquidacion("salario_integral", lambda tipo, banderas: bool(banderas & BANDERA_SALARIO_INTEGRAL), frozenset()),
+    ReglaLiquidacion("general", lambda tipo, banderas: True, CONCEPTOS_LOTE),
+]
+
+
+def registrar_regla(regla: ReglaLiquidacion, prioridad: Optional[int] = None) -> None:
+    """
+    Agrega una regla a REGLAS_LIQUIDACION.
+
+    Args:
+        regla: Regla a agregar (sus conceptos deben estar en CONCEPTOS_LOTE)
+        prioridad: Posición en la lista; por defecto justo antes de la regla general
+    """
+    desconocidos = regla.conceptos - CONCEPTOS_LOTE
+    if desconocidos:
+        raise ValueError(f"Conceptos desconocidos en la regla '{regla.nombre}': {sorted(desconocidos)}")
+    REGLAS_LIQUIDACION.insert(len(REGLAS_LIQUIDACION) - 1 if prioridad is None else prioridad, regla)
+
+
+def version_reglas() -> str:
+    """
+    Huella de REGLAS_LIQUIDACION (nombre y conceptos de cada regla, en orden de
+    prioridad), para invalidar cachés de resultados cuando se registra una regla.
+    """
+    firma = "|".join(f"{regla.nombre}:{','.join(sorted(regla.conceptos))}" for regla in REGLAS_LIQUIDACION)
+    return hashlib.sha256(firma.encode("utf-8")).hexdigest()[:16]
+
+
+def agrupar_por_regla(
+    tipos_contrato: Sequence[int],
+    banderas: Sequence[int]
+) -> Dict[ReglaLiquidacion, array]:
+    """
+    Clasifica las filas del lote según la regla que les aplica.
+
+    Las reglas se evalúan una vez por combinación distinta de (tipo de contrato,
+    banderas), no por fila. Cada grupo es la lista de índices de sus filas
+    (el equivalente de una máscara booleana sobre el lote).
+
+    Returns:
+        Diccionario {regla: array('q') con los índices de sus filas}
+
+    Raises:
+        ValueError: Si hay un código de tipo de contrato desconocido.
+    """
+    if len(tipos_contrato) != len(banderas):
+        raise ValueError("Todas las columnas del lote deben tener el mismo número de filas.")
+    regla_por_combinacion: Dict[Tuple[int, int], ReglaLiquidacion] = {}
+    for combinacion in set(zip(tipos_contrato, banderas)):
+        tipo, bandera = combinacion
+        if not 0 <= tipo < len(CODIGOS_TIPO_CONTRATO):
+            raise ValueError(f"Código de tipo de contrato desconocido: {tipo}")
+        regla_por_combinacion[combinacion] = next(regla for regla in REGLAS_LIQUIDACION if regla.aplica(tipo, bandera))
+
+    grupos: Dict[ReglaLiquidacion, array] = {}
+    for fila, combinacion in enumerate(zip(tipos_contrato, banderas)):
+        regla = regla_por_combinacion[combinacion]
+        filas = grupos.get(regla)
+        if filas is None:
+            filas = grupos[regla] = array("q")
+        filas.append(fila)
+    return grupos
+
+# ==============================================================================
+# Funciones de Cálculo por Lotes
+# ==============================================================================
+
+def calcular_dias_lote(
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None
+) -> array:
+    """
+    Calcula los días 30/360 (inclusivos) de cada periodo del lote.
+
+    Args:
+        serial_inicio: Seriales 30/360 de las fechas de inicio
+        serial_fin: Seriales 30/360 de las fechas de fin
+        ausencias: Licencias/suspensiones por empleado a descontar (opcional)
+
+    Returns:
+        array('i') con los días de liquidación por empleado
+    """
+    _validar_columnas(serial_inicio, serial_fin)
+    return _dias_periodo(serial_inicio, serial_fin, ausencias)
+
+
+def _dias_periodo(
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote]
+) -> array:
+    """Días de cada periodo menos las ausencias, sin validar."""
+    dias = array("i", [fin - inicio + 1 for inicio, fin in zip(serial_inicio, serial_fin)])
+    if ausencias is not None:
+        for fila, descuento in enumerate(ausencias.dias_superpuestos_lote(serial_inicio, serial_fin)):
+            dias[fila] -= descuento
+    return dias
+
+
+def _salarios_efectivos(
+    salarios: Sequence[float],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    historiales: Optional[HistorialesSalarialesLote]
+) -> Sequence[float]:
+    """Salario promedio para quienes tienen historial salarial; el fijo para el resto."""
+    if historiales is None:
+        return salarios
+    return historiales.promedios_lote(salarios, serial_inicio, serial_fin)
+
+
+def calcular_bases_lote(
+    salarios: Sequence[float],
+    serial_fin: Sequence[int],
+    snapshot: Optional[SnapshotParametros] = None
+) -> array:
+    """
+    Calcula el salario base de liquidación (salario + auxilio si aplica) por empleado.
+
+    El SMMLV y el auxilio se toman del año de la fecha de fin de cada periodo,
+    igual que en calcular_cesantias y calcular_prima_servicios.
+
+    Args:
+        salarios: Salarios mensuales (sin auxilio)
+        serial_fin: Seriales 30/360 de las fechas de fin
+        snapshot: Instantánea de parámetros a usar (por defecto la vigente)
+
+    Returns:
+        array('d') con la base de liquidación por empleado
+    """
+    parametros = obtener_parametros_anios((fin // DIAS_ANIO_COMERCIAL for fin in serial_fin), snapshot)
+    topes = {anio: (MAX_SMMLV_PARA_AUXILIO_TRANSPORTE * smmlv, auxilio) for anio, (smmlv, auxilio) in parametros.items()}
+    bases = array("d", bytes(8 * len(salarios)))
+    for fila, (salario, fin) in enumerate(zip(salarios, serial_fin)):
+        tope, auxilio = topes[fin // DIAS_ANIO_COMERCIAL]
+        bases[fila] = salario + auxilio if salario <= tope else salario
+    return bases
+
+
+@auditado(TIPO_LOTE)
+def calcular_cesantias_lote(
+    salarios: Sequence[float],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None,
+    historiales: Optional[HistorialesSalarialesLote] = None
+) -> array:
+    """
+    Calcula las cesantías de todos los empleados del lote.
+
+    Formula: (Salario Base * Días Trabajados) / 360
+
+    Args:
+        salarios: Salarios mensuales (sin auxilio)
+        serial_inicio: Seriales 30/360 de las fechas de inicio
+        serial_fin: Seriales 30/360 de las fechas de fin
+        ausencias: Licencias/suspensiones por empleado a descontar (opcional)
+        historiales: Historiales salariales para salarios variables (opcional);
+                     su promedio reemplaza al salario fijo
+
+    Returns:
+        array('d') con las cesantías por empleado
+
+    Raises:
+        ValueError: Si algún periodo es inválido o falta configuración para un año.
+    """
+    _validar_columnas(serial_inicio, serial_fin, salarios)
+    salarios = _salarios_efectivos(salarios, serial_inicio, serial_fin, historiales)
+    bases = calcular_bases_lote(salarios, serial_fin)
+    dias = _dias_periodo(serial_inicio, serial_fin, ausencias)
+    return array("d", [(base * d) / DIAS_ANIO_COMERCIAL for base, d in zip(bases, dias)])
+
+
+@auditado(TIPO_LOTE)
+def calcular_intereses_lote(
+    cesantias: Sequence[float],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None,
+    anticipos: Optional[LibrosAnticiposLote] = None
+) -> array:
+    """
+    Calcula los intereses sobre cesantías de todos los empleados del lote.
+
+    Formula: (Valor Cesantías * Días Trabajados * 0.12) / 360
+
+    Args:
+        cesantias: Valor de las cesantías por empleado
+        serial_inicio: Seriales 30/360 de las fechas de inicio
+        serial_fin: Seriales 30/360 de las fechas de fin
+        ausencias: Licencias/suspensiones por empleado a descontar (opcional)
+        anticipos: Anticipos de cesantías por empleado (opcional); lo anticipado
+                   deja de generar intereses desde la fecha del anticipo
+
+    Returns:
+        array('d') con los intereses por empleado
+
+    Raises:
+        ValueError: Si los anticipos de un periodo superan sus cesantías.
+    """
+    _validar_columnas(serial_inicio, serial_fin, cesantias)
+    dias = _dias_periodo(serial_inicio, serial_fin, ausencias)
+    return _intereses(cesantias, dias, serial_inicio, serial_fin, anticipos, ausencias)
+
+
+def _intereses(
+    cesantias: Sequence[float],
+    dias: Sequence[int],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    anticipos: Optional[LibrosAnticiposLote],
+    ausencias: Optional[IndiceIntervalosLote] = None
+) -> array:
+    """Intereses por empleado, descontando los anticipos si los hay."""
+    intereses = array("d", [
+        (valor * d * PORCENTAJE_INTERESES_CESANTIAS) / DIAS_ANIO_COMERCIAL
+        for valor, d in zip(cesantias, dias)
+    ])
+    if anticipos is not None:
+        _descontar_anticipos(intereses, cesantias, dias, serial_inicio, serial_fin, anticipos, ausencias=ausencias)
+    return intereses
+
+
+def _descontar_anticipos(
+    intereses: array,
+    cesantias: Sequence[float],
+    dias: Sequence[int],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    anticipos: LibrosAnticiposLote,
+    filas: Optional[Sequence[int]] = None,
+    ausencias: Optional[IndiceIntervalosLote] = None
+) -> None:
+    """Recalcula los intereses de quienes tienen anticipos en su periodo (solo 'filas' si se indica)."""
+    for fila, descuento in anticipos.descuentos_lote(cesantias, serial_inicio, serial_fin, filas, ausencias):
+        intereses[fila] = (
+            (cesantias[fila] * dias[fila] - descuento) * PORCENTAJE_INTERESES_CESANTIAS
+        ) / DIAS_ANIO_COMERCIAL
+
+
+def calcular_dias_semestre_lote(
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None
+) -> Tuple[array, array]:
+    """
+    Reparte los días de cada periodo entre los semestres del año de la fecha de fin.
+
+    Equivale a calcular_dias_por_semestre aplicado fila por fila. Las ausencias
+    se descuentan del semestre en el que caen.
+
+    Returns:
+        Tupla (dias_semestre_1, dias_semestre_2), ambos array('i')
+    """
+    _validar_columnas(serial_inicio, serial_fin)
+    return _repartir_dias_semestre(serial_inicio, serial_fin, ausencias)
+
+
+def _repartir_dias_semestre(
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None
+) -> Tuple[array, array]:
+    """Reparto de días por semestre sin validar (las columnas ya fueron validadas)."""
+    n = len(serial_inicio)
+    dias_s1 = array("i", bytes(4 * n))
+    dias_s2 = array("i", bytes(4 * n))
+    for fila, (inicio, fin) in enumerate(zip(serial_inicio, serial_fin)):
+        inicio_s1 = (fin // DIAS_ANIO_COMERCIAL) * DIAS_ANIO_COMERCIAL
+        inicio_s2 = inicio_s1 + DIAS_SEMESTRE_COMERCIAL
+        # Semestre 1: [inicio_s1, inicio_s2 - 1]; semestre 2: [inicio_s2, fin]
+        if inicio < inicio_s2 and fin >= inicio_s1:
+            desde, hasta = max(inicio, inicio_s1), min(fin, inicio_s2 - 1)
+            dias_s1[fila] = hasta - desde + 1
+            if ausencias is not None:
+                dias_s1[fila] -= ausencias.dias_superpuestos(fila, desde, hasta)
+        if fin >= inicio_s2:
+            desde = max(inicio, inicio_s2)
+            dias_s2[fila] = fin - desde + 1
+            if ausencias is not None:
+                dias_s2[fila] -= ausencias.dias_superpuestos(fila, desde, fin)
+    return dias_s1, dias_s2
+
+
+@auditado(TIPO_LOTE)
+def calcular_prima_lote(
+    salarios: Sequence[float],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None,
+    historiales: Optional[HistorialesSalarialesLote] = None
+) -> Tuple[array, array, array, array]:
+    """
+    Calcula la prima de servicios por semestre de todos los empleados del lote.
+
+    Formula Semestral: (Salario Base Liquidación * Días Trabajados Semestre) / 180
+
+    Returns:
+        Tupla (prima_semestre_1, prima_semestre_2, dias_semestre_1, dias_semestre_2)
+    """
+    _validar_columnas(serial_inicio, serial_fin, salarios)
+    salarios = _salarios_efectivos(salarios, serial_inicio, serial_fin, historiales)
+    bases = calcular_bases_lote(salarios, serial_fin)
+    dias_s1, dias_s2 = _repartir_dias_semestre(serial_inicio, serial_fin, ausencias)
+    prima_s1 = array("d", [(base * d) / 180.0 if d > 0 else 0.0 for base, d in zip(bases, dias_s1)])
+    prima_s2 = array("d", [(base * d) / 180.0 if d > 0 else 0.0 for base, d in zip(bases, dias_s2)])
+    return prima_s1, prima_s2, dias_s1, dias_s2
+
+
+@auditado(TIPO_LOTE)
+def calcular_liquidacion_lote(
+    salarios: Sequence[float],
+    serial_inicio: Sequence[int],
+    serial_fin: Sequence[int],
+    ausencias: Optional[IndiceIntervalosLote] = None,
+    historiales: Optional[HistorialesSalarialesLote] = None,
+    tipos_contrato: Optional[Sequence[int]] = None,
+    banderas: Optional[Sequence[int]] = None,
+    anticipos: Optional[LibrosAnticiposLote] = None
+) -> ResultadoLote:
+    """
+    Calcula cesantías, intereses y prima de todo un lote en una sola pasada.
+
+    Los días y la base de liquidación se calculan una vez y se reutilizan en
+    todos los conceptos.
+
+    Args:
+        salarios: Salarios mensuales (sin auxilio)
+        serial_inicio: Seriales 30/360 de las fechas de inicio
+        serial_fin: Seriales 30/360 de las fechas de fin
+        ausencias: Licencias/suspensiones por empleado a descontar (opcional)
+        historiales: Historiales salariales para salarios variables (opcional);
+                     su promedio reemplaza al salario fijo
+        tipos_contrato: Códigos de CODIGOS_TIPO_CONTRATO por empleado (opcional)
+        banderas: Banderas por empleado (BANDERA_SALARIO_INTEGRAL, BANDERA_APRENDIZ)
+                  (opcional). Con tipos_contrato y/o banderas cada concepto se
+                  liquida según REGLAS_LIQUIDACION; los conceptos que no
+                  aplican a un empleado quedan en 0.
+        anticipos: Anticipos de cesantías por empleado para los intereses (opcional)
+
+    Returns:
+        ResultadoLote con una posición por empleado
+
+    Raises:
+        ValueError: Si algún periodo es inválido o falta configuración para un año.
+    """
+    n = _validar_columnas(serial_inicio, serial_fin, salarios)
+    snapshot = snapshot_actual()  # Los mismos parámetros para todo el lote
+    salarios = _salarios_efectivos(salarios, serial_inicio, serial_fin, historiales)
+    dias = _dias_periodo(serial_inicio, serial_fin, ausencias)
+    dias_s1, dias_s2 = _repartir_dias_semestre(serial_inicio, serial_fin, ausencias)
+    if tipos_contrato is not None or banderas is not None:
+        return _liquidar_por_reglas(
+            salarios, serial_fin, dias, dias_s1, dias_s2,
+            tipos_contrato if tipos_contrato is not None else bytes(n),
+            banderas if banderas is not None else bytes(n),
+            serial_inicio, anticipos, snapshot, ausencias,
+        )
+    bases = calcular_bases_lote(salarios, serial_fin, snapshot)
+
+    cesantias = array("d", [(base * d) / DIAS_ANIO_COMERCIAL for base, d in zip(bases, dias)])
+    intereses = _intereses(cesantias, dias, serial_inicio, serial_fin, anticipos, ausencias)
+    prima_s1 = array("d", [(base * d) / 180.0 if d > 0 else 0.0 for base, d in zip(bases, dias_s1)])
+    prima_s2 = array("d", [(base * d) / 180.0 if d > 0 else 0.0 for base, d in zip(bases, dias_s2)])
+
+    return ResultadoLote(
+        dias=dias,
+        cesantias=cesantias,
+        intereses=intereses,
+        prima_semestre_1=prima_s1,
+        prima_semestre_2=prima_s2,
+        dias_semestre_1=dias_s1,
+        dias_semestre_2=dias_s2,
+        version_parametros=snapshot.version,
+    )
+
+
+def _liquidar_por_reglas(
+    salarios: Sequence[float],
+    serial_fin: Sequence[int],
+    dias: array,
+    dias_s1: array,
+    dias_s2: array,
+    tipos_contrato: Sequence[int],
+    banderas: Sequence[int],
+    serial_inicio: Sequence[int],
+    anticipos: Optional[LibrosAnticiposLote],
+    snapshot: SnapshotParametros,
+    ausencias: Optional[IndiceIntervalosLote] = None
+) -> ResultadoLote:
+    """
+    Liquida un lote mixto: cada fórmula se evalúa una vez por grupo de regla
+    (sobre las filas del grupo) y los resultados se ubican en su fila.
+    """
+    n = len(dias)
+    if len(tipos_contrato) != n or len(banderas) != n:
+        raise ValueError("Todas las columnas del lote deben tener el mismo número de filas.")
+    cesantias = array("d", bytes(8 * n))
+    intereses = array("d", bytes(8 * n))
+    prima_s1 = array("d", bytes(8 * n))
+    prima_s2 = array("d", bytes(8 * n))
+    # Cesantías de cada fila aunque su regla no las liquide (base de los intereses)
+    valores_cesantias = array("d", bytes(8 * n))
+
+    for regla, filas in agrupar_por_regla(tipos_contrato, banderas).items():
+        if not regla.conceptos:
+            continue
+        bases = calcular_bases_lote([salarios[fila] for fila in filas], [serial_fin[fila] for fila in filas], snapshot)
+        if "cesantias" in regla.conceptos or "intereses" in regla.conceptos:
+            for base, fila in zip(bases, filas):
+                valores_cesantias[fila] = (base * dias[fila]) / DIAS_ANIO_COMERCIAL
+            if "cesantias" in regla.conceptos:
+                for fila in filas:
+                    cesantias[fila] = valores_cesantias[fila]
+            if "intereses" in regla.conceptos:
+                for fila in filas:
+                    intereses[fila] = (
+                        valores_cesantias[fila] * dias[fila] * PORCENTAJE_INTERESES_CESANTIAS
+                    ) / DIAS_ANIO_COMERCIAL
+                if anticipos is not None:
+                    _descontar_anticipos(intereses, valores_cesantias, dias, serial_inicio, serial_fin,
+                                         anticipos, filas, ausencias)
+        if "prima" in regla.conceptos:
+            for base, fila in zip(bases, filas):
+                d1, d2 = dias_s1[fila], dias_s2[fila]
+                prima_s1[fila] = (base * d1) / 180.0 if d1 > 0 else 0.0
+                prima_s2[fila] = (base * d2) / 180.0 if d2 > 0 else 0.0
+
+    return ResultadoLote(
+        dias=dias,
+        cesantias=cesantias,
+        intereses=intereses,
+        prima_semestre_1=prima_s1,
+        prima_semestre_2=prima_s2,
+        dias_semestre_1=dias_s1,
+        dias_semestre_2=dias_s2,
+        version_parametros=snapshot.version,
+    )
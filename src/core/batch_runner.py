@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/batch_runner.py
+
+Corridas por lotes reanudables para rosters de millones de filas.
+
+El roster se liquida por bloques y los resultados se escriben como CSV
+(id_empleado, concepto, valor; el mismo formato de src/core/reconciliation.py).
+Cada cierto número de filas se guarda un punto de control con:
+
+    - el offset de la siguiente fila del roster a procesar,
+    - los totales parciales por concepto,
+    - la posición (en bytes) del archivo de salida hasta la que los datos son firmes,
+    - la huella del roster (SHA-256 de las columnas que entran al cálculo) y el
+      identificador de la instantánea de parámetros usada.
+
+Si la corrida se interrumpe, al volver a ejecutarla con el mismo punto de
+control se trunca la salida a la posición guardada y se continúa desde el
+offset. Como las filas se escriben en el orden del roster y los totales se
+acumulan en el mismo orden, el archivo final es idéntico byte a byte al de una
+corrida sin interrupciones, cualquiera que sea el intervalo de control.
+
+Esa garantía exige las mismas entradas: reanudar con otro roster es un error,
+y si los parámetros vigentes cambiaron desde el punto de control la corrida
+vuelve a empezar desde cero, para no mezclar resultados de dos versiones.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional
+
+from config.parameter_snapshot import snapshot_actual
+from src.core.batch import calcular_liquidacion_lote
+from src.core.reconciliation import filas_desde_lote
+from src.core.roster import Roster
+
+VERSION_PUNTO_CONTROL = 2
+
+# Filas del roster por bloque de cálculo
+TAMANO_BLOQUE_CORRIDA = 8192
+# Filas entre puntos de control (se redondea a bloques completos)
+INTERVALO_PUNTO_CONTROL = 100_000
+
+ENCABEZADO_SALIDA = ("id_empleado", "concepto", "valor")
+
+# Columnas del roster que determinan la salida (las que entran en la huella)
+COLUMNAS_HUELLA = ("id_empleado", "salario", "serial_inicio", "serial_fin", "tipo_contrato", "banderas")
+
+
+@dataclass
+class TotalesCorrida:
+    """Totales acumulados de una corrida (se guardan en cada punto de control)."""
+    empleados: int = 0
+    filas_salida: int = 0
+    valores: Dict[str, float] = field(default_factory=dict)  # concepto -> suma
+
+
+@dataclass
+class PuntoControl:
+    """Estado firme de una corrida: hasta dónde se leyó y hasta dónde se escribió."""
+    filas_roster: int
+    huella_roster: str = ""
+    parametros: str = ""  # Identificador de la instantánea de parámetros
+    offset: int = 0
+    posicion_salida: int = 0
+    totales: TotalesCorrida = field(default_factory=TotalesCorrida)
+    version: int = VERSION_PUNTO_CONTROL
+
+
+def huella_roster(roster: Roster) -> str:
+    """SHA-256 de las columnas del roster que determinan los resultados de la corrida."""
+    h = hashlib.sha256(str(len(roster)).encode("ascii"))
+    for nombre in COLUMNAS_HUELLA:
+        h.update(memoryview(roster[nombre]).cast("B"))  # array o vista de un roster mapeado, sin copiar
+    return h.hexdigest()
+
+
+def leer_punto_control(ruta: str) -> Optional[PuntoControl]:
+    """Lee un punto de control, o retorna None si no existe."""
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    if datos.get("version") != VERSION_PUNTO_CONTROL:
+        raise ValueError(f"Versión de punto de control no soportada: {datos.get('version')}")
+    datos["totales"] = TotalesCorrida(**datos["totales"])
+    return PuntoControl(**datos)
+
+
+def guardar_punto_control(ruta: str, punto: PuntoControl) -> None:
+    """Guarda el punto de control de forma atómica (archivo temporal + reemplazo)."""
+    ruta_temporal = f"{ruta}.tmp-{os.getpid()}"
+    with open(ruta_temporal, "w", encoding="utf-8") as archivo:
+        json.dump(asdict(punto), archivo)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(ruta_temporal, ruta)
+
+
+def _bloque_csv(ids_empleado, resultado, totales: TotalesCorrida) -> bytes:
+    """Serializa un bloque de resultados y lo suma a los totales."""
+    texto = io.StringIO()
+    escritor = csv.writer(texto)
+    for id_empleado, concepto, valor in filas_desde_lote(ids_empleado, resultado):
+        escritor.writerow((id_empleado, concepto, repr(float(valor))))
+        totales.valores[concepto] = totales.valores.get(concepto, 0.0) + valor
+        totales.filas_salida += 1
+    totales.empleados += len(ids_empleado)
+    return texto.getvalue().encode("utf-8")
+
+
+def ejecutar_corrida(
+    roster: Roster,
+    ruta_salida: str,
+    ruta_punto_control: Optional[str] = None,
+    intervalo_punto_control: int = INTERVALO_PUNTO_CONTROL,
+    tamano_bloque: int = TAMANO_BLOQUE_CORRIDA,
+    al_avanzar: Optional[Callable[[int, int], None]] = None
+) -> TotalesCorrida:
+    """
+    Liquida todo el roster escribiendo los resultados en ruta_salida, con
+    puntos de control periódicos para poder reanudar si la corrida se interrumpe.
+
+    Args:
+        roster: Roster a liquidar
+        ruta_salida: CSV de resultados
+        ruta_punto_control: Archivo del punto de control (por defecto
+                            ruta_salida + '.ckpt'). Se elimina al terminar.
+        intervalo_punto_control: Filas del roster entre puntos de control
+        tamano_bloque: Filas del roster por bloque de cálculo
+        al_avanzar: Callback opcional (filas procesadas, filas totales) tras cada punto de control
+
+    Returns:
+        Totales de la corrida completa
+
+    Raises:
+        ValueError: Si algún periodo es inválido, falta configuración para un
+                    año, el punto de control no corresponde al roster o los
+                    parámetros cambian durante la corrida.
+    """
+    if intervalo_punto_control <= 0 or tamano_bloque <= 0:
+        raise ValueError("El intervalo de control y el tamaño de bloque deben ser positivos.")
+    if ruta_punto_control is None:
+        ruta_punto_control = ruta_salida + ".ckpt"
+
+    n = len(roster)
+    huella = huella_roster(roster)
+    parametros = snapshot_actual().identificador
+    punto = leer_punto_control(ruta_punto_control)
+    if punto is not None and not os.path.exists(ruta_salida):
+        punto = None
+    if punto is not None:
+        if punto.filas_roster != n:
+            raise ValueError(
+                f"El punto de control corresponde a un roster de {punto.filas_roster} filas, no de {n}."
+            )
+        if punto.huella_roster != huella:
+            raise ValueError("El punto de control corresponde a otro roster (las columnas no coinciden).")
+        if punto.parametros != parametros:
+            print(f"ADVERTENCIA: Los parámetros cambiaron desde el punto de control ({punto.parametros} -> "
+                  f"{parametros}); la corrida empieza de nuevo.")
+            punto = None
+    if punto is not None:
+        salida = open(ruta_salida, "r+b")
+        salida.truncate(punto.posicion_salida)  # Descarta lo escrito después del último control
+        salida.seek(punto.posicion_salida)
+    else:
+        punto = PuntoControl(filas_roster=n, huella_roster=huella, parametros=parametros)
+        salida = open(ruta_salida, "wb")
+        salida.write((",".join(ENCABEZADO_SALIDA) + "\r\n").encode("utf-8"))
+
+    ids = roster["id_empleado"]
+    try:
+        offset = punto.offset
+        ultimo_control = offset
+        while offset < n:
+            fin = min(n, offset + tamano_bloque)
+            resultado = calcular_liquidacion_lote(
+                roster["salario"][offset:fin],
+                roster["serial_inicio"][offset:fin],
+                roster["serial_fin"][offset:fin],
+                tipos_contrato=roster["tipo_contrato"][offset:fin],
+                banderas=roster["banderas"][offset:fin],
+            )
+            # El bloque se calculó con la instantánea vigente al comparar: si ya no es
+            # la del punto de control, no se escribe (al reejecutar se empieza de nuevo)
+            if snapshot_actual().identificador != punto.parametros:
+                raise ValueError("Los parámetros cambiaron durante la corrida; vuelva a ejecutarla.")
+            salida.write(_bloque_csv(ids[offset:fin], resultado, punto.totales))
+            offset = fin
+
+            if offset - ultimo_control >= intervalo_punto_control or offset == n:
+                # Primero la salida debe quedar en disco; luego el control que la referencia
+                salida.flush()
+                os.fsync(salida.fileno())
+                punto.offset = offset
+                punto.posicion_salida = salida.tell()
+                guardar_punto_control(ruta_punto_control, punto)
+                ultimo_control = offset
+                if al_avanzar is not None:
+                    al_avanzar(offset, n)
+    finally:
+        salida.close()
+
+    if os.path.exists(ruta_punto_control):
+        os.remove(ruta_punto_control)
+    return punto.totales
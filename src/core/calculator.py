@@ -8,26 +8,35 @@ basados en el Código Sustantivo del Trabajo de Colombia y prácticas comunes.
 """
 
 import datetime
-from typing import Optional, Dict, Any
-from config import settings
-from src.core.constants import (
-    PORCENTAJE_INTERESES_CESANTIAS, 
-    MAX_SMMLV_PARA_AUXILIO_TRANSPORTE,
-    DIAS_ANIO_COMERCIAL
-)
-from src.utils.date_helpers import _calcular_dias_por_semestre, calcular_dias_liquidacion
+from typing import Optional, Dict, Sequence, Tuple, Union
+from src.utils.date_helpers import calcular_dias_liquidacion
 from src.utils.validation import validar_fechas_periodo
-from src.core.models import PeriodoLaboral, ResultadoCalculo
+from src.core.models import ResultadoCalculo
+from src.core.pipeline import ContextoLiquidacion, ejecutar_pipeline, formula_intereses_anticipos
+from src.core.intervals import IndiceIntervalos, IntervaloFechas
+from src.core.salary_history import HistorialSalarial
+from src.core.advances import LibroAnticipos, validar_descuento
+from src.core.audit_log import TIPO_ESCALAR, auditado
 
 # ==============================================================================
 # Funciones de Cálculo de Prestaciones
 # ==============================================================================
 
+def _indice_ausencias(ausencias: Optional[Sequence[IntervaloFechas]]) -> Optional[IndiceIntervalos]:
+    """Construye el índice de ausencias (o None si no hay)."""
+    if not ausencias:
+        return None
+    return IndiceIntervalos.desde_fechas(ausencias)
+
+
+@auditado(TIPO_ESCALAR)
 def calcular_cesantias(
     salario_mensual: float,
     fecha_inicio: datetime.date,
     fecha_fin: datetime.date,
-    anio_liquidacion: Optional[int] = None # Año para buscar SMMLV/Auxilio
+    anio_liquidacion: Optional[int] = None, # Año para buscar SMMLV/Auxilio
+    ausencias: Optional[Sequence[IntervaloFechas]] = None,
+    historial_salarial: Optional[HistorialSalarial] = None
 ) -> float:
     """
     Calcula el valor de las cesantías para un periodo determinado.
@@ -38,6 +47,10 @@ def calcular_cesantias(
         fecha_fin: Fecha de fin del periodo de cálculo.
         anio_liquidacion: El año para el cual se consultan el SMMLV y Aux. Transporte.
                           Si es None, se usará el año de la fecha_fin.
+        ausencias: Licencias no remuneradas / suspensiones (intervalos inclusivos
+                   de fechas) cuyos días se descuentan del periodo.
+        historial_salarial: Salario mensual variable (comisiones, aumentos). Si se
+                   indica, la base es el promedio del último año del periodo.
 
     Returns:
         El valor calculado de las cesantías para el periodo.
@@ -45,58 +58,49 @@ def calcular_cesantias(
     Raises:
         ValueError: Si las fechas son inválidas o falta configuración para el año.
     """
-    # Validar fechas
-    es_valido, mensaje_error = validar_fechas_periodo(fecha_inicio, fecha_fin)
-    if not es_valido:
-        raise ValueError(mensaje_error)
-        
-    if anio_liquidacion is None:
-        anio_liquidacion = fecha_fin.year
-
-    # Obtener SMMLV y Auxilio de Transporte del año correspondiente
-    smmlv_anio = settings.obtener_smmlv(anio_liquidacion)
-    auxilio_transporte_anio = settings.obtener_auxilio_transporte(anio_liquidacion)
-
-    if smmlv_anio <= 0 or auxilio_transporte_anio <= 0:
-        raise ValueError(f"No se encontró configuración de SMMLV/Aux. Transporte para el año {anio_liquidacion}")
-
-    # Determinar si aplica el auxilio de transporte
-    aplica_auxilio = salario_mensual <= (MAX_SMMLV_PARA_AUXILIO_TRANSPORTE * smmlv_anio)
-
-    # Calcular el salario base para la liquidación (incluye auxilio si aplica)
-    salario_base_liquidacion = salario_mensual
-    if aplica_auxilio:
-        salario_base_liquidacion += auxilio_transporte_anio
-
-    # Calcular los días trabajados en el periodo
-    dias_trabajados = calcular_dias_liquidacion(fecha_inicio, fecha_fin)
-
-    # Calcular las cesantías: (Salario Base * Días Trabajados) / 360
-    cesantias = (float(salario_base_liquidacion) * dias_trabajados) / DIAS_ANIO_COMERCIAL
-
-    return cesantias
+    ctx = ejecutar_pipeline(
+        ContextoLiquidacion(
+            salario_mensual=salario_mensual,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            anio_liquidacion=anio_liquidacion,
+            ausencias=_indice_ausencias(ausencias),
+            historial_salarial=historial_salarial
+        ),
+        conceptos=("cesantias",)
+    )
+    return ctx.valores["cesantias"]
 
 
+@auditado(TIPO_ESCALAR)
 def calcular_intereses_cesantias(
     valor_cesantias: float,
     fecha_inicio: datetime.date,
-    fecha_fin: datetime.date
+    fecha_fin: datetime.date,
+    ausencias: Optional[Sequence[IntervaloFechas]] = None,
+    anticipos: Optional[Union[LibroAnticipos, Sequence[Tuple[datetime.date, float]]]] = None
 ) -> float:
     """
     Calcula los intereses sobre las cesantías para un periodo determinado.
 
     Formula: (Valor Cesantías * Días Trabajados * 0.12) / 360
 
+    Con anticipos, cada valor anticipado deja de generar intereses desde su
+    fecha: ((Valor Cesantías * Días) - Σ Anticipo * Días sin intereses) * 0.12 / 360
+
     Args:
         valor_cesantias: El monto de las cesantías calculado para el periodo.
         fecha_inicio: Fecha de inicio del periodo de cálculo (para calcular días).
         fecha_fin: Fecha de fin del periodo de cálculo (para calcular días).
+        ausencias: Licencias no remuneradas / suspensiones cuyos días se descuentan.
+        anticipos: Anticipos (retiros parciales) de cesantías: un LibroAnticipos o
+                   pares (fecha, valor). Solo cuentan los del periodo.
 
     Returns:
         El valor calculado de los intereses sobre cesantías.
 
     Raises:
-        ValueError: Si las fechas son inválidas.
+        ValueError: Si las fechas son inválidas o los anticipos superan las cesantías.
     """
     # Validar fechas
     es_valido, mensaje_error = validar_fechas_periodo(fecha_inicio, fecha_fin)
@@ -110,93 +114,79 @@ def calcular_intereses_cesantias(
         # Re-lanzar el error si las fechas son inválidas
         raise ValueError(f"Error al calcular días para intereses: {e}")
 
+    indice_ausencias = _indice_ausencias(ausencias)
+    if indice_ausencias:
+        dias_trabajados -= indice_ausencias.dias_superpuestos(fecha_inicio, fecha_fin)
+
     if dias_trabajados < 0: # Validación extra
         raise ValueError("Los días trabajados no pueden ser negativos.")
 
     # Calcular los intereses usando la constante desde constants.py
-    intereses = (valor_cesantias * dias_trabajados * PORCENTAJE_INTERESES_CESANTIAS) / DIAS_ANIO_COMERCIAL
+    descuento_anticipos = 0.0
+    if anticipos:
+        if not isinstance(anticipos, LibroAnticipos):
+            anticipos = LibroAnticipos(anticipos)
+        total_anticipado, descuento_anticipos = anticipos.descuento(fecha_inicio, fecha_fin, indice_ausencias)
+        validar_descuento(valor_cesantias, total_anticipado)
+    intereses = formula_intereses_anticipos(valor_cesantias, dias_trabajados, descuento_anticipos)
 
     return intereses
 
 
 # --- Función de cálculo completo de liquidación ---
+@auditado(TIPO_ESCALAR)
 def calcular_liquidacion_completa(
     salario_mensual: float,
     fecha_inicio: datetime.date,
     fecha_fin: datetime.date,
-    incluir_auxilio: bool = True
+    incluir_auxilio: bool = True,
+    conceptos: Tuple[str, ...] = ("cesantias", "intereses"),
+    ausencias: Optional[Sequence[IntervaloFechas]] = None,
+    historial_salarial: Optional[HistorialSalarial] = None
 ) -> Dict[str, ResultadoCalculo]:
     """
     Calcula todos los conceptos de liquidación aplicables para un periodo.
+
+    Las fechas se validan una sola vez y los días y la base salarial se
+    calculan una sola vez para todos los conceptos (ver src/core/pipeline.py).
     
     Args:
         salario_mensual: Salario base mensual
         fecha_inicio: Fecha de inicio del periodo
         fecha_fin: Fecha de fin del periodo
         incluir_auxilio: Si debe considerarse el auxilio de transporte según normas
+        conceptos: Conceptos a calcular ("cesantias", "intereses", "prima" o
+                   cualquier concepto registrado en el pipeline)
+        ausencias: Licencias no remuneradas / suspensiones cuyos días se descuentan
+        historial_salarial: Salario mensual variable; si se indica, la base es el
+                            promedio del último año del periodo
         
     Returns:
         Diccionario con los resultados de cálculo por concepto
     """
-    from src.core.constants import CONCEPTOS
-    
-    # Validar fechas
-    es_valido, mensaje_error = validar_fechas_periodo(fecha_inicio, fecha_fin)
-    if not es_valido:
-        raise ValueError(mensaje_error)
-    
-    anio_liquidacion = fecha_fin.year
-    resultados = {}
-    
-    # Crear periodo laboral
-    periodo = PeriodoLaboral(
-        fecha_inicio=fecha_inicio,
-        fecha_fin=fecha_fin,
-        salario_base=salario_mensual,
-        incluye_auxilio=incluir_auxilio
-    )
-    
-    # 1. Calcular cesantías
-    cesantias_valor = calcular_cesantias(
-        salario_mensual=periodo.salario_base,
-        fecha_inicio=periodo.fecha_inicio,
-        fecha_fin=periodo.fecha_fin,
-        anio_liquidacion=anio_liquidacion
-    )
-    
-    resultados["cesantias"] = ResultadoCalculo(
-        concepto=CONCEPTOS["CESANTIAS"],
-        valor=cesantias_valor,
-        dias_calculados=periodo.dias_laborados,
-        fecha_inicio=periodo.fecha_inicio,
-        fecha_fin=periodo.fecha_fin
+    ctx = ejecutar_pipeline(
+        ContextoLiquidacion(
+            salario_mensual=salario_mensual,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            anio_liquidacion=fecha_fin.year,
+            incluir_auxilio=incluir_auxilio,
+            ausencias=_indice_ausencias(ausencias),
+            historial_salarial=historial_salarial
+        ),
+        conceptos=conceptos
     )
-    
-    # 2. Calcular intereses sobre cesantías
-    intereses_valor = calcular_intereses_cesantias(
-        valor_cesantias=cesantias_valor,
-        fecha_inicio=periodo.fecha_inicio,
-        fecha_fin=periodo.fecha_fin
-    )
-    
-    resultados["intereses"] = ResultadoCalculo(
-        concepto=CONCEPTOS["INTERESES"],
-        valor=intereses_valor,
-        dias_calculados=periodo.dias_laborados,
-        fecha_inicio=periodo.fecha_inicio,
-        fecha_fin=periodo.fecha_fin
-    )
-    
-    # Aquí se pueden añadir más cálculos a medida que se implementen
-    # (prima, vacaciones, etc.)
-    return resultados
+    return ctx.resultados
 
 
+@auditado(TIPO_ESCALAR)
 def calcular_prima_servicios(
     salario_mensual: float,
     fecha_inicio: datetime.date,
     fecha_fin: datetime.date,
-    anio_liquidacion: Optional[int] = None
+    anio_liquidacion: Optional[int] = None,
+    ausencias: Optional[Sequence[IntervaloFechas]] = None,
+    historial_salarial: Optional[HistorialSalarial] = None
 ) -> Dict[str, float]:
     """
     Calcula la Prima de Servicios para el periodo especificado.
@@ -213,6 +203,10 @@ def calcular_prima_servicios(
         fecha_fin: Fecha de fin del periodo a liquidar.
         anio_liquidacion: Año de referencia para SMMLV y Aux. Transporte.
                           Si es None, se usa el año de fecha_fin.
+        ausencias: Licencias no remuneradas / suspensiones cuyos días se
+                   descuentan del semestre en que caen.
+        historial_salarial: Salario mensual variable; si se indica, la base es el
+                   promedio del último año del periodo.
 
     Returns:
         Un diccionario con:
@@ -222,46 +216,24 @@ def calcular_prima_servicios(
     Raises:
         ValueError: Si las fechas son inválidas o si no hay configuración para el año.
     """
-    # Validar fechas
-    es_valido, mensaje_error = validar_fechas_periodo(fecha_inicio, fecha_fin)
-    if not es_valido:
-        raise ValueError(mensaje_error)
-        
-    if anio_liquidacion is None:
-        anio_liquidacion = fecha_fin.year
-
-    # Obtener SMMLV y Auxilio de Transporte del año correspondiente
-    smmlv_anio = settings.obtener_smmlv(anio_liquidacion)
-    auxilio_transporte_anio = settings.obtener_auxilio_transporte(anio_liquidacion)
-
-    if smmlv_anio <= 0:
-        raise ValueError(f"No se encontró configuración de SMMLV para el año {anio_liquidacion}")
-
-    # Determinar si aplica el auxilio de transporte
-    aplica_auxilio = salario_mensual <= (MAX_SMMLV_PARA_AUXILIO_TRANSPORTE * smmlv_anio)
-
-    # Calcular el salario base para la liquidación (incluye auxilio si aplica)
-    salario_base_liquidacion = salario_mensual
-    if aplica_auxilio and auxilio_transporte_anio > 0:
-        salario_base_liquidacion += auxilio_transporte_anio
-
-    # Calcular días trabajados por semestre dentro del periodo dado
-    from src.utils.date_helpers import calcular_dias_por_semestre
-    dias_por_semestre = calcular_dias_por_semestre(fecha_inicio, fecha_fin)
-    dias_sem1 = dias_por_semestre.get(1, 0)
-    dias_sem2 = dias_por_semestre.get(2, 0)
-
-    # Calcular prima para cada semestre (30 días / semestre = 180 días / año)
-    prima_semestre_1 = (salario_base_liquidacion * dias_sem1) / 180.0 if dias_sem1 > 0 else 0.0
-    prima_semestre_2 = (salario_base_liquidacion * dias_sem2) / 180.0 if dias_sem2 > 0 else 0.0
-    prima_total = prima_semestre_1 + prima_semestre_2
+    ctx = ejecutar_pipeline(
+        ContextoLiquidacion(
+            salario_mensual=salario_mensual,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            anio_liquidacion=anio_liquidacion,
+            ausencias=_indice_ausencias(ausencias),
+            historial_salarial=historial_salarial
+        ),
+        conceptos=("prima",)
+    )
 
     return {
-        "prima_semestre_1": prima_semestre_1,
-        "prima_semestre_2": prima_semestre_2,
-        "prima_total": prima_total,
-        "dias_semestre_1": dias_sem1,
-        "dias_semestre_2": dias_sem2
+        "prima_semestre_1": ctx.valores["prima_semestre_1"],
+        "prima_semestre_2": ctx.valores["prima_semestre_2"],
+        "prima_total": ctx.valores["prima_total"],
+        "dias_semestre_1": ctx.dias_semestre_1,
+        "dias_semestre_2": ctx.dias_semestre_2
     }
 
 
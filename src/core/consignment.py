@@ -0,0 +1,507 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/consignment.py
+
+Archivos de consignación de cesantías a los fondos (Porvenir, Protección,
+Colfondos, etc.), que deben recibirlas a más tardar el 14 de febrero del año
+siguiente a la liquidación anual.
+
+Las cesantías de cada empleado se agrupan por fondo y se escriben en un
+archivo por fondo, con el diseño de registro que pide ese fondo (ancho fijo o
+delimitado) y tres tipos de registro:
+
+    encabezado  -> empleador, fondo, año y fecha de generación
+    detalle     -> un registro por empleado con cesantías a consignar
+    control     -> número de registros de detalle y valor total
+
+Todo se hace en una sola pasada: los resultados llegan por bloques y cada
+registro se escribe de inmediato en el archivo (con buffer) de su fondo, así
+que la memoria no depende del tamaño del roster. Los totales de control se
+acumulan mientras se escribe y al final cada archivo se vuelve a leer y se
+coteja contra los totales del calculador (número de empleados con cesantías y
+su suma sin redondear), calculados aparte, directamente sobre los resultados
+de cada bloque; la suma de los archivos puede diferir de la del calculador a
+lo sumo medio peso por registro (el redondeo de cada valor). Los
+archivos se escriben con un nombre temporal y solo se publican (se renombran)
+si el cotejo no encontró errores.
+
+Los valores se consignan en pesos enteros (redondeo al peso más cercano).
+Los diseños de DISENOS_FONDOS son ilustrativos: cada empresa debe ajustarlos a
+la especificación vigente de sus fondos o pasar los suyos.
+"""
+
+import datetime
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, IO, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from src.core.batch import calcular_liquidacion_lote
+from src.core.batch_runner import TAMANO_BLOQUE_CORRIDA
+from src.core.constants import DIAS_ANIO_COMERCIAL
+from src.core.roster import Roster
+
+# Tipos de registro de un archivo de consignación
+TIPOS_REGISTRO: Tuple[str, ...] = ("encabezado", "detalle", "control")
+
+# Datos disponibles para los campos de cada tipo de registro
+DATOS_REGISTRO: Dict[str, Tuple[str, ...]] = {
+    "encabezado": ("tipo_registro", "nit_empleador", "codigo_fondo", "anio", "fecha_generacion"),
+    "detalle": ("tipo_registro", "secuencia", "id_empleado", "dias", "valor", "anio"),
+    "control": ("tipo_registro", "registros", "total"),
+}
+
+# ==============================================================================
+# Diseños de archivo
+# ==============================================================================
+
+@dataclass(frozen=True)
+class CampoConsignacion:
+    """
+    Campo de un registro.
+
+    Args:
+        dato: Dato del registro (ver DATOS_REGISTRO)
+        ancho: Ancho fijo del campo (0 = sin ancho fijo, solo en archivos delimitados)
+        relleno: Carácter de relleno hasta completar el ancho
+        a_la_derecha: Alinea el valor a la derecha (números) en lugar de a la izquierda
+    """
+    dato: str
+    ancho: int = 0
+    relleno: str = " "
+    a_la_derecha: bool = False
+
+    def formatear(self, valor: str) -> str:
+        if self.ancho:
+            if len(valor) > self.ancho:
+                raise ValueError(f"El valor '{valor}' no cabe en el campo {self.dato} de ancho {self.ancho}.")
+            return valor.rjust(self.ancho, self.relleno) if self.a_la_derecha else valor.ljust(self.ancho, self.relleno)
+        return valor
+
+
+def _numerico(dato: str, ancho: int) -> CampoConsignacion:
+    return CampoConsignacion(dato, ancho, "0", True)
+
+
+@dataclass(frozen=True)
+class DisenoConsignacion:
+    """
+    Diseño del archivo de consignación de un fondo.
+
+    Args:
+        codigo: Código del fondo (el de las afiliaciones de los empleados)
+        nombre: Nombre del fondo
+        encabezado, detalle, control: Campos de cada tipo de registro, en orden
+        separador: Separador de campos; None para archivos de ancho fijo
+        codigos_registro: Código de tipo_registro de encabezado, detalle y control
+        extension: Extensión del archivo generado
+        fin_linea: Terminador de cada registro
+    """
+    codigo: str
+    nombre: str
+    encabezado: Tuple[CampoConsignacion, ...]
+    detalle: Tuple[CampoConsignacion, ...]
+    control: Tuple[CampoConsignacion, ...]
+    separador: Optional[str] = None
+    codigos_registro: Tuple[str, str, str] = ("1", "2", "3")
+    extension: str = "txt"
+    fin_linea: str = "\r\n"
+
+    def __post_init__(self):
+        for tipo in TIPOS_REGISTRO:
+            campos = getattr(self, tipo)
+            for campo in campos:
+                if campo.dato not in DATOS_REGISTRO[tipo]:
+                    raise ValueError(f"Dato desconocido en el {tipo} de {self.codigo}: {campo.dato}")
+                if self.separador is None and campo.ancho <= 0:
+                    raise ValueError(f"El campo {campo.dato} de {self.codigo} necesita ancho fijo.")
+            if not campos or campos[0].dato != "tipo_registro":
+                raise ValueError(f"El {tipo} de {self.codigo} debe empezar por el campo tipo_registro.")
+        for tipo, datos in (("detalle", ("valor",)), ("control", ("registros", "total"))):
+            faltantes = set(datos) - {campo.dato for campo in getattr(self, tipo)}
+            if faltantes:
+                raise ValueError(f"El {tipo} de {self.codigo} debe incluir: {', '.join(sorted(faltantes))}")
+
+    def registro(self, tipo: str, valores: Mapping[str, object]) -> str:
+        """Texto de un registro (con fin de línea)."""
+        campos = getattr(self, tipo)
+        textos = [campo.formatear(str(valores[campo.dato])) for campo in campos]
+        if self.separador is None:
+            return "".join(textos) + self.fin_linea
+        for texto in textos:
+            if self.separador in texto:
+                raise ValueError(f"El valor '{texto}' contiene el separador del archivo de {self.codigo}.")
+        return self.separador.join(textos) + self.fin_linea
+
+    def leer_registro(self, linea: str) -> Tuple[str, Dict[str, str]]:
+        """(tipo de registro, dato -> texto) de una línea del archivo (sin fin de línea)."""
+        for tipo, codigo in zip(TIPOS_REGISTRO, self.codigos_registro):
+            campos = getattr(self, tipo)
+            if self.separador is None:
+                if linea[:campos[0].ancho].strip(campos[0].relleno + " ") != codigo.strip(campos[0].relleno + " "):
+                    continue
+                if len(linea) != sum(campo.ancho for campo in campos):
+                    raise ValueError(f"Registro de {tipo} con longitud inválida: {linea!r}")
+                textos, posicion = [], 0
+                for campo in campos:
+                    textos.append(linea[posicion:posicion + campo.ancho])
+                    posicion += campo.ancho
+            else:
+                textos = linea.split(self.separador)
+                if textos[0].strip() != codigo:
+                    continue
+                if len(textos) != len(campos):
+                    raise ValueError(f"Registro de {tipo} con número de campos inválido: {linea!r}")
+            return tipo, {campo.dato: texto for campo, texto in zip(campos, textos)}
+        raise ValueError(f"Tipo de registro desconocido: {linea!r}")
+
+
+def _diseno_ancho_fijo(codigo: str, nombre: str, ancho_id: int, ancho_valor: int) -> DisenoConsignacion:
+    return DisenoConsignacion(
+        codigo=codigo,
+        nombre=nombre,
+        encabezado=(
+            _numerico("tipo_registro", 1), _numerico("nit_empleador", 15),
+            CampoConsignacion("codigo_fondo", 12), _numerico("anio", 4), _numerico("fecha_generacion", 8),
+        ),
+        detalle=(
+            _numerico("tipo_registro", 1), _numerico("secuencia", 8), _numerico("id_empleado", ancho_id),
+            _numerico("dias", 3), _numerico("valor", ancho_valor),
+        ),
+        control=(_numerico("tipo_registro", 1), _numerico("registros", 8), _numerico("total", ancho_valor + 3)),
+    )
+
+
+def _diseno_delimitado(codigo: str, nombre: str, separador: str) -> DisenoConsignacion:
+    return DisenoConsignacion(
+        codigo=codigo,
+        nombre=nombre,
+        encabezado=tuple(CampoConsignacion(dato) for dato in DATOS_REGISTRO["encabezado"]),
+        detalle=tuple(CampoConsignacion(dato) for dato in ("tipo_registro", "id_empleado", "anio", "dias", "valor")),
+        control=tuple(CampoConsignacion(dato) for dato in DATOS_REGISTRO["control"]),
+        separador=separador,
+        codigos_registro=("E", "D", "T"),
+        extension="csv",
+    )
+
+
+# Diseños ilustrativos por código de fondo
+DISENOS_FONDOS: Dict[str, DisenoConsignacion] = {
+    diseno.codigo: diseno
+    for diseno in (
+        _diseno_ancho_fijo("PORVENIR", "Porvenir", 15, 15),
+        _diseno_delimitado("PROTECCION", "Protección", ";"),
+        _diseno_ancho_fijo("COLFONDOS", "Colfondos", 12, 13),
+        _diseno_delimitado("SKANDIA", "Skandia", ","),
+        _diseno_ancho_fijo("FNA", "Fondo Nacional del Ahorro", 15, 15),
+    )
+}
+
+# ==============================================================================
+# Resumen y validación
+# ==============================================================================
+
+@dataclass
+class TotalesFondo:
+    """Totales de control del archivo de un fondo."""
+    codigo: str
+    ruta: str
+    registros: int = 0
+    total: int = 0  # Pesos
+
+
+@dataclass
+class ResumenConsignacion:
+    """
+    Resultado de generar los archivos de consignación.
+
+    Los totales del calculador se acumulan directamente de los resultados (sin
+    pasar por la agrupación por fondo) y se cotejan contra cada archivo escrito.
+    """
+    anio: int
+    fondos: Dict[str, TotalesFondo] = field(default_factory=dict)
+    empleados: int = 0              # Empleados liquidados
+    registros_calculados: int = 0   # Empleados con cesantías a consignar
+    total_calculado: float = 0.0    # Suma sin redondear de sus cesantías
+    sin_fondo: int = 0              # Empleados con cesantías y sin fondo asignado
+    valor_sin_fondo: int = 0
+    errores: List[str] = field(default_factory=list)
+
+    @property
+    def registros(self) -> int:
+        return sum(totales.registros for totales in self.fondos.values())
+
+    @property
+    def total(self) -> int:
+        return sum(totales.total for totales in self.fondos.values())
+
+    @property
+    def valido(self) -> bool:
+        return not self.errores
+
+
+def verificar_archivo_consignacion(ruta: str, diseno: DisenoConsignacion) -> TotalesFondo:
+    """
+    Lee un archivo de consignación y verifica su estructura y sus totales de control.
+
+    Returns:
+        Totales de los registros de detalle del archivo
+
+    Raises:
+        ValueError: Si la estructura es inválida o el registro de control no
+                    coincide con los detalles.
+    """
+    totales = TotalesFondo(diseno.codigo, ruta)
+    control = None
+    with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+        for numero, linea in enumerate(archivo):
+            if not linea.endswith(diseno.fin_linea):
+                raise ValueError(f"{ruta}: el registro {numero + 1} no termina en el fin de línea del diseño.")
+            tipo, datos = diseno.leer_registro(linea[:-len(diseno.fin_linea)])
+            if (numero == 0) != (tipo == "encabezado") or control is not None:
+                raise ValueError(f"{ruta}: registro {numero + 1} fuera de orden ({tipo}).")
+            if tipo == "detalle":
+                totales.registros += 1
+                totales.total += int(datos["valor"])
+            elif tipo == "control":
+                control = datos
+    if control is None:
+        raise ValueError(f"{ruta}: falta el registro de control.")
+    if int(control["registros"]) != totales.registros or int(control["total"]) != totales.total:
+        raise ValueError(
+            f"{ruta}: el control indica {int(control['registros'])} registros por {int(control['total'])}, "
+            f"pero el archivo tiene {totales.registros} por {totales.total}."
+        )
+    return totales
+
+
+def _validar(
+    resumen: ResumenConsignacion,
+    disenos: Mapping[str, DisenoConsignacion],
+    rutas: Optional[Mapping[str, str]] = None
+) -> None:
+    """
+    Coteja los archivos escritos contra los totales del calculador.
+
+    'rutas' indica, por código de fondo, el archivo a leer si no es el de los
+    totales (por ejemplo el temporal antes de publicarlo).
+    """
+    for codigo, totales in resumen.fondos.items():
+        try:
+            leidos = verificar_archivo_consignacion((rutas or {}).get(codigo, totales.ruta), disenos[codigo])
+        except ValueError as e:
+            resumen.errores.append(str(e))
+            continue
+        if (leidos.registros, leidos.total) != (totales.registros, totales.total):
+            resumen.errores.append(
+                f"{totales.ruta}: se escribieron {totales.registros} registros por {totales.total}, "
+                f"pero el archivo tiene {leidos.registros} por {leidos.total}."
+            )
+    if resumen.sin_fondo:
+        resumen.errores.append(
+            f"{resumen.sin_fondo} empleados con cesantías por {resumen.valor_sin_fondo} no tienen fondo asignado."
+        )
+    if resumen.registros + resumen.sin_fondo != resumen.registros_calculados:
+        resumen.errores.append(
+            f"Los archivos tienen {resumen.registros} registros y el calculador "
+            f"{resumen.registros_calculados} (sin fondo: {resumen.sin_fondo})."
+        )
+    # Cada registro redondea al peso más cercano: difiere a lo sumo medio peso de su valor
+    if abs(resumen.total + resumen.valor_sin_fondo - resumen.total_calculado) > 0.5 * resumen.registros_calculados:
+        resumen.errores.append(
+            f"Los archivos suman {resumen.total} y el calculador {resumen.total_calculado:.2f} "
+            f"(sin fondo: {resumen.valor_sin_fondo}), más que el redondeo permitido."
+        )
+
+# ==============================================================================
+# Generación
+# ==============================================================================
+
+# Bloque de cesantías a consignar: (ids, días, cesantías, código de fondo por empleado)
+BloqueConsignacion = Tuple[Sequence[int], Sequence[int], Sequence[float], Sequence[Optional[str]]]
+
+
+# Cesantías desde las que se consigna (las menores redondean a 0 pesos)
+MINIMO_CONSIGNABLE = 0.5
+
+
+def _pesos(valor: float) -> int:
+    """Valor en pesos enteros (redondeo al peso más cercano, mitades hacia arriba)."""
+    return int(valor + 0.5)
+
+
+def escribir_consignaciones(
+    bloques: Iterable[BloqueConsignacion],
+    anio: int,
+    directorio: str,
+    disenos: Mapping[str, DisenoConsignacion] = DISENOS_FONDOS,
+    nit_empleador: str = "",
+    fecha_generacion: Optional[datetime.date] = None
+) -> ResumenConsignacion:
+    """
+    Escribe un archivo de consignación por fondo a partir de las cesantías por bloques.
+
+    Los empleados sin cesantías (valor 0, por ejemplo contratos de servicios)
+    no se consignan. Los que tienen cesantías pero no fondo (código None o
+    vacío) no se escriben y quedan reportados en el resumen.
+
+    Args:
+        bloques: Bloques (ids, días, cesantías, código de fondo), ver BloqueConsignacion
+        anio: Año de las cesantías consignadas
+        directorio: Carpeta de salida; cada archivo se llama CODIGO_ANIO.extension
+        disenos: Diseño de archivo por código de fondo
+        nit_empleador: NIT del empleador para los encabezados
+        fecha_generacion: Fecha de los encabezados (por defecto hoy)
+
+    Returns:
+        ResumenConsignacion con los totales por fondo y la validación contra el
+        calculador. Los archivos solo se publican si resumen.valido; si no,
+        resumen.errores describe los problemas y no queda ningún archivo.
+
+    Raises:
+        ValueError: Si un empleado tiene un fondo sin diseño o un valor no cabe
+                    en su campo. En ese caso no queda ningún archivo a medias.
+    """
+    fecha_generacion = fecha_generacion or datetime.date.today()
+    resumen = ResumenConsignacion(anio=anio)
+    os.makedirs(directorio, exist_ok=True)
+    abiertos: Dict[str, Tuple[IO[str], str, DisenoConsignacion]] = {}
+
+    def abrir(codigo: str) -> Tuple[IO[str], str, DisenoConsignacion]:
+        diseno = disenos.get(codigo)
+        if diseno is None:
+            raise ValueError(f"No hay diseño de archivo para el fondo {codigo}.")
+        ruta = os.path.join(directorio, f"{codigo}_{anio}.{diseno.extension}")
+        ruta_temporal = f"{ruta}.tmp-{os.getpid()}"
+        archivo = open(ruta_temporal, "w", encoding="utf-8", newline="", buffering=1 << 20)
+        abiertos[codigo] = (archivo, ruta_temporal, diseno)
+        resumen.fondos[codigo] = TotalesFondo(codigo, ruta)
+        archivo.write(diseno.registro("encabezado", {
+            "tipo_registro": diseno.codigos_registro[0],
+            "nit_empleador": nit_empleador,
+            "codigo_fondo": codigo,
+            "anio": anio,
+            "fecha_generacion": fecha_generacion.strftime("%Y%m%d"),
+        }))
+        return abiertos[codigo]
+
+    try:
+        for ids, dias, cesantias, fondos in bloques:
+            resumen.empleados += len(ids)
+            # Totales del calculador: del bloque tal como llegó, sin redondear ni agrupar
+            a_consignar = [valor for valor in cesantias if valor >= MINIMO_CONSIGNABLE]
+            resumen.registros_calculados += len(a_consignar)
+            resumen.total_calculado += sum(a_consignar)
+            for id_empleado, dias_empleado, valor, codigo in zip(ids, dias, cesantias, fondos):
+                pesos = _pesos(valor)
+                if pesos <= 0:
+                    continue
+                if not codigo:
+                    resumen.sin_fondo += 1
+                    resumen.valor_sin_fondo += pesos
+                    continue
+                archivo, _, diseno = abiertos.get(codigo) or abrir(codigo)
+                totales = resumen.fondos[codigo]
+                totales.registros += 1
+                totales.total += pesos
+                archivo.write(diseno.registro("detalle", {
+                    "tipo_registro": diseno.codigos_registro[1],
+                    "secuencia": totales.registros,
+                    "id_empleado": id_empleado,
+                    "dias": dias_empleado,
+                    "valor": pesos,
+                    "anio": anio,
+                }))
+        for codigo, (archivo, ruta_temporal, diseno) in abiertos.items():
+            totales = resumen.fondos[codigo]
+            archivo.write(diseno.registro("control", {
+                "tipo_registro": diseno.codigos_registro[2],
+                "registros": totales.registros,
+                "total": totales.total,
+            }))
+            archivo.close()
+    except BaseException:
+        for archivo, ruta_temporal, _ in abiertos.values():
+            archivo.close()
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+        raise
+    temporales = {codigo: ruta_temporal for codigo, (_, ruta_temporal, _) in abiertos.items()}
+    try:
+        _validar(resumen, disenos, temporales)
+    except BaseException:
+        resumen.errores.append("La validación de los archivos no terminó.")
+        raise
+    finally:
+        # Se publica todo o nada: un archivo con errores no debe llegar al fondo
+        for codigo, ruta_temporal in temporales.items():
+            if resumen.valido:
+                os.replace(ruta_temporal, resumen.fondos[codigo].ruta)
+            elif os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+    return resumen
+
+
+def bloques_cesantias_anuales(
+    roster: Roster,
+    afiliaciones: Mapping[int, str],
+    anio: int,
+    tamano_bloque: int = TAMANO_BLOQUE_CORRIDA
+) -> Iterator[BloqueConsignacion]:
+    """
+    Liquida por bloques las cesantías del año a consignar.
+
+    Se consignan las de los empleados con contrato vigente al 31 de diciembre
+    del año, por el periodo trabajado dentro del año (desde el 1 de enero o su
+    fecha de ingreso); a quien se retiró antes se le pagan directamente.
+
+    Args:
+        roster: Roster de la nómina
+        afiliaciones: id_empleado -> código del fondo de cesantías
+        anio: Año liquidado
+        tamano_bloque: Filas del roster por bloque
+
+    Yields:
+        Bloques (ids, días, cesantías, código de fondo) de los empleados vigentes
+    """
+    primer_dia = anio * DIAS_ANIO_COMERCIAL
+    corte = primer_dia + DIAS_ANIO_COMERCIAL - 1  # 31 de diciembre (día 30 comercial)
+    n = len(roster)
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(n, inicio + tamano_bloque)
+        filas = [
+            fila for fila, (desde, hasta) in enumerate(zip(roster["serial_inicio"][inicio:fin], roster["serial_fin"][inicio:fin]))
+            if desde <= corte <= hasta
+        ]
+        if not filas:
+            continue
+        filas = [inicio + fila for fila in filas]
+        ids = [roster["id_empleado"][fila] for fila in filas]
+        resultado = calcular_liquidacion_lote(
+            [roster["salario"][fila] for fila in filas],
+            [max(primer_dia, roster["serial_inicio"][fila]) for fila in filas],
+            [corte] * len(filas),
+            tipos_contrato=[roster["tipo_contrato"][fila] for fila in filas],
+            banderas=[roster["banderas"][fila] for fila in filas],
+        )
+        yield ids, resultado.dias, resultado.cesantias, [afiliaciones.get(id_empleado) for id_empleado in ids]
+
+
+def generar_consignaciones(
+    roster: Roster,
+    afiliaciones: Mapping[int, str],
+    anio: int,
+    directorio: str,
+    disenos: Mapping[str, DisenoConsignacion] = DISENOS_FONDOS,
+    nit_empleador: str = "",
+    fecha_generacion: Optional[datetime.date] = None,
+    tamano_bloque: int = TAMANO_BLOQUE_CORRIDA
+) -> ResumenConsignacion:
+    """
+    Liquida las cesantías anuales del roster y genera los archivos de consignación
+    por fondo en una sola pasada (ver bloques_cesantias_anuales y escribir_consignaciones).
+    """
+    return escribir_consignaciones(
+        bloques_cesantias_anuales(roster, afiliaciones, anio, tamano_bloque),
+        anio, directorio, disenos, nit_empleador, fecha_generacion,
+    )
@@ -1,7 +1,10 @@
 """
 Constantes utilizadas en los cálculos de liquidación.
 """
-from typing import Dict, Final
+from typing import Dict, Final, Tuple
+
+# Versión de las reglas de cálculo (cambiarla invalida los resultados en caché)
+VERSION_CALCULADORA: Final[str] = "1"
 
 # Porcentajes para cálculos
 PORCENTAJE_INTERESES_CESANTIAS: Final[float] = 0.12  # 12% anual
@@ -23,6 +26,13 @@ TIPOS_CONTRATO = {
     "SERVICIOS": "Prestación de Servicios"
 }
 
+# Códigos numéricos de tipo de contrato para cálculos por lotes (índice = código)
+CODIGOS_TIPO_CONTRATO: Final[Tuple[str, ...]] = tuple(TIPOS_CONTRATO)
+
+# Banderas por empleado para cálculos por lotes (campo de bits)
+BANDERA_SALARIO_INTEGRAL: Final[int] = 0x01
+BANDERA_APRENDIZ: Final[int] = 0x02
+
 # Conceptos de liquidación
 CONCEPTOS = {
     "CESANTIAS": "Cesantías",
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/ingestion.py
+
+Ingesta concurrente de muchos archivos de roster (por ejemplo, uno por sucursal).
+
+Dos grupos de hilos conectados por una cola acotada:
+
+    lectores     -> abren y parsean los archivos (CSV, JSONL o binario) y
+                    ponen bloques de filas en la cola
+    calculadores -> toman bloques de la cola, los liquidan con
+                    calcular_liquidacion_lote (en un grupo de procesos, para no
+                    competir por el GIL) y entregan los resultados
+
+La cola tiene un tamaño máximo: si los lectores van más rápido que el cálculo,
+put() los bloquea hasta que haya espacio (contrapresión), así que en memoria
+nunca hay más de tamano_cola + lectores + calculadores bloques, sin importar
+cuántos archivos ni de qué tamaño se ingieran.
+
+Con procesos, cada proceso de trabajo instala la instantánea de parámetros
+vigente en el proceso principal al empezar la ingesta (no relee el archivo de
+disco), y el proceso principal registra cada bloque liquidado en la bitácora de
+auditoría activa, como lo hace src/core/parallel.py; así ambos modos dan los
+mismos resultados, versiones y registros.
+
+Los errores se cuentan por archivo sin detener la ingesta: filas inválidas
+(datos mal formados o periodos con la fecha de fin anterior a la de inicio; se
+omiten y se guardan los primeros mensajes), bloques cuyo cálculo falló y
+archivos que no se pudieron leer. El resumen incluye además cuánto tiempo
+estuvieron los lectores esperando espacio en la cola y los calculadores
+esperando bloques, para ajustar el número de lectores frente al de calculadores.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config.parameter_snapshot import SnapshotParametros, instalar_snapshot, snapshot_actual
+from src.core.audit_log import TIPO_LOTE, bitacora_activa
+from src.core.batch import ResultadoLote, calcular_liquidacion_lote
+from src.core.batch_runner import TAMANO_BLOQUE_CORRIDA
+from src.core.parallel import ARGUMENTOS_ENTRADA
+from src.core.roster import COLUMNAS_ROSTER, Roster, abrir_roster_binario, registro_roster
+
+FORMATOS_INGESTA: Tuple[str, ...] = ("csv", "jsonl", "bin")
+
+LECTORES_POR_DEFECTO = 4
+# Mensajes de filas inválidas que se guardan por archivo (el resto solo se cuenta)
+MAX_ERRORES_POR_ARCHIVO = 20
+
+# Columnas que necesita el cálculo (en el orden de los argumentos de _liquidar_bloque)
+_COLUMNAS_CALCULO: Tuple[str, ...] = ("salario", "serial_inicio", "serial_fin", "tipo_contrato", "banderas")
+
+# Callback de resultados: (ruta del archivo, número de bloque, ids de empleado, resultado)
+AlResultado = Callable[[str, int, Sequence[int], ResultadoLote], None]
+
+
+@dataclass
+class EstadoArchivo:
+    """Contabilidad de la ingesta de un archivo."""
+    ruta: str
+    filas_leidas: int = 0        # Filas válidas puestas en la cola
+    filas_invalidas: int = 0     # Filas omitidas por datos inválidos
+    filas_calculadas: int = 0
+    filas_fallidas: int = 0      # Filas de bloques cuyo cálculo falló
+    bloques: int = 0
+    error: Optional[str] = None  # Error que impidió leer (el resto de) el archivo
+    errores: List[str] = field(default_factory=list)  # Primeros mensajes de error
+    totales: Dict[str, float] = field(default_factory=dict)  # concepto -> suma calculada
+
+    @property
+    def completo(self) -> bool:
+        """El archivo se leyó y calculó completo, sin errores."""
+        return self.error is None and not self.filas_invalidas and not self.filas_fallidas
+
+    def _anotar(self, mensaje: str) -> None:
+        if len(self.errores) < MAX_ERRORES_POR_ARCHIVO:
+            self.errores.append(mensaje)
+
+
+@dataclass
+class ResumenIngesta:
+    """Resultado de una ingesta: estado por archivo y tiempos de espera para ajustar la concurrencia."""
+    archivos: Dict[str, EstadoArchivo]
+    segundos: float = 0.0
+    espera_lectores: float = 0.0      # Tiempo total de lectores bloqueados por la cola llena
+    espera_calculadores: float = 0.0  # Tiempo total de calculadores esperando bloques
+
+    @property
+    def filas_calculadas(self) -> int:
+        return sum(estado.filas_calculadas for estado in self.archivos.values())
+
+    @property
+    def con_errores(self) -> List[EstadoArchivo]:
+        return [estado for estado in self.archivos.values() if not estado.completo]
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.filas_calculadas / self.segundos if self.segundos > 0 else 0.0
+
+# ==============================================================================
+# Lectura
+# ==============================================================================
+
+def _formato(ruta: str) -> str:
+    formato = os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in FORMATOS_INGESTA:
+        raise ValueError(f"Formato de roster no soportado: {ruta}")
+    return formato
+
+
+def _bloques_texto(ruta: str, formato: str, estado: EstadoArchivo, tamano_bloque: int) -> Iterator[Roster]:
+    """Bloques de un CSV o JSONL; las filas inválidas se cuentan y se omiten."""
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if formato == "csv":
+            lector = csv.DictReader(archivo)
+            filas = ((lector.line_num, fila) for fila in lector)
+        else:
+            filas = ((numero, linea) for numero, linea in enumerate(archivo, 1) if linea.strip())
+        bloque = Roster.vacio()
+        for numero, fila in filas:
+            try:
+                if formato == "jsonl":
+                    fila = json.loads(fila)
+                    if not isinstance(fila, dict):
+                        raise ValueError("la línea no es un objeto JSON")
+                bloque.agregar(**registro_roster(fila))
+            except ValueError as e:
+                estado.filas_invalidas += 1
+                estado._anotar(f"Línea {numero}: {e}")
+                continue
+            if len(bloque) >= tamano_bloque:
+                yield bloque
+                bloque = Roster.vacio()
+        if len(bloque):
+            yield bloque
+
+
+def _bloques_binario(ruta: str, estado: EstadoArchivo, tamano_bloque: int) -> Iterator[Roster]:
+    """
+    Bloques de un roster binario, copiados del mapeo para poder enviarlos a otros
+    procesos. Las filas con la fecha de fin anterior a la de inicio se cuentan y se omiten.
+    """
+    with abrir_roster_binario(ruta) as roster:
+        n = len(roster)
+        for inicio in range(0, n, tamano_bloque):
+            fin = min(n, inicio + tamano_bloque)
+            columnas = {nombre: array(codigo, roster[nombre][inicio:fin]) for nombre, codigo in COLUMNAS_ROSTER}
+            invalidas = [fila for fila, (desde, hasta) in enumerate(zip(columnas["serial_inicio"], columnas["serial_fin"]))
+                         if hasta < desde]
+            if invalidas:
+                for fila in invalidas:
+                    estado.filas_invalidas += 1
+                    estado._anotar(f"Fila {inicio + fila + 1}: la fecha de fin es anterior a la de inicio")
+                omitir = set(invalidas)
+                validas = [fila for fila in range(fin - inicio) if fila not in omitir]
+                columnas = {nombre: array(columna.typecode, (columna[fila] for fila in validas))
+                            for nombre, columna in columnas.items()}
+            if len(columnas["id_empleado"]):
+                yield Roster(columnas)
+
+
+def bloques_archivo(ruta: str, estado: EstadoArchivo, tamano_bloque: int = TAMANO_BLOQUE_CORRIDA) -> Iterator[Roster]:
+    """
+    Lee un archivo de roster por bloques de a lo sumo tamano_bloque filas válidas.
+
+    Raises:
+        ValueError: Si el formato no es soportado o el archivo binario es inválido.
+        OSError: Si el archivo no se puede leer.
+    """
+    formato = _formato(ruta)
+    if formato == "bin":
+        return _bloques_binario(ruta, estado, tamano_bloque)
+    return _bloques_texto(ruta, formato, estado, tamano_bloque)
+
+# ==============================================================================
+# Cálculo
+# ==============================================================================
+
+def _iniciar_calculador(snapshot: SnapshotParametros) -> None:
+    """Inicializador de los procesos de trabajo: usan los parámetros del proceso principal."""
+    instalar_snapshot(snapshot)
+
+
+def _liquidar_bloque(salarios, serial_inicio, serial_fin, tipos_contrato, banderas) -> ResultadoLote:
+    return calcular_liquidacion_lote(salarios, serial_inicio, serial_fin,
+                                     tipos_contrato=tipos_contrato, banderas=banderas)
+
+
+def _auditar_bloque(columnas: Sequence[Sequence], resultado: ResultadoLote) -> None:
+    """Registra en la bitácora activa un bloque liquidado en otro proceso."""
+    bitacora = bitacora_activa()
+    if bitacora is not None:
+        entradas = {ARGUMENTOS_ENTRADA[nombre]: columna for nombre, columna in zip(_COLUMNAS_CALCULO, columnas)}
+        bitacora.registrar(TIPO_LOTE, calcular_liquidacion_lote.__name__, resultado.version_parametros,
+                           entradas, {"resultado": resultado})
+
+
+def _sumar_totales(estado: EstadoArchivo, resultado: ResultadoLote) -> None:
+    for concepto, columna in (("cesantias", resultado.cesantias), ("intereses", resultado.intereses),
+                              ("prima", resultado.prima_semestre_1), ("prima", resultado.prima_semestre_2)):
+        estado.totales[concepto] = estado.totales.get(concepto, 0.0) + sum(columna)
+
+# ==============================================================================
+# Ingesta
+# ==============================================================================
+
+def ingerir_archivos(
+    rutas: Sequence[str],
+    al_resultado: Optional[AlResultado] = None,
+    lectores: int = LECTORES_POR_DEFECTO,
+    calculadores: Optional[int] = None,
+    tamano_cola: Optional[int] = None,
+    tamano_bloque: int = TAMANO_BLOQUE_CORRIDA,
+    usar_procesos: bool = True
+) -> ResumenIngesta:
+    """
+    Lee y liquida muchos archivos de roster de forma concurrente.
+
+    Args:
+        rutas: Archivos de roster (.csv, .jsonl o .bin)
+        al_resultado: Callback opcional por bloque liquidado (ruta, número de
+                      bloque, ids, ResultadoLote). Se llama desde los hilos
+                      calculadores, de a uno a la vez; los bloques de un mismo
+                      archivo pueden llegar en desorden.
+        lectores: Hilos que leen y parsean archivos
+        calculadores: Bloques que se liquidan a la vez (por defecto, los núcleos disponibles)
+        tamano_cola: Bloques en espera entre lectores y calculadores (por defecto 2 * calculadores)
+        tamano_bloque: Filas por bloque
+        usar_procesos: Liquida en un grupo de procesos (True) o en los mismos hilos
+
+    Returns:
+        ResumenIngesta con la contabilidad por archivo
+
+    Raises:
+        ValueError: Si algún parámetro de concurrencia no es positivo.
+    """
+    calculadores = calculadores or os.cpu_count() or 1
+    tamano_cola = tamano_cola or 2 * calculadores
+    if lectores <= 0 or calculadores <= 0 or tamano_cola <= 0 or tamano_bloque <= 0:
+        raise ValueError("Lectores, calculadores, tamaño de cola y tamaño de bloque deben ser positivos.")
+
+    resumen = ResumenIngesta(archivos={ruta: EstadoArchivo(ruta) for ruta in rutas})
+    pendientes: "queue.Queue[str]" = queue.Queue()
+    for ruta in resumen.archivos:
+        pendientes.put(ruta)
+    cola: "queue.Queue[Optional[Tuple[str, int, Roster]]]" = queue.Queue(maxsize=tamano_cola)
+    bloqueo = threading.Lock()  # Protege la contabilidad y serializa al_resultado
+    # spawn: los procesos se crean desde hilos calculadores mientras los lectores
+    # trabajan, y fork() en un proceso con varios hilos puede heredar bloqueos tomados.
+    # Un proceso creado con spawn carga los parámetros de disco: se le instala la
+    # instantánea vigente aquí.
+    ejecutor = ProcessPoolExecutor(
+        max_workers=calculadores, mp_context=multiprocessing.get_context("spawn"),
+        initializer=_iniciar_calculador, initargs=(snapshot_actual(),),
+    ) if usar_procesos else None
+
+    def leer() -> None:
+        espera = 0.0
+        while True:
+            try:
+                ruta = pendientes.get_nowait()
+            except queue.Empty:
+                break
+            estado = resumen.archivos[ruta]
+            try:
+                for numero, bloque in enumerate(bloques_archivo(ruta, estado, tamano_bloque)):
+                    inicio_espera = time.perf_counter()
+                    cola.put((ruta, numero, bloque))  # Se bloquea si la cola está llena
+                    espera += time.perf_counter() - inicio_espera
+                    with bloqueo:
+                        estado.filas_leidas += len(bloque)
+                        estado.bloques += 1
+            except Exception as e:
+                with bloqueo:
+                    estado.error = f"{type(e).__name__}: {e}"
+        with bloqueo:
+            resumen.espera_lectores += espera
+
+    def calcular() -> None:
+        espera = 0.0
+        while True:
+            inicio_espera = time.perf_counter()
+            elemento = cola.get()
+            espera += time.perf_counter() - inicio_espera
+            if elemento is None:
+                break
+            ruta, numero, bloque = elemento
+            estado = resumen.archivos[ruta]
+            columnas = [bloque[nombre] for nombre in _COLUMNAS_CALCULO]
+            try:
+                if ejecutor is not None:
+                    resultado = ejecutor.submit(_liquidar_bloque, *columnas).result()
+                    _auditar_bloque(columnas, resultado)
+                else:
+                    resultado = _liquidar_bloque(*columnas)
+                with bloqueo:
+                    if al_resultado is not None:
+                        al_resultado(ruta, numero, bloque["id_empleado"], resultado)
+                    estado.filas_calculadas += len(bloque)
+                    _sumar_totales(estado, resultado)
+            except Exception as e:
+                with bloqueo:
+                    estado.filas_fallidas += len(bloque)
+                    estado._anotar(f"Bloque {numero}: {type(e).__name__}: {e}")
+        with bloqueo:
+            resumen.espera_calculadores += espera
+
+    inicio = time.perf_counter()
+    hilos_lectores = [threading.Thread(target=leer, name=f"lector-{i}", daemon=True) for i in range(lectores)]
+    hilos_calculadores = [threading.Thread(target=calcular, name=f"calculador-{i}", daemon=True) for i in range(calculadores)]
+    try:
+        for hilo in hilos_lectores + hilos_calculadores:
+            hilo.start()
+        for hilo in hilos_lectores:
+            hilo.join()
+        for _ in hilos_calculadores:
+            cola.put(None)  # Un aviso de fin por calculador, detrás de los bloques pendientes
+        for hilo in hilos_calculadores:
+            hilo.join()
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown()
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/intervals.py
+
+Índices de intervalos excluidos (licencias no remuneradas, suspensiones) en el
+espacio de seriales 30/360.
+
+Los intervalos de cada empleado se ordenan y se fusionan una vez; junto con la
+suma acumulada de sus longitudes, los días excluidos dentro de cualquier
+periodo se obtienen con dos búsquedas binarias (O(log n) en el número de
+ausencias), sin recorrer todos los registros.
+"""
+
+import datetime
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Sequence, Tuple
+
+from src.utils.date_helpers import fecha_a_serial_360
+
+# Intervalo inclusivo de fechas (inicio, fin)
+IntervaloFechas = Tuple[datetime.date, datetime.date]
+
+
+def _fusionar(intervalos: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Ordena y fusiona intervalos inclusivos que se solapan o son contiguos."""
+    fusionados: List[Tuple[int, int]] = []
+    for inicio, fin in sorted(intervalos):
+        if fin < inicio:
+            raise ValueError("La fecha de fin de una ausencia no puede ser anterior a su fecha de inicio")
+        if fusionados and inicio <= fusionados[-1][1] + 1:
+            if fin > fusionados[-1][1]:
+                fusionados[-1] = (fusionados[-1][0], fin)
+        else:
+            fusionados.append((inicio, fin))
+    return fusionados
+
+
+def _a_seriales(intervalos: Iterable[IntervaloFechas]) -> Iterable[Tuple[int, int]]:
+    for inicio, fin in intervalos:
+        yield fecha_a_serial_360(inicio), fecha_a_serial_360(fin)
+
+
+def _cubiertos_hasta(inicios: Sequence[int], fines: Sequence[int], acumulado: Sequence[int],
+                     desde: int, hasta: int, serial: int) -> int:
+    """
+    Días cubiertos por los intervalos [desde, hasta) que son <= serial.
+    acumulado[k] es la suma de longitudes de los intervalos anteriores a k
+    (relativa a 'desde').
+    """
+    k = bisect_right(inicios, serial, desde, hasta) - 1
+    if k < desde:
+        return 0
+    return acumulado[k] + min(fines[k], serial) - inicios[k] + 1
+
+
+class IndiceIntervalos:
+    """
+    Conjunto ordenado y fusionado de intervalos excluidos de un empleado.
+
+    Ejemplo:
+        indice = IndiceIntervalos.desde_fechas([(date(2024, 3, 1), date(2024, 3, 10))])
+        indice.dias_superpuestos(date(2024, 1, 1), date(2024, 12, 31))  # 10
+    """
+
+    def __init__(self, intervalos_serial: Iterable[Tuple[int, int]] = ()):
+        fusionados = _fusionar(intervalos_serial)
+        self.inicios = array("i", (inicio for inicio, _ in fusionados))
+        self.fines = array("i", (fin for _, fin in fusionados))
+        self.acumulado = array("q", [0] * len(fusionados))
+        total = 0
+        for k, (inicio, fin) in enumerate(fusionados):
+            self.acumulado[k] = total
+            total += fin - inicio + 1
+        self.total_dias = total
+
+    @classmethod
+    def desde_fechas(cls, intervalos: Iterable[IntervaloFechas]) -> "IndiceIntervalos":
+        """Construye el índice a partir de intervalos inclusivos de fechas."""
+        return cls(_a_seriales(intervalos))
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+    def __bool__(self) -> bool:
+        return len(self.inicios) > 0
+
+    def dias_superpuestos_serial(self, serial_inicio: int, serial_fin: int) -> int:
+        """Días excluidos dentro del periodo inclusivo [serial_inicio, serial_fin]."""
+        if serial_fin < serial_inicio or not self.inicios:
+            return 0
+        n = len(self.inicios)
+        return (
+            _cubiertos_hasta(self.inicios, self.fines, self.acumulado, 0, n, serial_fin)
+            - _cubiertos_hasta(self.inicios, self.fines, self.acumulado, 0, n, serial_inicio - 1)
+        )
+
+    def dias_superpuestos(self, fecha_inicio: datetime.date, fecha_fin: datetime.date) -> int:
+        """Días excluidos (30/360) dentro del periodo inclusivo de fechas."""
+        return self.dias_superpuestos_serial(fecha_a_serial_360(fecha_inicio), fecha_a_serial_360(fecha_fin))
+
+
+class IndiceIntervalosLote:
+    """
+    Intervalos excluidos de todo un roster en formato compacto por filas (CSR).
+
+    Los intervalos del empleado i ocupan las posiciones [offsets[i], offsets[i+1])
+    de las columnas inicios/fines/acumulado, ya ordenados y fusionados.
+    """
+
+    def __init__(self, offsets: array, inicios: array, fines: array, acumulado: array):
+        self.offsets = offsets
+        self.inicios = inicios
+        self.fines = fines
+        self.acumulado = acumulado
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def desde_listas(cls, intervalos_por_empleado: Iterable[Iterable[Tuple[int, int]]]) -> "IndiceIntervalosLote":
+        """
+        Construye el índice a partir de los intervalos (en seriales 30/360) de
+        cada empleado, en el mismo orden del roster.
+        """
+        offsets = array("q", [0])
+        inicios, fines, acumulado = array("i"), array("i"), array("q")
+        for intervalos in intervalos_por_empleado:
+            total = 0
+            for inicio, fin in _fusionar(intervalos):
+                inicios.append(inicio)
+                fines.append(fin)
+                acumulado.append(total)
+                total += fin - inicio + 1
+            offsets.append(len(inicios))
+        return cls(offsets, inicios, fines, acumulado)
+
+    @classmethod
+    def desde_registros(cls, n_empleados: int, registros: Iterable[Tuple[int, int, int]]) -> "IndiceIntervalosLote":
+        """
+        Construye el índice desde registros (fila_roster, serial_inicio, serial_fin)
+        en cualquier orden, como los que vendrían de un archivo de novedades.
+        """
+        por_empleado: List[List[Tuple[int, int]]] = [[] for _ in range(n_empleados)]
+        for fila, inicio, fin in registros:
+            por_empleado[fila].append((inicio, fin))
+        return cls.desde_listas(por_empleado)
+
+    def dias_superpuestos(self, fila: int, serial_inicio: int, serial_fin: int) -> int:
+        """Días excluidos del empleado 'fila' dentro de [serial_inicio, serial_fin]."""
+        desde, hasta = self.offsets[fila], self.offsets[fila + 1]
+        if desde == hasta or serial_fin < serial_inicio:
+            return 0
+        return (
+            _cubiertos_hasta(self.inicios, self.fines, self.acumulado, desde, hasta, serial_fin)
+            - _cubiertos_hasta(self.inicios, self.fines, self.acumulado, desde, hasta, serial_inicio - 1)
+        )
+
+    def dias_superpuestos_lote(self, serial_inicio: Sequence[int], serial_fin: Sequence[int]) -> array:
+        """Días excluidos de cada empleado dentro de su periodo."""
+        if len(serial_inicio) != len(self):
+            raise ValueError("El índice de ausencias y el lote deben tener el mismo número de filas.")
+        return array("i", [
+            self.dias_superpuestos(fila, inicio, fin)
+            for fila, (inicio, fin) in enumerate(zip(serial_inicio, serial_fin))
+        ])
@@ -3,7 +3,7 @@ Modelos de datos para la aplicación de liquidación.
 """
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Optional, Dict, List, Union
+from typing import Any, Optional, Dict, List, Tuple, Union
 
 @dataclass
 class ParametrosAnio:
@@ -20,12 +20,30 @@ class PeriodoLaboral:
     fecha_fin: date
     salario_base: float
     incluye_auxilio: bool = False
+    # Licencias no remuneradas / suspensiones: intervalos inclusivos (inicio, fin)
+    ausencias: List[Tuple[date, date]] = field(default_factory=list)
+    # Salario variable (comisiones, aumentos): HistorialSalarial de src/core/salary_history.py
+    historial_salarial: Optional[Any] = None
+    
+    @property
+    def salario_promedio(self) -> float:
+        """Salario del último año del periodo (promedio si hay historial salarial)."""
+        if self.historial_salarial is None:
+            return self.salario_base
+        from src.utils.date_helpers import fecha_a_serial_360
+        return self.historial_salarial.promedio_liquidacion(
+            fecha_a_serial_360(self.fecha_inicio), fecha_a_serial_360(self.fecha_fin)
+        )
     
     @property
     def dias_laborados(self) -> int:
-        """Calcula los días laborados en el periodo según convención 30/360."""
+        """Calcula los días laborados en el periodo según convención 30/360, descontando ausencias."""
         from src.utils.date_helpers import calcular_dias_liquidacion
-        return calcular_dias_liquidacion(self.fecha_inicio, self.fecha_fin)
+        dias = calcular_dias_liquidacion(self.fecha_inicio, self.fecha_fin)
+        if self.ausencias:
+            from src.core.intervals import IndiceIntervalos
+            dias -= IndiceIntervalos.desde_fechas(self.ausencias).dias_superpuestos(self.fecha_inicio, self.fecha_fin)
+        return dias
 
 @dataclass
 class ResultadoCalculo:
@@ -36,6 +54,7 @@ class ResultadoCalculo:
     fecha_inicio: date
     fecha_fin: date
     detalles: Dict[str, Union[float, str, int]] = field(default_factory=dict)
+    version_parametros: Optional[str] = None  # Versión de los parámetros legales usados
     
     def formatear_valor(self) -> str:
         """Formatea el valor como moneda."""
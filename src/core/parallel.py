@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/parallel.py
+
+Liquidación en paralelo con resultados en memoria compartida.
+
+Los procesos de trabajo no retornan resultados (ni diccionarios ni dataclasses
+serializados con pickle): escriben cesantías, intereses, prima y días
+directamente en arreglos preasignados en un bloque de
+multiprocessing.shared_memory, indexados por fila del roster. El proceso
+principal solo espera a que terminen los rangos y luego lee las columnas como
+vistas memoryview, sin copias.
+
+Los procesos de trabajo no escriben en la bitácora de auditoría (ver
+src/core/audit_log.py): si hay una activa, el proceso principal registra cada
+rango liquidado como una llamada a calcular_liquidacion_lote, con sus entradas
+y los resultados leídos de la memoria compartida.
+
+Las entradas también se comparten sin serializar: si el roster es un archivo
+binario (src/core/roster.py) cada proceso lo mapea en memoria; si es un roster
+en memoria, sus columnas se copian una sola vez a otro bloque compartido.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.core.audit_log import TIPO_LOTE, BitacoraAuditoria, bitacora_activa
+from src.core.batch import ResultadoLote, calcular_liquidacion_lote
+from src.core.roster import Roster, abrir_roster_binario
+
+# Columnas de salida: (atributo de ResultadoLote, typecode)
+COLUMNAS_RESULTADO: Tuple[Tuple[str, str], ...] = (
+    ("dias", "i"),
+    ("cesantias", "d"),
+    ("intereses", "d"),
+    ("prima_semestre_1", "d"),
+    ("prima_semestre_2", "d"),
+    ("dias_semestre_1", "i"),
+    ("dias_semestre_2", "i"),
+)
+
+# Columnas de entrada necesarias para liquidar
+COLUMNAS_ENTRADA: Tuple[Tuple[str, str], ...] = (
+    ("salario", "d"),
+    ("serial_inicio", "i"),
+    ("serial_fin", "i"),
+    ("tipo_contrato", "B"),
+    ("banderas", "B"),
+)
+
+# Nombre del argumento de calcular_liquidacion_lote de cada columna de entrada (auditoría)
+ARGUMENTOS_ENTRADA: Dict[str, str] = {
+    "salario": "salarios",
+    "serial_inicio": "serial_inicio",
+    "serial_fin": "serial_fin",
+    "tipo_contrato": "tipos_contrato",
+    "banderas": "banderas",
+}
+
+# Filas por tarea enviada a cada proceso
+TAMANO_RANGO = 16384
+
+_TAMANOS = {"B": 1, "i": 4, "d": 8}
+
+
+def _distribucion(columnas: Sequence[Tuple[str, str]], n: int) -> Tuple[Dict[str, Tuple[str, int]], int]:
+    """Offset de cada columna dentro de un bloque compartido (alineadas a 8 bytes)."""
+    offsets: Dict[str, Tuple[str, int]] = {}
+    posicion = 0
+    for nombre, codigo in columnas:
+        offsets[nombre] = (codigo, posicion)
+        posicion += -(-n * _TAMANOS[codigo] // 8) * 8
+    return offsets, max(posicion, 1)
+
+
+def _vistas(buffer, distribucion: Dict[str, Tuple[str, int]], n: int) -> Dict[str, memoryview]:
+    """Vistas tipadas de cada columna sobre el buffer compartido."""
+    base = memoryview(buffer)
+    return {
+        nombre: base[offset:offset + n * _TAMANOS[codigo]].cast(codigo)
+        for nombre, (codigo, offset) in distribucion.items()
+    }
+
+
+class ResultadosCompartidos:
+    """
+    Resultados de una liquidación en paralelo, leídos directamente de la
+    memoria compartida. Se debe llamar a cerrar() (o usar un bloque with) para
+    liberar el bloque cuando ya no se necesiten las vistas.
+    """
+
+    def __init__(self, memoria: shared_memory.SharedMemory, n: int):
+        self._memoria = memoria
+        distribucion, _ = _distribucion(COLUMNAS_RESULTADO, n)
+        self._columnas = _vistas(memoria.buf, distribucion, n)
+        self.resultado = ResultadoLote(**self._columnas)
+
+    def __len__(self) -> int:
+        return len(self.resultado)
+
+    def __enter__(self) -> "ResultadosCompartidos":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Libera las vistas y elimina el bloque de memoria compartida."""
+        if self._memoria is None:
+            return
+        for vista in self._columnas.values():
+            vista.release()
+        self._columnas.clear()
+        self._memoria.close()
+        self._memoria.unlink()
+        self._memoria = None
+
+# ==============================================================================
+# Procesos de trabajo
+# ==============================================================================
+
+# Estado de cada proceso de trabajo (se fija una vez en el inicializador)
+_estado_trabajador: Dict[str, object] = {}
+
+
+def _iniciar_trabajador(
+    nombre_salida: str,
+    n: int,
+    ruta_roster: Optional[str],
+    nombre_entrada: Optional[str]
+) -> None:
+    salida = shared_memory.SharedMemory(name=nombre_salida)
+    distribucion_salida, _ = _distribucion(COLUMNAS_RESULTADO, n)
+    _estado_trabajador["memorias"] = [salida]
+    _estado_trabajador["salida"] = _vistas(salida.buf, distribucion_salida, n)
+    if ruta_roster is not None:
+        roster = abrir_roster_binario(ruta_roster)
+        _estado_trabajador["roster"] = roster
+        _estado_trabajador["entrada"] = {nombre: roster[nombre] for nombre, _ in COLUMNAS_ENTRADA}
+    else:
+        entrada = shared_memory.SharedMemory(name=nombre_entrada)
+        distribucion_entrada, _ = _distribucion(COLUMNAS_ENTRADA, n)
+        _estado_trabajador["memorias"].append(entrada)
+        _estado_trabajador["entrada"] = _vistas(entrada.buf, distribucion_entrada, n)
+
+
+def _liquidar_rango(inicio: int, fin: int) -> Optional[str]:
+    """
+    Liquida las filas [inicio, fin) y las escribe en la memoria compartida.
+
+    Returns:
+        Versión de los parámetros usados (para la auditoría en el proceso principal)
+    """
+    entrada = _estado_trabajador["entrada"]
+    salida = _estado_trabajador["salida"]
+    resultado = calcular_liquidacion_lote(
+        entrada["salario"][inicio:fin],
+        entrada["serial_inicio"][inicio:fin],
+        entrada["serial_fin"][inicio:fin],
+        tipos_contrato=entrada["tipo_contrato"][inicio:fin],
+        banderas=entrada["banderas"][inicio:fin],
+    )
+    for nombre, _ in COLUMNAS_RESULTADO:
+        salida[nombre][inicio:fin] = getattr(resultado, nombre)
+    return resultado.version_parametros
+
+
+def _auditar_rangos(
+    bitacora: BitacoraAuditoria,
+    roster: Union[Roster, str],
+    rangos: Sequence[Tuple[int, int]],
+    versiones: Sequence[Optional[str]],
+    compartidos: "ResultadosCompartidos"
+) -> None:
+    """Registra cada rango liquidado por los procesos de trabajo, en orden."""
+    abierto = abrir_roster_binario(roster) if isinstance(roster, str) else roster
+    try:
+        for (inicio, fin), version in zip(rangos, versiones):
+            # Copias: las vistas del roster mapeado no deben sobrevivir a su cierre
+            entradas = {
+                ARGUMENTOS_ENTRADA[nombre]: array(codigo, abierto[nombre][inicio:fin])
+                for nombre, codigo in COLUMNAS_ENTRADA
+            }
+            salida = ResultadoLote(
+                **{nombre: array(codigo, getattr(compartidos.resultado, nombre)[inicio:fin])
+                   for nombre, codigo in COLUMNAS_RESULTADO},
+                version_parametros=version,
+            )
+            bitacora.registrar(TIPO_LOTE, calcular_liquidacion_lote.__name__, version, entradas, {"resultado": salida})
+    finally:
+        if abierto is not roster:
+            abierto.cerrar()
+
+# ==============================================================================
+# Punto de entrada
+# ==============================================================================
+
+def liquidar_en_paralelo(
+    roster: Union[Roster, str],
+    procesos: Optional[int] = None,
+    tamano_rango: int = TAMANO_RANGO
+) -> ResultadosCompartidos:
+    """
+    Liquida un roster repartiendo rangos de filas entre varios procesos.
+
+    Args:
+        roster: Roster en memoria, o ruta de un roster binario (preferible: cada
+                proceso lo mapea sin copiarlo)
+        procesos: Número de procesos (por defecto, los núcleos disponibles)
+        tamano_rango: Filas por tarea
+
+    Returns:
+        ResultadosCompartidos con un ResultadoLote alineado con el roster
+
+    Raises:
+        ValueError: Si algún periodo es inválido o falta configuración para un año.
+    """
+    if tamano_rango <= 0:
+        raise ValueError("El tamaño de rango debe ser positivo.")
+    ruta_roster = roster if isinstance(roster, str) else None
+    if ruta_roster is not None:
+        with abrir_roster_binario(ruta_roster) as abierto:
+            n = len(abierto)
+    else:
+        n = len(roster)
+
+    _, tamano_salida = _distribucion(COLUMNAS_RESULTADO, n)
+    salida = shared_memory.SharedMemory(create=True, size=tamano_salida)
+    entrada: Optional[shared_memory.SharedMemory] = None
+    try:
+        if ruta_roster is None:
+            distribucion_entrada, tamano_entrada = _distribucion(COLUMNAS_ENTRADA, n)
+            entrada = shared_memory.SharedMemory(create=True, size=tamano_entrada)
+            vistas = _vistas(entrada.buf, distribucion_entrada, n)
+            for nombre, codigo in COLUMNAS_ENTRADA:
+                vistas[nombre][:] = array(codigo, roster[nombre])
+                vistas[nombre].release()
+
+        rangos: List[Tuple[int, int]] = [(inicio, min(n, inicio + tamano_rango)) for inicio in range(0, n, tamano_rango)]
+        with ProcessPoolExecutor(
+            max_workers=procesos or os.cpu_count() or 1,
+            initializer=_iniciar_trabajador,
+            initargs=(salida.name, n, ruta_roster, entrada.name if entrada is not None else None),
+        ) as executor:
+            futuros = [executor.submit(_liquidar_rango, inicio, fin) for inicio, fin in rangos]
+            versiones = [futuro.result() for futuro in futuros]  # Propaga el primer error
+    except BaseException:
+        salida.close()
+        salida.unlink()
+        raise
+    finally:
+        if entrada is not None:
+            entrada.close()
+            entrada.unlink()
+
+    compartidos = ResultadosCompartidos(salida, n)
+    bitacora = bitacora_activa()
+    if bitacora is not None:
+        try:
+            _auditar_rangos(bitacora, roster, rangos, versiones, compartidos)
+        except BaseException:
+            compartidos.cerrar()
+            raise
+    return compartidos
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/pipeline.py
+
+Pipeline de liquidación por etapas para un periodo (un empleado).
+
+Etapas:
+    1. Validar las entradas.
+    2. Normalizar las fechas a seriales 30/360.
+    3. Resolver los parámetros del año (SMMLV y auxilio de transporte).
+    4. Calcular la base salarial de liquidación.
+    5. Asignar los días (total y por semestre).
+    6. Evaluar los conceptos solicitados (cesantías, intereses, prima, ...).
+
+Los intermedios (días, base, parámetros) se guardan en un ContextoLiquidacion y
+se calculan una sola vez, sin importar cuántos conceptos los usen. Un concepto
+nuevo se agrega registrándolo con registrar_concepto().
+"""
+
+import datetime
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from config.parameter_snapshot import SnapshotParametros, snapshot_actual
+from src.core.constants import (
+    CONCEPTOS,
+    PORCENTAJE_INTERESES_CESANTIAS,
+    MAX_SMMLV_PARA_AUXILIO_TRANSPORTE,
+    DIAS_ANIO_COMERCIAL,
+    DIAS_SEMESTRE_COMERCIAL,
+)
+from src.core.intervals import IndiceIntervalos
+from src.core.models import ResultadoCalculo
+from src.core.salary_history import HistorialSalarial
+from src.utils.date_helpers import fecha_a_serial_360
+from src.utils.validation import validar_fechas_periodo
+
+# ==============================================================================
+# Contexto
+# ==============================================================================
+
+@dataclass
+class ContextoLiquidacion:
+    """Entradas e intermedios compartidos por todas las etapas del pipeline."""
+    # --- Entradas ---
+    salario_mensual: float
+    fecha_inicio: datetime.date
+    fecha_fin: datetime.date
+    anio_liquidacion: Optional[int] = None
+    incluir_auxilio: bool = True
+    ausencias: Optional[IndiceIntervalos] = None  # Licencias/suspensiones a descontar
+    historial_salarial: Optional[HistorialSalarial] = None  # Salario variable (se promedia)
+    parametros: Optional[SnapshotParametros] = None  # Por defecto, la instantánea vigente
+
+    # --- Intermedios (los llenan las etapas) ---
+    serial_inicio: int = 0
+    serial_fin: int = 0
+    smmlv: int = 0
+    auxilio_transporte: int = 0
+    aplica_auxilio: bool = False
+    salario_promedio: float = 0.0
+    salario_base_liquidacion: float = 0.0
+    dias: int = 0
+    dias_ausencia: int = 0
+    dias_semestre_1: int = 0
+    dias_semestre_2: int = 0
+
+    # --- Salidas ---
+    valores: Dict[str, float] = field(default_factory=dict)
+    resultados: Dict[str, ResultadoCalculo] = field(default_factory=dict)
+
+# ==============================================================================
+# Fórmulas
+# ==============================================================================
+
+def formula_cesantias(salario_base_liquidacion: float, dias: int) -> float:
+    """(Salario Base * Días Trabajados) / 360"""
+    return (float(salario_base_liquidacion) * dias) / DIAS_ANIO_COMERCIAL
+
+
+def formula_intereses(valor_cesantias: float, dias: int) -> float:
+    """(Valor Cesantías * Días Trabajados * 0.12) / 360"""
+    return (valor_cesantias * dias * PORCENTAJE_INTERESES_CESANTIAS) / DIAS_ANIO_COMERCIAL
+
+
+def formula_intereses_anticipos(valor_cesantias: float, dias: int, descuento_anticipos: float) -> float:
+    """((Valor Cesantías * Días Trabajados) - Σ Anticipo * Días sin intereses) * 0.12 / 360"""
+    if not descuento_anticipos:
+        return formula_intereses(valor_cesantias, dias)
+    return ((valor_cesantias * dias - descuento_anticipos) * PORCENTAJE_INTERESES_CESANTIAS) / DIAS_ANIO_COMERCIAL
+
+
+def formula_prima_semestre(salario_base_liquidacion: float, dias_semestre: int) -> float:
+    """(Salario Base Liquidación * Días Trabajados Semestre) / 180"""
+    return (salario_base_liquidacion * dias_semestre) / 180.0 if dias_semestre > 0 else 0.0
+
+# ==============================================================================
+# Etapas comunes
+# ==============================================================================
+
+def etapa_validar(ctx: ContextoLiquidacion) -> None:
+    """Valida que el periodo sea coherente."""
+    es_valido, mensaje_error = validar_fechas_periodo(ctx.fecha_inicio, ctx.fecha_fin)
+    if not es_valido:
+        raise ValueError(mensaje_error)
+    if ctx.anio_liquidacion is None:
+        ctx.anio_liquidacion = ctx.fecha_fin.year
+
+
+def etapa_normalizar_fechas(ctx: ContextoLiquidacion) -> None:
+    """Convierte las fechas a seriales 30/360 (el día 31 se toma como 30)."""
+    ctx.serial_inicio = fecha_a_serial_360(ctx.fecha_inicio)
+    ctx.serial_fin = fecha_a_serial_360(ctx.fecha_fin)
+
+
+def etapa_resolver_parametros(ctx: ContextoLiquidacion) -> None:
+    """
+    Obtiene SMMLV y Auxilio de Transporte del año de liquidación, de una sola
+    instantánea de parámetros para todo el cálculo.
+    """
+    if ctx.parametros is None:
+        ctx.parametros = snapshot_actual()
+    ctx.smmlv = ctx.parametros.smmlv(ctx.anio_liquidacion)
+    ctx.auxilio_transporte = ctx.parametros.auxilio_transporte(ctx.anio_liquidacion)
+    if ctx.smmlv <= 0:
+        raise ValueError(f"No se encontró configuración de SMMLV para el año {ctx.anio_liquidacion}")
+
+
+def etapa_base_salarial(ctx: ContextoLiquidacion) -> None:
+    """
+    Calcula el salario base de liquidación (incluye auxilio si aplica). Con
+    historial salarial se usa el promedio del último año del periodo.
+    """
+    if ctx.historial_salarial is not None:
+        ctx.salario_promedio = ctx.historial_salarial.promedio_liquidacion(ctx.serial_inicio, ctx.serial_fin)
+    else:
+        ctx.salario_promedio = ctx.salario_mensual
+    ctx.aplica_auxilio = (
+        ctx.incluir_auxilio
+        and ctx.auxilio_transporte > 0
+        and ctx.salario_promedio <= (MAX_SMMLV_PARA_AUXILIO_TRANSPORTE * ctx.smmlv)
+    )
+    ctx.salario_base_liquidacion = ctx.salario_promedio
+    if ctx.aplica_auxilio:
+        ctx.salario_base_liquidacion += ctx.auxilio_transporte
+
+
+def etapa_asignar_dias(ctx: ContextoLiquidacion) -> None:
+    """
+    Calcula los días 30/360 del periodo y su reparto por semestre del año de la
+    fecha fin, descontando los días de ausencia que caen en cada tramo.
+    """
+    ctx.dias = ctx.serial_fin - ctx.serial_inicio + 1
+    if ctx.ausencias:
+        ctx.dias_ausencia = ctx.ausencias.dias_superpuestos_serial(ctx.serial_inicio, ctx.serial_fin)
+        ctx.dias -= ctx.dias_ausencia
+
+    inicio_s1 = (ctx.serial_fin // DIAS_ANIO_COMERCIAL) * DIAS_ANIO_COMERCIAL
+    inicio_s2 = inicio_s1 + DIAS_SEMESTRE_COMERCIAL
+    ctx.dias_semestre_1 = 0
+    ctx.dias_semestre_2 = 0
+    if ctx.serial_inicio < inicio_s2 and ctx.serial_fin >= inicio_s1:
+        desde, hasta = max(ctx.serial_inicio, inicio_s1), min(ctx.serial_fin, inicio_s2 - 1)
+        ctx.dias_semestre_1 = hasta - desde + 1
+        if ctx.ausencias:
+            ctx.dias_semestre_1 -= ctx.ausencias.dias_superpuestos_serial(desde, hasta)
+    if ctx.serial_fin >= inicio_s2:
+        desde = max(ctx.serial_inicio, inicio_s2)
+        ctx.dias_semestre_2 = ctx.serial_fin - desde + 1
+        if ctx.ausencias:
+            ctx.dias_semestre_2 -= ctx.ausencias.dias_superpuestos_serial(desde, ctx.serial_fin)
+
+
+ETAPAS_COMUNES: Tuple[Callable[[ContextoLiquidacion], None], ...] = (
+    etapa_validar,
+    etapa_normalizar_fechas,
+    etapa_resolver_parametros,
+    etapa_base_salarial,
+    etapa_asignar_dias,
+)
+
+# ==============================================================================
+# Conceptos
+# ==============================================================================
+
+def _resultado(ctx: ContextoLiquidacion, concepto: str, valor: float, dias: int) -> ResultadoCalculo:
+    return ResultadoCalculo(
+        concepto=concepto,
+        valor=valor,
+        dias_calculados=dias,
+        fecha_inicio=ctx.fecha_inicio,
+        fecha_fin=ctx.fecha_fin,
+        version_parametros=ctx.parametros.version if ctx.parametros is not None else None
+    )
+
+
+def concepto_cesantias(ctx: ContextoLiquidacion) -> None:
+    """Cesantías del periodo."""
+    if ctx.auxilio_transporte <= 0:
+        raise ValueError(f"No se encontró configuración de SMMLV/Aux. Transporte para el año {ctx.anio_liquidacion}")
+    valor = formula_cesantias(ctx.salario_base_liquidacion, ctx.dias)
+    ctx.valores["cesantias"] = valor
+    ctx.resultados["cesantias"] = _resultado(ctx, CONCEPTOS["CESANTIAS"], valor, ctx.dias)
+
+
+def concepto_intereses(ctx: ContextoLiquidacion) -> None:
+    """Intereses sobre las cesantías del periodo (requiere el concepto 'cesantias')."""
+    valor = formula_intereses(ctx.valores["cesantias"], ctx.dias)
+    ctx.valores["intereses"] = valor
+    ctx.resultados["intereses"] = _resultado(ctx, CONCEPTOS["INTERESES"], valor, ctx.dias)
+
+
+def concepto_prima(ctx: ContextoLiquidacion) -> None:
+    """Prima de servicios por semestre y total."""
+    prima_s1 = formula_prima_semestre(ctx.salario_base_liquidacion, ctx.dias_semestre_1)
+    prima_s2 = formula_prima_semestre(ctx.salario_base_liquidacion, ctx.dias_semestre_2)
+    ctx.valores["prima_semestre_1"] = prima_s1
+    ctx.valores["prima_semestre_2"] = prima_s2
+    ctx.valores["prima_total"] = prima_s1 + prima_s2
+    resultado = _resultado(ctx, CONCEPTOS["PRIMA"], prima_s1 + prima_s2, ctx.dias_semestre_1 + ctx.dias_semestre_2)
+    resultado.detalles.update({
+        "prima_semestre_1": prima_s1,
+        "prima_semestre_2": prima_s2,
+        "dias_semestre_1": ctx.dias_semestre_1,
+        "dias_semestre_2": ctx.dias_semestre_2,
+    })
+    ctx.resultados["prima"] = resultado
+
+
+# Registro de conceptos: nombre -> (función, conceptos de los que depende)
+_REGISTRO_CONCEPTOS: Dict[str, Tuple[Callable[[ContextoLiquidacion], None], Tuple[str, ...]]] = {
+    "cesantias": (concepto_cesantias, ()),
+    "intereses": (concepto_intereses, ("cesantias",)),
+    "prima": (concepto_prima, ()),
+}
+
+
+def registrar_concepto(
+    nombre: str,
+    funcion: Callable[[ContextoLiquidacion], None],
+    depende_de: Iterable[str] = ()
+) -> None:
+    """
+    Registra un concepto nuevo como etapa del pipeline.
+
+    Args:
+        nombre: Nombre del concepto (clave en los resultados)
+        funcion: Recibe el ContextoLiquidacion con los intermedios ya calculados
+                 y guarda su valor en ctx.valores / ctx.resultados
+        depende_de: Conceptos que deben evaluarse antes
+    """
+    _REGISTRO_CONCEPTOS[nombre] = (funcion, tuple(depende_de))
+
+
+def _ordenar_conceptos(conceptos: Iterable[str]) -> Tuple[str, ...]:
+    """Ordena los conceptos pedidos agregando sus dependencias antes que ellos."""
+    orden = []
+
+    def visitar(nombre: str, camino: Tuple[str, ...]) -> None:
+        if nombre in orden:
+            return
+        if nombre in camino:
+            raise ValueError(f"Dependencia circular entre conceptos: {' -> '.join(camino + (nombre,))}")
+        if nombre not in _REGISTRO_CONCEPTOS:
+            raise ValueError(f"Concepto de liquidación desconocido: {nombre}")
+        for dependencia in _REGISTRO_CONCEPTOS[nombre][1]:
+            visitar(dependencia, camino + (nombre,))
+        orden.append(nombre)
+
+    for nombre in conceptos:
+        visitar(nombre, ())
+    return tuple(orden)
+
+# ==============================================================================
+# Ejecución
+# ==============================================================================
+
+def ejecutar_pipeline(ctx: ContextoLiquidacion, conceptos: Iterable[str]) -> ContextoLiquidacion:
+    """
+    Ejecuta las etapas comunes y luego los conceptos pedidos (con sus dependencias).
+
+    Args:
+        ctx: Contexto con las entradas
+        conceptos: Nombres de los conceptos a evaluar (ver registrar_concepto)
+
+    Returns:
+        El mismo contexto, con intermedios, valores y resultados
+
+    Raises:
+        ValueError: Si las entradas son inválidas, falta configuración para el
+                    año o se pide un concepto desconocido.
+    """
+    orden = _ordenar_conceptos(conceptos)
+    for etapa in ETAPAS_COMUNES:
+        etapa(ctx)
+    for nombre in orden:
+        _REGISTRO_CONCEPTOS[nombre][0](ctx)
+    return ctx
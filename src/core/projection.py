@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/projection.py
+
+Proyección de costos de retiro: cuánto costaría liquidar a cada empleado del
+roster en cada una de varias fechas candidatas de retiro.
+
+El resultado es una matriz empleados x fechas por concepto (cesantías,
+intereses, prima y total) más los totales por fecha. En lugar de llamar a
+calcular_liquidacion_completa una vez por par (empleado, fecha), el roster se
+cruza con el vector de fechas:
+
+    - las fechas se convierten a seriales 30/360 una sola vez;
+    - el SMMLV y el auxilio se consultan una vez por año distinto de las fechas;
+    - la base de liquidación de cada empleado se calcula una vez por año
+      (no por fecha), y los conceptos se derivan de ella y de los días.
+
+Para rosters grandes la matriz se produce por bloques de filas (tiles) cuyo
+tamaño se ajusta a MEMORIA_MAXIMA_BLOQUE; cada bloque puede consumirse y
+descartarse (o escribirse a disco) sin tener la matriz completa en memoria.
+
+Los valores son idénticos a los de calcular_liquidacion_lote con la fecha de
+retiro como fecha de fin. Un empleado que todavía no ha ingresado en una fecha
+tiene costo 0 en esa fecha.
+"""
+
+import calendar
+import datetime
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config.parameter_snapshot import SnapshotParametros, snapshot_actual
+from src.core.batch import agrupar_por_regla, obtener_parametros_anios
+from src.core.constants import (
+    DIAS_ANIO_COMERCIAL,
+    DIAS_SEMESTRE_COMERCIAL,
+    MAX_SMMLV_PARA_AUXILIO_TRANSPORTE,
+    PORCENTAJE_INTERESES_CESANTIAS,
+)
+from src.core.roster import Roster
+from src.utils.date_helpers import fecha_a_serial_360
+
+# Conceptos de la proyección (una matriz por concepto)
+CONCEPTOS_PROYECCION: Tuple[str, ...] = ("cesantias", "intereses", "prima", "total")
+
+# Memoria máxima de las matrices de un bloque (todas las de CONCEPTOS_PROYECCION)
+MEMORIA_MAXIMA_BLOQUE = 64 * 1024 * 1024
+
+# Meses proyectados por defecto
+MESES_PROYECCION = 24
+
+
+def fechas_fin_de_mes(desde: datetime.date, meses: int = MESES_PROYECCION) -> List[datetime.date]:
+    """
+    Último día de cada mes, empezando por el mes de 'desde'.
+
+    Args:
+        desde: Fecha dentro del primer mes a proyectar
+        meses: Número de fechas a generar
+
+    Returns:
+        Lista de fechas candidatas de retiro
+    """
+    fechas = []
+    anio, mes = desde.year, desde.month
+    for _ in range(meses):
+        fechas.append(datetime.date(anio, mes, calendar.monthrange(anio, mes)[1]))
+        anio, mes = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return fechas
+
+
+@dataclass
+class BloqueProyeccion:
+    """
+    Matrices de costo de las filas [inicio, fin) del roster.
+
+    Cada matriz es un array('d') por filas: el costo del empleado inicio + i en
+    la fecha j está en la posición i * n_fechas + j.
+    """
+    inicio: int
+    fin: int
+    n_fechas: int
+    matrices: Dict[str, array]
+
+    def valor(self, concepto: str, fila: int, indice_fecha: int) -> float:
+        """Costo de un concepto para la fila (del roster) y la fecha indicadas."""
+        return self.matrices[concepto][(fila - self.inicio) * self.n_fechas + indice_fecha]
+
+
+@dataclass
+class ProyeccionRetiro:
+    """Totales por fecha de la proyección (y la matriz completa si se pidió)."""
+    fechas: List[datetime.date]
+    totales: Dict[str, array]  # concepto -> array('d') con un total por fecha
+    matrices: Optional[Dict[str, array]] = None
+    version_parametros: Optional[str] = None
+
+
+def filas_por_bloque(n_fechas: int, memoria_maxima: int = MEMORIA_MAXIMA_BLOQUE) -> int:
+    """Filas por bloque para que sus matrices no superen la memoria indicada."""
+    return max(1, memoria_maxima // (8 * len(CONCEPTOS_PROYECCION) * max(1, n_fechas)))
+
+
+def proyectar_bloques(
+    roster: Roster,
+    fechas_retiro: Sequence[datetime.date],
+    memoria_maxima: int = MEMORIA_MAXIMA_BLOQUE,
+    snapshot: Optional[SnapshotParametros] = None
+) -> Iterator[BloqueProyeccion]:
+    """
+    Calcula las matrices de costo de retiro por bloques de filas.
+
+    Usa las columnas salario, serial_inicio, tipo_contrato y banderas del roster;
+    los conceptos que no aplican a un empleado según REGLAS_LIQUIDACION quedan en 0.
+
+    Args:
+        roster: Roster a proyectar
+        fechas_retiro: Fechas candidatas de retiro
+        memoria_maxima: Memoria máxima de las matrices de cada bloque
+        snapshot: Instantánea de parámetros a usar (por defecto la vigente)
+
+    Yields:
+        BloqueProyeccion por cada bloque de filas, en orden
+
+    Raises:
+        ValueError: Si falta configuración de SMMLV/auxilio para el año de alguna fecha.
+    """
+    seriales = [fecha_a_serial_360(fecha) for fecha in fechas_retiro]
+    m = len(seriales)
+    anios = sorted({serial // DIAS_ANIO_COMERCIAL for serial in seriales})
+    parametros = obtener_parametros_anios(anios, snapshot)
+    topes = [(MAX_SMMLV_PARA_AUXILIO_TRANSPORTE * parametros[anio][0], parametros[anio][1]) for anio in anios]
+    # Por fecha: (serial, índice del año, inicio del semestre 1, inicio del semestre 2)
+    columnas_fecha = []
+    for serial in seriales:
+        anio = serial // DIAS_ANIO_COMERCIAL
+        inicio_s1 = anio * DIAS_ANIO_COMERCIAL
+        columnas_fecha.append((serial, anios.index(anio), inicio_s1, inicio_s1 + DIAS_SEMESTRE_COMERCIAL))
+
+    n = len(roster)
+    tamano = filas_por_bloque(m, memoria_maxima)
+    for inicio in range(0, n, tamano):
+        fin = min(n, inicio + tamano)
+        yield _proyectar_bloque(
+            inicio, fin,
+            roster["salario"][inicio:fin],
+            roster["serial_inicio"][inicio:fin],
+            roster["tipo_contrato"][inicio:fin],
+            roster["banderas"][inicio:fin],
+            columnas_fecha, topes,
+        )
+
+
+def _proyectar_bloque(
+    inicio: int,
+    fin: int,
+    salarios: Sequence[float],
+    serial_inicio: Sequence[int],
+    tipos_contrato: Sequence[int],
+    banderas: Sequence[int],
+    columnas_fecha: List[Tuple[int, int, int, int]],
+    topes: List[Tuple[int, int]]
+) -> BloqueProyeccion:
+    m = len(columnas_fecha)
+    tamano = (fin - inicio) * m
+    matrices = {concepto: array("d", bytes(8 * tamano)) for concepto in CONCEPTOS_PROYECCION}
+    cesantias, intereses, prima, total = (matrices[concepto] for concepto in CONCEPTOS_PROYECCION)
+
+    for regla, filas in agrupar_por_regla(tipos_contrato, banderas).items():
+        if not regla.conceptos:
+            continue
+        con_cesantias = "cesantias" in regla.conceptos
+        con_intereses = "intereses" in regla.conceptos
+        con_prima = "prima" in regla.conceptos
+        for fila in filas:
+            salario = salarios[fila]
+            si = serial_inicio[fila]
+            # Base de liquidación una vez por año de las fechas, no por fecha
+            bases = [salario + auxilio if salario <= tope else salario for tope, auxilio in topes]
+            posicion = fila * m
+            for serial, indice_anio, inicio_s1, inicio_s2 in columnas_fecha:
+                if serial >= si:
+                    base = bases[indice_anio]
+                    dias = serial - si + 1
+                    valor_cesantias = (base * dias) / DIAS_ANIO_COMERCIAL
+                    valor_intereses = (valor_cesantias * dias * PORCENTAJE_INTERESES_CESANTIAS) / DIAS_ANIO_COMERCIAL
+                    dias_s1 = min(serial, inicio_s2 - 1) - max(si, inicio_s1) + 1 if si < inicio_s2 else 0
+                    dias_s2 = serial - max(si, inicio_s2) + 1 if serial >= inicio_s2 else 0
+                    prima_s1 = (base * dias_s1) / 180.0 if dias_s1 > 0 else 0.0
+                    prima_s2 = (base * dias_s2) / 180.0 if dias_s2 > 0 else 0.0
+                    c = valor_cesantias if con_cesantias else 0.0
+                    i = valor_intereses if con_intereses else 0.0
+                    p1, p2 = (prima_s1, prima_s2) if con_prima else (0.0, 0.0)
+                    cesantias[posicion] = c
+                    intereses[posicion] = i
+                    prima[posicion] = p1 + p2
+                    total[posicion] = c + i + p1 + p2
+                posicion += 1
+    return BloqueProyeccion(inicio=inicio, fin=fin, n_fechas=m, matrices=matrices)
+
+
+def _acumular_totales(totales: Dict[str, array], bloque: BloqueProyeccion) -> None:
+    """
+    Suma las columnas (fechas) de las matrices del bloque a los totales.
+
+    Se acumula fila por fila, en el orden del roster, para que los totales no
+    dependan del tamaño de los bloques.
+    """
+    m = bloque.n_fechas
+    for concepto, acumulado in totales.items():
+        matriz = bloque.matrices[concepto]
+        for j in range(m):
+            total = acumulado[j]
+            for valor in matriz[j::m]:
+                total += valor
+            acumulado[j] = total
+
+
+def proyectar_costos_retiro(
+    roster: Roster,
+    fechas_retiro: Sequence[datetime.date],
+    conservar_matrices: bool = False,
+    memoria_maxima: int = MEMORIA_MAXIMA_BLOQUE
+) -> ProyeccionRetiro:
+    """
+    Proyecta el costo de retirar a cada empleado en cada fecha candidata.
+
+    Args:
+        roster: Roster a proyectar
+        fechas_retiro: Fechas candidatas de retiro (por ejemplo fechas_fin_de_mes(hoy))
+        conservar_matrices: Si True, retorna también las matrices completas
+                            (empleados x fechas); si False, solo los totales y la
+                            memoria queda acotada por memoria_maxima
+        memoria_maxima: Memoria máxima de las matrices de cada bloque
+
+    Returns:
+        ProyeccionRetiro con los totales por fecha de cada concepto
+
+    Raises:
+        ValueError: Si falta configuración de SMMLV/auxilio para el año de alguna fecha.
+    """
+    m = len(fechas_retiro)
+    totales = {concepto: array("d", bytes(8 * m)) for concepto in CONCEPTOS_PROYECCION}
+    matrices = {concepto: array("d") for concepto in CONCEPTOS_PROYECCION} if conservar_matrices else None
+    snapshot = snapshot_actual()
+    for bloque in proyectar_bloques(roster, fechas_retiro, memoria_maxima, snapshot):
+        _acumular_totales(totales, bloque)
+        if matrices is not None:
+            for concepto in CONCEPTOS_PROYECCION:
+                matrices[concepto].extend(bloque.matrices[concepto])
+    return ProyeccionRetiro(fechas=list(fechas_retiro), totales=totales, matrices=matrices,
+                            version_parametros=snapshot.version)
+
+
+def escribir_matriz_proyeccion(
+    ruta: str,
+    roster: Roster,
+    fechas_retiro: Sequence[datetime.date],
+    concepto: str = "total",
+    memoria_maxima: int = MEMORIA_MAXIMA_BLOQUE
+) -> ProyeccionRetiro:
+    """
+    Escribe la matriz de un concepto en un archivo binario (float64 por filas,
+    orden de bytes nativo) bloque a bloque, sin tenerla completa en memoria.
+
+    Returns:
+        ProyeccionRetiro con los totales por fecha (sin matrices)
+    """
+    if concepto not in CONCEPTOS_PROYECCION:
+        raise ValueError(f"Concepto de proyección desconocido: {concepto}")
+    m = len(fechas_retiro)
+    totales = {nombre: array("d", bytes(8 * m)) for nombre in CONCEPTOS_PROYECCION}
+    snapshot = snapshot_actual()
+    with open(ruta, "wb") as archivo:
+        for bloque in proyectar_bloques(roster, fechas_retiro, memoria_maxima, snapshot):
+            _acumular_totales(totales, bloque)
+            bloque.matrices[concepto].tofile(archivo)
+    return ProyeccionRetiro(fechas=list(fechas_retiro), totales=totales, version_parametros=snapshot.version)
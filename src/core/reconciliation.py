@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/reconciliation.py
+
+Conciliación entre dos corridas de liquidación (por ejemplo antes y después de
+corregir un parámetro o de actualizar la calculadora).
+
+Cada corrida se representa como un flujo de filas (id_empleado, concepto, valor).
+Las dos corridas se cruzan por (empleado, concepto) con un hash join
+particionado: ambos lados se reparten primero en archivos temporales según el
+hash de la llave y luego cada partición se cruza en memoria por separado. Así
+la memoria usada depende del tamaño de una partición y no del total de filas.
+"""
+
+import csv
+import math
+import os
+import shutil
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.core.constants import CONCEPTOS
+from src.core.models import ResultadoCalculo
+
+# (id_empleado, concepto, valor)
+FilaResultado = Tuple[int, str, float]
+
+ESTADO_MODIFICADO = "modificado"
+ESTADO_SOLO_A = "solo_a"
+ESTADO_SOLO_B = "solo_b"
+
+# ==============================================================================
+# Modelos
+# ==============================================================================
+
+@dataclass
+class DiferenciaFila:
+    """Una fila que cambió (o que existe en una sola de las corridas)."""
+    id_empleado: int
+    concepto: str
+    valor_a: Optional[float]
+    valor_b: Optional[float]
+    estado: str
+
+    @property
+    def delta(self) -> float:
+        """Diferencia absoluta (B - A); las filas faltantes cuentan como 0."""
+        return (self.valor_b or 0.0) - (self.valor_a or 0.0)
+
+    @property
+    def delta_relativo(self) -> Optional[float]:
+        """Diferencia relativa respecto a A; None si A no existe o es 0."""
+        if not self.valor_a:
+            return None
+        return self.delta / abs(self.valor_a)
+
+
+@dataclass
+class TotalesConcepto:
+    """Totales de un concepto en ambas corridas."""
+    total_a: float = 0.0
+    total_b: float = 0.0
+    filas_modificadas: int = 0
+
+    @property
+    def delta(self) -> float:
+        return self.total_b - self.total_a
+
+
+@dataclass
+class ResumenReconciliacion:
+    """Resumen agregado de la conciliación."""
+    filas_a: int = 0
+    filas_b: int = 0
+    iguales: int = 0
+    modificadas: int = 0
+    solo_a: int = 0
+    solo_b: int = 0
+    delta_absoluto_maximo: float = 0.0
+    por_concepto: Dict[str, TotalesConcepto] = field(default_factory=dict)
+
+    @property
+    def total_a(self) -> float:
+        return math.fsum(t.total_a for t in self.por_concepto.values())
+
+    @property
+    def total_b(self) -> float:
+        return math.fsum(t.total_b for t in self.por_concepto.values())
+
+    @property
+    def delta_total(self) -> float:
+        return self.total_b - self.total_a
+
+    @property
+    def sin_diferencias(self) -> bool:
+        return self.modificadas == 0 and self.solo_a == 0 and self.solo_b == 0
+
+# ==============================================================================
+# Fuentes de filas
+# ==============================================================================
+
+def filas_desde_liquidacion(id_empleado: int, resultados: Dict[str, ResultadoCalculo]) -> Iterator[FilaResultado]:
+    """Convierte la salida de calcular_liquidacion_completa en filas de conciliación."""
+    for resultado in resultados.values():
+        yield id_empleado, resultado.concepto, resultado.valor
+
+
+def filas_desde_lote(ids_empleado: Sequence[int], resultado) -> Iterator[FilaResultado]:
+    """
+    Convierte un ResultadoLote (src/core/batch.py) en filas de conciliación.
+
+    Args:
+        ids_empleado: Columna id_empleado del roster liquidado
+        resultado: ResultadoLote alineado con ids_empleado
+    """
+    columnas = (
+        (CONCEPTOS["CESANTIAS"], resultado.cesantias),
+        (CONCEPTOS["INTERESES"], resultado.intereses),
+        (CONCEPTOS["PRIMA_S1"], resultado.prima_semestre_1),
+        (CONCEPTOS["PRIMA_S2"], resultado.prima_semestre_2),
+    )
+    for fila, id_empleado in enumerate(ids_empleado):
+        for concepto, valores in columnas:
+            yield id_empleado, concepto, valores[fila]
+
+
+def leer_filas_csv(ruta: str) -> Iterator[FilaResultado]:
+    """Lee una corrida almacenada (CSV con columnas id_empleado, concepto, valor)."""
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        for fila in csv.DictReader(archivo):
+            yield int(fila["id_empleado"]), fila["concepto"], float(fila["valor"])
+
+
+def escribir_filas_csv(ruta: str, filas: Iterable[FilaResultado]) -> int:
+    """Guarda una corrida como CSV para conciliarla más adelante. Retorna las filas escritas."""
+    escritas = 0
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(("id_empleado", "concepto", "valor"))
+        for id_empleado, concepto, valor in filas:
+            escritor.writerow((id_empleado, concepto, repr(float(valor))))
+            escritas += 1
+    return escritas
+
+# ==============================================================================
+# Conciliación
+# ==============================================================================
+
+def _particion(id_empleado: int, concepto: str, n_particiones: int) -> int:
+    return zlib.crc32(f"{id_empleado}\x1f{concepto}".encode("utf-8")) % n_particiones
+
+
+def _particionar(filas: Iterable[FilaResultado], directorio: str, prefijo: str, n_particiones: int) -> int:
+    """Reparte las filas en archivos temporales por hash de la llave. Retorna el total de filas."""
+    archivos = [
+        open(os.path.join(directorio, f"{prefijo}{i}.csv"), "w", newline="", encoding="utf-8")
+        for i in range(n_particiones)
+    ]
+    total = 0
+    try:
+        escritores = [csv.writer(archivo) for archivo in archivos]
+        for id_empleado, concepto, valor in filas:
+            escritores[_particion(id_empleado, concepto, n_particiones)].writerow(
+                (id_empleado, concepto, repr(float(valor)))
+            )
+            total += 1
+    finally:
+        for archivo in archivos:
+            archivo.close()
+    return total
+
+
+def _leer_particion(ruta: str) -> Iterator[FilaResultado]:
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        for id_empleado, concepto, valor in csv.reader(archivo):
+            yield int(id_empleado), concepto, float(valor)
+
+
+def reconciliar(
+    filas_a: Iterable[FilaResultado],
+    filas_b: Iterable[FilaResultado],
+    al_encontrar_diferencia: Optional[Callable[[DiferenciaFila], None]] = None,
+    tolerancia: float = 1e-6,
+    n_particiones: int = 64,
+    directorio_temporal: Optional[str] = None,
+) -> ResumenReconciliacion:
+    """
+    Compara dos corridas de liquidación fila por fila.
+
+    Args:
+        filas_a: Filas de la corrida de referencia (A)
+        filas_b: Filas de la corrida nueva (B)
+        al_encontrar_diferencia: Función llamada con cada DiferenciaFila a medida
+                                 que se encuentra (las diferencias no se acumulan
+                                 en memoria)
+        tolerancia: Diferencia absoluta por debajo de la cual dos valores se
+                    consideran iguales
+        n_particiones: Número de particiones del hash join; a más particiones,
+                       menos memoria por partición
+        directorio_temporal: Dónde crear los archivos de partición
+
+    Returns:
+        ResumenReconciliacion con los conteos y totales por concepto
+
+    Raises:
+        ValueError: Si una corrida trae la misma llave (empleado, concepto) dos veces.
+    """
+    if n_particiones < 1:
+        raise ValueError("El número de particiones debe ser mayor o igual a 1")
+
+    resumen = ResumenReconciliacion()
+    directorio = tempfile.mkdtemp(prefix="conciliacion-", dir=directorio_temporal)
+    try:
+        resumen.filas_a = _particionar(filas_a, directorio, "a", n_particiones)
+        resumen.filas_b = _particionar(filas_b, directorio, "b", n_particiones)
+
+        for i in range(n_particiones):
+            # Construcción: lado A de la partición en un diccionario
+            lado_a: Dict[Tuple[int, str], float] = {}
+            for id_empleado, concepto, valor in _leer_particion(os.path.join(directorio, f"a{i}.csv")):
+                llave = (id_empleado, concepto)
+                if llave in lado_a:
+                    raise ValueError(f"Llave duplicada en la corrida A: empleado {id_empleado}, {concepto}")
+                lado_a[llave] = valor
+                _totales(resumen, concepto).total_a += valor
+
+            # Sondeo: se recorre el lado B contra el diccionario
+            vistos_b = set()
+            for id_empleado, concepto, valor_b in _leer_particion(os.path.join(directorio, f"b{i}.csv")):
+                llave = (id_empleado, concepto)
+                if llave in vistos_b:
+                    raise ValueError(f"Llave duplicada en la corrida B: empleado {id_empleado}, {concepto}")
+                vistos_b.add(llave)
+                _totales(resumen, concepto).total_b += valor_b
+
+                valor_a = lado_a.pop(llave, None)
+                if valor_a is None:
+                    _registrar(resumen, DiferenciaFila(id_empleado, concepto, None, valor_b, ESTADO_SOLO_B), al_encontrar_diferencia)
+                elif abs(valor_b - valor_a) > tolerancia:
+                    _registrar(resumen, DiferenciaFila(id_empleado, concepto, valor_a, valor_b, ESTADO_MODIFICADO), al_encontrar_diferencia)
+                else:
+                    resumen.iguales += 1
+
+            # Lo que queda en A no tiene pareja en B
+            for (id_empleado, concepto), valor_a in sorted(lado_a.items()):
+                _registrar(resumen, DiferenciaFila(id_empleado, concepto, valor_a, None, ESTADO_SOLO_A), al_encontrar_diferencia)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    return resumen
+
+
+def _totales(resumen: ResumenReconciliacion, concepto: str) -> TotalesConcepto:
+    totales = resumen.por_concepto.get(concepto)
+    if totales is None:
+        totales = resumen.por_concepto[concepto] = TotalesConcepto()
+    return totales
+
+
+def _registrar(
+    resumen: ResumenReconciliacion,
+    diferencia: DiferenciaFila,
+    al_encontrar_diferencia: Optional[Callable[[DiferenciaFila], None]],
+) -> None:
+    if diferencia.estado == ESTADO_MODIFICADO:
+        resumen.modificadas += 1
+        _totales(resumen, diferencia.concepto).filas_modificadas += 1
+    elif diferencia.estado == ESTADO_SOLO_A:
+        resumen.solo_a += 1
+    else:
+        resumen.solo_b += 1
+    resumen.delta_absoluto_maximo = max(resumen.delta_absoluto_maximo, abs(diferencia.delta))
+    if al_encontrar_diferencia is not None:
+        al_encontrar_diferencia(diferencia)
+
+
+def reconciliar_a_csv(
+    filas_a: Iterable[FilaResultado],
+    filas_b: Iterable[FilaResultado],
+    ruta_salida: str,
+    **opciones,
+) -> ResumenReconciliacion:
+    """
+    Concilia dos corridas y escribe las filas con diferencias en un CSV.
+
+    Columnas: id_empleado, concepto, valor_a, valor_b, delta, delta_relativo, estado.
+    Acepta las mismas opciones que reconciliar().
+    """
+    with open(ruta_salida, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(("id_empleado", "concepto", "valor_a", "valor_b", "delta", "delta_relativo", "estado"))
+
+        def escribir(diferencia: DiferenciaFila) -> None:
+            escritor.writerow((
+                diferencia.id_empleado,
+                diferencia.concepto,
+                "" if diferencia.valor_a is None else diferencia.valor_a,
+                "" if diferencia.valor_b is None else diferencia.valor_b,
+                diferencia.delta,
+                "" if diferencia.delta_relativo is None else diferencia.delta_relativo,
+                diferencia.estado,
+            ))
+
+        return reconciliar(filas_a, filas_b, al_encontrar_diferencia=escribir, **opciones)
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/result_cache.py
+
+Caché persistente en disco de resultados de liquidación, direccionada por contenido.
+
+Cada entrada se guarda en un archivo cuyo nombre es el SHA-256 de:
+    - el contenido de las entradas (un bloque de columnas del roster, con las
+      de sus ausencias, historiales y anticipos si los hay, o los argumentos
+      de una llamada escalar),
+    - la versión de la instantánea de parámetros (SMMLV y auxilio por año,
+      config/parameter_snapshot.py),
+    - la versión de la calculadora (VERSION_CALCULADORA) y la huella de las
+      reglas de liquidación por tipo de contrato (src/core/batch.py), que
+      cambia al registrar una regla.
+
+Si cambia cualquiera de ellas, cambia la clave y el resultado se vuelve a
+calcular; nunca se sirve un resultado viejo. Los argumentos de las llamadas
+escalares se normalizan con la firma de la función, así que pasarlos por
+posición o por nombre, u omitir los que tienen valor por defecto, da la misma
+clave. Las escrituras son atómicas
+(archivo temporal + os.replace), de modo que varios procesos pueden compartir
+el mismo directorio: en el peor caso dos procesos calculan la misma entrada y
+uno reemplaza el archivo del otro con el mismo contenido. El tamaño total se
+acota desalojando las entradas usadas hace más tiempo (LRU según la fecha de
+modificación, que se actualiza en cada acierto).
+"""
+
+import datetime
+import hashlib
+import inspect
+import json
+import os
+import struct
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.parameter_snapshot import SnapshotParametros, snapshot_actual
+from src.core import calculator
+from src.core.advances import LibrosAnticiposLote
+from src.core.batch import ResultadoLote, calcular_liquidacion_lote, version_reglas
+from src.core.constants import VERSION_CALCULADORA
+from src.core.intervals import IndiceIntervalosLote
+from src.core.models import ResultadoCalculo
+from src.core.salary_history import HistorialesSalarialesLote, HistorialSalarial
+
+# Tamaño máximo por defecto del directorio de caché
+TAMANO_MAXIMO_CACHE = 512 * 1024 * 1024
+# Al superar el máximo se desaloja hasta quedar en esta fracción
+FRACCION_TRAS_DESALOJO = 0.9
+# Filas del roster por entrada de la caché por lotes
+TAMANO_BLOQUE_CACHE = 8192
+
+_SUFIJO_TEMPORAL = ".tmp"
+
+
+def version_parametros() -> str:
+    """Versión y huella de la instantánea vigente de parámetros (SMMLV y auxilio por año)."""
+    return snapshot_actual().identificador
+
+
+class CacheResultados:
+    """
+    Caché de resultados en un directorio (compartible entre procesos y corridas).
+
+    Args:
+        directorio: Carpeta de la caché (se crea si no existe)
+        tamano_maximo: Bytes máximos que puede ocupar la caché
+    """
+
+    def __init__(self, directorio: str, tamano_maximo: int = TAMANO_MAXIMO_CACHE):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+        self._tamano_estimado = sum(tamano for _, _, tamano in self._entradas())
+
+    # --- Claves ---
+    def clave(self, *partes: bytes, snapshot: Optional[SnapshotParametros] = None) -> str:
+        """
+        Clave SHA-256 de las partes más las versiones de parámetros (de snapshot,
+        por defecto la vigente), calculadora y reglas.
+        """
+        h = hashlib.sha256()
+        h.update(VERSION_CALCULADORA.encode("utf-8"))
+        h.update(b"\x00")
+        h.update((snapshot.identificador if snapshot is not None else version_parametros()).encode("utf-8"))
+        h.update(b"\x00")
+        h.update(version_reglas().encode("utf-8"))
+        for parte in partes:
+            h.update(struct.pack("<Q", len(parte)))
+            h.update(parte)
+        return h.hexdigest()
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], clave)
+
+    # --- Lectura / escritura ---
+    def obtener(self, clave: str) -> Optional[bytes]:
+        """Contenido de la entrada, o None si no existe (o fue desalojada)."""
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+            os.utime(ruta)  # Marca la entrada como usada recientemente (LRU)
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return datos
+
+    def guardar(self, clave: str, datos: bytes) -> None:
+        """Guarda una entrada de forma atómica y desaloja si se supera el tamaño máximo."""
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        ruta_temporal = f"{ruta}.{os.getpid()}{_SUFIJO_TEMPORAL}"
+        with open(ruta_temporal, "wb") as archivo:
+            archivo.write(datos)
+        os.replace(ruta_temporal, ruta)
+        self._tamano_estimado += len(datos)
+        if self._tamano_estimado > self.tamano_maximo:
+            self.desalojar()
+
+    def _entradas(self) -> Iterable[Tuple[str, float, int]]:
+        """(ruta, fecha de último uso, tamaño) de cada entrada."""
+        for subdirectorio in os.scandir(self.directorio):
+            if not subdirectorio.is_dir():
+                continue
+            for entrada in os.scandir(subdirectorio.path):
+                if entrada.name.endswith(_SUFIJO_TEMPORAL):
+                    continue
+                try:
+                    estado = entrada.stat()
+                except FileNotFoundError:  # Desalojada por otro proceso
+                    continue
+                yield entrada.path, estado.st_mtime, estado.st_size
+
+    def desalojar(self) -> int:
+        """
+        Elimina las entradas menos usadas hasta quedar por debajo del tamaño
+        objetivo. Retorna el número de entradas eliminadas.
+        """
+        entradas = sorted(self._entradas(), key=lambda entrada: entrada[1])
+        total = sum(tamano for _, _, tamano in entradas)
+        objetivo = self.tamano_maximo * FRACCION_TRAS_DESALOJO
+        eliminadas = 0
+        for ruta, _, tamano in entradas:
+            if total <= objetivo:
+                break
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+            total -= tamano
+            eliminadas += 1
+        self._tamano_estimado = total
+        return eliminadas
+
+    def limpiar(self) -> None:
+        """Elimina todas las entradas."""
+        for ruta, _, _ in list(self._entradas()):
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+        self._tamano_estimado = 0
+
+    # --- Liquidación por lotes ---
+    def calcular_liquidacion_lote(
+        self,
+        salarios: Sequence[float],
+        serial_inicio: Sequence[int],
+        serial_fin: Sequence[int],
+        ausencias: Optional[IndiceIntervalosLote] = None,
+        historiales: Optional[HistorialesSalarialesLote] = None,
+        tipos_contrato: Optional[Sequence[int]] = None,
+        banderas: Optional[Sequence[int]] = None,
+        anticipos: Optional[LibrosAnticiposLote] = None,
+        *,
+        tamano_bloque: int = TAMANO_BLOQUE_CACHE
+    ) -> ResultadoLote:
+        """
+        Igual que src.core.batch.calcular_liquidacion_lote (mismos argumentos),
+        pero cada bloque de tamano_bloque filas se busca primero en la caché y
+        solo se calcula si no está.
+
+        Las ausencias, historiales y anticipos no se pueden partir por filas:
+        si se indica alguno, todo el lote es una sola entrada cuya clave
+        incluye sus columnas.
+        """
+        n = len(salarios)
+        por_reglas = tipos_contrato is not None or banderas is not None
+        if por_reglas:
+            tipos_contrato = tipos_contrato if tipos_contrato is not None else bytes(n)
+            banderas = banderas if banderas is not None else bytes(n)
+        extras = {"ausencias": ausencias, "historiales": historiales, "anticipos": anticipos}
+        extras = {nombre: valor for nombre, valor in extras.items() if valor is not None}
+        if extras:
+            tamano_bloque = max(n, 1)
+        partes: List[ResultadoLote] = []
+        for inicio in range(0, n, tamano_bloque):
+            fin = min(n, inicio + tamano_bloque)
+            columnas = (
+                array("d", salarios[inicio:fin]),
+                array("i", serial_inicio[inicio:fin]),
+                array("i", serial_fin[inicio:fin]),
+            )
+            if por_reglas:
+                columnas += (array("B", tipos_contrato[inicio:fin]), array("B", banderas[inicio:fin]))
+            contenido = [columna.tobytes() for columna in columnas]
+            for nombre, valor in extras.items():
+                contenido += _partes_estructura(nombre, valor)
+            # Una sola instantánea por bloque: la de la clave es la de la versión registrada
+            snapshot = snapshot_actual()
+            clave = self.clave(b"lote+" if extras else b"lote", *contenido, snapshot=snapshot)
+            datos = self.obtener(clave)
+            if datos is None:
+                resultado = calcular_liquidacion_lote(
+                    *columnas[:3], tipos_contrato=columnas[3] if por_reglas else None,
+                    banderas=columnas[4] if por_reglas else None, **extras,
+                )
+                # Si la instantánea cambió durante el cálculo, el resultado no corresponde a la clave
+                if snapshot_actual() is snapshot:
+                    self.guardar(clave, _codificar_lote(resultado))
+            else:
+                resultado = _decodificar_lote(datos)
+                resultado.version_parametros = snapshot.version
+            partes.append(resultado)
+        return _concatenar_lotes(partes)
+
+    # --- Funciones escalares ---
+    def calcular_liquidacion_completa(self, *args, **kwargs) -> Dict[str, ResultadoCalculo]:
+        """calculator.calcular_liquidacion_completa con caché (mismos argumentos)."""
+        return self._llamar(calculator.calcular_liquidacion_completa, args, kwargs,
+                            _codificar_resultados, _decodificar_resultados)
+
+    def calcular_prima_servicios(self, *args, **kwargs) -> Dict[str, float]:
+        """calculator.calcular_prima_servicios con caché (mismos argumentos)."""
+        return self._llamar(calculator.calcular_prima_servicios, args, kwargs,
+                            lambda valor: json.dumps(valor).encode("utf-8"),
+                            lambda datos: json.loads(datos.decode("utf-8")))
+
+    def _llamar(self, funcion: Callable, args: tuple, kwargs: dict,
+                codificar: Callable[[Any], bytes], decodificar: Callable[[bytes], Any]) -> Any:
+        try:
+            argumentos = inspect.signature(funcion).bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            contenido = json.dumps(_canonico(list(argumentos.arguments.items())))
+        except TypeError:
+            # Argumentos inválidos (la llamada reporta el error) o sin
+            # representación canónica: se calcula sin caché
+            return funcion(*args, **kwargs)
+        clave = self.clave(funcion.__name__.encode("utf-8"), contenido.encode("utf-8"))
+        datos = self.obtener(clave)
+        if datos is not None:
+            return decodificar(datos)
+        valor = funcion(*args, **kwargs)
+        self.guardar(clave, codificar(valor))
+        return valor
+
+# ==============================================================================
+# Serialización
+# ==============================================================================
+
+def _canonico(valor: Any) -> Any:
+    """Representación JSON estable de un argumento (TypeError si no la tiene)."""
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, datetime.date):
+        return {"fecha": valor.isoformat()}
+    if isinstance(valor, (list, tuple)):
+        return [_canonico(elemento) for elemento in valor]
+    if isinstance(valor, HistorialSalarial):
+        return {"historial": [valor.mes_inicial, list(valor.salarios)]}
+    raise TypeError(f"Argumento sin representación canónica para la caché: {type(valor).__name__}")
+
+
+def _partes_estructura(nombre: str, valor: Any) -> List[bytes]:
+    """Partes de clave de una estructura por lotes (ausencias, historiales, anticipos): sus columnas."""
+    partes = [nombre.encode("ascii")]
+    for atributo, columna in sorted(vars(valor).items()):
+        partes.append(f"{atributo}:{columna.typecode}".encode("ascii"))
+        partes.append(columna.tobytes())
+    return partes
+
+
+def _codificar_resultados(resultados: Dict[str, ResultadoCalculo]) -> bytes:
+    return json.dumps({
+        nombre: {
+            "concepto": resultado.concepto,
+            "valor": resultado.valor,
+            "dias_calculados": resultado.dias_calculados,
+            "fecha_inicio": resultado.fecha_inicio.isoformat(),
+            "fecha_fin": resultado.fecha_fin.isoformat(),
+            "detalles": resultado.detalles,
+            "version_parametros": resultado.version_parametros,
+        }
+        for nombre, resultado in resultados.items()
+    }).encode("utf-8")
+
+
+def _decodificar_resultados(datos: bytes) -> Dict[str, ResultadoCalculo]:
+    resultados = {}
+    for nombre, campos in json.loads(datos.decode("utf-8")).items():
+        campos["fecha_inicio"] = datetime.date.fromisoformat(campos["fecha_inicio"])
+        campos["fecha_fin"] = datetime.date.fromisoformat(campos["fecha_fin"])
+        resultados[nombre] = ResultadoCalculo(**campos)
+    return resultados
+
+
+# Columnas de ResultadoLote en el orden serializado
+_COLUMNAS_LOTE: Tuple[Tuple[str, str], ...] = (
+    ("dias", "i"),
+    ("cesantias", "d"),
+    ("intereses", "d"),
+    ("prima_semestre_1", "d"),
+    ("prima_semestre_2", "d"),
+    ("dias_semestre_1", "i"),
+    ("dias_semestre_2", "i"),
+)
+
+
+def _codificar_lote(resultado: ResultadoLote) -> bytes:
+    partes = [struct.pack("<Q", len(resultado))]
+    for nombre, codigo in _COLUMNAS_LOTE:
+        partes.append(array(codigo, getattr(resultado, nombre)).tobytes())
+    return b"".join(partes)
+
+
+def _decodificar_lote(datos: bytes) -> ResultadoLote:
+    (n,) = struct.unpack_from("<Q", datos, 0)
+    posicion = 8
+    columnas = {}
+    for nombre, codigo in _COLUMNAS_LOTE:
+        columna = array(codigo)
+        ancho = columna.itemsize * n
+        columna.frombytes(datos[posicion:posicion + ancho])
+        columnas[nombre] = columna
+        posicion += ancho
+    return ResultadoLote(**columnas)
+
+
+def _concatenar_lotes(partes: Sequence[ResultadoLote]) -> ResultadoLote:
+    columnas = {nombre: array(codigo) for nombre, codigo in _COLUMNAS_LOTE}
+    for parte in partes:
+        for nombre, _ in _COLUMNAS_LOTE:
+            columnas[nombre].extend(getattr(parte, nombre))
+    versiones = {parte.version_parametros for parte in partes}
+    return ResultadoLote(**columnas, version_parametros=versiones.pop() if len(versiones) == 1 else None)
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/roster.py
+
+Roster (nómina) por columnas y su formato binario de registros de ancho fijo.
+
+El archivo binario se escribe una vez (por ejemplo a partir del CSV de nómina)
+y se abre en ejecuciones posteriores con mmap: cada columna queda expuesta como
+una vista memoryview de solo lectura sobre el archivo, sin copiar ni parsear
+datos. Varios procesos que abren el mismo archivo comparten las páginas en el
+caché del sistema operativo.
+
+Formato (little-endian):
+    Encabezado:  magic (8s) | versión (H) | número de columnas (H) | registros (Q)
+    Descriptor por columna: nombre (16s) | typecode (1s) | relleno (7x) | offset (Q)
+    Datos: un bloque contiguo por columna, alineado a ALINEACION_BLOQUE bytes.
+
+Cada registro ocupa el mismo ancho (la suma de los anchos de sus columnas); los
+campos se guardan agrupados por columna para que cada una sea una vista
+contigua compatible con las funciones de src/core/batch.py (y con
+numpy.frombuffer si se quisiera usar NumPy).
+"""
+
+import csv
+import datetime
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+
+from src.core.constants import CODIGOS_TIPO_CONTRATO
+from src.utils.date_helpers import fecha_a_serial_360, serial_360_a_fecha
+
+# --- Esquema del roster ---
+# (nombre de columna, typecode de array/memoryview)
+COLUMNAS_ROSTER: Tuple[Tuple[str, str], ...] = (
+    ("id_empleado", "q"),
+    ("salario", "d"),
+    ("serial_inicio", "i"),
+    ("serial_fin", "i"),
+    ("tipo_contrato", "B"),
+    ("banderas", "B"),
+    ("centro_costo", "I"),
+    # Fechas reales (date.toordinal()); los seriales 30/360 pierden el día 31
+    ("ordinal_inicio", "i"),
+    ("ordinal_fin", "i"),
+)
+
+MAGIC_ROSTER = b"LIQROST\x00"
+# Se incrementa con cada cambio de COLUMNAS_ROSTER:
+#   1: id_empleado .. banderas (algunos archivos 1 ya traen centro_costo)
+#   2: + centro_costo, ordinal_inicio, ordinal_fin
+VERSION_FORMATO_ROSTER = 2
+ALINEACION_BLOQUE = 64
+
+_ENCABEZADO = struct.Struct("<8sHHQ")
+_DESCRIPTOR = struct.Struct("<16ss7xQ")
+_ES_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Columnas de fechas reales que se reconstruyen desde los seriales en archivos anteriores
+_SERIAL_DE_ORDINAL = {"ordinal_inicio": "serial_inicio", "ordinal_fin": "serial_fin"}
+
+
+class Roster:
+    """
+    Nómina organizada por columnas (una secuencia por campo, misma longitud).
+
+    Las columnas son array.array cuando el roster se construye en memoria, o
+    vistas memoryview de solo lectura cuando se abre un archivo binario con
+    abrir_roster_binario. En este último caso se debe llamar a cerrar() (o usar
+    el roster como context manager) para liberar el mapeo.
+    """
+
+    def __init__(self, columnas: Mapping[str, Sequence], _mapeo: Optional[mmap.mmap] = None):
+        largos = {len(columna) for columna in columnas.values()}
+        if len(largos) > 1:
+            raise ValueError("Todas las columnas del roster deben tener el mismo número de filas.")
+        self.columnas: Dict[str, Sequence] = dict(columnas)
+        self._mapeo = _mapeo
+
+    def __len__(self) -> int:
+        for columna in self.columnas.values():
+            return len(columna)
+        return 0
+
+    def __getitem__(self, nombre: str) -> Sequence:
+        return self.columnas[nombre]
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self.columnas
+
+    def __enter__(self) -> "Roster":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        """Libera las vistas y el mapeo de memoria (si el roster proviene de un archivo)."""
+        if self._mapeo is None:
+            return
+        for columna in self.columnas.values():
+            if isinstance(columna, memoryview):
+                columna.release()
+        self.columnas = {}
+        self._mapeo.close()
+        self._mapeo = None
+
+    @classmethod
+    def vacio(cls) -> "Roster":
+        """Crea un roster sin filas con todas las columnas del esquema."""
+        return cls({nombre: array(codigo) for nombre, codigo in COLUMNAS_ROSTER})
+
+    @classmethod
+    def desde_registros(cls, registros: Iterable[Mapping[str, Any]]) -> "Roster":
+        """
+        Construye un roster a partir de registros tipo diccionario.
+
+        Cada registro debe traer id_empleado, salario, fecha_inicio y fecha_fin
+        (datetime.date); tipo_contrato (clave de TIPOS_CONTRATO), banderas y
+        centro_costo son opcionales.
+        """
+        roster = cls.vacio()
+        for registro in registros:
+            roster.agregar(**registro)
+        return roster
+
+    def agregar(
+        self,
+        id_empleado: int,
+        salario: float,
+        fecha_inicio: datetime.date,
+        fecha_fin: datetime.date,
+        tipo_contrato: str = "INDEFINIDO",
+        banderas: int = 0,
+        centro_costo: int = 0,
+    ) -> None:
+        """Agrega un empleado al final de un roster en memoria."""
+        if tipo_contrato not in CODIGOS_TIPO_CONTRATO:
+            raise ValueError(f"Tipo de contrato desconocido: {tipo_contrato}")
+        fila = {
+            "id_empleado": int(id_empleado),
+            "salario": float(salario),
+            "serial_inicio": fecha_a_serial_360(fecha_inicio),
+            "serial_fin": fecha_a_serial_360(fecha_fin),
+            "tipo_contrato": CODIGOS_TIPO_CONTRATO.index(tipo_contrato),
+            "banderas": int(banderas),
+            "centro_costo": int(centro_costo),
+            "ordinal_inicio": fecha_inicio.toordinal(),
+            "ordinal_fin": fecha_fin.toordinal(),
+        }
+        for nombre, _ in COLUMNAS_ROSTER:
+            self.columnas[nombre].append(fila[nombre])
+
+# ==============================================================================
+# Lectura de CSV
+# ==============================================================================
+
+def leer_roster_csv(ruta: str) -> Roster:
+    """
+    Lee un roster desde un CSV con encabezado.
+
+    Columnas esperadas: id_empleado, salario, fecha_inicio, fecha_fin (YYYY-MM-DD)
+    y, opcionalmente, tipo_contrato (clave de TIPOS_CONTRATO), banderas (entero) y
+    centro_costo (código entero).
+
+    Raises:
+        ValueError: Si una fila tiene datos inválidos (indica el número de línea).
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return Roster.desde_registros(_registros_csv(csv.DictReader(archivo)))
+
+
+def registro_roster(fila: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Convierte una fila con los campos del CSV de roster (texto, o valores ya
+    tipados como en JSON) en los argumentos de Roster.agregar.
+
+    Raises:
+        ValueError: Si falta un campo obligatorio, un valor es inválido o la
+                    fecha de fin es anterior a la de inicio.
+    """
+    try:
+        registro = {
+            "id_empleado": int(fila["id_empleado"]),
+            "salario": float(fila["salario"]),
+            "fecha_inicio": datetime.date.fromisoformat(fila["fecha_inicio"].strip()),
+            "fecha_fin": datetime.date.fromisoformat(fila["fecha_fin"].strip()),
+            "tipo_contrato": (fila.get("tipo_contrato") or "INDEFINIDO").strip(),
+            "banderas": int(fila.get("banderas") or 0),
+            "centro_costo": int(fila.get("centro_costo") or 0),
+        }
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        raise ValueError(f"fila de roster inválida ({e})")
+    if registro["fecha_fin"] < registro["fecha_inicio"]:
+        raise ValueError("fila de roster inválida (la fecha de fin es anterior a la de inicio)")
+    return registro
+
+
+def _registros_csv(lector: csv.DictReader) -> Iterator[Dict[str, Any]]:
+    for fila in lector:
+        try:
+            yield registro_roster(fila)
+        except ValueError as e:
+            raise ValueError(f"Línea {lector.line_num}: {e}")
+
+# ==============================================================================
+# Formato binario
+# ==============================================================================
+
+def _alinear(posicion: int) -> int:
+    return -(-posicion // ALINEACION_BLOQUE) * ALINEACION_BLOQUE
+
+
+def _descriptores(n: int) -> Iterator[Tuple[str, str, int]]:
+    """(nombre, typecode, offset) de cada columna para un roster de n filas."""
+    posicion = _ENCABEZADO.size + _DESCRIPTOR.size * len(COLUMNAS_ROSTER)
+    for nombre, codigo in COLUMNAS_ROSTER:
+        posicion = _alinear(posicion)
+        yield nombre, codigo, posicion
+        posicion += n * struct.calcsize("<" + codigo)
+
+
+def escribir_roster_binario(ruta: str, roster: Roster) -> None:
+    """
+    Escribe el roster en formato binario.
+
+    El archivo se escribe primero en una ruta temporal y luego se reemplaza de
+    forma atómica, para que ningún proceso lea un archivo a medio escribir.
+    """
+    escribir_roster_binario_por_bloques(ruta, len(roster), [roster])
+
+
+def escribir_roster_binario_por_bloques(ruta: str, n: int, bloques: Iterable[Roster]) -> None:
+    """
+    Escribe en formato binario un roster de n filas que llega por bloques
+    consecutivos, sin tenerlo completo en memoria. Cada bloque se escribe
+    directamente en la posición de cada columna.
+
+    Raises:
+        ValueError: Si los bloques no suman exactamente n filas.
+    """
+    descriptores = list(_descriptores(n))
+    ruta_temporal = f"{ruta}.tmp-{os.getpid()}"
+    try:
+        with open(ruta_temporal, "wb") as archivo:
+            archivo.write(_ENCABEZADO.pack(MAGIC_ROSTER, VERSION_FORMATO_ROSTER, len(COLUMNAS_ROSTER), n))
+            for nombre, codigo, offset in descriptores:
+                archivo.write(_DESCRIPTOR.pack(nombre.encode("ascii"), codigo.encode("ascii"), offset))
+            escritas = 0
+            for bloque in bloques:
+                filas = len(bloque)
+                if escritas + filas > n:
+                    raise ValueError(f"Los bloques del roster superan las {n} filas declaradas.")
+                for nombre, codigo, offset in descriptores:
+                    datos = array(codigo, bloque[nombre])
+                    if not _ES_LITTLE_ENDIAN:
+                        datos.byteswap()
+                    archivo.seek(offset + escritas * datos.itemsize)
+                    datos.tofile(archivo)
+                escritas += filas
+            if escritas != n:
+                raise ValueError(f"Los bloques del roster suman {escritas} filas; se esperaban {n}.")
+            # Extiende el archivo hasta el final de la última columna (aun si está vacía)
+            nombre, codigo, offset = descriptores[-1]
+            archivo.truncate(offset + n * struct.calcsize("<" + codigo))
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+
+def abrir_roster_binario(ruta: str) -> Roster:
+    """
+    Abre un roster binario mapeándolo en memoria (sin copiar los datos).
+
+    Los archivos de versiones anteriores no traen todas las columnas:
+    ordinal_inicio y ordinal_fin se reconstruyen desde los seriales 30/360 (un
+    día 31 queda como 30) y las demás (centro_costo) se llenan con ceros, en
+    arrays en memoria.
+
+    Returns:
+        Roster cuyas columnas son vistas memoryview de solo lectura.
+
+    Raises:
+        ValueError: Si el archivo no es un roster válido o su versión no es compatible.
+    """
+    with open(ruta, "rb") as archivo:
+        mapeo = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, n_columnas, n = _ENCABEZADO.unpack_from(mapeo, 0)
+        if magic != MAGIC_ROSTER:
+            raise ValueError(f"{ruta} no es un archivo de roster binario.")
+        if version > VERSION_FORMATO_ROSTER:
+            raise ValueError(f"Versión de roster no soportada: {version}")
+
+        vista = memoryview(mapeo)
+        columnas = {}
+        for i in range(n_columnas):
+            nombre, codigo, offset = _DESCRIPTOR.unpack_from(mapeo, _ENCABEZADO.size + i * _DESCRIPTOR.size)
+            nombre = nombre.rstrip(b"\x00").decode("ascii")
+            codigo = codigo.decode("ascii")
+            ancho = struct.calcsize("<" + codigo)
+            bloque = vista[offset:offset + n * ancho]
+            if _ES_LITTLE_ENDIAN:
+                columnas[nombre] = bloque.cast(codigo)
+            else:
+                # Sin vista directa posible: se copia y se invierte el orden de bytes
+                datos = array(codigo, bytes(bloque))
+                datos.byteswap()
+                columnas[nombre] = datos
+                bloque.release()
+        vista.release()
+        faltantes = [(nombre, codigo) for nombre, codigo in COLUMNAS_ROSTER if nombre not in columnas]
+        if faltantes and version == VERSION_FORMATO_ROSTER:
+            raise ValueError(f"{ruta}: faltan columnas del roster: {', '.join(nombre for nombre, _ in faltantes)}")
+        for nombre, codigo in faltantes:
+            serial = _SERIAL_DE_ORDINAL.get(nombre)
+            if serial is not None:
+                columnas[nombre] = array(codigo, (serial_360_a_fecha(s).toordinal() for s in columnas[serial]))
+            else:
+                columnas[nombre] = array(codigo, bytes(n * struct.calcsize(codigo)))
+    except Exception:
+        mapeo.close()
+        raise
+    return Roster(columnas, _mapeo=mapeo)
+
+
+def convertir_csv_a_binario(ruta_csv: str, ruta_binario: str) -> int:
+    """
+    Convierte un roster CSV al formato binario.
+
+    Returns:
+        Número de empleados escritos.
+    """
+    roster = leer_roster_csv(ruta_csv)
+    escribir_roster_binario(ruta_binario, roster)
+    return len(roster)
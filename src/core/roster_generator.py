@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/roster_generator.py
+
+Generador determinista de rosters sintéticos para pruebas de carga y de escala.
+
+Los rosters imitan una nómina real:
+    - salarios agrupados alrededor del SMMLV del año (parámetros vigentes),
+      muchos cerca del tope de 2 SMMLV del auxilio de transporte y una cola de
+      salarios altos (algunos con salario integral);
+    - fechas de inicio repartidas en los años con parámetros;
+    - fechas de fin concentradas en los cierres de semestre (30 de junio y 31 de
+      diciembre) y en días 31;
+    - mezcla de tipos de contrato (TIPOS_CONTRATO), aprendices y centros de costo.
+
+La salida depende solo de la semilla y del número de filas: las filas se
+generan en bloques de TAMANO_BLOQUE_GENERADOR, cada uno con su propio
+random.Random sembrado con (semilla, número de bloque), y solo se usan
+operaciones de resultado exacto en IEEE 754 (enteros, random() y raíz
+cuadrada), de modo que el mismo roster sale idéntico en cualquier máquina.
+
+Uso desde la línea de comandos:
+    python -m src.core.roster_generator 1000000 roster.bin --semilla 42
+"""
+
+import argparse
+import calendar
+import datetime
+import os
+import random
+from array import array
+from typing import Iterator, Mapping, Optional, Tuple
+
+from config.parameter_snapshot import snapshot_actual
+from src.core.constants import BANDERA_APRENDIZ, BANDERA_SALARIO_INTEGRAL, CODIGOS_TIPO_CONTRATO
+from src.core.roster import COLUMNAS_ROSTER, Roster, escribir_roster_binario_por_bloques
+
+# Filas por bloque de generación (cambiarlo cambia los rosters generados)
+TAMANO_BLOQUE_GENERADOR = 65536
+
+FORMATOS_ROSTER_SINTETICO: Tuple[str, ...] = ("csv", "jsonl", "bin")
+
+# Pesos acumulados de cada tipo de contrato (en el orden de CODIGOS_TIPO_CONTRATO)
+PESOS_TIPO_CONTRATO: Tuple[int, ...] = (55, 80, 90, 100)  # INDEFINIDO, FIJO, OBRA_LABOR, SERVICIOS
+
+PROBABILIDAD_APRENDIZ = 0.02
+PROBABILIDAD_FIN_SEMESTRE = 0.40
+PROBABILIDAD_FIN_DIA_31 = 0.15
+CENTROS_COSTO = 50
+
+# Salario integral: mínimo 13 SMMLV (10 de salario + 30% de factor prestacional)
+SMMLV_SALARIO_INTEGRAL = 13
+
+_MESES_31 = (1, 3, 5, 7, 8, 10, 12)
+
+
+def _salario(rng: random.Random, smmlv: int) -> Tuple[float, bool]:
+    """Salario mensual y si puede pactarse como salario integral."""
+    u = rng.random()
+    if u < 0.35:
+        salario = smmlv
+    elif u < 0.60:
+        # Alrededor del tope de 2 SMMLV del auxilio de transporte
+        salario = smmlv * (1.9 + 0.2 * rng.random())
+    elif u < 0.90:
+        salario = smmlv * rng.triangular(1.0, 5.0, 1.5)
+    else:
+        salario = smmlv * rng.triangular(5.0, 25.0, 8.0)
+    salario = float(round(salario))
+    return salario, salario >= SMMLV_SALARIO_INTEGRAL * smmlv
+
+
+def _fecha_fin(rng: random.Random, anio: int) -> Tuple[int, int]:
+    """(mes, día) de la fecha de fin dentro del año."""
+    u = rng.random()
+    if u < PROBABILIDAD_FIN_SEMESTRE:
+        return (6, 30) if rng.random() < 0.5 else (12, 31)
+    if u < PROBABILIDAD_FIN_SEMESTRE + PROBABILIDAD_FIN_DIA_31:
+        return _MESES_31[rng.randrange(len(_MESES_31))], 31
+    mes = rng.randrange(1, 13)
+    return mes, rng.randrange(1, calendar.monthrange(anio, mes)[1] + 1)
+
+
+def _serial_360(anio: int, mes: int, dia: int) -> int:
+    # Igual que src.utils.date_helpers.fecha_a_serial_360, sin construir el date
+    return anio * 360 + (mes - 1) * 30 + min(dia, 30) - 1
+
+
+def _generar_bloque(semilla: int, bloque: int, inicio: int, fin: int,
+                    anios: Tuple[int, int], salarios_minimos: Mapping[int, int]) -> Tuple[Roster, list]:
+    """
+    Genera las filas [inicio, fin) del roster.
+
+    Returns:
+        (Roster del bloque, lista de pares (fecha_inicio, fecha_fin) en texto ISO)
+    """
+    rng = random.Random(f"{semilla}:{bloque}")
+    anio_minimo, anio_maximo = anios
+    columnas = {nombre: array(codigo) for nombre, codigo in COLUMNAS_ROSTER}
+    fechas = []
+    for id_empleado in range(inicio + 1, fin + 1):
+        anio_inicio = rng.randrange(anio_minimo, anio_maximo + 1)
+        mes_inicio = rng.randrange(1, 13)
+        dia_inicio = rng.randrange(1, calendar.monthrange(anio_inicio, mes_inicio)[1] + 1)
+        anio_fin = rng.randrange(anio_inicio, anio_maximo + 1)
+        mes_fin, dia_fin = _fecha_fin(rng, anio_fin)
+        if (anio_fin, mes_fin, dia_fin) < (anio_inicio, mes_inicio, dia_inicio):
+            mes_fin, dia_fin = 12, 31
+
+        smmlv = salarios_minimos[anio_fin]
+        tipo = 0
+        marca = rng.randrange(PESOS_TIPO_CONTRATO[-1])
+        while marca >= PESOS_TIPO_CONTRATO[tipo]:
+            tipo += 1
+        banderas = 0
+        if tipo != CODIGOS_TIPO_CONTRATO.index("SERVICIOS") and rng.random() < PROBABILIDAD_APRENDIZ:
+            salario, banderas = float(smmlv), BANDERA_APRENDIZ
+        else:
+            salario, integral = _salario(rng, smmlv)
+            if integral and rng.random() < 0.5:
+                banderas = BANDERA_SALARIO_INTEGRAL
+
+        columnas["id_empleado"].append(id_empleado)
+        columnas["salario"].append(salario)
+        columnas["serial_inicio"].append(_serial_360(anio_inicio, mes_inicio, dia_inicio))
+        columnas["serial_fin"].append(_serial_360(anio_fin, mes_fin, dia_fin))
+        columnas["tipo_contrato"].append(tipo)
+        columnas["banderas"].append(banderas)
+        columnas["centro_costo"].append(rng.randrange(1, CENTROS_COSTO + 1))
+        columnas["ordinal_inicio"].append(datetime.date(anio_inicio, mes_inicio, dia_inicio).toordinal())
+        columnas["ordinal_fin"].append(datetime.date(anio_fin, mes_fin, dia_fin).toordinal())
+        fechas.append((
+            f"{anio_inicio:04d}-{mes_inicio:02d}-{dia_inicio:02d}",
+            f"{anio_fin:04d}-{mes_fin:02d}-{dia_fin:02d}",
+        ))
+    return Roster(columnas), fechas
+
+
+def _anios_disponibles(salarios_minimos: Mapping[int, int]) -> Tuple[int, int]:
+    anios = sorted(salarios_minimos)
+    if not anios:
+        raise ValueError("No hay salarios mínimos configurados para generar rosters.")
+    return anios[0], anios[-1]
+
+
+def generar_bloques(n: int, semilla: int = 0) -> Iterator[Tuple[Roster, list]]:
+    """
+    Genera un roster sintético de n filas por bloques.
+
+    Yields:
+        (Roster del bloque, fechas de inicio y fin en texto ISO por fila)
+    """
+    if n < 0:
+        raise ValueError("El número de filas no puede ser negativo.")
+    salarios_minimos = snapshot_actual().salarios_minimos
+    anios = _anios_disponibles(salarios_minimos)
+    for bloque, inicio in enumerate(range(0, n, TAMANO_BLOQUE_GENERADOR)):
+        yield _generar_bloque(semilla, bloque, inicio, min(n, inicio + TAMANO_BLOQUE_GENERADOR), anios, salarios_minimos)
+
+
+def generar_roster(n: int, semilla: int = 0) -> Roster:
+    """Roster sintético de n filas en memoria (para rosters que caben en RAM)."""
+    roster = Roster.vacio()
+    for bloque, _ in generar_bloques(n, semilla):
+        for nombre, _ in COLUMNAS_ROSTER:
+            roster.columnas[nombre].extend(bloque[nombre])
+    return roster
+
+
+def _lineas_texto(bloque: Roster, fechas: list, formato: str) -> str:
+    columnas = [bloque[nombre] for nombre, _ in COLUMNAS_ROSTER]
+    lineas = []
+    for (id_empleado, salario, _, _, tipo, banderas, centro, _, _), (inicio, fin) in zip(zip(*columnas), fechas):
+        if formato == "csv":
+            lineas.append(
+                f"{id_empleado},{salario:.0f},{inicio},{fin},{CODIGOS_TIPO_CONTRATO[tipo]},{banderas},{centro}\n"
+            )
+        else:
+            lineas.append(
+                f'{{"id_empleado": {id_empleado}, "salario": {salario:.0f}, "fecha_inicio": "{inicio}", '
+                f'"fecha_fin": "{fin}", "tipo_contrato": "{CODIGOS_TIPO_CONTRATO[tipo]}", '
+                f'"banderas": {banderas}, "centro_costo": {centro}}}\n'
+            )
+    return "".join(lineas)
+
+
+def escribir_roster_sintetico(ruta: str, n: int, semilla: int = 0, formato: Optional[str] = None) -> int:
+    """
+    Genera un roster sintético y lo escribe en disco sin tenerlo completo en memoria.
+
+    Args:
+        ruta: Archivo de salida
+        n: Número de empleados
+        semilla: Semilla del generador (mismo valor y n -> mismo archivo)
+        formato: "csv" (legible por leer_roster_csv), "jsonl" o "bin" (formato
+                 binario de src/core/roster.py); por defecto según la extensión
+
+    Returns:
+        Número de empleados escritos.
+
+    Raises:
+        ValueError: Si el formato no es soportado.
+    """
+    if formato is None:
+        formato = os.path.splitext(ruta)[1].lstrip(".").lower() or "csv"
+    if formato not in FORMATOS_ROSTER_SINTETICO:
+        raise ValueError(f"Formato de roster no soportado: {formato}")
+
+    if formato == "bin":
+        escribir_roster_binario_por_bloques(ruta, n, (bloque for bloque, _ in generar_bloques(n, semilla)))
+        return n
+
+    ruta_temporal = f"{ruta}.tmp-{os.getpid()}"
+    with open(ruta_temporal, "w", encoding="utf-8", newline="") as archivo:
+        if formato == "csv":
+            archivo.write("id_empleado,salario,fecha_inicio,fecha_fin,tipo_contrato,banderas,centro_costo\n")
+        for bloque, fechas in generar_bloques(n, semilla):
+            archivo.write(_lineas_texto(bloque, fechas, formato))
+    os.replace(ruta_temporal, ruta)
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un roster sintético determinista.")
+    parser.add_argument("filas", type=int, help="Número de empleados")
+    parser.add_argument("salida", help="Archivo de salida (.csv, .jsonl o .bin)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--formato", choices=FORMATOS_ROSTER_SINTETICO)
+    argumentos = parser.parse_args()
+    escritos = escribir_roster_sintetico(argumentos.salida, argumentos.filas, argumentos.semilla, argumentos.formato)
+    print(f"{escritos} empleados escritos en {argumentos.salida}")
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/salary_history.py
+
+Historial de salario mensual y promedios para salarios variables (comisiones,
+aumentos durante el periodo).
+
+Cada mes comercial (30 días) tiene un salario; con la suma acumulada de los
+salarios, el promedio ponderado por días de cualquier ventana [inicio, fin] en
+seriales 30/360 se obtiene en O(1) tras un único precálculo O(n).
+"""
+
+import datetime
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.core.constants import DIAS_MES_COMERCIAL
+from src.utils.date_helpers import fecha_a_serial_360
+
+# Meses que se promedian para la base de un salario variable (Art. 253 CST)
+MESES_PROMEDIO_SALARIO_VARIABLE = 12
+
+
+def ventana_promedio(serial_inicio: int, serial_fin: int) -> Tuple[int, int]:
+    """
+    Ventana sobre la que se promedia el salario: el último año del periodo, o
+    todo el periodo si es más corto.
+    """
+    dias_ventana = MESES_PROMEDIO_SALARIO_VARIABLE * DIAS_MES_COMERCIAL
+    return max(serial_inicio, serial_fin - dias_ventana + 1), serial_fin
+
+
+def _suma_ventana(salarios: Sequence[float], base_salarios: int,
+                  acumulado: Sequence[float], base_acumulado: int,
+                  mes_inicial: int, n_meses: int, serial_inicio: int, serial_fin: int) -> float:
+    """
+    Suma salario-día de la ventana. salarios[base_salarios + k] es el salario
+    del mes k del historial y acumulado[base_acumulado + k] la suma de
+    salario * 30 de los meses anteriores a k.
+    """
+    mes_a = serial_inicio // DIAS_MES_COMERCIAL - mes_inicial
+    mes_b = serial_fin // DIAS_MES_COMERCIAL - mes_inicial
+    if mes_a < 0 or mes_b >= n_meses:
+        raise ValueError("El historial salarial no cubre todo el periodo a promediar.")
+    dia_a = serial_inicio % DIAS_MES_COMERCIAL
+    dia_b = serial_fin % DIAS_MES_COMERCIAL
+    if mes_a == mes_b:
+        return salarios[base_salarios + mes_a] * (dia_b - dia_a + 1)
+    return (
+        salarios[base_salarios + mes_a] * (DIAS_MES_COMERCIAL - dia_a)
+        + (acumulado[base_acumulado + mes_b] - acumulado[base_acumulado + mes_a + 1])
+        + salarios[base_salarios + mes_b] * (dia_b + 1)
+    )
+
+
+class HistorialSalarial:
+    """
+    Salario mensual de un empleado, un valor por mes consecutivo.
+
+    Args:
+        anio_inicial: Año del primer mes del historial
+        mes_inicial: Mes (1-12) del primer mes del historial
+        salarios: Salario de cada mes a partir del mes inicial
+    """
+
+    def __init__(self, anio_inicial: int, mes_inicial: int, salarios: Iterable[float]):
+        self.mes_inicial = anio_inicial * 12 + (mes_inicial - 1)
+        self.salarios = array("d", salarios)
+        # acumulado[k] = suma de salario * 30 de los meses 0..k-1
+        self.acumulado = array("d", [0.0] * (len(self.salarios) + 1))
+        total = 0.0
+        for k, salario in enumerate(self.salarios):
+            if salario < 0:
+                raise ValueError("Los salarios del historial no pueden ser negativos.")
+            total += salario * DIAS_MES_COMERCIAL
+            self.acumulado[k + 1] = total
+
+    @classmethod
+    def desde_cambios(
+        cls,
+        cambios: Iterable[Tuple[datetime.date, float]],
+        hasta: datetime.date
+    ) -> "HistorialSalarial":
+        """
+        Construye el historial a partir de cambios de salario (fecha, nuevo salario),
+        manteniendo cada salario vigente hasta el siguiente cambio o hasta la fecha 'hasta'.
+        Los cambios se aplican desde el mes en que ocurren.
+        """
+        cambios = sorted(cambios)
+        if not cambios:
+            raise ValueError("Se requiere al menos un salario para construir el historial.")
+        primero = cambios[0][0]
+        mes_final = hasta.year * 12 + hasta.month - 1
+        mes_actual = primero.year * 12 + primero.month - 1
+        salarios: List[float] = []
+        salario_vigente = cambios[0][1]
+        indice = 0
+        while mes_actual <= mes_final:
+            while indice < len(cambios) and cambios[indice][0].year * 12 + cambios[indice][0].month - 1 <= mes_actual:
+                salario_vigente = cambios[indice][1]
+                indice += 1
+            salarios.append(salario_vigente)
+            mes_actual += 1
+        return cls(primero.year, primero.month, salarios)
+
+    def __len__(self) -> int:
+        return len(self.salarios)
+
+    def promedio_serial(self, serial_inicio: int, serial_fin: int) -> float:
+        """Salario mensual promedio (ponderado por días 30/360) de la ventana inclusiva."""
+        if serial_fin < serial_inicio:
+            raise ValueError("La fecha de fin no puede ser anterior a la fecha de inicio")
+        suma = _suma_ventana(self.salarios, 0, self.acumulado, 0, self.mes_inicial, len(self.salarios),
+                             serial_inicio, serial_fin)
+        return suma / (serial_fin - serial_inicio + 1)
+
+    def promedio(self, fecha_inicio: datetime.date, fecha_fin: datetime.date) -> float:
+        """Salario mensual promedio entre dos fechas (inclusivas)."""
+        return self.promedio_serial(fecha_a_serial_360(fecha_inicio), fecha_a_serial_360(fecha_fin))
+
+    def promedio_liquidacion(self, serial_inicio: int, serial_fin: int) -> float:
+        """Salario promedio del último año del periodo (o de todo el periodo si es menor)."""
+        return self.promedio_serial(*ventana_promedio(serial_inicio, serial_fin))
+
+
+class HistorialesSalarialesLote:
+    """
+    Historiales salariales de todo un roster en formato compacto por filas (CSR).
+
+    Los meses del empleado i ocupan [offsets[i], offsets[i+1]) en 'salarios'; su
+    suma acumulada ocupa [offsets[i] + i, offsets[i+1] + i + 1) en 'acumulado'.
+    Un empleado sin historial (cero meses) conserva su salario fijo del roster.
+    """
+
+    def __init__(self, historiales: Iterable[Optional[HistorialSalarial]]):
+        self.offsets = array("q", [0])
+        self.meses_iniciales = array("i")
+        self.salarios = array("d")
+        self.acumulado = array("d")
+        for historial in historiales:
+            if historial is None or len(historial) == 0:
+                self.meses_iniciales.append(0)
+                self.acumulado.append(0.0)
+            else:
+                self.meses_iniciales.append(historial.mes_inicial)
+                self.salarios.extend(historial.salarios)
+                self.acumulado.extend(historial.acumulado)
+            self.offsets.append(len(self.salarios))
+
+    def __len__(self) -> int:
+        return len(self.meses_iniciales)
+
+    def promedios_lote(
+        self,
+        salarios_fijos: Sequence[float],
+        serial_inicio: Sequence[int],
+        serial_fin: Sequence[int]
+    ) -> array:
+        """
+        Salario base por empleado: el promedio del último año del periodo para
+        quienes tienen historial, o el salario fijo del roster para el resto.
+        """
+        if len(salarios_fijos) != len(self):
+            raise ValueError("Los historiales y el lote deben tener el mismo número de filas.")
+        resultado = array("d", salarios_fijos)
+        for fila, (inicio, fin) in enumerate(zip(serial_inicio, serial_fin)):
+            desde, hasta = self.offsets[fila], self.offsets[fila + 1]
+            if desde == hasta:
+                continue
+            ventana_inicio, ventana_fin = ventana_promedio(inicio, fin)
+            # Los salarios del empleado empiezan en 'desde' y su acumulado en 'desde + fila'
+            suma = _suma_ventana(
+                self.salarios, desde, self.acumulado, desde + fila,
+                self.meses_iniciales[fila], hasta - desde, ventana_inicio, ventana_fin
+            )
+            resultado[fila] = suma / (ventana_fin - ventana_inicio + 1)
+        return resultado
@@ -0,0 +1,570 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/scheduler.py
+
+Planificador local de trabajos de liquidación para varias empresas (clientes).
+
+Al cierre de semestre (PERIODOS_LIQUIDACION) todas las empresas envían sus
+rosters a la vez. Cada roster es un trabajo con prioridad que se encola y se
+despacha a un grupo de procesos de trabajo compartido, respetando un límite de
+trabajos simultáneos por empresa. Entre los trabajos de mayor prioridad que
+pueden arrancar se elige el de la empresa con menos trabajos en curso (y, a
+igualdad, la atendida hace más tiempo), así una empresa con muchos rosters
+grandes no acapara el grupo ni deja esperando a las pequeñas.
+
+El estado de la cola se guarda en SQLite. Cada trabajo se ejecuta con
+src/core/batch_runner.py (puntos de control reanudables), de modo que si el
+planificador se reinicia, los trabajos que estaban en curso vuelven a la cola
+y continúan desde su último punto de control: no se pierde nada. Lo mismo
+ocurre si un proceso de trabajo muere (por ejemplo por falta de memoria): el
+grupo de procesos se reemplaza y sus trabajos vuelven a la cola, hasta
+MAX_INTENTOS_TRABAJO veces. Un bloqueo de archivo junto a la base de datos
+impide que dos despachadores atiendan la misma cola.
+
+Los procesos de trabajo reportan el avance (filas procesadas) en la base de
+datos en cada punto de control; metricas() lo resume junto con el rendimiento
+(filas por segundo) global, por empresa y por trabajo.
+
+Uso desde la línea de comandos:
+    python -m src.core.scheduler cola.db enviar EMPRESA roster.bin salida.csv --prioridad 5
+    python -m src.core.scheduler cola.db ejecutar --trabajadores 4
+    python -m src.core.scheduler cola.db estado
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import IO, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo del despachador
+    fcntl = None
+
+from src.core.batch_runner import INTERVALO_PUNTO_CONTROL, ejecutar_corrida
+from src.core.constants import PERIODOS_LIQUIDACION
+from src.core.roster import abrir_roster_binario, leer_roster_csv
+
+# Estados de un trabajo
+ESTADOS_TRABAJO: Tuple[str, ...] = ("PENDIENTE", "EN_CURSO", "TERMINADO", "FALLIDO", "CANCELADO")
+
+LIMITE_EMPRESA_POR_DEFECTO = 1
+# Segundos entre revisiones de la cola cuando no hay trabajos terminando
+INTERVALO_REVISION = 0.5
+# Segundos de espera de SQLite cuando otro proceso tiene la base bloqueada
+ESPERA_BLOQUEO_BD = 30.0
+# Veces que un trabajo vuelve a la cola porque su proceso de trabajo murió
+MAX_INTENTOS_TRABAJO = 3
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS empresas (
+    empresa TEXT PRIMARY KEY,
+    limite_concurrencia INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trabajos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    empresa TEXT NOT NULL,
+    prioridad INTEGER NOT NULL,
+    periodo TEXT,
+    ruta_roster TEXT NOT NULL,
+    ruta_salida TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    filas_total INTEGER,
+    filas_procesadas INTEGER NOT NULL DEFAULT 0,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    creado REAL NOT NULL,
+    iniciado REAL,
+    terminado REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS trabajos_cola ON trabajos (estado, prioridad DESC, id);
+"""
+
+
+def _conectar(ruta_bd: str) -> sqlite3.Connection:
+    conexion = sqlite3.connect(ruta_bd, timeout=ESPERA_BLOQUEO_BD, isolation_level=None)
+    conexion.row_factory = sqlite3.Row
+    # WAL: el despachador y los procesos de trabajo escriben sin bloquear las lecturas
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    return conexion
+
+
+def _bloquear_despachador(ruta_bd: str) -> Optional[IO[bytes]]:
+    """
+    Toma el bloqueo exclusivo del despachador de la cola (un archivo junto a la
+    base de datos). El sistema lo libera si el proceso muere.
+
+    Returns:
+        Archivo del bloqueo (se libera al cerrarlo), o None si la plataforma no
+        ofrece fcntl
+
+    Raises:
+        ValueError: Si otro despachador ya atiende la cola.
+    """
+    if fcntl is None:
+        print("ADVERTENCIA: Sin fcntl no se puede impedir que dos despachadores atiendan la misma cola.")
+        return None
+    archivo = open(f"{ruta_bd}.despachador", "ab")
+    try:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        archivo.close()
+        raise ValueError(f"Ya hay un despachador atendiendo la cola {ruta_bd}.")
+    return archivo
+
+# ==============================================================================
+# Modelos
+# ==============================================================================
+
+@dataclass
+class EstadoTrabajo:
+    """Estado de un trabajo de la cola."""
+    id: int
+    empresa: str
+    prioridad: int
+    periodo: Optional[str]
+    ruta_roster: str
+    ruta_salida: str
+    estado: str
+    filas_total: Optional[int]
+    filas_procesadas: int
+    intentos: int
+    creado: float
+    iniciado: Optional[float]
+    terminado: Optional[float]
+    error: Optional[str]
+
+    @property
+    def progreso(self) -> float:
+        """Fracción procesada del roster (0 a 1)."""
+        if self.estado == "TERMINADO":
+            return 1.0
+        return self.filas_procesadas / self.filas_total if self.filas_total else 0.0
+
+    @property
+    def filas_por_segundo(self) -> float:
+        """Rendimiento del trabajo desde que inició (o durante toda su ejecución)."""
+        if self.iniciado is None:
+            return 0.0
+        duracion = (self.terminado or time.time()) - self.iniciado
+        return self.filas_procesadas / duracion if duracion > 0 else 0.0
+
+
+@dataclass
+class MetricasEmpresa:
+    """Conteos y rendimiento de los trabajos de una empresa."""
+    pendientes: int = 0
+    en_curso: int = 0
+    terminados: int = 0
+    fallidos: int = 0
+    filas_procesadas: int = 0
+    filas_por_segundo: float = 0.0
+
+
+@dataclass
+class MetricasPlanificador:
+    """Resumen de la cola: conteos por estado, filas y rendimiento."""
+    pendientes: int = 0
+    en_curso: int = 0
+    terminados: int = 0
+    fallidos: int = 0
+    filas_procesadas: int = 0
+    filas_por_segundo: float = 0.0   # Desde que arrancó el despachador
+    espera_promedio: float = 0.0     # Segundos entre envío e inicio de los trabajos iniciados
+    por_empresa: Dict[str, MetricasEmpresa] = field(default_factory=dict)
+
+# ==============================================================================
+# Ejecución de un trabajo (en el proceso de trabajo)
+# ==============================================================================
+
+def _abrir_roster(ruta: str):
+    if ruta.lower().endswith(".csv"):
+        return leer_roster_csv(ruta)
+    return abrir_roster_binario(ruta)
+
+
+def _ejecutar_trabajo(ruta_bd: str, id_trabajo: int, ruta_roster: str, ruta_salida: str,
+                      intervalo_punto_control: int) -> int:
+    """Liquida el roster de un trabajo reportando el avance en la base de datos."""
+    conexion = _conectar(ruta_bd)
+    try:
+        roster = _abrir_roster(ruta_roster)
+        try:
+            conexion.execute("UPDATE trabajos SET filas_total = ? WHERE id = ?", (len(roster), id_trabajo))
+
+            def al_avanzar(procesadas: int, total: int) -> None:
+                conexion.execute("UPDATE trabajos SET filas_procesadas = ? WHERE id = ?", (procesadas, id_trabajo))
+
+            totales = ejecutar_corrida(roster, ruta_salida, intervalo_punto_control=intervalo_punto_control,
+                                       al_avanzar=al_avanzar)
+        finally:
+            if hasattr(roster, "cerrar"):
+                roster.cerrar()
+        return totales.empleados
+    finally:
+        conexion.close()
+
+# ==============================================================================
+# Planificador
+# ==============================================================================
+
+class PlanificadorLiquidaciones:
+    """
+    Cola persistente de trabajos de liquidación con prioridades y límites por empresa.
+
+    Se pueden enviar trabajos desde cualquier proceso (enviar abre su propia
+    transacción); solo un proceso debe ejecutar el despachador (ejecutar).
+
+    Args:
+        ruta_bd: Base de datos SQLite de la cola (se crea si no existe)
+        trabajadores: Procesos del grupo compartido (por defecto, los núcleos disponibles)
+        limite_por_defecto: Trabajos simultáneos de una empresa sin límite configurado
+        intervalo_punto_control: Filas entre puntos de control (y reportes de avance)
+    """
+
+    def __init__(
+        self,
+        ruta_bd: str,
+        trabajadores: Optional[int] = None,
+        limite_por_defecto: int = LIMITE_EMPRESA_POR_DEFECTO,
+        intervalo_punto_control: int = INTERVALO_PUNTO_CONTROL
+    ):
+        if limite_por_defecto <= 0:
+            raise ValueError("El límite de concurrencia debe ser positivo.")
+        self.ruta_bd = ruta_bd
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.limite_por_defecto = limite_por_defecto
+        self.intervalo_punto_control = intervalo_punto_control
+        self._conexion = _conectar(ruta_bd)
+        self._conexion.executescript(_ESQUEMA)
+        self._detener = threading.Event()
+        self._ultimo_despacho: Dict[str, float] = {}
+        self._inicio: Optional[float] = None
+
+    def __enter__(self) -> "PlanificadorLiquidaciones":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        self._conexion.close()
+
+    # --- Cola ---
+    def enviar(self, empresa: str, ruta_roster: str, ruta_salida: str,
+               prioridad: int = 0, periodo: Optional[str] = None) -> int:
+        """
+        Encola el roster de una empresa.
+
+        Args:
+            empresa: Identificador de la empresa (cliente)
+            ruta_roster: Roster binario (.bin) o CSV (.csv)
+            ruta_salida: CSV de resultados (ver batch_runner)
+            prioridad: Mayor número = se atiende antes
+            periodo: Clave de PERIODOS_LIQUIDACION (opcional, informativo)
+
+        Returns:
+            Id del trabajo
+
+        Raises:
+            ValueError: Si el periodo no es válido o el roster no existe.
+        """
+        if periodo is not None and periodo not in PERIODOS_LIQUIDACION:
+            raise ValueError(f"Periodo desconocido: {periodo}")
+        if not os.path.exists(ruta_roster):
+            raise ValueError(f"No existe el roster {ruta_roster}")
+        cursor = self._conexion.execute(
+            "INSERT INTO trabajos (empresa, prioridad, periodo, ruta_roster, ruta_salida, estado, creado) "
+            "VALUES (?, ?, ?, ?, ?, 'PENDIENTE', ?)",
+            (empresa, prioridad, periodo, os.path.abspath(ruta_roster), os.path.abspath(ruta_salida), time.time()),
+        )
+        return cursor.lastrowid
+
+    def fijar_limite(self, empresa: str, limite: int) -> None:
+        """Fija cuántos trabajos de la empresa pueden ejecutarse a la vez."""
+        if limite <= 0:
+            raise ValueError("El límite de concurrencia debe ser positivo.")
+        self._conexion.execute(
+            "INSERT INTO empresas (empresa, limite_concurrencia) VALUES (?, ?) "
+            "ON CONFLICT(empresa) DO UPDATE SET limite_concurrencia = excluded.limite_concurrencia",
+            (empresa, limite),
+        )
+
+    def cancelar(self, id_trabajo: int) -> bool:
+        """Cancela un trabajo pendiente. Retorna False si ya no estaba pendiente."""
+        cursor = self._conexion.execute(
+            "UPDATE trabajos SET estado = 'CANCELADO', terminado = ? WHERE id = ? AND estado = 'PENDIENTE'",
+            (time.time(), id_trabajo),
+        )
+        return cursor.rowcount == 1
+
+    def reintentar(self, id_trabajo: int) -> bool:
+        """Devuelve a la cola un trabajo fallido. Retorna False si no estaba fallido."""
+        cursor = self._conexion.execute(
+            "UPDATE trabajos SET estado = 'PENDIENTE', error = NULL, terminado = NULL WHERE id = ? AND estado = 'FALLIDO'",
+            (id_trabajo,),
+        )
+        return cursor.rowcount == 1
+
+    def estado(self, id_trabajo: int) -> EstadoTrabajo:
+        fila = self._conexion.execute("SELECT * FROM trabajos WHERE id = ?", (id_trabajo,)).fetchone()
+        if fila is None:
+            raise ValueError(f"No existe el trabajo {id_trabajo}")
+        return EstadoTrabajo(**dict(fila))
+
+    def trabajos(self, empresa: Optional[str] = None, estado: Optional[str] = None) -> List[EstadoTrabajo]:
+        """Trabajos de la cola (opcionalmente de una empresa y/o en un estado), en orden de envío."""
+        condiciones, parametros = [], []
+        if empresa is not None:
+            condiciones.append("empresa = ?")
+            parametros.append(empresa)
+        if estado is not None:
+            condiciones.append("estado = ?")
+            parametros.append(estado)
+        donde = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        filas = self._conexion.execute(f"SELECT * FROM trabajos{donde} ORDER BY id", parametros).fetchall()
+        return [EstadoTrabajo(**dict(fila)) for fila in filas]
+
+    # --- Métricas ---
+    def metricas(self) -> MetricasPlanificador:
+        """Conteos por estado, filas procesadas y rendimiento, global y por empresa."""
+        metricas = MetricasPlanificador()
+        ahora = time.time()
+        ejecutados: Dict[str, Tuple[int, float]] = {}  # empresa -> (filas, segundos) de trabajos iniciados
+        for fila in self._conexion.execute(
+            "SELECT empresa, estado, COUNT(*) AS trabajos, SUM(filas_procesadas) AS filas, "
+            "SUM(COALESCE(terminado, ?) - iniciado) AS duracion FROM trabajos GROUP BY empresa, estado",
+            (ahora,),
+        ):
+            atributo = {"PENDIENTE": "pendientes", "EN_CURSO": "en_curso",
+                        "TERMINADO": "terminados", "FALLIDO": "fallidos"}.get(fila["estado"])
+            if atributo is None:
+                continue
+            empresa = metricas.por_empresa.setdefault(fila["empresa"], MetricasEmpresa())
+            setattr(empresa, atributo, getattr(empresa, atributo) + fila["trabajos"])
+            setattr(metricas, atributo, getattr(metricas, atributo) + fila["trabajos"])
+            empresa.filas_procesadas += fila["filas"] or 0
+            if fila["estado"] in ("EN_CURSO", "TERMINADO") and fila["duracion"]:
+                filas, segundos = ejecutados.get(fila["empresa"], (0, 0.0))
+                ejecutados[fila["empresa"]] = (filas + (fila["filas"] or 0), segundos + fila["duracion"])
+        for nombre, (filas, segundos) in ejecutados.items():
+            metricas.por_empresa[nombre].filas_por_segundo = filas / segundos if segundos > 0 else 0.0
+        metricas.filas_procesadas = sum(empresa.filas_procesadas for empresa in metricas.por_empresa.values())
+        if self._inicio is not None:
+            filas_sesion = self._conexion.execute(
+                "SELECT COALESCE(SUM(filas_procesadas), 0) FROM trabajos WHERE iniciado >= ?", (self._inicio,)
+            ).fetchone()[0]
+            metricas.filas_por_segundo = filas_sesion / max(ahora - self._inicio, 1e-9)
+        espera = self._conexion.execute(
+            "SELECT AVG(iniciado - creado) FROM trabajos WHERE iniciado IS NOT NULL"
+        ).fetchone()[0]
+        metricas.espera_promedio = espera or 0.0
+        return metricas
+
+    # --- Despacho ---
+    def _limites(self) -> Dict[str, int]:
+        return {fila["empresa"]: fila["limite_concurrencia"]
+                for fila in self._conexion.execute("SELECT empresa, limite_concurrencia FROM empresas")}
+
+    def _siguiente(self, en_curso: Dict[str, int]) -> Optional[sqlite3.Row]:
+        """
+        Elige el siguiente trabajo: entre los pendientes de mayor prioridad cuyas
+        empresas no alcanzaron su límite, el de la empresa con menos trabajos en
+        curso y, a igualdad, la que hace más tiempo no recibe un despacho.
+        """
+        limites = self._limites()
+        candidatos: Dict[str, sqlite3.Row] = {}
+        prioridad_elegida = None
+        for fila in self._conexion.execute(
+            "SELECT id, empresa, prioridad, ruta_roster, ruta_salida FROM trabajos "
+            "WHERE estado = 'PENDIENTE' ORDER BY prioridad DESC, id"
+        ):
+            if prioridad_elegida is not None and fila["prioridad"] < prioridad_elegida:
+                break
+            empresa = fila["empresa"]
+            if empresa in candidatos or en_curso.get(empresa, 0) >= limites.get(empresa, self.limite_por_defecto):
+                continue
+            candidatos[empresa] = fila
+            prioridad_elegida = fila["prioridad"]
+        if not candidatos:
+            return None
+        empresa = min(candidatos, key=lambda e: (en_curso.get(e, 0), self._ultimo_despacho.get(e, 0.0), candidatos[e]["id"]))
+        return candidatos[empresa]
+
+    def _recuperar(self) -> int:
+        """Devuelve a la cola los trabajos que quedaron en curso (reinicio tras una caída)."""
+        return self._conexion.execute(
+            "UPDATE trabajos SET estado = 'PENDIENTE' WHERE estado = 'EN_CURSO'"
+        ).rowcount
+
+    def detener(self) -> None:
+        """Pide al despachador que no inicie más trabajos y termine al acabar los en curso."""
+        self._detener.set()
+
+    def ejecutar(self, hasta_vaciar: bool = True) -> MetricasPlanificador:
+        """
+        Despacha trabajos al grupo de procesos hasta vaciar la cola (o hasta
+        detener(), si hasta_vaciar es False).
+
+        Returns:
+            Métricas al terminar
+
+        Raises:
+            ValueError: Si otro despachador ya atiende la misma cola.
+        """
+        bloqueo = _bloquear_despachador(self.ruta_bd)
+        try:
+            recuperados = self._recuperar()
+            if recuperados:
+                print(f"ADVERTENCIA: {recuperados} trabajos en curso de una ejecución anterior vuelven a la cola.")
+            self._detener.clear()
+            self._inicio = time.time()
+            self._despachar(hasta_vaciar)
+        finally:
+            if bloqueo is not None:
+                bloqueo.close()
+        return self.metricas()
+
+    def _despachar(self, hasta_vaciar: bool) -> None:
+        en_curso: Dict[str, int] = {}
+        futuros: Dict[Future, Tuple[int, str]] = {}
+        executor = ProcessPoolExecutor(max_workers=self.trabajadores)
+        try:
+            while True:
+                roto = False
+                while not self._detener.is_set() and len(futuros) < self.trabajadores:
+                    fila = self._siguiente(en_curso)
+                    if fila is None:
+                        break
+                    ahora = time.time()
+                    reclamado = self._conexion.execute(
+                        "UPDATE trabajos SET estado = 'EN_CURSO', iniciado = COALESCE(iniciado, ?), "
+                        "intentos = intentos + 1 WHERE id = ? AND estado = 'PENDIENTE'",
+                        (ahora, fila["id"]),
+                    ).rowcount
+                    if not reclamado:  # Cancelado mientras se elegía
+                        continue
+                    try:
+                        futuro = executor.submit(_ejecutar_trabajo, self.ruta_bd, fila["id"], fila["ruta_roster"],
+                                                 fila["ruta_salida"], self.intervalo_punto_control)
+                    except BrokenProcessPool:
+                        # El grupo se rompió antes de recibir el trabajo: no cuenta como intento
+                        self._conexion.execute(
+                            "UPDATE trabajos SET estado = 'PENDIENTE', intentos = intentos - 1 WHERE id = ?",
+                            (fila["id"],),
+                        )
+                        roto = True
+                        break
+                    futuros[futuro] = (fila["id"], fila["empresa"])
+                    en_curso[fila["empresa"]] = en_curso.get(fila["empresa"], 0) + 1
+                    self._ultimo_despacho[fila["empresa"]] = ahora
+
+                if not roto:
+                    if not futuros:
+                        if self._detener.is_set() or hasta_vaciar:
+                            break
+                        self._detener.wait(INTERVALO_REVISION)
+                        continue
+                    terminados, _ = wait(futuros, timeout=INTERVALO_REVISION, return_when=FIRST_COMPLETED)
+                    for futuro in terminados:
+                        id_trabajo, empresa = futuros.pop(futuro)
+                        en_curso[empresa] -= 1
+                        roto = self._finalizar(id_trabajo, futuro) or roto
+                if roto:
+                    executor = self._reemplazar_grupo(executor, futuros, en_curso)
+        finally:
+            executor.shutdown(wait=True)
+
+    def _reemplazar_grupo(
+        self,
+        executor: ProcessPoolExecutor,
+        futuros: Dict[Future, Tuple[int, str]],
+        en_curso: Dict[str, int]
+    ) -> ProcessPoolExecutor:
+        """
+        Reemplaza un grupo de procesos roto (un proceso de trabajo murió). Los
+        trabajos que seguían en él terminan con BrokenProcessPool y vuelven a la cola.
+        """
+        print("ADVERTENCIA: Un proceso de trabajo terminó inesperadamente; se reinicia el grupo de procesos.")
+        executor.shutdown(wait=True)
+        for futuro, (id_trabajo, empresa) in list(futuros.items()):
+            del futuros[futuro]
+            en_curso[empresa] -= 1
+            self._finalizar(id_trabajo, futuro)
+        return ProcessPoolExecutor(max_workers=self.trabajadores)
+
+    def _finalizar(self, id_trabajo: int, futuro: Future) -> bool:
+        """Registra el resultado de un trabajo. Retorna True si su grupo de procesos se rompió."""
+        try:
+            futuro.result()
+        except BrokenProcessPool:
+            # El trabajo se reanuda desde su último punto de control, salvo que ya se haya intentado demasiado
+            self._conexion.execute(
+                "UPDATE trabajos SET estado = CASE WHEN intentos >= ? THEN 'FALLIDO' ELSE 'PENDIENTE' END, "
+                "terminado = CASE WHEN intentos >= ? THEN ? END, "
+                "error = CASE WHEN intentos >= ? THEN ? END WHERE id = ?",
+                (MAX_INTENTOS_TRABAJO, MAX_INTENTOS_TRABAJO, time.time(), MAX_INTENTOS_TRABAJO,
+                 f"El proceso de trabajo terminó inesperadamente {MAX_INTENTOS_TRABAJO} veces.", id_trabajo),
+            )
+            return True
+        except Exception as e:
+            self._conexion.execute(
+                "UPDATE trabajos SET estado = 'FALLIDO', terminado = ?, error = ? WHERE id = ?",
+                (time.time(), f"{type(e).__name__}: {e}", id_trabajo),
+            )
+        else:
+            self._conexion.execute(
+                "UPDATE trabajos SET estado = 'TERMINADO', terminado = ?, filas_procesadas = filas_total WHERE id = ?",
+                (time.time(), id_trabajo),
+            )
+        return False
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Planificador de liquidaciones por empresa.")
+    parser.add_argument("base_datos", help="Base de datos SQLite de la cola")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    enviar = subcomandos.add_parser("enviar", help="Encola un roster")
+    enviar.add_argument("empresa")
+    enviar.add_argument("roster")
+    enviar.add_argument("salida")
+    enviar.add_argument("--prioridad", type=int, default=0)
+    enviar.add_argument("--periodo", choices=tuple(PERIODOS_LIQUIDACION))
+
+    limite = subcomandos.add_parser("limite", help="Fija el límite de trabajos simultáneos de una empresa")
+    limite.add_argument("empresa")
+    limite.add_argument("limite", type=int)
+
+    ejecutar = subcomandos.add_parser("ejecutar", help="Despacha la cola hasta vaciarla")
+    ejecutar.add_argument("--trabajadores", type=int)
+
+    subcomandos.add_parser("estado", help="Muestra los trabajos y las métricas")
+    argumentos = parser.parse_args(argv)
+
+    with PlanificadorLiquidaciones(argumentos.base_datos, getattr(argumentos, "trabajadores", None)) as planificador:
+        if argumentos.comando == "enviar":
+            id_trabajo = planificador.enviar(argumentos.empresa, argumentos.roster, argumentos.salida,
+                                             argumentos.prioridad, argumentos.periodo)
+            print(f"Trabajo {id_trabajo} encolado")
+        elif argumentos.comando == "limite":
+            planificador.fijar_limite(argumentos.empresa, argumentos.limite)
+        else:
+            metricas = planificador.ejecutar() if argumentos.comando == "ejecutar" else planificador.metricas()
+            for trabajo in planificador.trabajos():
+                print(f"{trabajo.id:>6} {trabajo.empresa:<20} p={trabajo.prioridad:<3} {trabajo.estado:<10} "
+                      f"{trabajo.progreso:6.1%} {trabajo.filas_por_segundo:12.0f} filas/s {trabajo.error or ''}")
+            print(f"Pendientes: {metricas.pendientes}  En curso: {metricas.en_curso}  "
+                  f"Terminados: {metricas.terminados}  Fallidos: {metricas.fallidos}  "
+                  f"Filas: {metricas.filas_procesadas}  Rendimiento: {metricas.filas_por_segundo:.0f} filas/s")
+
+
+if __name__ == "__main__":
+    main()
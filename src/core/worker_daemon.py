@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+
+"""
+src/core/worker_daemon.py
+
+Servicio local de liquidación con trabajadores pre-creados ("pre-fork").
+
+Cada invocación de un script de liquidación paga el arranque de Python y la
+importación de config.settings, del calculador y de las utilidades de fechas.
+Este servicio hace ese trabajo una sola vez: el proceso principal importa y
+"calienta" el calculador (ejecutando una liquidación de prueba), abre un socket
+de dominio Unix y crea con fork() un grupo de trabajadores que heredan todo lo
+ya cargado. Cada trabajador acepta conexiones del socket compartido y atiende
+solicitudes; si uno termina, el proceso principal lo reemplaza. Antes de cada
+solicitud el trabajador recarga los parámetros legales si su archivo cambió.
+
+El socket se crea en un directorio privado del usuario ($XDG_RUNTIME_DIR o un
+directorio 0700 en el directorio temporal); el cliente y el servicio solo usan
+un socket del usuario actual y el servicio rechaza conexiones de otros usuarios.
+
+Protocolo (una línea JSON por mensaje, UTF-8):
+    solicitud: {"argv": ["liquidacion", "2000000", "2024-01-01", "2024-12-31"]}
+    respuesta: {"codigo": 0, "salida": "<JSON con el resultado>", "error": ""}
+
+Los argumentos son los mismos de la línea de comandos del cliente
+(cliente_liquidacion.py en la raíz del proyecto), que los reenvía tal cual.
+
+Uso:
+    python -m src.core.worker_daemon --trabajadores 4
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from typing import List, Optional, Sequence, Set, Tuple
+
+from config.parameter_snapshot import recargar_si_cambio, snapshot_actual
+from src.core import calculator
+from src.utils.date_helpers import calcular_dias_liquidacion
+
+# Ruta por defecto del socket (el cliente usa la misma regla)
+VARIABLE_ENTORNO_SOCKET = "LIQUIDACIONES_SOCKET"
+TRABAJADORES_POR_DEFECTO = 4
+# Un trabajador se recicla tras este número de solicitudes (acota el crecimiento de memoria)
+MAX_SOLICITUDES_TRABAJADOR = 10_000
+TAMANO_MAXIMO_SOLICITUD = 64 * 1024
+COLA_CONEXIONES = 128
+
+
+NOMBRE_SOCKET = "liquidaciones.sock"
+
+
+def directorio_socket() -> str:
+    """
+    Directorio privado del socket: $XDG_RUNTIME_DIR o, si no está definido, un
+    directorio por usuario con permisos 0700 en el directorio temporal.
+
+    Raises:
+        ValueError: Si el directorio pertenece a otro usuario o otros pueden escribir en él.
+    """
+    directorio = os.environ.get("XDG_RUNTIME_DIR")
+    if not directorio:
+        directorio = os.path.join(tempfile.gettempdir(), f"liquidaciones-{os.getuid()}")
+        try:
+            os.mkdir(directorio, 0o700)
+        except FileExistsError:
+            pass
+    estado = os.lstat(directorio)
+    if not stat.S_ISDIR(estado.st_mode) or estado.st_uid != os.getuid() or estado.st_mode & 0o077:
+        raise ValueError(f"El directorio del socket {directorio} no es privado del usuario actual.")
+    return directorio
+
+
+def ruta_socket_por_defecto() -> str:
+    """Ruta del socket: $LIQUIDACIONES_SOCKET o NOMBRE_SOCKET en directorio_socket()."""
+    return os.environ.get(VARIABLE_ENTORNO_SOCKET) or os.path.join(directorio_socket(), NOMBRE_SOCKET)
+
+
+def socket_es_propio(ruta: str) -> bool:
+    """True si 'ruta' es un socket Unix del usuario actual (el cliente aplica la misma regla)."""
+    try:
+        estado = os.lstat(ruta)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(estado.st_mode) and estado.st_uid == os.getuid()
+
+
+def _uid_par(conexion: socket.socket) -> Optional[int]:
+    """UID del proceso del otro extremo (SO_PEERCRED), o None si la plataforma no lo ofrece."""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credenciales = conexion.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credenciales)
+    return uid
+
+# ==============================================================================
+# Comandos
+# ==============================================================================
+
+class _ParserComandos(argparse.ArgumentParser):
+    """ArgumentParser que lanza ValueError en lugar de terminar el proceso."""
+
+    def error(self, message):
+        raise ValueError(f"{self.prog}: {message}")
+
+    def exit(self, status=0, message=None):
+        raise ValueError(message or f"{self.prog}: argumentos inválidos")
+
+
+def _fecha(texto: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{texto}' (use YYYY-MM-DD)")
+
+
+def _crear_parser() -> _ParserComandos:
+    parser = _ParserComandos(prog="liquidacion", add_help=False)
+    comandos = parser.add_subparsers(dest="comando", required=True, parser_class=_ParserComandos)
+
+    dias = comandos.add_parser("dias", add_help=False)
+    dias.add_argument("fecha_inicio", type=_fecha)
+    dias.add_argument("fecha_fin", type=_fecha)
+
+    for nombre in ("cesantias", "prima"):
+        sub = comandos.add_parser(nombre, add_help=False)
+        sub.add_argument("salario", type=float)
+        sub.add_argument("fecha_inicio", type=_fecha)
+        sub.add_argument("fecha_fin", type=_fecha)
+
+    intereses = comandos.add_parser("intereses", add_help=False)
+    intereses.add_argument("valor_cesantias", type=float)
+    intereses.add_argument("fecha_inicio", type=_fecha)
+    intereses.add_argument("fecha_fin", type=_fecha)
+
+    liquidacion = comandos.add_parser("liquidacion", add_help=False)
+    liquidacion.add_argument("salario", type=float)
+    liquidacion.add_argument("fecha_inicio", type=_fecha)
+    liquidacion.add_argument("fecha_fin", type=_fecha)
+    liquidacion.add_argument("--conceptos", default="cesantias,intereses,prima")
+    liquidacion.add_argument("--sin-auxilio", action="store_true")
+    return parser
+
+
+_PARSER = _crear_parser()
+
+
+def ejecutar_comando(argv: Sequence[str]) -> Tuple[int, str, str]:
+    """
+    Ejecuta un comando de liquidación.
+
+    Args:
+        argv: Argumentos del comando (sin el nombre del programa)
+
+    Returns:
+        Tupla (código de salida, salida JSON, mensaje de error)
+    """
+    try:
+        argumentos = _PARSER.parse_args(list(argv))
+        if argumentos.comando == "dias":
+            resultado = {"dias": calcular_dias_liquidacion(argumentos.fecha_inicio, argumentos.fecha_fin)}
+        elif argumentos.comando == "cesantias":
+            resultado = {"cesantias": calculator.calcular_cesantias(
+                argumentos.salario, argumentos.fecha_inicio, argumentos.fecha_fin)}
+        elif argumentos.comando == "intereses":
+            resultado = {"intereses": calculator.calcular_intereses_cesantias(
+                argumentos.valor_cesantias, argumentos.fecha_inicio, argumentos.fecha_fin)}
+        elif argumentos.comando == "prima":
+            resultado = calculator.calcular_prima_servicios(
+                argumentos.salario, argumentos.fecha_inicio, argumentos.fecha_fin)
+        else:
+            conceptos = tuple(c.strip() for c in argumentos.conceptos.split(",") if c.strip())
+            resultados = calculator.calcular_liquidacion_completa(
+                argumentos.salario, argumentos.fecha_inicio, argumentos.fecha_fin,
+                incluir_auxilio=not argumentos.sin_auxilio, conceptos=conceptos,
+            )
+            resultado = {
+                nombre: {"valor": r.valor, "dias": r.dias_calculados, "detalles": r.detalles,
+                         "version_parametros": r.version_parametros}
+                for nombre, r in resultados.items()
+            }
+    except ValueError as e:
+        return 1, "", str(e)
+    return 0, json.dumps(resultado, ensure_ascii=False, default=str), ""
+
+# ==============================================================================
+# Trabajadores
+# ==============================================================================
+
+def _atender_conexion(conexion: socket.socket, max_solicitudes: int = MAX_SOLICITUDES_TRABAJADOR) -> int:
+    """
+    Atiende las solicitudes de una conexión hasta que el cliente la cierre o se
+    alcance max_solicitudes (una conexión persistente no evita el reciclaje).
+    Las conexiones de otro usuario se cierran sin atenderlas.
+    """
+    atendidas = 0
+    uid = _uid_par(conexion)
+    if uid is not None and uid != os.getuid():
+        conexion.close()
+        return 0
+    with conexion, conexion.makefile("rb") as lector, conexion.makefile("wb") as escritor:
+        while atendidas < max_solicitudes:
+            linea = lector.readline(TAMANO_MAXIMO_SOLICITUD + 1)
+            if not linea:
+                break
+            try:
+                if len(linea) > TAMANO_MAXIMO_SOLICITUD:
+                    raise ValueError("Solicitud demasiado grande.")
+                # Si el archivo de parámetros cambió, se toma la nueva versión (un stat por solicitud)
+                recargar_si_cambio()
+                argv = json.loads(linea.decode("utf-8"))["argv"]
+                if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                    raise ValueError("'argv' debe ser una lista de textos.")
+                codigo, salida, error = ejecutar_comando(argv)
+            except (ValueError, KeyError, TypeError) as e:
+                codigo, salida, error = 2, "", f"Solicitud inválida: {e}"
+            except Exception as e:  # Un error inesperado no debe tumbar al trabajador
+                codigo, salida, error = 3, "", f"Error interno: {e}"
+            escritor.write(json.dumps({"codigo": codigo, "salida": salida, "error": error}).encode("utf-8") + b"\n")
+            escritor.flush()
+            atendidas += 1
+            if len(linea) > TAMANO_MAXIMO_SOLICITUD:
+                break
+    return atendidas
+
+
+def _bucle_trabajador(servidor: socket.socket, max_solicitudes: int) -> None:
+    """Acepta conexiones del socket compartido hasta alcanzar max_solicitudes."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    atendidas = 0
+    while atendidas < max_solicitudes:
+        try:
+            conexion, _ = servidor.accept()
+        except InterruptedError:
+            continue
+        try:
+            atendidas += _atender_conexion(conexion, max_solicitudes - atendidas)
+        except OSError:
+            pass  # El cliente cerró la conexión a mitad de la respuesta
+
+
+def _crear_trabajador(servidor: socket.socket, max_solicitudes: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        codigo = 0
+        try:
+            _bucle_trabajador(servidor, max_solicitudes)
+        except BaseException:
+            codigo = 1
+        finally:
+            os._exit(codigo)
+    return pid
+
+
+class _Terminar(Exception):
+    """Señal de terminación recibida por el proceso principal."""
+
+
+def _calentar() -> None:
+    """Ejecuta una liquidación de prueba para dejar cargado todo lo que se usa en caliente."""
+    anio = max(snapshot_actual().salarios_minimos)
+    ejecutar_comando(["liquidacion", "1000000", f"{anio}-01-01", f"{anio}-12-31"])
+
+
+def servir(
+    ruta_socket: Optional[str] = None,
+    trabajadores: int = TRABAJADORES_POR_DEFECTO,
+    max_solicitudes: int = MAX_SOLICITUDES_TRABAJADOR
+) -> None:
+    """
+    Inicia el servicio y bloquea hasta recibir SIGTERM o SIGINT.
+
+    Args:
+        ruta_socket: Ruta del socket Unix (por defecto ruta_socket_por_defecto())
+        trabajadores: Número de procesos trabajadores
+        max_solicitudes: Solicitudes por trabajador antes de reemplazarlo
+
+    Raises:
+        ValueError: Si el número de trabajadores no es positivo, el socket ya está en
+                    uso o su ruta pertenece a otro usuario.
+    """
+    if trabajadores < 1:
+        raise ValueError("Debe haber al menos un trabajador.")
+    ruta_socket = ruta_socket or ruta_socket_por_defecto()
+    if os.path.lexists(ruta_socket):
+        if not socket_es_propio(ruta_socket):
+            raise ValueError(f"{ruta_socket} existe y no es un socket del usuario actual.")
+        # Un socket que ya no responde es de una ejecución anterior que no terminó limpiamente
+        sonda = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sonda.connect(ruta_socket)
+        except OSError:
+            os.remove(ruta_socket)
+        else:
+            raise ValueError(f"Ya hay un servicio escuchando en {ruta_socket}")
+        finally:
+            sonda.close()
+
+    _calentar()
+    servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    mascara_anterior = os.umask(0o077)  # Solo el usuario propietario puede conectarse
+    try:
+        servidor.bind(ruta_socket)
+    finally:
+        os.umask(mascara_anterior)
+    servidor.listen(COLA_CONEXIONES)
+
+    # Lo cargado hasta aquí se comparte con los trabajadores sin copiarse (copy-on-write)
+    gc.freeze()
+    pids: Set[int] = set()
+
+    def _terminar(signum, frame):
+        raise _Terminar()
+
+    signal.signal(signal.SIGTERM, _terminar)
+    signal.signal(signal.SIGINT, _terminar)
+    try:
+        for _ in range(trabajadores):
+            pids.add(_crear_trabajador(servidor, max_solicitudes))
+        print(f"Servicio de liquidación escuchando en {ruta_socket} con {trabajadores} trabajadores")
+        while True:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            if pid in pids:
+                # Trabajador reciclado o caído: se reemplaza
+                pids.discard(pid)
+                pids.add(_crear_trabajador(servidor, max_solicitudes))
+    except _Terminar:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        servidor.close()
+        if os.path.exists(ruta_socket):
+            os.remove(ruta_socket)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servicio local de liquidación con trabajadores pre-creados.")
+    parser.add_argument("--socket", default=None, help="Ruta del socket Unix")
+    parser.add_argument("--trabajadores", type=int, default=TRABAJADORES_POR_DEFECTO)
+    parser.add_argument("--max-solicitudes", type=int, default=MAX_SOLICITUDES_TRABAJADOR)
+    argumentos = parser.parse_args(argv)
+    try:
+        servir(argumentos.socket, argumentos.trabajadores, argumentos.max_solicitudes)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
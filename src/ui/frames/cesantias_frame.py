@@ -1,6 +1,6 @@
 # src/ui/frames/cesantias_frame.py
 import customtkinter as ctk
-from tkcalendar import DateEntry
+from src.ui.widgets.date_picker import DatePicker
 import datetime
 import src.ui.theme as theme # Importar theme para colores/fuentes
 from typing import Any, Dict, Optional
@@ -19,13 +19,13 @@ class CesantiasFrame(ctk.CTkFrame):
         self.entry_salario = ctk.CTkEntry(self, placeholder_text="Ej: 1300000")
 
         self.label_inicio = ctk.CTkLabel(self, text="Fecha Inicio:")
-        self.date_entry_inicio = DateEntry(
+        self.date_entry_inicio = DatePicker(
             self, date_pattern='yyyy-mm-dd', locale='es_CO'
         )
         self.date_entry_inicio.config({"borderwidth": 1})
 
         self.label_fin = ctk.CTkLabel(self, text="Fecha Fin:")
-        self.date_entry_fin = DateEntry(
+        self.date_entry_fin = DatePicker(
             self, date_pattern='yyyy-mm-dd', locale='es_CO'
         )
         self.date_entry_fin.config({"borderwidth": 1})
@@ -109,6 +109,16 @@ class CesantiasFrame(ctk.CTkFrame):
             # self.result_intereses_label.configure(text_color=theme.COLOR_SIDEBAR_TEXT)
 
 
+    def set_change_command(self, command):
+        """
+        Asigna el comando que se invoca cada vez que cambia una entrada
+        (tecla en el salario o fecha seleccionada), para el recálculo en vivo.
+        """
+        self.entry_salario.bind("<KeyRelease>", lambda event: command(), add="+")
+        for date_entry in (self.date_entry_inicio, self.date_entry_fin):
+            date_entry.bind("<<DateEntrySelected>>", lambda event: command(), add="+")
+            date_entry.bind("<KeyRelease>", lambda event: command(), add="+")
+
     def set_calculate_command(self, command):
         """Asigna comando al botón Calcular."""
         self.calculate_button.configure(command=command)
@@ -1,6 +1,6 @@
 # src/ui/frames/input_frame.py
 import customtkinter as ctk
-from tkcalendar import DateEntry
+from src.ui.widgets.date_picker import DatePicker
 import datetime
 
 class InputFrame(ctk.CTkFrame):
@@ -14,23 +14,19 @@ class InputFrame(ctk.CTkFrame):
 
         # --- Widgets ---
         self.label_inicio = ctk.CTkLabel(self, text="Fecha Inicio:")
-        self.date_entry_inicio = DateEntry(
+        self.date_entry_inicio = DatePicker(
             self,
             date_pattern='yyyy-mm-dd', # Formato de fecha
-            selectmode='day',
-            showweeknumbers=False,
-            locale='es_CO' # Para que muestre calendario en español si está instalado locale
+            locale='es_CO' # Nombres de meses/días en español (compartidos entre widgets)
         )
-        # Estilo básico para DateEntry (puedes personalizar más si lo necesitas)
+        # Estilo básico para DatePicker (puedes personalizar más si lo necesitas)
         self.date_entry_inicio.config({"borderwidth": 1})
 
 
         self.label_fin = ctk.CTkLabel(self, text="Fecha Fin:")
-        self.date_entry_fin = DateEntry(
+        self.date_entry_fin = DatePicker(
             self,
             date_pattern='yyyy-mm-dd',
-            selectmode='day',
-            showweeknumbers=False,
             locale='es_CO'
         )
         self.date_entry_fin.config({"borderwidth": 1})
@@ -1,6 +1,6 @@
 # src/ui/frames/intereses_cesantias_frame.py
 import customtkinter as ctk
-from tkcalendar import DateEntry
+from src.ui.widgets.date_picker import DatePicker
 import datetime
 import src.ui.theme as theme
 from typing import Dict, Any
@@ -20,11 +20,11 @@ class InteresesCesantiasFrame(ctk.CTkFrame):
         self.entry_cesantias = ctk.CTkEntry(self, placeholder_text="Ej: 1440606")
 
         self.label_inicio = ctk.CTkLabel(self, text="Fecha Inicio Periodo:")
-        self.date_entry_inicio = DateEntry(self, date_pattern='yyyy-mm-dd', locale='es_CO')
+        self.date_entry_inicio = DatePicker(self, date_pattern='yyyy-mm-dd', locale='es_CO')
         self.date_entry_inicio.config({"borderwidth": 1})
 
         self.label_fin = ctk.CTkLabel(self, text="Fecha Fin Periodo:")
-        self.date_entry_fin = DateEntry(self, date_pattern='yyyy-mm-dd', locale='es_CO')
+        self.date_entry_fin = DatePicker(self, date_pattern='yyyy-mm-dd', locale='es_CO')
         self.date_entry_fin.config({"borderwidth": 1})
 
         self.calculate_button = ctk.CTkButton(self, text="Calcular Intereses")
@@ -168,6 +168,9 @@ class MainMenuFrame(ctk.CTkFrame):
         self.cards_main["CalcDias"] = ToolCard(self.main_content_frame, text="Calcular Días (30/360)")
         self.cards_main["CalcDias"].grid(row=row_idx, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
         row_idx += 1
+        self.cards_main["RosterGrid"] = ToolCard(self.main_content_frame, text="Liquidación de Nómina Completa (Roster)")
+        self.cards_main["RosterGrid"].grid(row=row_idx, column=0, columnspan=2, padx=5, pady=5, sticky="ew")
+        row_idx += 1
 
         # --- Sección Prestaciones Sociales ---
         prestaciones_label = ctk.CTkLabel(self.main_content_frame, text="Prestaciones Sociales", text_color=theme.COLOR_SECTION_HEADER, font=header_font)
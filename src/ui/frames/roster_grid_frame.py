@@ -0,0 +1,181 @@
+# src/ui/frames/roster_grid_frame.py
+import tkinter as tk
+from tkinter import filedialog
+import customtkinter as ctk
+import src.ui.theme as theme
+from typing import Callable, List, Optional, Sequence, Tuple
+
+class RosterGridFrame(ctk.CTkFrame):
+    """
+    Frame con la tabla de resultados por empleado de un roster completo.
+
+    La tabla es virtual: solo existen los ítems de canvas de las filas visibles
+    y al desplazarse se reutilizan cambiando su texto. Los valores de cada fila
+    se piden a un proveedor (obtener_fila) que puede calcularlos de forma
+    perezosa; si una fila aún no está lista se muestra un marcador.
+    """
+    COLUMNAS: Tuple[Tuple[str, int], ...] = (
+        ("Empleado", 110),
+        ("Días", 60),
+        ("Cesantías", 150),
+        ("Intereses", 130),
+        ("Prima Sem. 1", 140),
+        ("Prima Sem. 2", 140),
+    )
+    ALTO_FILA = 24
+    TEXTO_PENDIENTE = "…"
+
+    def __init__(self, master, **kwargs):
+        kwargs.update({"fg_color": theme.COLOR_MAIN_BG})
+        super().__init__(master, **kwargs)
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        # --- Estado de la tabla virtual ---
+        self._total_filas = 0
+        self._primera_fila = 0
+        self._obtener_fila: Optional[Callable[[int], Optional[Sequence[str]]]] = None
+        self._celdas: List[List[int]] = []  # Ítems de texto por fila visible
+        self._fondos: List[int] = []        # Rectángulo de fondo por fila visible
+
+        # --- Widgets ---
+        self.top_bar = ctk.CTkFrame(self, fg_color="transparent")
+        self.top_bar.grid_columnconfigure(1, weight=1)
+        self.load_button = ctk.CTkButton(self.top_bar, text="Cargar Roster (CSV o binario)")
+        self.status_label_var = ctk.StringVar(value="Ningún roster cargado.")
+        self.status_label = ctk.CTkLabel(self.top_bar, textvariable=self.status_label_var, anchor="w")
+
+        self.header_canvas = tk.Canvas(self, height=self.ALTO_FILA, highlightthickness=0, bg=theme.COLOR_SIDEBAR_BG)
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=theme.COLOR_MAIN_BG)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+
+        self.back_button = ctk.CTkButton(self, text="Volver al Menú", fg_color="gray")
+
+        # --- Layout ---
+        self.top_bar.grid(row=0, column=0, columnspan=2, padx=10, pady=(10, 5), sticky="ew")
+        self.load_button.grid(row=0, column=0, padx=(0, 10), sticky="w")
+        self.status_label.grid(row=0, column=1, sticky="ew")
+
+        self.header_canvas.grid(row=1, column=0, padx=(10, 0), sticky="ew")
+        self.canvas.grid(row=2, column=0, padx=(10, 0), sticky="nsew")
+        self.scrollbar.grid(row=2, column=1, padx=(0, 10), sticky="ns")
+
+        self.back_button.grid(row=3, column=0, columnspan=2, padx=10, pady=(10, 10), sticky="ew")
+
+        self._dibujar_encabezado()
+
+        # --- Eventos ---
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)          # Windows / macOS
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-3))  # Linux
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+    # --- API para el controlador ---
+    def set_rows(self, total_filas: int, obtener_fila: Optional[Callable[[int], Optional[Sequence[str]]]]):
+        """
+        Define el número de filas y la función que entrega los textos de una fila.
+        obtener_fila(i) retorna una secuencia de textos (una por columna) o None
+        si la fila aún no está calculada.
+        """
+        self._total_filas = total_filas
+        self._obtener_fila = obtener_fila
+        self._primera_fila = 0
+        self.refresh()
+
+    def refresh(self):
+        """Vuelve a pintar las filas visibles (ej: cuando termina de calcularse un bloque)."""
+        for slot, (items, fondo) in enumerate(zip(self._celdas, self._fondos)):
+            fila = self._primera_fila + slot
+            if fila >= self._total_filas or self._obtener_fila is None:
+                textos: Sequence[str] = ("",) * len(items)
+            else:
+                textos = self._obtener_fila(fila) or (str(fila + 1),) + (self.TEXTO_PENDIENTE,) * (len(items) - 1)
+            for item, texto in zip(items, textos):
+                self.canvas.itemconfigure(item, text=texto)
+            color = theme.COLOR_CARD_HOVER if fila % 2 else theme.COLOR_MAIN_BG
+            self.canvas.itemconfigure(fondo, fill=color if fila < self._total_filas else theme.COLOR_MAIN_BG)
+        self._actualizar_scrollbar()
+
+    def visible_range(self) -> Tuple[int, int]:
+        """Retorna el rango [inicio, fin) de filas visibles."""
+        return self._primera_fila, min(self._total_filas, self._primera_fila + len(self._celdas))
+
+    def scroll_rows(self, delta: int):
+        """Desplaza la tabla delta filas (negativo hacia arriba)."""
+        self._ir_a_fila(self._primera_fila + delta)
+
+    def ask_roster_path(self) -> str:
+        """Pide al usuario el archivo de roster. Retorna '' si se cancela."""
+        return filedialog.askopenfilename(
+            title="Seleccionar roster",
+            filetypes=[("Roster", "*.csv *.bin *.roster"), ("Todos los archivos", "*.*")]
+        )
+
+    def update_status(self, text: str):
+        self.status_label_var.set(text)
+
+    def show_error(self, error_msg: str):
+        self.status_label_var.set(f"Error: {error_msg}")
+
+    def set_load_command(self, command):
+        self.load_button.configure(command=command)
+
+    def set_back_command(self, command):
+        self.back_button.configure(command=command)
+
+    # --- Internos ---
+    def _dibujar_encabezado(self):
+        x = 0
+        for titulo, ancho in self.COLUMNAS:
+            self.header_canvas.create_text(
+                x + ancho - 8, self.ALTO_FILA // 2, text=titulo, anchor="e",
+                font=(theme.FONT_FAMILY_DEFAULT, 12, "bold"), fill=theme.COLOR_SECTION_HEADER
+            )
+            x += ancho
+
+    def _on_resize(self, event):
+        """Crea o elimina ítems de canvas para que haya uno por fila visible."""
+        filas_visibles = max(1, event.height // self.ALTO_FILA + 1)
+        ancho_total = max(event.width, sum(ancho for _, ancho in self.COLUMNAS))
+        while len(self._celdas) < filas_visibles:
+            slot = len(self._celdas)
+            y = slot * self.ALTO_FILA
+            self._fondos.append(self.canvas.create_rectangle(0, y, ancho_total, y + self.ALTO_FILA, width=0))
+            items, x = [], 0
+            for _, ancho in self.COLUMNAS:
+                items.append(self.canvas.create_text(
+                    x + ancho - 8, y + self.ALTO_FILA // 2, anchor="e",
+                    font=(theme.FONT_FAMILY_DEFAULT, 12), fill=theme.COLOR_SIDEBAR_TEXT
+                ))
+                x += ancho
+            self._celdas.append(items)
+        while len(self._celdas) > filas_visibles:
+            for item in self._celdas.pop():
+                self.canvas.delete(item)
+            self.canvas.delete(self._fondos.pop())
+        self._ir_a_fila(self._primera_fila)
+
+    def _on_mousewheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._ir_a_fila(int(float(args[1]) * self._total_filas))
+        elif args[0] == "scroll":
+            paso = int(args[1]) * (max(1, len(self._celdas) - 1) if args[2] == "pages" else 1)
+            self.scroll_rows(paso)
+
+    def _ir_a_fila(self, fila: int):
+        maximo = max(0, self._total_filas - len(self._celdas) + 1)
+        self._primera_fila = max(0, min(fila, maximo))
+        self.refresh()
+
+    def _actualizar_scrollbar(self):
+        if self._total_filas <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        inicio, fin = self.visible_range()
+        self.scrollbar.set(inicio / self._total_filas, fin / self._total_filas)
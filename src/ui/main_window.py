@@ -7,6 +7,7 @@ from .frames.days_calculator_frame import DaysCalculatorFrame
 from .frames.cesantias_frame import CesantiasFrame
 from .frames.intereses_cesantias_frame import InteresesCesantiasFrame
 from .frames.prima_frame import PrimaFrame
+from .frames.roster_grid_frame import RosterGridFrame
 
 class MainWindow(ctk.CTk):
     """
@@ -47,7 +48,7 @@ class MainWindow(ctk.CTk):
         self.frames = {}
 
         # --- Crear e inicializar todos los frames ---
-        for F in (MainMenuFrame, DaysCalculatorFrame, CesantiasFrame, InteresesCesantiasFrame, PrimaFrame):
+        for F in (MainMenuFrame, DaysCalculatorFrame, CesantiasFrame, InteresesCesantiasFrame, PrimaFrame, RosterGridFrame):
             page_name = F.__name__
             # Crear instancia pasando el contenedor como master
             frame = F(master=container)
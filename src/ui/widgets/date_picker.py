@@ -0,0 +1,193 @@
+# src/ui/widgets/date_picker.py
+import calendar
+import datetime
+import tkinter as tk
+from functools import lru_cache
+from tkinter import ttk
+from typing import List, Optional, Tuple
+
+try:
+    from babel.dates import get_day_names, get_month_names
+except ImportError:  # babel es opcional (ver requirements.txt)
+    get_day_names = None
+    get_month_names = None
+
+# Nombres por defecto si babel no está disponible
+_MESES_ES: Tuple[str, ...] = (
+    "enero", "febrero", "marzo", "abril", "mayo", "junio",
+    "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre",
+)
+_DIAS_ES: Tuple[str, ...] = ("lu", "ma", "mi", "ju", "vi", "sá", "do")
+
+# Patrones de fecha soportados (sintaxis de tkcalendar -> strftime)
+_PATRONES = {"yyyy-mm-dd": "%Y-%m-%d", "dd/mm/yyyy": "%d/%m/%Y"}
+
+
+@lru_cache(maxsize=None)
+def datos_locale(locale: str = "es_CO") -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Nombres de los meses y abreviaturas de los días (lunes primero) del locale.
+
+    Se cargan una sola vez por locale y se comparten entre todos los DatePicker
+    (tkcalendar vuelve a cargar y procesar los datos de babel en cada widget).
+    """
+    if get_month_names is None:
+        return _MESES_ES, _DIAS_ES
+    try:
+        meses = get_month_names("wide", locale=locale)
+        dias = get_day_names("short", locale=locale)
+    except Exception:  # Locale no disponible en babel
+        return _MESES_ES, _DIAS_ES
+    return tuple(meses[m] for m in range(1, 13)), tuple(dias[d] for d in range(7))
+
+
+class DatePicker(ttk.Frame):
+    """
+    Campo de fecha con calendario desplegable, liviano y compatible con el uso
+    que la aplicación hacía de tkcalendar.DateEntry: get_date(), set_date() y el
+    evento virtual <<DateEntrySelected>> al elegir un día.
+
+    El calendario emergente (un Toplevel con su grilla de días) no se crea al
+    construir el widget sino la primera vez que se abre, y luego se reutiliza.
+    Los enlaces de teclado (<Key...>) se redirigen al campo de texto interno.
+    """
+    EVENTO_SELECCION = "<<DateEntrySelected>>"
+
+    def __init__(self, master, date_pattern: str = "yyyy-mm-dd", locale: str = "es_CO", **kwargs):
+        super().__init__(master, **kwargs)
+        if date_pattern not in _PATRONES:
+            raise ValueError(f"Patrón de fecha no soportado: {date_pattern}")
+        self._formato = _PATRONES[date_pattern]
+        self._locale = locale
+        self._fecha = datetime.date.today()
+
+        self.grid_columnconfigure(0, weight=1)
+        self.entry = ttk.Entry(self)
+        self.button = ttk.Button(self, text="▼", width=2, command=self.toggle_calendar)
+        self.entry.grid(row=0, column=0, sticky="ew")
+        self.button.grid(row=0, column=1, sticky="ns")
+        self._mostrar_fecha()
+
+        self.entry.bind("<FocusOut>", self._on_focus_out, add="+")
+        self.entry.bind("<Alt-Down>", lambda event: self.open_calendar(), add="+")
+
+        # --- Calendario emergente (perezoso) ---
+        self._popup: Optional[tk.Toplevel] = None
+        self._titulo_var: Optional[tk.StringVar] = None
+        self._botones_dia: List[ttk.Button] = []
+        self._mes_visible: Tuple[int, int] = (self._fecha.year, self._fecha.month)
+
+    # --- API compatible con DateEntry ---
+    def get_date(self) -> datetime.date:
+        """Devuelve la fecha escrita o seleccionada (ValueError si el texto no es una fecha)."""
+        texto = self.entry.get().strip()
+        try:
+            self._fecha = datetime.datetime.strptime(texto, self._formato).date()
+        except ValueError:
+            raise ValueError(f"Fecha inválida: '{texto}'")
+        return self._fecha
+
+    def set_date(self, fecha: datetime.date) -> None:
+        """Muestra la fecha indicada en el campo."""
+        self._fecha = fecha
+        self._mostrar_fecha()
+
+    def bind(self, sequence=None, func=None, add=None):
+        """Los eventos de teclado se enlazan al campo de texto; el resto, al widget."""
+        if sequence and sequence.startswith("<Key"):
+            return self.entry.bind(sequence, func, add)
+        return super().bind(sequence, func, add)
+
+    # --- Calendario ---
+    def toggle_calendar(self) -> None:
+        if self._popup is not None and self._popup.winfo_viewable():
+            self.close_calendar()
+        else:
+            self.open_calendar()
+
+    def open_calendar(self) -> None:
+        """Abre el calendario debajo del campo (lo crea la primera vez)."""
+        try:
+            fecha = self.get_date()
+        except ValueError:
+            fecha = self._fecha
+        if self._popup is None:
+            self._crear_popup()
+        self._mes_visible = (fecha.year, fecha.month)
+        self._dibujar_mes()
+        self._popup.geometry(f"+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}")
+        self._popup.deiconify()
+        self._popup.lift()
+        self._popup.focus_set()
+
+    def close_calendar(self) -> None:
+        if self._popup is not None:
+            self._popup.withdraw()
+
+    # --- Internos ---
+    def _mostrar_fecha(self) -> None:
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, self._fecha.strftime(self._formato))
+
+    def _on_focus_out(self, event=None) -> None:
+        # Un texto inválido vuelve a la última fecha válida
+        try:
+            self.get_date()
+        except ValueError:
+            self._mostrar_fecha()
+
+    def _crear_popup(self) -> None:
+        _, dias = datos_locale(self._locale)
+        self._popup = tk.Toplevel(self)
+        self._popup.withdraw()
+        self._popup.overrideredirect(True)
+        self._popup.bind("<Escape>", lambda event: self.close_calendar())
+        self._popup.bind("<FocusOut>", self._on_popup_focus_out)
+
+        encabezado = ttk.Frame(self._popup)
+        encabezado.grid(row=0, column=0, columnspan=7, sticky="ew")
+        encabezado.grid_columnconfigure(1, weight=1)
+        self._titulo_var = tk.StringVar()
+        ttk.Button(encabezado, text="◀", width=2, command=lambda: self._cambiar_mes(-1)).grid(row=0, column=0)
+        ttk.Label(encabezado, textvariable=self._titulo_var, anchor="center").grid(row=0, column=1, sticky="ew")
+        ttk.Button(encabezado, text="▶", width=2, command=lambda: self._cambiar_mes(1)).grid(row=0, column=2)
+
+        for columna, dia in enumerate(dias):
+            ttk.Label(self._popup, text=dia, anchor="center", width=3).grid(row=1, column=columna)
+        # 6 semanas x 7 días; los botones se reutilizan al cambiar de mes
+        for indice in range(42):
+            boton = ttk.Button(self._popup, width=3, command=lambda indice=indice: self._on_dia(indice))
+            boton.grid(row=2 + indice // 7, column=indice % 7)
+            self._botones_dia.append(boton)
+
+    def _dibujar_mes(self) -> None:
+        meses, _ = datos_locale(self._locale)
+        anio, mes = self._mes_visible
+        self._titulo_var.set(f"{meses[mes - 1].capitalize()} {anio}")
+        primer_dia, dias_mes = calendar.monthrange(anio, mes)
+        for indice, boton in enumerate(self._botones_dia):
+            dia = indice - primer_dia + 1
+            if 1 <= dia <= dias_mes:
+                boton.configure(text=str(dia), state="normal")
+            else:
+                boton.configure(text="", state="disabled")
+
+    def _on_dia(self, indice: int) -> None:
+        anio, mes = self._mes_visible
+        primer_dia, _ = calendar.monthrange(anio, mes)
+        self.set_date(datetime.date(anio, mes, indice - primer_dia + 1))
+        self.close_calendar()
+        self.entry.focus_set()
+        self.event_generate(self.EVENTO_SELECCION)
+
+    def _cambiar_mes(self, delta: int) -> None:
+        anio, mes = self._mes_visible
+        anio, mes = divmod(anio * 12 + mes - 1 + delta, 12)
+        self._mes_visible = (anio, mes + 1)
+        self._dibujar_mes()
+
+    def _on_popup_focus_out(self, event=None) -> None:
+        # Cierra el calendario si el foco sale a otra ventana/widget externo
+        foco = self._popup.focus_get() if self._popup is not None else None
+        if foco is None or not str(foco).startswith(str(self._popup)):
+            self.close_calendar()
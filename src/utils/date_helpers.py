@@ -1,6 +1,7 @@
 """
 Utilidades para el manejo de fechas en la aplicación.
 """
+import calendar
 import datetime
 from typing import Dict, Optional, Tuple
 from src.core.constants import DIAS_ANIO_COMERCIAL, DIAS_MES_COMERCIAL
@@ -65,6 +66,41 @@ def calcular_dias_liquidacion(fecha_inicio: datetime.date, fecha_fin: datetime.d
 # Mantener compatibilidad con código que pueda usar calcular_dias_360
 calcular_dias_360 = calcular_dias_liquidacion
 
+def fecha_a_serial_360(fecha: datetime.date) -> int:
+    """
+    Convierte una fecha a su número de serie en la convención 30/360.
+
+    El serial cuenta días comerciales desde el año 0 (año * 360 + mes * 30 + día,
+    con el día 31 tomado como 30), de modo que para dos fechas cualesquiera
+    calcular_dias_liquidacion(a, b) == fecha_a_serial_360(b) - fecha_a_serial_360(a) + 1.
+
+    Args:
+        fecha: Fecha a convertir
+
+    Returns:
+        Serial 30/360 de la fecha (int)
+    """
+    dia = 30 if fecha.day == 31 else fecha.day
+    return fecha.year * DIAS_ANIO_COMERCIAL + (fecha.month - 1) * DIAS_MES_COMERCIAL + (dia - 1)
+
+def serial_360_a_fecha(serial: int) -> datetime.date:
+    """
+    Convierte un serial 30/360 de vuelta a una fecha del calendario.
+
+    Los días comerciales que no existen en el calendario (ej: 30 de febrero)
+    se ajustan al último día real del mes.
+
+    Args:
+        serial: Serial 30/360 (ver fecha_a_serial_360)
+
+    Returns:
+        Fecha correspondiente
+    """
+    anio, resto = divmod(serial, DIAS_ANIO_COMERCIAL)
+    mes, dia = divmod(resto, DIAS_MES_COMERCIAL)
+    ultimo_dia = calendar.monthrange(anio, mes + 1)[1]
+    return datetime.date(anio, mes + 1, min(dia + 1, ultimo_dia))
+
 def obtener_fecha_inicio_semestre(anio: int, semestre: int) -> datetime.date:
     """
     Obtiene la fecha de inicio de un semestre específico.
@@ -0,0 +1,315 @@
+"""
+Exportación masiva de resultados de liquidación por lotes.
+
+Los resultados se escriben en formato largo, una fila por (empleado, concepto):
+
+    id_empleado (int64) | concepto (código de CONCEPTOS) | valor (float64) | dias (int32)
+
+Los conceptos exportados son CESANTIAS, INTERESES, PRIMA_S1 y PRIMA_S2; los días
+de las filas de prima son los días del semestre correspondiente.
+
+Formatos:
+    - Parquet y Arrow IPC (requieren pyarrow, dependencia opcional), con
+      columnas tipadas y compresión opcional.
+    - CSV comprimido con gzip, sin dependencias adicionales.
+
+Cada archivo registra la versión de los parámetros legales con que se
+calcularon los resultados (ResultadoLote.version_parametros): en los
+metadatos del esquema Arrow (clave "version_parametros") y, en el CSV, en una
+línea de comentario antes del encabezado ("# version_parametros: 2025.1"; ver
+leer_version_csv). Todos los bloques de una exportación deben tener la misma versión.
+
+La escritura se hace por bloques: cada bloque de columnas se convierte
+directamente en arreglos de Arrow (sin copiar los buffers) o en filas de CSV,
+sin construir un diccionario por fila.
+"""
+import csv
+import gzip
+import os
+from array import array
+from itertools import chain
+from typing import IO, Iterable, Iterator, Optional, Sequence, Tuple
+
+from src.core.batch import ResultadoLote
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional
+    pa = None
+    pq = None
+
+# Conceptos exportados: (código en CONCEPTOS, atributo de valor, atributo de días)
+CONCEPTOS_EXPORTADOS: Tuple[Tuple[str, str, str], ...] = (
+    ("CESANTIAS", "cesantias", "dias"),
+    ("INTERESES", "intereses", "dias"),
+    ("PRIMA_S1", "prima_semestre_1", "dias_semestre_1"),
+    ("PRIMA_S2", "prima_semestre_2", "dias_semestre_2"),
+)
+
+COLUMNAS_EXPORTACION: Tuple[str, ...] = ("id_empleado", "concepto", "valor", "dias")
+
+TAMANO_BLOQUE_EXPORTACION = 65536
+
+# Clave de la versión de parámetros en los metadatos de Arrow y en el comentario del CSV
+METADATO_VERSION = "version_parametros"
+_PREFIJO_VERSION_CSV = f"# {METADATO_VERSION}: "
+
+# Bloque de exportación: (ids de empleado, resultados alineados con los ids)
+BloqueResultados = Tuple[Sequence[int], ResultadoLote]
+
+def dividir_en_bloques(
+    ids_empleado: Sequence[int],
+    resultado: ResultadoLote,
+    tamano_bloque: int = TAMANO_BLOQUE_EXPORTACION
+) -> Iterator[BloqueResultados]:
+    """
+    Divide un resultado por lotes en bloques de a lo sumo tamano_bloque empleados.
+
+    Args:
+        ids_empleado: Columna id_empleado del roster
+        resultado: Resultado alineado con ids_empleado
+        tamano_bloque: Empleados por bloque
+
+    Returns:
+        Iterador de bloques (ids, ResultadoLote)
+    """
+    n = len(ids_empleado)
+    if len(resultado) != n:
+        raise ValueError("Los ids de empleado y los resultados deben tener el mismo número de filas.")
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(n, inicio + tamano_bloque)
+        yield ids_empleado[inicio:fin], ResultadoLote(
+            dias=resultado.dias[inicio:fin],
+            cesantias=resultado.cesantias[inicio:fin],
+            intereses=resultado.intereses[inicio:fin],
+            prima_semestre_1=resultado.prima_semestre_1[inicio:fin],
+            prima_semestre_2=resultado.prima_semestre_2[inicio:fin],
+            dias_semestre_1=resultado.dias_semestre_1[inicio:fin],
+            dias_semestre_2=resultado.dias_semestre_2[inicio:fin],
+            version_parametros=resultado.version_parametros,
+        )
+
+
+def _con_version(bloques: Iterable[BloqueResultados]) -> Tuple[Optional[str], Iterator[BloqueResultados]]:
+    """
+    Versión de parámetros de los bloques (la del primero) y los bloques, que se
+    siguen leyendo por demanda.
+
+    El iterador retornado lanza ValueError si un bloque tiene otra versión.
+    """
+    iterador = iter(bloques)
+    primero = next(iterador, None)
+    if primero is None:
+        return None, iter(())
+    version = primero[1].version_parametros
+
+    def verificados() -> Iterator[BloqueResultados]:
+        for bloque in chain((primero,), iterador):
+            if bloque[1].version_parametros != version:
+                raise ValueError(
+                    f"Los bloques exportados tienen versiones de parámetros distintas "
+                    f"({version} y {bloque[1].version_parametros})."
+                )
+            yield bloque
+    return version, verificados()
+
+# --- Arrow / Parquet ---
+
+def _requerir_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "La exportación a Parquet/Arrow requiere 'pyarrow' (pip install pyarrow). "
+            "Use exportar_csv_gzip como alternativa."
+        )
+
+
+def esquema_arrow(version_parametros: Optional[str] = None):
+    """Retorna el esquema Arrow de la exportación (con la versión de parámetros en los metadatos, si se indica)."""
+    _requerir_pyarrow()
+    return pa.schema([
+        ("id_empleado", pa.int64()),
+        ("concepto", pa.dictionary(pa.int8(), pa.string())),
+        ("valor", pa.float64()),
+        ("dias", pa.int32()),
+    ], metadata={METADATO_VERSION: version_parametros} if version_parametros is not None else None)
+
+
+def _arreglo_arrow(tipo, datos: Sequence, codigo: str):
+    """Crea un arreglo Arrow sobre el buffer de la columna (copia solo si no es un buffer del tipo exacto)."""
+    if not (isinstance(datos, (array, memoryview)) and _codigo(datos) == codigo):
+        datos = array(codigo, datos)
+    return pa.Array.from_buffers(tipo, len(datos), [None, pa.py_buffer(datos)])
+
+
+def _codigo(datos) -> str:
+    return datos.typecode if isinstance(datos, array) else datos.format
+
+
+def _tabla_arrow(ids_empleado: Sequence[int], resultado: ResultadoLote, esquema):
+    """Convierte un bloque en una tabla Arrow en formato largo."""
+    n = len(ids_empleado)
+    codigos = pa.array([codigo for codigo, _, _ in CONCEPTOS_EXPORTADOS], type=pa.string())
+    ids = _arreglo_arrow(pa.int64(), ids_empleado, "q")
+    columnas_id, columnas_concepto, columnas_valor, columnas_dias = [], [], [], []
+    for indice, (_, atributo_valor, atributo_dias) in enumerate(CONCEPTOS_EXPORTADOS):
+        columnas_id.append(ids)
+        indices = _arreglo_arrow(pa.int8(), array("b", [indice]) * n, "b")
+        columnas_concepto.append(pa.DictionaryArray.from_arrays(indices, codigos))
+        columnas_valor.append(_arreglo_arrow(pa.float64(), getattr(resultado, atributo_valor), "d"))
+        columnas_dias.append(_arreglo_arrow(pa.int32(), getattr(resultado, atributo_dias), "i"))
+    return pa.Table.from_arrays(
+        [
+            pa.chunked_array(columnas_id),
+            pa.chunked_array(columnas_concepto),
+            pa.chunked_array(columnas_valor),
+            pa.chunked_array(columnas_dias),
+        ],
+        schema=esquema,
+    )
+
+
+def exportar_parquet(ruta: str, bloques: Iterable[BloqueResultados], compresion: Optional[str] = "zstd") -> int:
+    """
+    Exporta los resultados a un archivo Parquet, un row group por bloque.
+
+    Args:
+        ruta: Archivo de destino
+        bloques: Bloques (ids, ResultadoLote), ver dividir_en_bloques
+        compresion: Códec de Parquet ('zstd', 'snappy', 'gzip', ...) o None
+
+    Returns:
+        Número de filas escritas
+    """
+    _requerir_pyarrow()
+    filas = 0
+    version, bloques = _con_version(bloques)
+    esquema = esquema_arrow(version)
+    with pq.ParquetWriter(ruta, esquema, compression=compresion or "none") as escritor:
+        for ids_empleado, resultado in bloques:
+            tabla = _tabla_arrow(ids_empleado, resultado, esquema)
+            escritor.write_table(tabla)
+            filas += tabla.num_rows
+    return filas
+
+
+def exportar_arrow(ruta: str, bloques: Iterable[BloqueResultados], compresion: Optional[str] = None) -> int:
+    """
+    Exporta los resultados a un archivo Arrow IPC (formato de archivo / Feather v2).
+
+    Args:
+        ruta: Archivo de destino
+        bloques: Bloques (ids, ResultadoLote), ver dividir_en_bloques
+        compresion: 'lz4', 'zstd' o None
+
+    Returns:
+        Número de filas escritas
+    """
+    _requerir_pyarrow()
+    filas = 0
+    opciones = pa.ipc.IpcWriteOptions(compression=compresion)
+    version, bloques = _con_version(bloques)
+    esquema = esquema_arrow(version)
+    with pa.OSFile(ruta, "wb") as destino:
+        with pa.ipc.new_file(destino, esquema, options=opciones) as escritor:
+            for ids_empleado, resultado in bloques:
+                tabla = _tabla_arrow(ids_empleado, resultado, esquema)
+                escritor.write_table(tabla)
+                filas += tabla.num_rows
+    return filas
+
+# --- CSV comprimido ---
+
+def exportar_csv_gzip(ruta: str, bloques: Iterable[BloqueResultados], nivel_compresion: int = 6) -> int:
+    """
+    Exporta los resultados a un CSV comprimido con gzip, escribiendo bloque a bloque.
+
+    Args:
+        ruta: Archivo de destino (normalmente *.csv.gz)
+        bloques: Bloques (ids, ResultadoLote), ver dividir_en_bloques
+        nivel_compresion: Nivel de gzip (1 = rápido, 9 = máximo)
+
+    Returns:
+        Número de filas escritas
+    """
+    filas = 0
+    version, bloques = _con_version(bloques)
+    with gzip.open(ruta, "wt", newline="", encoding="utf-8", compresslevel=nivel_compresion) as archivo:
+        if version is not None:
+            archivo.write(f"{_PREFIJO_VERSION_CSV}{version}\r\n")
+        escritor = csv.writer(archivo)
+        escritor.writerow(COLUMNAS_EXPORTACION)
+        for ids_empleado, resultado in bloques:
+            for codigo, atributo_valor, atributo_dias in CONCEPTOS_EXPORTADOS:
+                escritor.writerows(zip(
+                    ids_empleado,
+                    (codigo,) * len(ids_empleado),
+                    map(repr, getattr(resultado, atributo_valor)),
+                    getattr(resultado, atributo_dias),
+                ))
+                filas += len(ids_empleado)
+    return filas
+
+def leer_version_csv(archivo: IO[str]) -> Optional[str]:
+    """
+    Lee la línea de versión de parámetros de un CSV exportado (abierto en modo
+    texto) y deja el archivo en el encabezado, listo para csv.reader/DictReader.
+
+    Returns:
+        La versión, o None si el archivo no la registra
+    """
+    posicion = archivo.tell()
+    linea = archivo.readline()
+    if linea.startswith(_PREFIJO_VERSION_CSV):
+        return linea[len(_PREFIJO_VERSION_CSV):].rstrip("\r\n")
+    archivo.seek(posicion)
+    return None
+
+# --- Punto de entrada ---
+
+def exportar_resultados(
+    ruta: str,
+    ids_empleado: Sequence[int],
+    resultado: ResultadoLote,
+    formato: Optional[str] = None,
+    compresion: Optional[str] = "zstd",
+    tamano_bloque: int = TAMANO_BLOQUE_EXPORTACION
+) -> int:
+    """
+    Exporta un resultado por lotes al formato indicado (o deducido de la extensión).
+
+    Args:
+        ruta: Archivo de destino (.parquet, .arrow/.feather o .csv.gz)
+        ids_empleado: Columna id_empleado del roster liquidado
+        resultado: ResultadoLote alineado con ids_empleado
+        formato: 'parquet', 'arrow' o 'csv'; si es None se deduce de la extensión
+        compresion: Códec para Parquet/Arrow, o None para no comprimir (se ignora
+                    en CSV, que siempre usa gzip)
+        tamano_bloque: Empleados por bloque de escritura
+
+    Returns:
+        Número de filas escritas
+
+    Raises:
+        ValueError: Si el formato no es soportado.
+        ImportError: Si se pide Parquet/Arrow y pyarrow no está instalado.
+    """
+    if formato is None:
+        nombre = os.path.basename(ruta).lower()
+        if nombre.endswith(".parquet"):
+            formato = "parquet"
+        elif nombre.endswith((".arrow", ".feather", ".ipc")):
+            formato = "arrow"
+        elif nombre.endswith(".csv.gz"):
+            formato = "csv"
+        else:
+            raise ValueError(f"No se pudo deducir el formato de exportación de '{ruta}'")
+
+    bloques = dividir_en_bloques(ids_empleado, resultado, tamano_bloque)
+    if formato == "parquet":
+        return exportar_parquet(ruta, bloques, compresion=compresion)
+    if formato == "arrow":
+        return exportar_arrow(ruta, bloques, compresion=compresion)
+    if formato == "csv":
+        return exportar_csv_gzip(ruta, bloques)
+    raise ValueError(f"Formato de exportación no soportado: {formato}")
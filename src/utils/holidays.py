@@ -0,0 +1,175 @@
+"""
+Calendario de festivos de Colombia y conteo de días hábiles (para vacaciones).
+
+Festivos (Ley 51 de 1983, "Ley Emiliani"):
+    - Fijos: 1 de enero, 1 de mayo, 20 de julio, 7 de agosto, 8 y 25 de diciembre.
+    - Trasladables al lunes siguiente: 6 de enero, 19 de marzo, 29 de junio,
+      15 de agosto, 12 de octubre, 1 y 11 de noviembre.
+    - Según la Pascua: Jueves y Viernes Santo; Ascensión, Corpus Christi y
+      Sagrado Corazón (trasladados a lunes).
+
+Cada año se construye una sola vez (perezosamente, al primer uso) como un
+mapa de bits de días hábiles (ni domingo ni festivo) más la suma acumulada de
+bits por byte; contar los días hábiles entre dos fechas cuesta dos búsquedas
+en la suma acumulada y un popcount del byte parcial.
+"""
+import datetime
+from array import array
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+# Festivos de fecha fija (mes, día)
+FESTIVOS_FIJOS: Tuple[Tuple[int, int], ...] = ((1, 1), (5, 1), (7, 20), (8, 7), (12, 8), (12, 25))
+
+# Festivos que se trasladan al lunes siguiente (mes, día)
+FESTIVOS_TRASLADABLES: Tuple[Tuple[int, int], ...] = (
+    (1, 6), (3, 19), (6, 29), (8, 15), (10, 12), (11, 1), (11, 11)
+)
+
+# Festivos según la Pascua: (días desde el domingo de Pascua, se traslada al lunes)
+FESTIVOS_PASCUA: Tuple[Tuple[int, bool], ...] = (
+    (-3, False),  # Jueves Santo
+    (-2, False),  # Viernes Santo
+    (39, True),   # Ascensión del Señor
+    (60, True),   # Corpus Christi
+    (68, True),   # Sagrado Corazón de Jesús
+)
+
+DOMINGO = 6  # datetime.date.weekday()
+
+
+@lru_cache(maxsize=None)
+def domingo_de_pascua(anio: int) -> datetime.date:
+    """Domingo de Pascua del año (algoritmo anónimo gregoriano, Meeus/Jones/Butcher)."""
+    a = anio % 19
+    b, c = divmod(anio, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(anio, mes, dia + 1)
+
+
+def _trasladar_a_lunes(fecha: datetime.date) -> datetime.date:
+    """Ley Emiliani: un festivo que no cae en lunes se pasa al lunes siguiente."""
+    return fecha + datetime.timedelta(days=(7 - fecha.weekday()) % 7)
+
+
+@lru_cache(maxsize=None)
+def festivos_anio(anio: int) -> Tuple[datetime.date, ...]:
+    """Festivos del año en Colombia, ordenados."""
+    festivos = {datetime.date(anio, mes, dia) for mes, dia in FESTIVOS_FIJOS}
+    festivos.update(_trasladar_a_lunes(datetime.date(anio, mes, dia)) for mes, dia in FESTIVOS_TRASLADABLES)
+    pascua = domingo_de_pascua(anio)
+    for desplazamiento, trasladable in FESTIVOS_PASCUA:
+        fecha = pascua + datetime.timedelta(days=desplazamiento)
+        festivos.add(_trasladar_a_lunes(fecha) if trasladable else fecha)
+    return tuple(sorted(festivos))
+
+
+def es_festivo(fecha: datetime.date) -> bool:
+    """Indica si la fecha es festivo en Colombia."""
+    return fecha in festivos_anio(fecha.year)
+
+
+class CalendarioAnio:
+    """
+    Mapa de bits de días hábiles de un año (bit i = día i del año, desde 0)
+    y suma acumulada de días hábiles al inicio de cada byte.
+    """
+
+    def __init__(self, anio: int):
+        self.anio = anio
+        self.ordinal_inicio = datetime.date(anio, 1, 1).toordinal()
+        self.dias = datetime.date(anio, 12, 31).toordinal() - self.ordinal_inicio + 1
+        self.bits = bytearray((self.dias + 7) // 8)
+        festivos = {fecha.toordinal() - self.ordinal_inicio for fecha in festivos_anio(anio)}
+        primer_dia_semana = datetime.date(anio, 1, 1).weekday()
+        for dia in range(self.dias):
+            if (primer_dia_semana + dia) % 7 != DOMINGO and dia not in festivos:
+                self.bits[dia >> 3] |= 1 << (dia & 7)
+        # acumulado[k] = días hábiles en los bytes 0..k-1
+        self.acumulado = array("H", [0] * (len(self.bits) + 1))
+        for k, byte in enumerate(self.bits):
+            self.acumulado[k + 1] = self.acumulado[k] + byte.bit_count()
+        self.total = self.acumulado[-1]
+
+    def habiles_hasta(self, dia: int) -> int:
+        """Días hábiles en los días [0, dia] del año (dia < 0 retorna 0)."""
+        if dia < 0:
+            return 0
+        if dia >= self.dias:
+            return self.total
+        byte = dia >> 3
+        mascara = (1 << ((dia & 7) + 1)) - 1
+        return self.acumulado[byte] + (self.bits[byte] & mascara).bit_count()
+
+    def es_habil(self, dia: int) -> bool:
+        return bool(self.bits[dia >> 3] & (1 << (dia & 7)))
+
+
+@lru_cache(maxsize=None)
+def calendario_anio(anio: int) -> CalendarioAnio:
+    """Calendario de días hábiles del año (se construye una vez y queda en caché)."""
+    return CalendarioAnio(anio)
+
+
+def _habiles_hasta_ordinal(ordinal: int) -> Tuple[int, int]:
+    """(año, días hábiles desde el 1 de enero de ese año hasta el ordinal inclusive)."""
+    anio = datetime.date.fromordinal(ordinal).year
+    calendario = calendario_anio(anio)
+    return anio, calendario.habiles_hasta(ordinal - calendario.ordinal_inicio)
+
+
+def contar_dias_habiles_ordinal(ordinal_inicio: int, ordinal_fin: int) -> int:
+    """Días hábiles entre dos ordinales de fecha (date.toordinal()), ambos inclusive."""
+    if ordinal_fin < ordinal_inicio:
+        return 0
+    anio_fin, habiles_fin = _habiles_hasta_ordinal(ordinal_fin)
+    anio_inicio, habiles_inicio = _habiles_hasta_ordinal(ordinal_inicio - 1)
+    # Años completos intermedios (y el año del día anterior al inicio, ya contado en parte)
+    total = habiles_fin - habiles_inicio
+    for anio in range(anio_inicio, anio_fin):
+        total += calendario_anio(anio).total
+    return total
+
+
+def contar_dias_habiles(fecha_inicio: datetime.date, fecha_fin: datetime.date) -> int:
+    """
+    Cuenta los días hábiles (excluye domingos y festivos) entre dos fechas.
+
+    Args:
+        fecha_inicio: Primera fecha (inclusive)
+        fecha_fin: Última fecha (inclusive)
+
+    Returns:
+        Número de días hábiles; 0 si fecha_fin es anterior a fecha_inicio
+    """
+    return contar_dias_habiles_ordinal(fecha_inicio.toordinal(), fecha_fin.toordinal())
+
+
+def contar_dias_habiles_lote(ordinales_inicio: Sequence[int], ordinales_fin: Sequence[int]) -> array:
+    """
+    Días hábiles de cada periodo de un lote (ordinales de fecha, inclusivos).
+
+    Returns:
+        array('i') con los días hábiles por fila
+    """
+    if len(ordinales_inicio) != len(ordinales_fin):
+        raise ValueError("Las columnas de fechas deben tener el mismo número de filas.")
+    return array("i", [
+        contar_dias_habiles_ordinal(inicio, fin) for inicio, fin in zip(ordinales_inicio, ordinales_fin)
+    ])
+
+
+def dias_habiles_anio(anio: int) -> List[datetime.date]:
+    """Lista de los días hábiles del año (útil para mostrar o depurar el calendario)."""
+    calendario = calendario_anio(anio)
+    return [
+        datetime.date.fromordinal(calendario.ordinal_inicio + dia)
+        for dia in range(calendario.dias) if calendario.es_habil(dia)
+    ]
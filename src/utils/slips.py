@@ -0,0 +1,298 @@
+"""
+Generación masiva de comprobantes de liquidación (HTML, texto plano y PDF opcional).
+
+Cada comprobante muestra el salario mensual del roster, el periodo, los días,
+las cesantías, los intereses y la prima por semestre de un empleado. Los
+valores se toman de un ResultadoLote (src/core/batch.py), sin volver a
+liquidar (así el comprobante no puede mostrar algo distinto a lo liquidado), y
+las fechas son las reales del roster (columnas ordinal_inicio / ordinal_fin).
+
+Las plantillas se compilan una sola vez (al importar el módulo, en cada
+proceso) en una lista de segmentos literales y campos; renderizar un
+comprobante es solo unir esos segmentos. Los comprobantes se renderizan por
+bloques en un pool de procesos y se escriben a medida que llegan en un .zip o
+en un directorio, con un número acotado de bloques en vuelo.
+
+La salida PDF requiere 'reportlab' (dependencia opcional).
+"""
+import datetime
+import html
+import io
+import os
+import zipfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from src.core.batch import ResultadoLote
+from src.core.constants import CONCEPTOS
+from src.core.roster import Roster
+from src.utils.date_helpers import formatear_fecha
+from src.utils.formatting import formatear_moneda
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas as pdf_canvas
+except ImportError:  # reportlab es opcional
+    letter = None
+    pdf_canvas = None
+
+# ==============================================================================
+# Plantillas
+# ==============================================================================
+
+class PlantillaCompilada:
+    """
+    Plantilla con sintaxis de string.Template ($campo / ${campo}) separada una
+    sola vez en segmentos: los literales se guardan tal cual y los campos como
+    nombres a buscar al renderizar.
+    """
+
+    def __init__(self, texto: str, escapar: Optional[Callable[[str], str]] = None):
+        self.segmentos: List[Tuple[bool, str]] = []  # (es_campo, literal o nombre)
+        self.escapar = escapar
+        posicion = 0
+        for coincidencia in Template.pattern.finditer(texto):
+            inicio, fin = coincidencia.span()
+            if inicio > posicion:
+                self.segmentos.append((False, texto[posicion:inicio]))
+            if coincidencia.group("escaped") is not None:
+                self.segmentos.append((False, "$"))
+            elif coincidencia.group("invalid") is not None:
+                raise ValueError(f"Marcador inválido en la plantilla (posición {inicio})")
+            else:
+                self.segmentos.append((True, coincidencia.group("named") or coincidencia.group("braced")))
+            posicion = fin
+        if posicion < len(texto):
+            self.segmentos.append((False, texto[posicion:]))
+        self.campos = tuple(nombre for es_campo, nombre in self.segmentos if es_campo)
+
+    def renderizar(self, valores: Mapping[str, str]) -> str:
+        """Sustituye los campos (KeyError si falta alguno)."""
+        escapar = self.escapar
+        if escapar is None:
+            return "".join(valores[parte] if es_campo else parte for es_campo, parte in self.segmentos)
+        return "".join(escapar(valores[parte]) if es_campo else parte for es_campo, parte in self.segmentos)
+
+
+PLANTILLA_TEXTO = PlantillaCompilada(
+    "COMPROBANTE DE LIQUIDACIÓN\n"
+    "==========================\n"
+    "Empleado:            $id_empleado\n"
+    "Periodo:             $fecha_inicio - $fecha_fin\n"
+    "Salario mensual:     $salario\n"
+    "Días liquidados:     $dias\n"
+    "--------------------------\n"
+    f"{CONCEPTOS['CESANTIAS']}: $cesantias\n"
+    f"{CONCEPTOS['INTERESES']}: $intereses\n"
+    f"{CONCEPTOS['PRIMA_S1']} ($dias_semestre_1 días): $prima_semestre_1\n"
+    f"{CONCEPTOS['PRIMA_S2']} ($dias_semestre_2 días): $prima_semestre_2\n"
+    "--------------------------\n"
+    "TOTAL:               $total\n"
+)
+
+PLANTILLA_HTML = PlantillaCompilada(
+    "<!DOCTYPE html>\n"
+    "<html lang=\"es\"><head><meta charset=\"utf-8\">"
+    "<title>Comprobante de liquidación $id_empleado</title></head>\n"
+    "<body>\n"
+    "<h1>Comprobante de liquidación</h1>\n"
+    "<p>Empleado: <strong>$id_empleado</strong><br>"
+    "Periodo: $fecha_inicio - $fecha_fin<br>"
+    "Salario mensual: $salario<br>"
+    "Días liquidados: $dias</p>\n"
+    "<table>\n"
+    f"<tr><td>{CONCEPTOS['CESANTIAS']}</td><td>$cesantias</td></tr>\n"
+    f"<tr><td>{CONCEPTOS['INTERESES']}</td><td>$intereses</td></tr>\n"
+    f"<tr><td>{CONCEPTOS['PRIMA_S1']} ($dias_semestre_1 días)</td><td>$prima_semestre_1</td></tr>\n"
+    f"<tr><td>{CONCEPTOS['PRIMA_S2']} ($dias_semestre_2 días)</td><td>$prima_semestre_2</td></tr>\n"
+    "<tr><th>Total</th><th>$total</th></tr>\n"
+    "</table>\n"
+    "</body></html>\n",
+    escapar=html.escape
+)
+
+FORMATOS_COMPROBANTE: Dict[str, str] = {"html": ".html", "texto": ".txt", "pdf": ".pdf"}
+
+# Empleados por bloque de renderizado
+TAMANO_BLOQUE_COMPROBANTES = 1000
+
+# ==============================================================================
+# Renderizado
+# ==============================================================================
+
+# Bloque de entrada para un proceso: columnas del roster y del resultado ya recortadas
+BloqueComprobantes = Dict[str, array]
+
+_COLUMNAS_ROSTER = (("id_empleado", "q"), ("salario", "d"), ("ordinal_inicio", "i"), ("ordinal_fin", "i"))
+_COLUMNAS_RESULTADO = (
+    ("dias", "i"), ("cesantias", "d"), ("intereses", "d"),
+    ("prima_semestre_1", "d"), ("prima_semestre_2", "d"),
+    ("dias_semestre_1", "i"), ("dias_semestre_2", "i"),
+)
+
+
+def _valores_comprobante(bloque: BloqueComprobantes, fila: int) -> Dict[str, str]:
+    """Textos de los campos de la plantilla para una fila del bloque."""
+    prima_s1 = bloque["prima_semestre_1"][fila]
+    prima_s2 = bloque["prima_semestre_2"][fila]
+    cesantias = bloque["cesantias"][fila]
+    intereses = bloque["intereses"][fila]
+    return {
+        "id_empleado": str(bloque["id_empleado"][fila]),
+        "fecha_inicio": formatear_fecha(datetime.date.fromordinal(bloque["ordinal_inicio"][fila])),
+        "fecha_fin": formatear_fecha(datetime.date.fromordinal(bloque["ordinal_fin"][fila])),
+        "salario": formatear_moneda(bloque["salario"][fila]),
+        "dias": str(bloque["dias"][fila]),
+        "cesantias": formatear_moneda(cesantias),
+        "intereses": formatear_moneda(intereses),
+        "prima_semestre_1": formatear_moneda(prima_s1),
+        "prima_semestre_2": formatear_moneda(prima_s2),
+        "dias_semestre_1": str(bloque["dias_semestre_1"][fila]),
+        "dias_semestre_2": str(bloque["dias_semestre_2"][fila]),
+        "total": formatear_moneda(cesantias + intereses + prima_s1 + prima_s2),
+    }
+
+
+def _requerir_reportlab() -> None:
+    if pdf_canvas is None:
+        raise ImportError(
+            "La generación de comprobantes PDF requiere 'reportlab' (pip install reportlab). "
+            "Use los formatos 'html' o 'texto' como alternativa."
+        )
+
+
+def _texto_a_pdf(texto: str) -> bytes:
+    """Dibuja el comprobante de texto en una página PDF."""
+    salida = io.BytesIO()
+    pagina = pdf_canvas.Canvas(salida, pagesize=letter)
+    objeto_texto = pagina.beginText(50, letter[1] - 60)
+    objeto_texto.setFont("Courier", 10)
+    for linea in texto.splitlines():
+        objeto_texto.textLine(linea)
+    pagina.drawText(objeto_texto)
+    pagina.showPage()
+    pagina.save()
+    return salida.getvalue()
+
+
+def renderizar_comprobante(valores: Mapping[str, str], formato: str = "html") -> bytes:
+    """
+    Renderiza un comprobante a partir de los textos de sus campos.
+
+    Args:
+        valores: Campo -> texto (ver PLANTILLA_TEXTO / PLANTILLA_HTML)
+        formato: 'html', 'texto' o 'pdf'
+
+    Returns:
+        Contenido del comprobante (UTF-8 para html/texto)
+    """
+    if formato == "html":
+        return PLANTILLA_HTML.renderizar(valores).encode("utf-8")
+    if formato == "texto":
+        return PLANTILLA_TEXTO.renderizar(valores).encode("utf-8")
+    if formato == "pdf":
+        _requerir_reportlab()
+        return _texto_a_pdf(PLANTILLA_TEXTO.renderizar(valores))
+    raise ValueError(f"Formato de comprobante no soportado: {formato}")
+
+
+def _renderizar_bloque(bloque: BloqueComprobantes, formato: str) -> List[Tuple[str, bytes]]:
+    """Renderiza todos los comprobantes de un bloque: [(nombre de archivo, contenido)]."""
+    extension = FORMATOS_COMPROBANTE[formato]
+    return [
+        (f"comprobante_{bloque['id_empleado'][fila]}{extension}",
+         renderizar_comprobante(_valores_comprobante(bloque, fila), formato))
+        for fila in range(len(bloque["id_empleado"]))
+    ]
+
+
+def _bloques(roster: Roster, resultado: ResultadoLote, tamano_bloque: int) -> Iterator[BloqueComprobantes]:
+    n = len(roster)
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(n, inicio + tamano_bloque)
+        bloque = {nombre: array(codigo, roster[nombre][inicio:fin]) for nombre, codigo in _COLUMNAS_ROSTER}
+        bloque.update(
+            (nombre, array(codigo, getattr(resultado, nombre)[inicio:fin])) for nombre, codigo in _COLUMNAS_RESULTADO
+        )
+        yield bloque
+
+# ==============================================================================
+# Punto de entrada
+# ==============================================================================
+
+def generar_comprobantes(
+    roster: Roster,
+    resultado: ResultadoLote,
+    destino: str,
+    formato: str = "html",
+    procesos: Optional[int] = None,
+    tamano_bloque: int = TAMANO_BLOQUE_COMPROBANTES
+) -> int:
+    """
+    Genera un comprobante por empleado y los guarda en un .zip o en un directorio.
+
+    Args:
+        roster: Roster liquidado
+        resultado: ResultadoLote alineado con el roster
+        destino: Ruta terminada en .zip, o directorio (se crea si no existe)
+        formato: 'html', 'texto' o 'pdf'
+        procesos: Procesos de renderizado (por defecto, los núcleos disponibles;
+                  1 renderiza en el proceso actual)
+        tamano_bloque: Comprobantes por tarea
+
+    Returns:
+        Número de comprobantes generados
+
+    Raises:
+        ValueError: Si el formato no es soportado o el resultado no corresponde al roster.
+        ImportError: Si se pide PDF y reportlab no está instalado.
+    """
+    if formato not in FORMATOS_COMPROBANTE:
+        raise ValueError(f"Formato de comprobante no soportado: {formato}")
+    if formato == "pdf":
+        _requerir_reportlab()
+    if len(resultado) != len(roster):
+        raise ValueError("El resultado y el roster deben tener el mismo número de filas.")
+
+    if destino.lower().endswith(".zip"):
+        archivo_zip = zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED)
+
+        def guardar(nombre: str, contenido: bytes) -> None:
+            archivo_zip.writestr(nombre, contenido)
+    else:
+        archivo_zip = None
+        os.makedirs(destino, exist_ok=True)
+
+        def guardar(nombre: str, contenido: bytes) -> None:
+            with open(os.path.join(destino, nombre), "wb") as archivo:
+                archivo.write(contenido)
+
+    generados = 0
+    try:
+        procesos = procesos or os.cpu_count() or 1
+        if procesos == 1:
+            for bloque in _bloques(roster, resultado, tamano_bloque):
+                for nombre, contenido in _renderizar_bloque(bloque, formato):
+                    guardar(nombre, contenido)
+                    generados += 1
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as executor:
+                en_vuelo = deque()
+                for bloque in _bloques(roster, resultado, tamano_bloque):
+                    en_vuelo.append(executor.submit(_renderizar_bloque, bloque, formato))
+                    # Acota la memoria: se escribe el bloque más antiguo antes de enviar más
+                    while len(en_vuelo) >= 2 * procesos:
+                        for nombre, contenido in en_vuelo.popleft().result():
+                            guardar(nombre, contenido)
+                            generados += 1
+                while en_vuelo:
+                    for nombre, contenido in en_vuelo.popleft().result():
+                        guardar(nombre, contenido)
+                        generados += 1
+    finally:
+        if archivo_zip is not None:
+            archivo_zip.close()
+    return generados
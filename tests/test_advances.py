@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de los anticipos de cesantías en los intereses (src/core/advances.py), escalar y por lotes."""
+
+import datetime
+import random
+
+import pytest
+
+from src.core.advances import LibroAnticipos, LibrosAnticiposLote
+from src.core.batch import calcular_intereses_lote, calcular_liquidacion_lote
+from src.core.calculator import calcular_intereses_cesantias
+from src.core.constants import DIAS_ANIO_COMERCIAL, PORCENTAJE_INTERESES_CESANTIAS
+from src.core.intervals import IndiceIntervalosLote
+from src.utils.date_helpers import calcular_dias_liquidacion, fecha_a_serial_360
+
+INICIO = datetime.date(2024, 1, 1)
+FIN = datetime.date(2024, 12, 31)
+
+
+def _intereses_fuerza_bruta(cesantias, inicio, fin, ausencias, retiros):
+    """Saldo día a día (seriales 30/360): cada día trabajado genera intereses sobre lo no anticipado."""
+    ausentes = set()
+    for desde, hasta in ausencias:
+        ausentes.update(range(desde, hasta + 1))
+    saldo_dias = 0.0
+    for dia in range(inicio, fin + 1):
+        if dia not in ausentes:
+            saldo_dias += cesantias - sum(valor for serial, valor in retiros if serial <= dia)
+    return saldo_dias * PORCENTAJE_INTERESES_CESANTIAS / DIAS_ANIO_COMERCIAL
+
+
+def test_anticipo_con_ausencia_posterior_no_es_negativo():
+    ausencias = [(datetime.date(2024, 3, 1), FIN)]
+    intereses = calcular_intereses_cesantias(1000, INICIO, FIN, ausencias=ausencias,
+                                             anticipos=[(datetime.date(2024, 1, 2), 1000)])
+    assert intereses >= 0
+    # Solo el 1 de enero generó intereses sobre las 1000 cesantías
+    assert intereses == pytest.approx(1000 * PORCENTAJE_INTERESES_CESANTIAS / DIAS_ANIO_COMERCIAL)
+
+
+def test_sin_ausencias_igual_a_formula_cerrada():
+    anticipos = [(datetime.date(2024, 7, 1), 300.0)]
+    dias = calcular_dias_liquidacion(INICIO, FIN)
+    esperado = (1000 * dias - 300 * 180) * PORCENTAJE_INTERESES_CESANTIAS / DIAS_ANIO_COMERCIAL
+    assert calcular_intereses_cesantias(1000, INICIO, FIN, anticipos=anticipos) == pytest.approx(esperado)
+
+
+def test_escalar_contra_fuerza_bruta():
+    rng = random.Random(21)
+    for _ in range(100):
+        inicio = INICIO + datetime.timedelta(days=rng.randrange(120))
+        ausencias = []
+        for _ in range(rng.randrange(3)):
+            desde = inicio + datetime.timedelta(days=rng.randrange((FIN - inicio).days))
+            ausencias.append((desde, min(FIN, desde + datetime.timedelta(days=rng.randrange(60)))))
+        anticipos = [(inicio + datetime.timedelta(days=rng.randrange(330)), float(rng.randrange(1, 300)))
+                     for _ in range(rng.randrange(1, 4))]
+        intereses = calcular_intereses_cesantias(1000.0, inicio, FIN, ausencias=ausencias, anticipos=anticipos)
+        assert intereses >= 0
+        esperado = _intereses_fuerza_bruta(
+            1000.0, fecha_a_serial_360(inicio), fecha_a_serial_360(FIN),
+            [(fecha_a_serial_360(desde), fecha_a_serial_360(hasta)) for desde, hasta in ausencias],
+            [(fecha_a_serial_360(fecha), valor) for fecha, valor in anticipos],
+        )
+        assert intereses == pytest.approx(esperado)
+
+
+def test_lote_contra_fuerza_bruta_con_ausencias():
+    rng = random.Random(4)
+    n = 60
+    inicio = [fecha_a_serial_360(INICIO + datetime.timedelta(days=rng.randrange(100))) for _ in range(n)]
+    fin = [fecha_a_serial_360(FIN)] * n
+    ausencias = [[(s, min(fin[0], s + rng.randrange(90)))] for s in (inicio[i] + rng.randrange(200) for i in range(n))]
+    libros = [LibroAnticipos([(INICIO + datetime.timedelta(days=rng.randrange(150, 300)), 500.0)]) for _ in range(n)]
+    indice = IndiceIntervalosLote.desde_listas(ausencias)
+    cesantias = [1000.0] * n
+    lote = calcular_intereses_lote(cesantias, inicio, fin, ausencias=indice, anticipos=LibrosAnticiposLote(libros))
+    for fila in range(n):
+        esperado = _intereses_fuerza_bruta(1000.0, inicio[fila], fin[fila], ausencias[fila],
+                                           list(zip(libros[fila].seriales, libros[fila].valores)))
+        assert lote[fila] >= 0
+        assert lote[fila] == pytest.approx(esperado)
+
+    # La liquidación completa (general y por reglas) aplica el mismo descuento
+    salarios = [1_300_000.0] * n
+    libros_grandes = LibrosAnticiposLote([LibroAnticipos([(INICIO + datetime.timedelta(days=200), 1000.0)])] * n)
+    general = calcular_liquidacion_lote(salarios, inicio, fin, ausencias=indice, anticipos=libros_grandes)
+    por_reglas = calcular_liquidacion_lote(salarios, inicio, fin, ausencias=indice, anticipos=libros_grandes,
+                                           tipos_contrato=[0] * n)
+    assert general.intereses == por_reglas.intereses
+    sin_anticipos = calcular_liquidacion_lote(salarios, inicio, fin, ausencias=indice)
+    assert all(0 <= con <= sin for con, sin in zip(general.intereses, sin_anticipos.intereses))
+
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del roll-up de totales de nómina (src/core/aggregation.py)."""
+
+import random
+
+import pytest
+
+from src.core.aggregation import AgregadoParcial, agrupar, agrupar_liquidacion, combinar_parciales, etiqueta_clave
+from src.core.batch import calcular_liquidacion_lote
+from src.core.roster_generator import generar_roster
+
+
+def _datos(n=500, semilla=2):
+    rng = random.Random(semilla)
+    columnas = [[rng.randrange(4) for _ in range(n)], [rng.randrange(3) for _ in range(n)]]
+    valores = {"a": [rng.uniform(0, 1000) for _ in range(n)], "b": [float(rng.randrange(-50, 50)) for _ in range(n)]}
+    return columnas, valores
+
+
+def _ingenuo(columnas, valores):
+    grupos = {}
+    for fila, clave in enumerate(zip(*columnas)):
+        for concepto, columna in valores.items():
+            grupos.setdefault((clave, concepto), []).append(columna[fila])
+    return grupos
+
+
+@pytest.mark.parametrize("metodo", ["hash", "orden"])
+def test_agrupar_contra_calculo_ingenuo(metodo):
+    columnas, valores = _datos()
+    parcial = agrupar(("x", "y"), columnas, valores, metodo=metodo)
+    esperado = _ingenuo(columnas, valores)
+    assert len(parcial.grupos) * 2 == len(esperado)
+    for (clave, concepto), grupo in esperado.items():
+        assert parcial.valor(clave, concepto, "suma") == pytest.approx(sum(grupo))
+        assert parcial.valor(clave, concepto, "conteo") == len(grupo)
+        assert parcial.valor(clave, concepto, "promedio") == pytest.approx(sum(grupo) / len(grupo))
+        assert parcial.valor(clave, concepto, "maximo") == max(grupo)
+
+
+def test_combinar_parciales_igual_a_una_pasada():
+    columnas, valores = _datos()
+    completo = agrupar(("x", "y"), columnas, valores)
+    parciales = [
+        agrupar(("x", "y"), [columna[inicio:inicio + 64] for columna in columnas],
+                {concepto: columna[inicio:inicio + 64] for concepto, columna in valores.items()})
+        for inicio in range(0, 500, 64)
+    ]
+    combinado = combinar_parciales(parciales)
+    assert combinado.grupos.keys() == completo.grupos.keys()
+    for clave in completo.grupos:
+        for concepto in ("a", "b"):
+            assert combinado.valor(clave, concepto, "suma") == pytest.approx(completo.valor(clave, concepto, "suma"))
+            assert combinado.valor(clave, concepto, "conteo") == completo.valor(clave, concepto, "conteo")
+            assert combinado.valor(clave, concepto, "maximo") == completo.valor(clave, concepto, "maximo")
+    # combinar_parciales no modifica el primer parcial
+    assert sum(medidas[0][1] for medidas in parciales[0].grupos.values()) == 64
+
+
+def test_combinar_claves_distintas():
+    with pytest.raises(ValueError):
+        AgregadoParcial(("x",), ("a",)).combinar(AgregadoParcial(("y",), ("a",)))
+    with pytest.raises(ValueError):
+        combinar_parciales([])
+
+
+def test_errores_de_agrupacion():
+    columnas, valores = _datos(10)
+    with pytest.raises(ValueError):
+        agrupar(("x",), columnas, valores)
+    with pytest.raises(ValueError):
+        agrupar(("x", "y"), columnas, valores, metodo="otro")
+
+
+def test_agrupar_liquidacion_por_bloques():
+    roster = generar_roster(600, semilla=1)
+    resultado = calcular_liquidacion_lote(
+        roster["salario"], roster["serial_inicio"], roster["serial_fin"],
+        tipos_contrato=roster["tipo_contrato"], banderas=roster["banderas"],
+    )
+    completo = agrupar_liquidacion(roster, resultado)
+    assert sum(completo.valor(clave, "cesantias", "suma") for clave in completo.grupos) == pytest.approx(sum(resultado.cesantias))
+
+    bloques = []
+    for inicio in range(0, 600, 250):
+        fin = min(600, inicio + 250)
+        parcial = calcular_liquidacion_lote(
+            roster["salario"][inicio:fin], roster["serial_inicio"][inicio:fin], roster["serial_fin"][inicio:fin],
+            tipos_contrato=roster["tipo_contrato"][inicio:fin], banderas=roster["banderas"][inicio:fin],
+        )
+        bloques.append(agrupar_liquidacion(roster, parcial, inicio=inicio, metodo="orden"))
+    combinado = combinar_parciales(bloques)
+    filas_combinadas, filas_completas = list(combinado.filas()), list(completo.filas())
+    assert len(filas_combinadas) == len(filas_completas)
+    for combinada, completa in zip(filas_combinadas, filas_completas):
+        # (etiquetas..., concepto, suma, conteo, promedio, máximo)
+        assert combinada[:-4] == completa[:-4]
+        assert combinada[-3] == completa[-3]
+        assert combinada[-4] == pytest.approx(completa[-4])
+        assert combinada[-1] == completa[-1]
+
+
+def test_etiquetas():
+    assert etiqueta_clave("centro_costo", 12) == "12"
+    assert etiqueta_clave("tipo_contrato", 0) != "0"
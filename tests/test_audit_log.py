@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la bitácora de auditoría (src/core/audit_log.py)."""
+
+import dataclasses
+import datetime
+import os
+
+import pytest
+
+from config import parameter_snapshot
+from src.core.audit_log import (
+    TIPO_ESCALAR,
+    BitacoraAuditoria,
+    activar_auditoria,
+    auditado,
+    bitacora_activa,
+    desactivar_auditoria,
+    leer_registros,
+    verificar_log,
+)
+from src.core.calculator import calcular_cesantias, calcular_liquidacion_completa
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    yield str(tmp_path / "auditoria.log")
+    desactivar_auditoria()
+
+
+def test_registra_llamadas_y_reabre(ruta):
+    with BitacoraAuditoria(ruta) as bitacora:
+        activar_auditoria(bitacora)
+        valor = calcular_cesantias(1_300_000, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+        desactivar_auditoria()
+    # Al reabrir, la cadena continúa desde el último registro
+    with BitacoraAuditoria(ruta) as bitacora:
+        activar_auditoria(bitacora)
+        calcular_cesantias(2_000_000, datetime.date(2024, 1, 1), datetime.date(2024, 6, 30))
+        desactivar_auditoria()
+    verificacion = verificar_log(ruta)
+    assert verificacion.valida and verificacion.registros == 2
+    primero = next(leer_registros(ruta))
+    assert primero.funcion == "calcular_cesantias"
+    assert primero.entradas["salario_mensual"] == 1_300_000
+    assert primero.salidas["resultado"] == valor
+
+
+def test_resultados_escalares_con_campos_fijos(ruta):
+    inicio, fin = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+    with BitacoraAuditoria(ruta) as bitacora:
+        activar_auditoria(bitacora)
+        resultados = calcular_liquidacion_completa(1_300_000, inicio, fin, conceptos=("cesantias", "intereses", "prima"))
+        desactivar_auditoria()
+    registro = next(leer_registros(ruta))
+    assert registro.entradas == {"salario_mensual": 1_300_000, "fecha_inicio": inicio.isoformat(),
+                                 "fecha_fin": fin.isoformat(), "conceptos": ["cesantias", "intereses", "prima"]}
+    assert {nombre: registro.salidas[f"resultado.{nombre}"] for nombre in resultados} == resultados
+
+
+def test_version_tomada_antes_de_la_llamada(ruta, monkeypatch):
+    for nombre in ("_snapshot", "_estado_archivo", "_snapshot_instalado"):
+        monkeypatch.setattr(parameter_snapshot, nombre, getattr(parameter_snapshot, nombre))
+    vigente = parameter_snapshot.snapshot_actual()
+
+    @auditado(TIPO_ESCALAR)
+    def calcular_con_recarga(valor):
+        # Otra instantánea instalada mientras la llamada usa la anterior
+        parameter_snapshot.instalar_snapshot(dataclasses.replace(vigente, version="nueva"))
+        return valor * 2
+
+    with BitacoraAuditoria(ruta) as bitacora:
+        activar_auditoria(bitacora)
+        calcular_con_recarga(3)
+        desactivar_auditoria()
+    registro = next(leer_registros(ruta))
+    assert registro.version_parametros == vigente.version
+    assert registro.salidas["resultado"] == 6
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere fork()")
+def test_proceso_hijo_no_escribe_en_la_bitacora(ruta):
+    with BitacoraAuditoria(ruta) as bitacora:
+        activar_auditoria(bitacora)
+        # Registro aún en el buffer al hacer fork(): el hijo no debe duplicarlo
+        calcular_cesantias(1_300_000, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+        pid = os.fork()
+        if pid == 0:
+            codigo = 0
+            try:
+                codigo = 1 if bitacora_activa() is not None else 0
+                calcular_cesantias(2_000_000, datetime.date(2024, 1, 1), datetime.date(2024, 6, 30))
+                bitacora.registrar(1, "directo", None, {}, {})
+                bitacora.sincronizar()
+            except BaseException:
+                codigo = 2
+            finally:
+                os._exit(codigo)
+        _, estado = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(estado) == 0
+        assert bitacora_activa() is bitacora
+        desactivar_auditoria()
+    verificacion = verificar_log(ruta)
+    assert verificacion.valida, verificacion.mensaje
+    assert verificacion.registros == 1
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del calculador por lotes (src/core/batch.py) contra el escalar."""
+
+import datetime
+import random
+
+import pytest
+
+from src.core import calculator
+from src.core.batch import (
+    calcular_cesantias_lote,
+    calcular_dias_lote,
+    calcular_intereses_lote,
+    calcular_liquidacion_lote,
+    calcular_prima_lote,
+)
+from src.utils.date_helpers import calcular_dias_liquidacion, fecha_a_serial_360
+
+
+def _periodos(n, semilla=7):
+    rng = random.Random(semilla)
+    periodos = []
+    for _ in range(n):
+        inicio = datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randrange(5 * 365))
+        fin = min(inicio + datetime.timedelta(days=rng.randrange(1, 900)), datetime.date(2025, 12, 31))
+        salario = rng.choice([1_300_000.0, 1_423_500.0, 2_500_000.0, 2_847_000.0, 9_000_000.0])
+        periodos.append((salario, inicio, fin))
+    # Casos de borde: día 31, febrero y un solo día
+    periodos += [
+        (1_300_000.0, datetime.date(2024, 1, 31), datetime.date(2024, 3, 31)),
+        (2_000_000.0, datetime.date(2023, 2, 28), datetime.date(2024, 2, 29)),
+        (1_423_500.0, datetime.date(2025, 12, 31), datetime.date(2025, 12, 31)),
+    ]
+    return periodos
+
+
+def _columnas(periodos):
+    salarios = [salario for salario, _, _ in periodos]
+    inicios = [fecha_a_serial_360(inicio) for _, inicio, _ in periodos]
+    fines = [fecha_a_serial_360(fin) for _, _, fin in periodos]
+    return salarios, inicios, fines
+
+
+def test_dias_lote_igual_a_escalar():
+    periodos = _periodos(300)
+    _, inicios, fines = _columnas(periodos)
+    dias = calcular_dias_lote(inicios, fines)
+    assert list(dias) == [calcular_dias_liquidacion(inicio, fin) for _, inicio, fin in periodos]
+
+
+def test_cesantias_intereses_y_prima_lote_igual_a_escalar():
+    periodos = _periodos(300)
+    salarios, inicios, fines = _columnas(periodos)
+    cesantias = calcular_cesantias_lote(salarios, inicios, fines)
+    intereses = calcular_intereses_lote(cesantias, inicios, fines)
+    prima_s1, prima_s2, dias_s1, dias_s2 = calcular_prima_lote(salarios, inicios, fines)
+    for fila, (salario, inicio, fin) in enumerate(periodos):
+        esperado = calculator.calcular_cesantias(salario, inicio, fin)
+        assert cesantias[fila] == esperado
+        assert intereses[fila] == calculator.calcular_intereses_cesantias(esperado, inicio, fin)
+        prima = calculator.calcular_prima_servicios(salario, inicio, fin)
+        assert (prima_s1[fila], prima_s2[fila]) == (prima["prima_semestre_1"], prima["prima_semestre_2"])
+        assert (dias_s1[fila], dias_s2[fila]) == (prima["dias_semestre_1"], prima["dias_semestre_2"])
+
+
+def test_liquidacion_lote_igual_a_funciones_por_concepto():
+    salarios, inicios, fines = _columnas(_periodos(200, semilla=3))
+    resultado = calcular_liquidacion_lote(salarios, inicios, fines)
+    cesantias = calcular_cesantias_lote(salarios, inicios, fines)
+    assert resultado.cesantias == cesantias
+    assert resultado.intereses == calcular_intereses_lote(cesantias, inicios, fines)
+    prima_s1, prima_s2, _, _ = calcular_prima_lote(salarios, inicios, fines)
+    assert (resultado.prima_semestre_1, resultado.prima_semestre_2) == (prima_s1, prima_s2)
+    assert len(resultado) == len(salarios)
+
+
+def test_lote_rechaza_periodo_invertido_y_columnas_desiguales():
+    with pytest.raises(ValueError):
+        calcular_dias_lote([fecha_a_serial_360(datetime.date(2024, 5, 1))],
+                           [fecha_a_serial_360(datetime.date(2024, 4, 1))])
+    with pytest.raises(ValueError):
+        calcular_cesantias_lote([1_300_000.0, 1_300_000.0], [0], [10])
+
+
+def test_lote_sin_parametros_para_el_anio():
+    serial = fecha_a_serial_360(datetime.date(1990, 6, 30))
+    with pytest.raises(ValueError):
+        calcular_cesantias_lote([1_000_000.0], [serial - 10], [serial])
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de las corridas reanudables (src/core/batch_runner.py)."""
+
+import dataclasses
+import os
+
+import pytest
+
+from config import parameter_snapshot
+from src.core.batch_runner import ejecutar_corrida, huella_roster, leer_punto_control
+from src.core.reconciliation import leer_filas_csv
+from src.core.roster_generator import generar_roster
+
+
+class _Interrupcion(Exception):
+    pass
+
+
+def _leer(ruta):
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
+
+
+@pytest.fixture(scope="module")
+def roster():
+    return generar_roster(1000, semilla=4)
+
+
+def test_corrida_completa(tmp_path, roster):
+    ruta = str(tmp_path / "salida.csv")
+    totales = ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300)
+    filas = list(leer_filas_csv(ruta))
+    assert totales.empleados == 1000
+    assert totales.filas_salida == len(filas) == 4000
+    assert not os.path.exists(ruta + ".ckpt")
+    for concepto, total in totales.valores.items():
+        assert total == pytest.approx(sum(valor for _, c, valor in filas if c == concepto))
+
+
+@pytest.mark.parametrize("controles_antes_de_fallar", [1, 2])
+def test_reanudar_produce_el_mismo_archivo(tmp_path, roster, controles_antes_de_fallar):
+    referencia = str(tmp_path / "referencia.csv")
+    totales_referencia = ejecutar_corrida(roster, referencia, tamano_bloque=128, intervalo_punto_control=300)
+
+    ruta = str(tmp_path / "salida.csv")
+    avances = []
+
+    def fallar(procesadas, total):
+        avances.append(procesadas)
+        if len(avances) == controles_antes_de_fallar:
+            raise _Interrupcion()
+
+    with pytest.raises(_Interrupcion):
+        ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300, al_avanzar=fallar)
+    punto = leer_punto_control(ruta + ".ckpt")
+    assert punto.offset == avances[-1] < len(roster)
+
+    # Bytes escritos después del último control (la corrida murió a mitad de un bloque)
+    with open(ruta, "ab") as archivo:
+        archivo.write(b"999,CESANTIAS,1.")
+
+    totales = ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300)
+    assert _leer(ruta) == _leer(referencia)
+    assert totales == totales_referencia
+    assert not os.path.exists(ruta + ".ckpt")
+
+
+def test_punto_control_de_otro_roster(tmp_path, roster):
+    ruta = str(tmp_path / "salida.csv")
+
+    def fallar(procesadas, total):
+        raise _Interrupcion()
+
+    with pytest.raises(_Interrupcion):
+        ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300, al_avanzar=fallar)
+    with pytest.raises(ValueError):
+        ejecutar_corrida(generar_roster(10, semilla=4), ruta)
+
+
+def _interrumpir_en_el_primer_control(roster, ruta):
+    def fallar(procesadas, total):
+        raise _Interrupcion()
+
+    with pytest.raises(_Interrupcion):
+        ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300, al_avanzar=fallar)
+
+
+def test_punto_control_de_otro_roster_con_las_mismas_filas(tmp_path, roster):
+    ruta = str(tmp_path / "salida.csv")
+    _interrumpir_en_el_primer_control(roster, ruta)
+    assert leer_punto_control(ruta + ".ckpt").huella_roster == huella_roster(roster)
+    otro = generar_roster(len(roster), semilla=5)
+    assert huella_roster(otro) != huella_roster(roster)
+    with pytest.raises(ValueError):
+        ejecutar_corrida(otro, ruta, tamano_bloque=128, intervalo_punto_control=300)
+
+
+def test_parametros_cambiados_reinician_la_corrida(tmp_path, roster, monkeypatch, capsys):
+    for nombre in ("_snapshot", "_estado_archivo", "_snapshot_instalado"):
+        monkeypatch.setattr(parameter_snapshot, nombre, getattr(parameter_snapshot, nombre))
+    ruta = str(tmp_path / "salida.csv")
+    _interrumpir_en_el_primer_control(roster, ruta)
+    assert leer_punto_control(ruta + ".ckpt").parametros == parameter_snapshot.snapshot_actual().identificador
+
+    vigente = parameter_snapshot.snapshot_actual()
+    parameter_snapshot.instalar_snapshot(dataclasses.replace(vigente, version="otra", huella="0" * 64))
+    referencia = str(tmp_path / "referencia.csv")
+    ejecutar_corrida(roster, referencia, tamano_bloque=128, intervalo_punto_control=300)
+    ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300)
+    assert "empieza de nuevo" in capsys.readouterr().out
+    assert _leer(ruta) == _leer(referencia)
+
+
+def test_parametros_cambiados_durante_la_corrida(tmp_path, roster, monkeypatch):
+    for nombre in ("_snapshot", "_estado_archivo", "_snapshot_instalado"):
+        monkeypatch.setattr(parameter_snapshot, nombre, getattr(parameter_snapshot, nombre))
+    vigente = parameter_snapshot.snapshot_actual()
+
+    def cambiar(procesadas, total):
+        parameter_snapshot.instalar_snapshot(dataclasses.replace(vigente, version="otra", huella="0" * 64))
+
+    ruta = str(tmp_path / "salida.csv")
+    with pytest.raises(ValueError):
+        ejecutar_corrida(roster, ruta, tamano_bloque=128, intervalo_punto_control=300, al_avanzar=cambiar)
+    # El punto de control sigue siendo el de los parámetros originales
+    assert leer_punto_control(ruta + ".ckpt").parametros == vigente.identificador
+
+
+def test_parametros_invalidos(tmp_path, roster):
+    with pytest.raises(ValueError):
+        ejecutar_corrida(roster, str(tmp_path / "salida.csv"), tamano_bloque=0)
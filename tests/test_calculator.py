@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de las funciones de liquidación escalares (src/core/calculator.py)."""
+
+import datetime
+
+import pytest
+
+from src.core import calculator
+
+INICIO = datetime.date(2024, 1, 1)
+FIN = datetime.date(2024, 12, 31)
+
+
+def test_cesantias_anio_completo():
+    assert calculator.calcular_cesantias(3_000_000, INICIO, FIN) == pytest.approx(3_000_000)
+
+
+def test_cesantias_incluye_auxilio_de_transporte():
+    # 2024: SMMLV 1.300.000, auxilio 162.000
+    assert calculator.calcular_cesantias(1_300_000, INICIO, FIN) == pytest.approx(1_462_000)
+
+
+def test_cesantias_descuenta_ausencias():
+    ausencias = [(datetime.date(2024, 3, 1), datetime.date(2024, 3, 30))]
+    assert calculator.calcular_cesantias(3_000_000, INICIO, FIN, ausencias=ausencias) == pytest.approx(3_000_000 * 330 / 360)
+
+
+def test_intereses_anio_completo():
+    assert calculator.calcular_intereses_cesantias(3_000_000, INICIO, FIN) == pytest.approx(360_000)
+
+
+def test_intereses_periodo_invertido():
+    with pytest.raises(ValueError):
+        calculator.calcular_intereses_cesantias(3_000_000, FIN, INICIO)
+
+
+def test_prima_por_semestre():
+    prima = calculator.calcular_prima_servicios(3_000_000, datetime.date(2024, 4, 1), FIN)
+    assert (prima["dias_semestre_1"], prima["dias_semestre_2"]) == (90, 180)
+    assert prima["prima_total"] == pytest.approx(prima["prima_semestre_1"] + prima["prima_semestre_2"])
+    assert prima["prima_semestre_1"] == pytest.approx(prima["prima_semestre_2"] / 2)
+
+
+def test_liquidacion_completa_igual_a_conceptos_sueltos():
+    ausencias = [(datetime.date(2024, 5, 10), datetime.date(2024, 5, 19))]
+    resultados = calculator.calcular_liquidacion_completa(
+        2_000_000, INICIO, FIN, conceptos=("cesantias", "intereses", "prima"), ausencias=ausencias
+    )
+    cesantias = calculator.calcular_cesantias(2_000_000, INICIO, FIN, ausencias=ausencias)
+    assert resultados["cesantias"].valor == pytest.approx(cesantias)
+    assert resultados["intereses"].valor == pytest.approx(
+        calculator.calcular_intereses_cesantias(cesantias, INICIO, FIN, ausencias=ausencias)
+    )
+    assert resultados["prima"].valor == pytest.approx(
+        calculator.calcular_prima_servicios(2_000_000, INICIO, FIN, ausencias=ausencias)["prima_total"]
+    )
+
+
+def test_anio_sin_parametros():
+    with pytest.raises(ValueError):
+        calculator.calcular_cesantias(1_000_000, datetime.date(1990, 1, 1), datetime.date(1990, 12, 31))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de los archivos de consignación de cesantías (src/core/consignment.py)."""
+
+import datetime
+import os
+
+import pytest
+
+from src.core import consignment
+from src.core.consignment import (
+    DISENOS_FONDOS,
+    escribir_consignaciones,
+    generar_consignaciones,
+    verificar_archivo_consignacion,
+)
+from src.core.roster import Roster
+
+FONDOS = ("PORVENIR", "PROTECCION", "COLFONDOS")
+
+
+def _roster(n=40):
+    roster = Roster.vacio()
+    for i in range(n):
+        roster.agregar(i + 1, 1_300_000.0 + 10_000 * i, datetime.date(2024, 1 + i % 12, 1), datetime.date(2025, 6, 30))
+    return roster
+
+
+def _afiliaciones(n=40):
+    return {i + 1: FONDOS[i % len(FONDOS)] for i in range(n)}
+
+
+def test_totales_de_control_coinciden_con_el_calculador(tmp_path):
+    resumen = generar_consignaciones(_roster(), _afiliaciones(), 2024, str(tmp_path), nit_empleador="900123456",
+                                     fecha_generacion=datetime.date(2025, 2, 1))
+    assert resumen.valido, resumen.errores
+    assert resumen.empleados == 40
+    assert resumen.registros == resumen.registros_calculados == 40
+    assert abs(resumen.total - resumen.total_calculado) <= 0.5 * resumen.registros_calculados
+    assert resumen.total_calculado != int(resumen.total_calculado)  # Suma sin redondear
+    for codigo in FONDOS:
+        totales = resumen.fondos[codigo]
+        leidos = verificar_archivo_consignacion(totales.ruta, DISENOS_FONDOS[codigo])
+        assert (leidos.registros, leidos.total) == (totales.registros, totales.total)
+    # Solo los archivos publicados, sin temporales
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(t.ruta) for t in resumen.fondos.values())
+
+
+def test_control_alterado_se_detecta(tmp_path):
+    resumen = generar_consignaciones(_roster(6), _afiliaciones(6), 2024, str(tmp_path))
+    ruta = resumen.fondos["PROTECCION"].ruta
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        lineas = archivo.readlines()
+    # El registro de control declara un total distinto
+    campos = lineas[-1].rstrip("\r\n").split(";")
+    campos[-1] = str(int(campos[-1]) + 1)
+    lineas[-1] = ";".join(campos) + "\r\n"
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        archivo.writelines(lineas)
+    with pytest.raises(ValueError):
+        verificar_archivo_consignacion(ruta, DISENOS_FONDOS["PROTECCION"])
+
+
+def test_con_errores_no_se_publica_ningun_archivo(tmp_path):
+    afiliaciones = _afiliaciones()
+    del afiliaciones[5]  # Un empleado sin fondo
+    resumen = generar_consignaciones(_roster(), afiliaciones, 2024, str(tmp_path))
+    assert not resumen.valido
+    assert resumen.sin_fondo == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_archivo_inconsistente_no_se_publica(tmp_path, monkeypatch):
+    verificar = consignment.verificar_archivo_consignacion
+    leidas = []
+
+    def verificar_archivo_danado(ruta, diseno):
+        # Se pierde el último detalle del archivo temporal antes de verificarlo
+        leidas.append(ruta)
+        with open(ruta, encoding="utf-8", newline="") as archivo:
+            lineas = archivo.readlines()
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            archivo.writelines(lineas[:-2] + lineas[-1:])
+        return verificar(ruta, diseno)
+
+    monkeypatch.setattr(consignment, "verificar_archivo_consignacion", verificar_archivo_danado)
+    resumen = generar_consignaciones(_roster(9), _afiliaciones(9), 2024, str(tmp_path))
+    # Se verificaron los temporales, no los archivos finales
+    assert leidas and all(".tmp-" in ruta for ruta in leidas)
+    assert not resumen.valido
+    assert len(resumen.errores) == len(FONDOS)
+    assert os.listdir(tmp_path) == []
+
+
+def test_error_de_redondeo_por_fondo_se_detecta(tmp_path, monkeypatch):
+    # Un peso de más por registro: los archivos son coherentes entre sí, pero no con el calculador
+    monkeypatch.setattr(consignment, "_pesos", lambda valor: int(valor + 0.5) + 1)
+    resumen = generar_consignaciones(_roster(12), _afiliaciones(12), 2024, str(tmp_path))
+    assert not resumen.valido
+    assert any("redondeo" in error for error in resumen.errores)
+    assert os.listdir(tmp_path) == []
+
+
+def test_valores_menores_a_medio_peso_no_se_consignan(tmp_path):
+    bloques = [([1, 2, 3], [360, 1, 360], [1_000_000.4, 0.3, 2_000_000.5], ["PORVENIR"] * 3)]
+    resumen = escribir_consignaciones(bloques, 2024, str(tmp_path))
+    assert resumen.valido, resumen.errores
+    assert (resumen.registros, resumen.registros_calculados) == (2, 2)
+    assert (resumen.total, resumen.total_calculado) == (3_000_001, pytest.approx(3_000_000.9))
+
+
+def test_fondo_sin_diseno(tmp_path):
+    bloques = [([1], [360], [1_000_000.0], ["DESCONOCIDO"])]
+    with pytest.raises(ValueError):
+        escribir_consignaciones(bloques, 2024, str(tmp_path), DISENOS_FONDOS)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de src/utils/date_helpers.py."""
+
+import datetime
+
+import pytest
+
+from src.utils.date_helpers import (
+    calcular_dias_liquidacion,
+    calcular_dias_por_semestre,
+    fecha_a_serial_360,
+    formatear_fecha,
+    serial_360_a_fecha,
+)
+
+
+@pytest.mark.parametrize("inicio, fin, dias", [
+    (datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), 360),
+    (datetime.date(2024, 1, 1), datetime.date(2024, 1, 1), 1),
+    (datetime.date(2024, 1, 31), datetime.date(2024, 2, 1), 2),
+    (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29), 29),
+    (datetime.date(2023, 7, 1), datetime.date(2024, 6, 30), 360),
+])
+def test_dias_liquidacion_30_360(inicio, fin, dias):
+    assert calcular_dias_liquidacion(inicio, fin) == dias
+
+
+def test_dias_liquidacion_rechaza_periodo_invertido():
+    with pytest.raises(ValueError):
+        calcular_dias_liquidacion(datetime.date(2024, 2, 1), datetime.date(2024, 1, 1))
+
+
+def test_serial_360_consistente_con_dias():
+    fechas = [datetime.date(2023, 1, 1) + datetime.timedelta(days=d) for d in range(0, 800, 7)]
+    for inicio in fechas[:40]:
+        for fin in fechas:
+            if fin >= inicio:
+                assert calcular_dias_liquidacion(inicio, fin) == fecha_a_serial_360(fin) - fecha_a_serial_360(inicio) + 1
+
+
+def test_serial_360_ida_y_vuelta():
+    assert serial_360_a_fecha(fecha_a_serial_360(datetime.date(2024, 5, 17))) == datetime.date(2024, 5, 17)
+    # El 30 comercial de febrero se ajusta al último día real del mes
+    assert serial_360_a_fecha(2024 * 360 + 30 + 29) == datetime.date(2024, 2, 29)
+
+
+def test_dias_por_semestre():
+    assert calcular_dias_por_semestre(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)) == {1: 180, 2: 180}
+    assert calcular_dias_por_semestre(datetime.date(2024, 8, 1), datetime.date(2024, 12, 31)) == {1: 0, 2: 150}
+    assert calcular_dias_por_semestre(datetime.date(2023, 3, 1), datetime.date(2024, 3, 30)) == {1: 90, 2: 0}
+
+
+def test_formatear_fecha():
+    assert formatear_fecha(datetime.date(2024, 3, 5)) == "05/03/2024"
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del DatePicker (src/ui/widgets/date_picker.py); las de Tk requieren una pantalla."""
+
+import datetime
+import tkinter as tk
+
+import pytest
+
+from src.ui.widgets import date_picker
+from src.ui.widgets.date_picker import DatePicker, datos_locale
+
+
+def test_datos_locale_compartidos():
+    meses, dias = datos_locale("es_CO")
+    assert len(meses) == 12 and len(dias) == 7
+    assert datos_locale("es_CO") is datos_locale("es_CO")
+    if date_picker.get_month_names is None:
+        assert meses[0] == "enero" and dias[0] == "lu"
+
+
+@pytest.fixture
+def raiz():
+    try:
+        raiz = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no hay pantalla para Tk")
+    raiz.withdraw()
+    yield raiz
+    raiz.destroy()
+
+
+def test_get_set_date(raiz):
+    selector = DatePicker(raiz, date_pattern="dd/mm/yyyy")
+    selector.set_date(datetime.date(2024, 2, 29))
+    assert selector.entry.get() == "29/02/2024"
+    assert selector.get_date() == datetime.date(2024, 2, 29)
+    selector.entry.delete(0, tk.END)
+    selector.entry.insert(0, "31/02/2024")
+    with pytest.raises(ValueError):
+        selector.get_date()
+
+
+def test_calendario_perezoso_y_seleccion(raiz):
+    selector = DatePicker(raiz)
+    selector.set_date(datetime.date(2024, 3, 15))
+    assert selector._popup is None
+    seleccionados = []
+    selector.bind(DatePicker.EVENTO_SELECCION, lambda event: seleccionados.append(selector.get_date()))
+    selector.open_calendar()
+    popup = selector._popup
+    selector._cambiar_mes(-1)  # febrero 2024 empieza en jueves
+    selector._on_dia(3)
+    raiz.update()
+    assert selector.get_date() == datetime.date(2024, 2, 1)
+    assert seleccionados == [datetime.date(2024, 2, 1)]
+    selector.open_calendar()
+    assert selector._popup is popup
+
+
+def test_patron_no_soportado(raiz):
+    with pytest.raises(ValueError):
+        DatePicker(raiz, date_pattern="mm-dd-yy")
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la exportación de resultados por lotes (src/utils/export.py)."""
+
+import csv
+import datetime
+import gzip
+from array import array
+
+import pytest
+
+from src.core.batch import calcular_liquidacion_lote
+from src.utils import export
+from src.utils.date_helpers import fecha_a_serial_360
+
+
+def _resultado(n=25):
+    salarios = array("d", (1_300_000.0 + 1000 * i for i in range(n)))
+    inicio = array("i", (fecha_a_serial_360(datetime.date(2024, 1, 1 + i % 28)) for i in range(n)))
+    fin = array("i", [fecha_a_serial_360(datetime.date(2024, 12, 31))] * n)
+    return array("q", range(100, 100 + n)), calcular_liquidacion_lote(salarios, inicio, fin)
+
+
+def test_dividir_en_bloques():
+    ids, resultado = _resultado(25)
+    bloques = list(export.dividir_en_bloques(ids, resultado, tamano_bloque=10))
+    assert [len(ids_bloque) for ids_bloque, _ in bloques] == [10, 10, 5]
+    assert [len(bloque) for _, bloque in bloques] == [10, 10, 5]
+    assert list(bloques[2][1].cesantias) == list(resultado.cesantias[20:])
+    assert list(bloques[1][0]) == list(ids[10:20])
+
+
+def test_dividir_en_bloques_filas_distintas():
+    ids, resultado = _resultado(5)
+    with pytest.raises(ValueError):
+        list(export.dividir_en_bloques(ids[:4], resultado))
+
+
+def test_exportar_csv_gzip(tmp_path):
+    ids, resultado = _resultado(25)
+    ruta = str(tmp_path / "resultados.csv.gz")
+    filas = export.exportar_resultados(ruta, ids, resultado, tamano_bloque=7)
+    assert filas == 25 * len(export.CONCEPTOS_EXPORTADOS)
+
+    with gzip.open(ruta, "rt", newline="", encoding="utf-8") as archivo:
+        assert export.leer_version_csv(archivo) == resultado.version_parametros
+        leidas = list(csv.DictReader(archivo))
+    assert len(leidas) == filas
+    cesantias = {int(fila["id_empleado"]): float(fila["valor"]) for fila in leidas if fila["concepto"] == "CESANTIAS"}
+    assert cesantias == dict(zip(ids, resultado.cesantias))
+
+
+def test_bloques_con_versiones_distintas(tmp_path):
+    ids, resultado = _resultado(10)
+    bloques = list(export.dividir_en_bloques(ids, resultado, tamano_bloque=5))
+    assert {bloque.version_parametros for _, bloque in bloques} == {resultado.version_parametros}
+    bloques[1][1].version_parametros = "otra"
+    with pytest.raises(ValueError):
+        export.exportar_csv_gzip(str(tmp_path / "resultados.csv.gz"), bloques)
+
+    # Sin versión registrada no hay línea de comentario
+    resultado.version_parametros = None
+    ruta = str(tmp_path / "sin_version.csv.gz")
+    export.exportar_resultados(ruta, ids, resultado)
+    with gzip.open(ruta, "rt", newline="", encoding="utf-8") as archivo:
+        assert export.leer_version_csv(archivo) is None
+        assert next(csv.reader(archivo)) == list(export.COLUMNAS_EXPORTACION)
+
+
+def test_formato_no_deducible(tmp_path):
+    ids, resultado = _resultado(1)
+    with pytest.raises(ValueError):
+        export.exportar_resultados(str(tmp_path / "resultados.txt"), ids, resultado)
+
+
+@pytest.mark.skipif(export.pa is None, reason="requiere pyarrow")
+@pytest.mark.parametrize("compresion", ["zstd", None])
+def test_exportar_parquet_respeta_compresion(tmp_path, compresion):
+    ids, resultado = _resultado(25)
+    ruta = str(tmp_path / "resultados.parquet")
+    export.exportar_resultados(ruta, ids, resultado, compresion=compresion)
+    metadatos = export.pq.ParquetFile(ruta).metadata
+    assert metadatos.row_group(0).column(2).compression == (compresion or "uncompressed").upper()
+
+
+@pytest.mark.skipif(export.pa is None, reason="requiere pyarrow")
+@pytest.mark.parametrize("extension", ["parquet", "arrow"])
+def test_exportar_arrow_registra_version(tmp_path, extension):
+    ids, resultado = _resultado(25)
+    ruta = str(tmp_path / f"resultados.{extension}")
+    export.exportar_resultados(ruta, ids, resultado, tamano_bloque=10)
+    if extension == "parquet":
+        esquema = export.pq.read_schema(ruta)
+    else:
+        with export.pa.memory_map(ruta) as fuente:
+            esquema = export.pa.ipc.open_file(fuente).schema
+    assert esquema.metadata[b"version_parametros"] == resultado.version_parametros.encode("utf-8")
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del calendario de festivos y días hábiles (src/utils/holidays.py)."""
+
+import datetime
+import random
+
+import pytest
+
+from src.utils.holidays import (
+    contar_dias_habiles,
+    contar_dias_habiles_lote,
+    dias_habiles_anio,
+    domingo_de_pascua,
+    es_festivo,
+    festivos_anio,
+)
+
+FESTIVOS_2024 = [
+    (1, 1), (1, 8), (3, 25), (3, 28), (3, 29), (5, 1), (5, 13), (6, 3), (6, 10),
+    (7, 1), (7, 20), (8, 7), (8, 19), (10, 14), (11, 4), (11, 11), (12, 8), (12, 25),
+]
+
+
+def _habiles_fuerza_bruta(inicio, fin):
+    total = 0
+    fecha = inicio
+    while fecha <= fin:
+        if fecha.weekday() != 6 and not es_festivo(fecha):
+            total += 1
+        fecha += datetime.timedelta(days=1)
+    return total
+
+
+@pytest.mark.parametrize("anio, pascua", [(2024, (3, 31)), (2025, (4, 20)), (2019, (4, 21)), (2038, (4, 25))])
+def test_domingo_de_pascua(anio, pascua):
+    assert domingo_de_pascua(anio) == datetime.date(anio, *pascua)
+
+
+def test_festivos_2024():
+    assert festivos_anio(2024) == tuple(datetime.date(2024, mes, dia) for mes, dia in FESTIVOS_2024)
+
+
+def test_dias_habiles_contra_fuerza_bruta():
+    rng = random.Random(8)
+    base = datetime.date(2019, 1, 1)
+    for _ in range(300):
+        inicio = base + datetime.timedelta(days=rng.randrange(6 * 365))
+        fin = inicio + datetime.timedelta(days=rng.randrange(-3, 800))
+        assert contar_dias_habiles(inicio, fin) == _habiles_fuerza_bruta(inicio, fin), (inicio, fin)
+
+
+def test_dias_habiles_anio_completo():
+    habiles = dias_habiles_anio(2024)
+    assert len(habiles) == contar_dias_habiles(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+    assert datetime.date(2024, 1, 2) in habiles
+    assert datetime.date(2024, 1, 7) not in habiles  # domingo
+    assert datetime.date(2024, 1, 8) not in habiles  # festivo trasladado
+
+
+def test_dias_habiles_lote():
+    periodos = [(datetime.date(2024, 12, 20), datetime.date(2025, 1, 10)), (datetime.date(2024, 3, 25), datetime.date(2024, 3, 31))]
+    lote = contar_dias_habiles_lote([a.toordinal() for a, _ in periodos], [b.toordinal() for _, b in periodos])
+    assert list(lote) == [contar_dias_habiles(a, b) for a, b in periodos]
+    assert lote[1] == 3  # Semana Santa: lunes festivo, jueves y viernes santos, domingo
+    with pytest.raises(ValueError):
+        contar_dias_habiles_lote([1], [])
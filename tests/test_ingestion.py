@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la ingesta concurrente de rosters (src/core/ingestion.py) y su contabilidad por archivo."""
+
+import dataclasses
+import datetime
+import json
+from types import MappingProxyType
+
+import pytest
+
+from config import parameter_snapshot
+from src.core.audit_log import BitacoraAuditoria, activar_auditoria, desactivar_auditoria, leer_registros, verificar_log
+from src.core.batch import calcular_liquidacion_lote
+from src.core.ingestion import ingerir_archivos
+from src.core.roster import Roster, escribir_roster_binario, registro_roster
+
+_ENCABEZADO = "id_empleado,salario,fecha_inicio,fecha_fin\n"
+
+
+def _filas_validas(n, desde=1):
+    return [f"{desde + i},{1_300_000 + 1000 * i},2024-01-{1 + i % 28:02d},2024-12-31\n" for i in range(n)]
+
+
+@pytest.fixture
+def archivos(tmp_path):
+    rutas = {}
+    rutas["bueno"] = str(tmp_path / "bueno.csv")
+    with open(rutas["bueno"], "w", encoding="utf-8") as archivo:
+        archivo.write(_ENCABEZADO + "".join(_filas_validas(25)))
+
+    rutas["mixto"] = str(tmp_path / "mixto.csv")
+    with open(rutas["mixto"], "w", encoding="utf-8") as archivo:
+        archivo.write(_ENCABEZADO + "".join(_filas_validas(10)))
+        archivo.write("900,abc,2024-01-01,2024-12-31\n")         # Salario inválido
+        archivo.write("901,1300000,2024-06-01,2024-03-31\n")     # Fin anterior al inicio
+        archivo.write("".join(_filas_validas(5, desde=100)))
+
+    rutas["jsonl"] = str(tmp_path / "sucursal.jsonl")
+    with open(rutas["jsonl"], "w", encoding="utf-8") as archivo:
+        for i in range(7):
+            archivo.write(json.dumps({"id_empleado": i, "salario": 2_000_000, "fecha_inicio": "2024-02-01",
+                                      "fecha_fin": "2024-11-30"}) + "\n")
+        archivo.write("[1, 2]\n")
+        archivo.write(json.dumps({"id_empleado": 99, "salario": 2_000_000, "fecha_inicio": "2024-12-01",
+                                  "fecha_fin": "2024-01-31"}) + "\n")
+
+    roster = Roster.vacio()
+    for i in range(12):
+        roster.agregar(i, 1_500_000.0, datetime.date(2024, 3, 1), datetime.date(2024, 9, 30))
+    roster.agregar(50, 1_500_000.0, datetime.date(2024, 9, 30), datetime.date(2024, 3, 1))
+    rutas["bin"] = str(tmp_path / "sucursal.bin")
+    escribir_roster_binario(rutas["bin"], roster)
+
+    rutas["ausente"] = str(tmp_path / "no_existe.csv")
+    rutas["formato"] = str(tmp_path / "roster.xlsx")
+    return rutas
+
+
+@pytest.mark.parametrize("usar_procesos", [False, True])
+def test_contabilidad_por_archivo(archivos, usar_procesos):
+    resultados = []
+    resumen = ingerir_archivos(list(archivos.values()), lambda ruta, numero, ids, r: resultados.append((ruta, len(ids))),
+                               lectores=3, calculadores=2, tamano_bloque=4, usar_procesos=usar_procesos)
+    estados = {nombre: resumen.archivos[ruta] for nombre, ruta in archivos.items()}
+
+    assert (estados["bueno"].filas_leidas, estados["bueno"].filas_calculadas, estados["bueno"].completo) == (25, 25, True)
+    assert (estados["mixto"].filas_leidas, estados["mixto"].filas_invalidas) == (15, 2)
+    assert [mensaje.split(":")[0] for mensaje in estados["mixto"].errores] == ["Línea 12", "Línea 13"]
+    assert (estados["jsonl"].filas_leidas, estados["jsonl"].filas_invalidas) == (7, 2)
+    assert (estados["bin"].filas_leidas, estados["bin"].filas_invalidas) == (12, 1)
+    for nombre in ("mixto", "jsonl", "bin"):
+        assert estados[nombre].filas_fallidas == 0
+        assert estados[nombre].filas_calculadas == estados[nombre].filas_leidas
+        assert not estados[nombre].completo
+    assert estados["ausente"].error.startswith("FileNotFoundError")
+    assert estados["formato"].error.startswith("ValueError")
+    assert {estado.ruta for estado in resumen.con_errores} == {archivos[n] for n in ("mixto", "jsonl", "bin", "ausente", "formato")}
+    assert sum(filas for _, filas in resultados) == resumen.filas_calculadas == 25 + 15 + 7 + 12
+
+    esperado = calcular_liquidacion_lote([1_300_000 + 1000 * i for i in range(25)],
+                                         [2024 * 360 + i % 28 for i in range(25)], [2024 * 360 + 359] * 25)
+    assert estados["bueno"].totales["cesantias"] == pytest.approx(sum(esperado.cesantias))
+
+
+def test_procesos_e_hilos_usan_la_instantanea_vigente(tmp_path, monkeypatch):
+    for nombre in ("_snapshot", "_estado_archivo", "_snapshot_instalado"):
+        monkeypatch.setattr(parameter_snapshot, nombre, getattr(parameter_snapshot, nombre))
+    # Parámetros distintos a los del archivo de disco, que los procesos no deben releer
+    vigente = parameter_snapshot.snapshot_actual()
+    parameter_snapshot.instalar_snapshot(dataclasses.replace(
+        vigente, version="X",
+        salarios_minimos=MappingProxyType({2024: 1_000_000}),
+        auxilios_transporte=MappingProxyType({2024: 300_000}),
+    ))
+    roster = Roster.vacio()
+    for i in range(300):
+        roster.agregar(i, 1_000_000.0 + 5000 * i, datetime.date(2024, 1, 1 + i % 28), datetime.date(2024, 12, 31))
+    ruta = str(tmp_path / "sucursal.bin")
+    escribir_roster_binario(ruta, roster)
+
+    corridas = {}
+    for usar_procesos in (False, True):
+        resultados = {}
+        ruta_log = str(tmp_path / f"auditoria_{usar_procesos}.log")
+        with BitacoraAuditoria(ruta_log) as bitacora:
+            activar_auditoria(bitacora)
+            try:
+                ingerir_archivos([ruta], lambda _, numero, ids, r: resultados.__setitem__(numero, r),
+                                 lectores=1, calculadores=2, tamano_bloque=100, usar_procesos=usar_procesos)
+            finally:
+                desactivar_auditoria()
+        assert verificar_log(ruta_log).valida
+        registros = sorted(leer_registros(ruta_log), key=lambda registro: registro.entradas["salarios"][0])
+        corridas[usar_procesos] = resultados, registros
+
+    (hilos, registros_hilos), (procesos, registros_procesos) = corridas[False], corridas[True]
+    assert sorted(hilos) == sorted(procesos) == [0, 1, 2]
+    assert hilos == procesos
+    assert {resultado.version_parametros for resultado in procesos.values()} == {"X"}
+    assert len(registros_hilos) == len(registros_procesos) == 3
+    for en_hilo, en_proceso in zip(registros_hilos, registros_procesos):
+        assert (en_hilo.funcion, en_hilo.version_parametros) == (en_proceso.funcion, en_proceso.version_parametros)
+        assert en_hilo.entradas == en_proceso.entradas
+        assert en_hilo.salidas == en_proceso.salidas
+
+
+def test_registro_roster_rechaza_periodo_invertido():
+    with pytest.raises(ValueError):
+        registro_roster({"id_empleado": "1", "salario": "1300000", "fecha_inicio": "2024-06-01", "fecha_fin": "2024-05-31"})
+    registro = registro_roster({"id_empleado": "1", "salario": "1300000", "fecha_inicio": "2024-06-01",
+                                "fecha_fin": "2024-06-01"})
+    assert registro["fecha_inicio"] == registro["fecha_fin"]
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        ingerir_archivos([], lectores=0)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de los índices de ausencias (src/core/intervals.py) contra conteo por fuerza bruta."""
+
+import datetime
+import random
+
+import pytest
+
+from src.core.intervals import IndiceIntervalos, IndiceIntervalosLote
+from src.utils.date_helpers import fecha_a_serial_360
+
+
+def _intervalos(rng, n, base=0, rango=400):
+    intervalos = []
+    for _ in range(n):
+        inicio = base + rng.randrange(rango)
+        intervalos.append((inicio, inicio + rng.randrange(40)))
+    return intervalos
+
+
+def _fuerza_bruta(intervalos, inicio, fin):
+    cubiertos = set()
+    for a, b in intervalos:
+        cubiertos.update(range(a, b + 1))
+    return sum(1 for serial in range(inicio, fin + 1) if serial in cubiertos)
+
+
+def test_indice_contra_fuerza_bruta():
+    rng = random.Random(3)
+    for _ in range(200):
+        intervalos = _intervalos(rng, rng.randrange(0, 12))
+        indice = IndiceIntervalos(intervalos)
+        for _ in range(10):
+            inicio = rng.randrange(-20, 450)
+            fin = inicio + rng.randrange(-5, 200)
+            assert indice.dias_superpuestos_serial(inicio, fin) == _fuerza_bruta(intervalos, inicio, fin)
+
+
+def test_indice_fusiona_solapados_y_contiguos():
+    indice = IndiceIntervalos([(10, 20), (15, 25), (26, 30), (40, 40)])
+    assert len(indice) == 2
+    assert indice.total_dias == 22
+
+
+def test_indice_desde_fechas():
+    indice = IndiceIntervalos.desde_fechas([(datetime.date(2024, 3, 1), datetime.date(2024, 3, 10))])
+    assert indice.dias_superpuestos(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)) == 10
+    assert indice.dias_superpuestos(datetime.date(2024, 3, 5), datetime.date(2024, 3, 31)) == 6
+
+
+def test_ausencia_invertida():
+    with pytest.raises(ValueError):
+        IndiceIntervalos([(5, 4)])
+
+
+def test_lote_igual_a_indices_individuales():
+    rng = random.Random(11)
+    por_empleado = [_intervalos(rng, rng.randrange(0, 6)) for _ in range(50)]
+    lote = IndiceIntervalosLote.desde_listas(por_empleado)
+    inicios = [rng.randrange(0, 200) for _ in por_empleado]
+    fines = [inicio + rng.randrange(0, 300) for inicio in inicios]
+    esperado = [IndiceIntervalos(intervalos).dias_superpuestos_serial(a, b)
+                for intervalos, a, b in zip(por_empleado, inicios, fines)]
+    assert list(lote.dias_superpuestos_lote(inicios, fines)) == esperado
+
+
+def test_lote_desde_registros_en_desorden():
+    registros = [(2, 30, 39), (0, 0, 4), (2, 5, 9), (0, 3, 8)]
+    lote = IndiceIntervalosLote.desde_registros(3, registros)
+    assert [lote.dias_superpuestos(fila, 0, 100) for fila in range(3)] == [9, 0, 15]
+
+
+def test_lote_filas_distintas():
+    lote = IndiceIntervalosLote.desde_listas([[(0, 1)]])
+    with pytest.raises(ValueError):
+        lote.dias_superpuestos_lote([0, 0], [5, 5])
+
+
+def test_seriales_del_31_cuentan_como_30():
+    indice = IndiceIntervalos.desde_fechas([(datetime.date(2024, 1, 30), datetime.date(2024, 1, 31))])
+    assert fecha_a_serial_360(datetime.date(2024, 1, 31)) == fecha_a_serial_360(datetime.date(2024, 1, 30))
+    assert indice.total_dias == 1
+
+
+def test_liquidacion_lote_con_ausencias_igual_a_escalar():
+    from src.core import calculator
+    from src.core.batch import calcular_liquidacion_lote
+
+    inicio, fin = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+    ausencias = [
+        [],
+        [(datetime.date(2024, 2, 10), datetime.date(2024, 3, 5))],
+        [(datetime.date(2024, 6, 20), datetime.date(2024, 7, 10)), (datetime.date(2024, 7, 1), datetime.date(2024, 7, 31))],
+    ]
+    lote = calcular_liquidacion_lote(
+        [2_000_000.0] * 3,
+        [fecha_a_serial_360(inicio)] * 3,
+        [fecha_a_serial_360(fin)] * 3,
+        ausencias=IndiceIntervalosLote.desde_listas(
+            [[(fecha_a_serial_360(a), fecha_a_serial_360(b)) for a, b in intervalos] for intervalos in ausencias]
+        ),
+    )
+    for fila, intervalos in enumerate(ausencias):
+        cesantias = calculator.calcular_cesantias(2_000_000, inicio, fin, ausencias=intervalos)
+        prima = calculator.calcular_prima_servicios(2_000_000, inicio, fin, ausencias=intervalos)
+        assert lote.cesantias[fila] == cesantias
+        assert lote.intereses[fila] == calculator.calcular_intereses_cesantias(cesantias, inicio, fin, ausencias=intervalos)
+        assert (lote.prima_semestre_1[fila], lote.prima_semestre_2[fila]) == (prima["prima_semestre_1"], prima["prima_semestre_2"])
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del recálculo en vivo (src/controllers/live_recalculation.py) sin Tk."""
+
+import dataclasses
+import time
+
+import pytest
+
+from config import parameter_snapshot
+from src.controllers.live_recalculation import RecalculoEnVivo
+
+
+class _WidgetFalso:
+    """Reemplaza after()/after_cancel() de Tk: los callbacks se ejecutan a mano."""
+
+    def __init__(self):
+        self.pendientes = {}
+        self._siguiente = 0
+
+    def after(self, ms, funcion, *args):
+        self._siguiente += 1
+        identificador = f"after#{self._siguiente}"
+        self.pendientes[identificador] = (funcion, args)
+        return identificador
+
+    def after_cancel(self, identificador):
+        self.pendientes.pop(identificador, None)
+
+    def vaciar(self, limite=2.0):
+        fin = time.monotonic() + limite
+        while self.pendientes:
+            assert time.monotonic() < fin, "los callbacks no terminaron"
+            identificador = next(iter(self.pendientes))
+            funcion, args = self.pendientes.pop(identificador)
+            funcion(*args)
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def snapshot_restaurado(monkeypatch):
+    # Al terminar, monkeypatch devuelve el estado del módulo (incluida la marca de instalación)
+    for nombre in ("_snapshot", "_estado_archivo", "_snapshot_instalado"):
+        monkeypatch.setattr(parameter_snapshot, nombre, getattr(parameter_snapshot, nombre))
+    return parameter_snapshot.snapshot_actual()
+
+
+def _recalculo(entradas):
+    widget = _WidgetFalso()
+    llamadas, aplicados = [], []
+
+    def calcular(valores):
+        llamadas.append(valores)
+        return {"valor": str(sum(valores))}
+
+    recalculo = RecalculoEnVivo(widget, lambda: entradas[0], calcular, aplicados.append)
+    return widget, recalculo, llamadas, aplicados
+
+
+def test_debounce_calcula_una_vez():
+    entradas = [(1, 2)]
+    widget, recalculo, llamadas, aplicados = _recalculo(entradas)
+    for _ in range(5):
+        recalculo.notificar_cambio()
+    assert len(widget.pendientes) == 1
+    widget.vaciar()
+    assert llamadas == [(1, 2)]
+    assert aplicados == [{"valor": "3"}]
+
+
+def test_entradas_repetidas_usan_cache():
+    entradas = [(1, 2)]
+    widget, recalculo, llamadas, aplicados = _recalculo(entradas)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    entradas[0] = (5,)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    entradas[0] = (1, 2)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    assert llamadas == [(1, 2), (5,)]
+    assert aplicados == [{"valor": "3"}, {"valor": "5"}, {"valor": "3"}]
+
+
+def test_cambio_de_parametros_invalida_cache(snapshot_restaurado):
+    entradas = [(1, 2)]
+    widget, recalculo, llamadas, aplicados = _recalculo(entradas)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+
+    # Mismas entradas, otra instantánea de parámetros: hay que recalcular
+    parameter_snapshot.instalar_snapshot(dataclasses.replace(snapshot_restaurado, huella="f" * 64))
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    assert llamadas == [(1, 2), (1, 2)]
+
+    # De vuelta a la instantánea original: el resultado sigue en caché
+    parameter_snapshot.instalar_snapshot(snapshot_restaurado)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    assert len(llamadas) == 2
+    assert len(aplicados) == 3
+
+
+def test_error_de_entradas_se_aplica():
+    widget = _WidgetFalso()
+    aplicados = []
+
+    def leer():
+        raise ValueError("Salario inválido")
+
+    recalculo = RecalculoEnVivo(widget, leer, lambda valores: {}, aplicados.append)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    assert aplicados == [{"error": "Salario inválido"}]
+
+
+def test_fallo_transitorio_se_reintenta(capsys):
+    widget = _WidgetFalso()
+    llamadas, aplicados = [], []
+
+    def calcular(valores):
+        llamadas.append(valores)
+        if len(llamadas) == 1:
+            raise OSError("fallo transitorio")
+        return {"valor": str(sum(valores))}
+
+    recalculo = RecalculoEnVivo(widget, lambda: (1, 2), calcular, aplicados.append)
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    assert "error" in aplicados[-1]
+    # Las mismas entradas se recalculan en el siguiente cambio
+    recalculo.notificar_cambio()
+    widget.vaciar()
+    assert llamadas == [(1, 2), (1, 2)]
+    assert aplicados[-1] == {"valor": "3"}
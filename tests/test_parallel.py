@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la liquidación en paralelo con memoria compartida (src/core/parallel.py)."""
+
+import pytest
+
+from src.core.audit_log import (
+    BitacoraAuditoria,
+    activar_auditoria,
+    desactivar_auditoria,
+    leer_registros,
+    verificar_log,
+)
+from src.core.batch import calcular_liquidacion_lote
+from src.core.parallel import COLUMNAS_RESULTADO, liquidar_en_paralelo
+from src.core.roster import escribir_roster_binario
+from src.core.roster_generator import generar_roster
+
+
+@pytest.fixture(scope="module")
+def roster():
+    return generar_roster(3000, semilla=9)
+
+
+def _secuencial(roster):
+    return calcular_liquidacion_lote(
+        roster["salario"], roster["serial_inicio"], roster["serial_fin"],
+        tipos_contrato=roster["tipo_contrato"], banderas=roster["banderas"],
+    )
+
+
+def _comparar(compartidos, esperado):
+    assert len(compartidos) == len(esperado)
+    for nombre, _ in COLUMNAS_RESULTADO:
+        assert list(getattr(compartidos.resultado, nombre)) == list(getattr(esperado, nombre)), nombre
+
+
+def test_paralelo_igual_a_secuencial(roster):
+    with liquidar_en_paralelo(roster, procesos=2, tamano_rango=700) as compartidos:
+        _comparar(compartidos, _secuencial(roster))
+
+
+def test_paralelo_desde_roster_binario(tmp_path, roster):
+    ruta = str(tmp_path / "roster.bin")
+    escribir_roster_binario(ruta, roster)
+    with liquidar_en_paralelo(ruta, procesos=2, tamano_rango=1024) as compartidos:
+        _comparar(compartidos, _secuencial(roster))
+
+
+def test_tamano_rango_invalido(roster):
+    with pytest.raises(ValueError):
+        liquidar_en_paralelo(roster, tamano_rango=0)
+
+
+def test_auditoria_con_procesos_de_trabajo(tmp_path, roster):
+    ruta = str(tmp_path / "auditoria.log")
+    esperado = _secuencial(roster)
+    # Buffer pequeño: cualquier escritura de un proceso de trabajo llegaría al archivo
+    with BitacoraAuditoria(ruta, tamano_buffer=64) as bitacora:
+        activar_auditoria(bitacora)
+        try:
+            with liquidar_en_paralelo(roster, procesos=2, tamano_rango=1000) as compartidos:
+                _comparar(compartidos, esperado)
+        finally:
+            desactivar_auditoria()
+
+    verificacion = verificar_log(ruta)
+    assert verificacion.valida, verificacion.mensaje
+    registros = list(leer_registros(ruta))
+    assert [registro.funcion for registro in registros] == ["calcular_liquidacion_lote"] * 3
+    assert [len(registro.entradas["salarios"]) for registro in registros] == [1000, 1000, 1000]
+    assert list(registros[1].salidas["resultado.cesantias"]) == list(esperado.cesantias[1000:2000])
+    assert list(registros[2].entradas["serial_fin"]) == list(roster["serial_fin"][2000:3000])
+
+    # Alterar un byte en medio de la bitácora rompe la cadena
+    with open(ruta, "r+b") as archivo:
+        archivo.seek(verificacion.posicion_valida // 2)
+        byte = archivo.read(1)
+        archivo.seek(-1, 1)
+        archivo.write(bytes([byte[0] ^ 0xFF]))
+    assert not verificar_log(ruta).valida
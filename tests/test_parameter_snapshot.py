@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la instantánea de parámetros legales (config/parameter_snapshot.py)."""
+
+import dataclasses
+import json
+import os
+from types import MappingProxyType
+
+import pytest
+
+from config import parameter_snapshot, settings
+
+
+@pytest.fixture(autouse=True)
+def estado_restaurado(monkeypatch):
+    for nombre in ("_snapshot", "_estado_archivo", "_snapshot_instalado"):
+        monkeypatch.setattr(parameter_snapshot, nombre, getattr(parameter_snapshot, nombre))
+
+
+def _escribir(ruta, version, smmlv=1_300_000):
+    contenido = {"version": version, "anios": {"2024": {"smmlv": smmlv, "auxilio_transporte": 162_000}}}
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(contenido, archivo)
+
+
+def _tocar(ruta, segundos):
+    estado = os.stat(ruta)
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + segundos * 1_000_000_000))
+
+
+def test_recargar_si_cambio(tmp_path):
+    ruta = str(tmp_path / "parametros.json")
+    _escribir(ruta, "1")
+    assert parameter_snapshot.recargar(ruta).version == "1"
+    assert parameter_snapshot.recargar_si_cambio(ruta) is parameter_snapshot.snapshot_actual()
+    _escribir(ruta, "2", smmlv=1_400_000)
+    _tocar(ruta, 1)
+    assert parameter_snapshot.recargar_si_cambio(ruta).smmlv(2024) == 1_400_000
+
+
+def test_archivo_invalido_conserva_la_vigente(tmp_path, capsys):
+    ruta = str(tmp_path / "parametros.json")
+    _escribir(ruta, "1")
+    vigente = parameter_snapshot.recargar(ruta)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("{")
+    _tocar(ruta, 1)
+    assert parameter_snapshot.recargar_si_cambio(ruta) is vigente
+    assert "ADVERTENCIA" in capsys.readouterr().out
+
+
+def test_cambio_durante_la_lectura_se_detecta(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "parametros.json")
+    _escribir(ruta, "1")
+    cargar = parameter_snapshot.cargar_snapshot
+
+    def cargar_y_editar(ruta_archivo):
+        snapshot = cargar(ruta_archivo)
+        # El archivo cambia justo después de leerlo
+        _escribir(ruta_archivo, "2", smmlv=1_400_000)
+        _tocar(ruta_archivo, 1)
+        return snapshot
+
+    monkeypatch.setattr(parameter_snapshot, "cargar_snapshot", cargar_y_editar)
+    assert parameter_snapshot.recargar(ruta).version == "1"
+    monkeypatch.setattr(parameter_snapshot, "cargar_snapshot", cargar)
+    assert parameter_snapshot.recargar_si_cambio(ruta).version == "2"
+
+
+def test_instalada_no_se_reemplaza_por_el_archivo(tmp_path):
+    ruta = str(tmp_path / "parametros.json")
+    _escribir(ruta, "1")
+    parameter_snapshot.recargar(ruta)
+    instalada = dataclasses.replace(parameter_snapshot.snapshot_actual(), version="prueba")
+    parameter_snapshot.instalar_snapshot(instalada)
+    _escribir(ruta, "2")
+    _tocar(ruta, 1)
+    assert parameter_snapshot.recargar_si_cambio(ruta) is instalada
+    # Una recarga explícita sí vuelve al archivo
+    assert parameter_snapshot.recargar(ruta).version == "2"
+
+
+def test_settings_derivados_de_la_vigente():
+    vigente = parameter_snapshot.snapshot_actual()
+    assert settings.SALARIOS_MINIMOS_HISTORICOS == dict(vigente.salarios_minimos)
+    anio = settings.CURRENT_YEAR
+    parameter_snapshot.instalar_snapshot(dataclasses.replace(
+        vigente,
+        salarios_minimos=MappingProxyType({anio: 2_000_000}),
+        auxilios_transporte=MappingProxyType({anio: 200_000}),
+    ))
+    assert settings.SALARIOS_MINIMOS_HISTORICOS == {anio: 2_000_000}
+    assert settings.AUXILIOS_TRANSPORTE_HISTORICOS == {anio: 200_000}
+    assert settings.SALARIO_MINIMO_VIGENTE == 2_000_000
+    assert settings.AUXILIO_TRANSPORTE_VIGENTE == 200_000
+    with pytest.raises(AttributeError):
+        settings.NO_EXISTE
+
+
+def test_contenido_invalido():
+    with pytest.raises(ValueError):
+        parameter_snapshot.compilar_snapshot(b'{"version": "1", "anios": {"2024": {"smmlv": 0, "auxilio_transporte": 1}}}')
+    with pytest.raises(ValueError):
+        parameter_snapshot.compilar_snapshot(b"no es json")
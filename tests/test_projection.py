@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la proyección de costos de retiro (src/core/projection.py) contra el cálculo por lotes."""
+
+import datetime
+import random
+from array import array
+
+import pytest
+
+from src.core.batch import calcular_liquidacion_lote
+from src.core.constants import BANDERA_APRENDIZ, BANDERA_SALARIO_INTEGRAL, CODIGOS_TIPO_CONTRATO
+from src.core.projection import (
+    CONCEPTOS_PROYECCION,
+    escribir_matriz_proyeccion,
+    fechas_fin_de_mes,
+    filas_por_bloque,
+    proyectar_bloques,
+    proyectar_costos_retiro,
+)
+from src.core.roster import Roster
+from src.utils.date_helpers import fecha_a_serial_360
+
+
+def _roster(n=60, semilla=5):
+    rng = random.Random(semilla)
+    roster = Roster.vacio()
+    for i in range(n):
+        inicio = datetime.date(2023, 1, 1) + datetime.timedelta(days=rng.randrange(700))
+        roster.agregar(
+            id_empleado=i + 1,
+            salario=float(rng.choice([1_300_000, 2_000_000, 2_600_000, 9_000_000])),
+            fecha_inicio=inicio,
+            fecha_fin=datetime.date(2025, 12, 31),
+            tipo_contrato=rng.choice(CODIGOS_TIPO_CONTRATO),
+            banderas=rng.choice((0, 0, BANDERA_APRENDIZ, BANDERA_SALARIO_INTEGRAL)),
+        )
+    return roster
+
+
+def test_fechas_fin_de_mes():
+    fechas = fechas_fin_de_mes(datetime.date(2023, 11, 15), 4)
+    assert fechas == [datetime.date(2023, 11, 30), datetime.date(2023, 12, 31),
+                      datetime.date(2024, 1, 31), datetime.date(2024, 2, 29)]
+
+
+def test_proyeccion_igual_a_lote_por_fecha():
+    roster = _roster()
+    fechas = fechas_fin_de_mes(datetime.date(2024, 1, 1), 18)
+    proyeccion = proyectar_costos_retiro(roster, fechas, conservar_matrices=True)
+    m = len(fechas)
+    for j, fecha in enumerate(fechas):
+        serial = fecha_a_serial_360(fecha)
+        # Solo quienes ya ingresaron en la fecha; el resto debe costar 0
+        filas = [fila for fila in range(len(roster)) if roster["serial_inicio"][fila] <= serial]
+        for fila in set(range(len(roster))) - set(filas):
+            assert all(proyeccion.matrices[concepto][fila * m + j] == 0.0 for concepto in CONCEPTOS_PROYECCION)
+        lote = calcular_liquidacion_lote(
+            [roster["salario"][fila] for fila in filas],
+            [roster["serial_inicio"][fila] for fila in filas],
+            [serial] * len(filas),
+            tipos_contrato=[roster["tipo_contrato"][fila] for fila in filas],
+            banderas=[roster["banderas"][fila] for fila in filas],
+        )
+        for k, fila in enumerate(filas):
+            posicion = fila * m + j
+            assert proyeccion.matrices["cesantias"][posicion] == lote.cesantias[k]
+            assert proyeccion.matrices["intereses"][posicion] == lote.intereses[k]
+            assert proyeccion.matrices["prima"][posicion] == lote.prima_semestre_1[k] + lote.prima_semestre_2[k]
+        assert proyeccion.totales["cesantias"][j] == pytest.approx(sum(lote.cesantias))
+
+
+def test_totales_no_dependen_del_tamano_de_bloque():
+    roster = _roster(40)
+    fechas = fechas_fin_de_mes(datetime.date(2024, 6, 1), 12)
+    completo = proyectar_costos_retiro(roster, fechas, conservar_matrices=True)
+    # Memoria para una sola fila por bloque
+    por_filas = proyectar_costos_retiro(roster, fechas, conservar_matrices=True, memoria_maxima=1)
+    assert filas_por_bloque(len(fechas), 1) == 1
+    assert len(list(proyectar_bloques(roster, fechas, memoria_maxima=1))) == len(roster)
+    assert completo.totales == por_filas.totales
+    assert completo.matrices == por_filas.matrices
+
+
+def test_escribir_matriz(tmp_path):
+    roster = _roster(25)
+    fechas = fechas_fin_de_mes(datetime.date(2024, 1, 1), 6)
+    ruta = str(tmp_path / "proyeccion.bin")
+    escrita = escribir_matriz_proyeccion(ruta, roster, fechas, concepto="total", memoria_maxima=8 * 4 * 6 * 7)
+    leida = array("d")
+    with open(ruta, "rb") as archivo:
+        leida.fromfile(archivo, len(roster) * len(fechas))
+    esperado = proyectar_costos_retiro(roster, fechas, conservar_matrices=True)
+    assert leida == esperado.matrices["total"]
+    assert escrita.totales == esperado.totales
+    with pytest.raises(ValueError):
+        escribir_matriz_proyeccion(ruta, roster, fechas, concepto="vacaciones")
+
+
+def test_anio_sin_parametros():
+    with pytest.raises(ValueError):
+        proyectar_costos_retiro(_roster(3), [datetime.date(1990, 6, 30)])
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la conciliación por hash join particionado (src/core/reconciliation.py)."""
+
+import csv
+import random
+
+import pytest
+
+from src.core.reconciliation import (
+    ESTADO_MODIFICADO,
+    ESTADO_SOLO_A,
+    ESTADO_SOLO_B,
+    escribir_filas_csv,
+    leer_filas_csv,
+    reconciliar,
+    reconciliar_a_csv,
+)
+
+CONCEPTOS_PRUEBA = ("Cesantías", "Intereses", "Prima")
+
+
+def _corridas(semilla=11):
+    rng = random.Random(semilla)
+    a = [(e, c, float(rng.randrange(1, 10_000_000))) for e in range(1, 400) for c in CONCEPTOS_PRUEBA]
+    b = []
+    for id_empleado, concepto, valor in a:
+        u = rng.random()
+        if u < 0.05:
+            continue  # Solo en A
+        b.append((id_empleado, concepto, valor + 1500.0 if u < 0.15 else valor))
+    b += [(1000 + e, "Prima", 10.0) for e in range(7)]  # Solo en B
+    rng.shuffle(b)
+    return a, b
+
+
+def _join_ingenuo(a, b, tolerancia=1e-6):
+    mapa_a = {(e, c): v for e, c, v in a}
+    mapa_b = {(e, c): v for e, c, v in b}
+    diferencias = {}
+    for llave in mapa_a.keys() | mapa_b.keys():
+        va, vb = mapa_a.get(llave), mapa_b.get(llave)
+        if va is None:
+            diferencias[llave] = (None, vb, ESTADO_SOLO_B)
+        elif vb is None:
+            diferencias[llave] = (va, None, ESTADO_SOLO_A)
+        elif abs(va - vb) > tolerancia:
+            diferencias[llave] = (va, vb, ESTADO_MODIFICADO)
+    return diferencias
+
+
+@pytest.mark.parametrize("n_particiones", [1, 7, 64])
+def test_join_particionado_igual_a_join_ingenuo(n_particiones, tmp_path):
+    a, b = _corridas()
+    encontradas = {}
+    resumen = reconciliar(
+        a, b,
+        al_encontrar_diferencia=lambda d: encontradas.__setitem__((d.id_empleado, d.concepto), (d.valor_a, d.valor_b, d.estado)),
+        n_particiones=n_particiones,
+        directorio_temporal=str(tmp_path),
+    )
+    esperadas = _join_ingenuo(a, b)
+    assert encontradas == esperadas
+    assert resumen.filas_a == len(a) and resumen.filas_b == len(b)
+    assert resumen.modificadas == sum(1 for d in esperadas.values() if d[2] == ESTADO_MODIFICADO)
+    assert resumen.solo_a == sum(1 for d in esperadas.values() if d[2] == ESTADO_SOLO_A)
+    assert resumen.solo_b == 7
+    assert resumen.iguales + resumen.modificadas + resumen.solo_b == len(b)
+    assert list(tmp_path.iterdir()) == []  # Particiones temporales eliminadas
+
+
+def test_llave_duplicada():
+    with pytest.raises(ValueError, match="duplicada"):
+        reconciliar([(1, "Prima", 1.0), (1, "Prima", 2.0)], [])
+
+
+def test_csv_ida_y_vuelta_y_reporte(tmp_path):
+    a, b = _corridas(semilla=5)
+    ruta_a = str(tmp_path / "a.csv")
+    assert escribir_filas_csv(ruta_a, a) == len(a)
+    assert list(leer_filas_csv(ruta_a)) == a
+
+    ruta_reporte = str(tmp_path / "diferencias.csv")
+    resumen = reconciliar_a_csv(leer_filas_csv(ruta_a), b, ruta_reporte, n_particiones=4)
+    with open(ruta_reporte, newline="", encoding="utf-8") as archivo:
+        filas = list(csv.DictReader(archivo))
+    assert len(filas) == resumen.modificadas + resumen.solo_a + resumen.solo_b
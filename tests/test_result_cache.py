@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la caché persistente de resultados (src/core/result_cache.py)."""
+
+import datetime
+import inspect
+from array import array
+
+import pytest
+
+from src.core import batch, calculator
+from src.core.advances import LibroAnticipos, LibrosAnticiposLote
+from src.core.intervals import IndiceIntervalosLote
+from src.core.batch import ReglaLiquidacion, calcular_liquidacion_lote, registrar_regla
+from src.core.result_cache import CacheResultados
+from src.core.roster_generator import generar_roster
+
+INICIO = datetime.date(2024, 1, 1)
+FIN = datetime.date(2024, 12, 31)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheResultados(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def reglas_restauradas():
+    originales = list(batch.REGLAS_LIQUIDACION)
+    yield
+    batch.REGLAS_LIQUIDACION[:] = originales
+
+
+def test_llamadas_posicionales_y_por_nombre_comparten_clave(cache):
+    primero = cache.calcular_liquidacion_completa(2_000_000, INICIO, FIN)
+    assert (cache.aciertos, cache.fallos) == (0, 1)
+    segundo = cache.calcular_liquidacion_completa(salario_mensual=2_000_000, fecha_inicio=INICIO, fecha_fin=FIN,
+                                                  incluir_auxilio=True)
+    tercero = cache.calcular_liquidacion_completa(2_000_000, INICIO, fecha_fin=FIN, conceptos=("cesantias", "intereses"))
+    assert (cache.aciertos, cache.fallos) == (2, 1)
+    assert segundo == tercero == primero == calculator.calcular_liquidacion_completa(2_000_000, INICIO, FIN)
+
+
+def test_argumentos_distintos_no_comparten_clave(cache):
+    cache.calcular_prima_servicios(2_000_000, INICIO, FIN)
+    cache.calcular_prima_servicios(2_000_000, INICIO, FIN, anio_liquidacion=2023)
+    assert cache.fallos == 2
+
+
+def test_argumentos_invalidos_propagan_el_error(cache):
+    with pytest.raises(TypeError):
+        cache.calcular_prima_servicios(2_000_000, INICIO, FIN, argumento_inexistente=1)
+
+
+def test_lote_desde_cache_igual_a_calculado(cache):
+    roster = generar_roster(300, semilla=6)
+    columnas = (roster["salario"], roster["serial_inicio"], roster["serial_fin"])
+    opciones = dict(tipos_contrato=roster["tipo_contrato"], banderas=roster["banderas"])
+    esperado = calcular_liquidacion_lote(*columnas, **opciones)
+    for _ in range(2):
+        resultado = cache.calcular_liquidacion_lote(*columnas, tamano_bloque=128, **opciones)
+        for nombre in ("dias", "cesantias", "intereses", "prima_semestre_1", "prima_semestre_2"):
+            assert list(getattr(resultado, nombre)) == list(getattr(esperado, nombre))
+        assert resultado.version_parametros == esperado.version_parametros
+    assert (cache.aciertos, cache.fallos) == (3, 3)
+
+
+def test_lote_con_la_firma_del_calculo_por_lotes(cache):
+    firma_cache = list(inspect.signature(cache.calcular_liquidacion_lote).parameters.values())
+    firma_lote = list(inspect.signature(calcular_liquidacion_lote).parameters.values())
+    assert [p.name for p in firma_cache[:-1]] == [p.name for p in firma_lote]
+    assert firma_cache[-1].name == "tamano_bloque" and firma_cache[-1].kind is inspect.Parameter.KEYWORD_ONLY
+
+    roster = generar_roster(50, semilla=8)
+    columnas = (roster["salario"], roster["serial_inicio"], roster["serial_fin"])
+    ausencias = IndiceIntervalosLote.desde_listas([[(s + 10, s + 40)] for s in roster["serial_inicio"]])
+    anticipos = LibrosAnticiposLote([LibroAnticipos([(datetime.date(2024, 6, 1), 100_000.0)])] * len(roster))
+    esperado = calcular_liquidacion_lote(*columnas, ausencias, anticipos=anticipos)
+    for _ in range(2):
+        # Las ausencias por posición, como en calcular_liquidacion_lote
+        resultado = cache.calcular_liquidacion_lote(*columnas, ausencias, anticipos=anticipos, tamano_bloque=16)
+        assert list(resultado.cesantias) == list(esperado.cesantias)
+        assert list(resultado.intereses) == list(esperado.intereses)
+    assert (cache.aciertos, cache.fallos) == (1, 1)
+
+    # Otras ausencias son otra entrada
+    otras = IndiceIntervalosLote.desde_listas([[(s + 10, s + 41)] for s in roster["serial_inicio"]])
+    cache.calcular_liquidacion_lote(*columnas, otras, anticipos=anticipos)
+    assert cache.fallos == 2
+    sin_ausencias = cache.calcular_liquidacion_lote(*columnas)
+    assert cache.fallos == 3
+    assert sum(sin_ausencias.cesantias) > sum(esperado.cesantias)
+
+
+def test_registrar_regla_invalida_claves(cache, reglas_restauradas):
+    salarios, inicio, fin = array("d", [2_000_000.0]), array("i", [INICIO.year * 360]), array("i", [FIN.year * 360 + 359])
+    tipos, banderas = array("B", [1]), array("B", [0])
+    antes = cache.calcular_liquidacion_lote(salarios, inicio, fin, tipos_contrato=tipos, banderas=banderas)
+    assert antes.cesantias[0] > 0
+
+    # Contratos a término fijo sin cesantías
+    registrar_regla(ReglaLiquidacion("fijo_sin_cesantias", lambda tipo, banderas: tipo == 1, frozenset({"prima"})), 0)
+    despues = cache.calcular_liquidacion_lote(salarios, inicio, fin, tipos_contrato=tipos, banderas=banderas)
+    assert cache.aciertos == 0
+    assert despues.cesantias[0] == 0.0
+    assert despues.prima_semestre_1[0] == antes.prima_semestre_1[0]
+
+
+def test_desalojo(tmp_path):
+    cache = CacheResultados(str(tmp_path / "cache"), tamano_maximo=1000)
+    for i in range(20):
+        cache.guardar(cache.clave(str(i).encode()), b"x" * 100)
+    assert cache._tamano_estimado <= 1000
+    assert cache.obtener(cache.clave(b"19")) == b"x" * 100
+    cache.limpiar()
+    assert cache.obtener(cache.clave(b"19")) is None
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del roster por columnas y su formato binario (src/core/roster.py)."""
+
+import datetime
+
+import pytest
+
+from src.core import roster as roster_modulo
+from src.core.roster import (
+    COLUMNAS_ROSTER,
+    Roster,
+    abrir_roster_binario,
+    escribir_roster_binario,
+    leer_roster_csv,
+)
+from src.utils.date_helpers import fecha_a_serial_360, serial_360_a_fecha
+
+
+def _roster():
+    return Roster.desde_registros([
+        {"id_empleado": 1, "salario": 1_300_000, "fecha_inicio": datetime.date(2024, 1, 1),
+         "fecha_fin": datetime.date(2024, 12, 31)},
+        {"id_empleado": 2, "salario": 5_000_000, "fecha_inicio": datetime.date(2023, 3, 15),
+         "fecha_fin": datetime.date(2024, 6, 30), "tipo_contrato": "FIJO", "banderas": 1, "centro_costo": 7},
+    ])
+
+
+def test_roster_en_memoria():
+    roster = _roster()
+    assert len(roster) == 2
+    assert roster["serial_fin"][0] == fecha_a_serial_360(datetime.date(2024, 12, 31))
+    assert roster["tipo_contrato"][1] == 1 and roster["centro_costo"][1] == 7
+
+
+def test_roster_rechaza_tipo_de_contrato_desconocido():
+    with pytest.raises(ValueError):
+        Roster.vacio().agregar(1, 1_000_000, datetime.date(2024, 1, 1), datetime.date(2024, 2, 1), "OTRO")
+
+
+def test_binario_ida_y_vuelta(tmp_path):
+    roster = _roster()
+    ruta = str(tmp_path / "roster.bin")
+    escribir_roster_binario(ruta, roster)
+    with abrir_roster_binario(ruta) as abierto:
+        assert len(abierto) == len(roster)
+        for nombre, _ in COLUMNAS_ROSTER:
+            assert list(abierto[nombre]) == list(roster[nombre])
+
+
+@pytest.mark.parametrize("columnas_v1", [6, 7])  # Antes y después de agregar centro_costo
+def test_binario_version_1(tmp_path, monkeypatch, columnas_v1):
+    roster = _roster()
+    ruta = str(tmp_path / "v1.bin")
+    # El escritor con el esquema de la versión 1 produce el mismo archivo que entonces
+    with monkeypatch.context() as parche:
+        parche.setattr(roster_modulo, "COLUMNAS_ROSTER", COLUMNAS_ROSTER[:columnas_v1])
+        parche.setattr(roster_modulo, "VERSION_FORMATO_ROSTER", 1)
+        escribir_roster_binario(ruta, roster)
+    with abrir_roster_binario(ruta) as abierto:
+        assert {nombre for nombre, _ in COLUMNAS_ROSTER} <= set(abierto.columnas)
+        for nombre, _ in COLUMNAS_ROSTER[:6]:
+            assert list(abierto[nombre]) == list(roster[nombre])
+        centros = list(roster["centro_costo"]) if columnas_v1 == 7 else [0] * len(roster)
+        assert list(abierto["centro_costo"]) == centros
+        assert list(abierto["ordinal_inicio"]) == [serial_360_a_fecha(s).toordinal() for s in roster["serial_inicio"]]
+
+
+def test_binario_vacio_y_archivo_invalido(tmp_path):
+    ruta = str(tmp_path / "vacio.bin")
+    escribir_roster_binario(ruta, Roster.vacio())
+    with abrir_roster_binario(ruta) as abierto:
+        assert len(abierto) == 0
+    invalido = tmp_path / "invalido.bin"
+    invalido.write_bytes(b"no es un roster" * 10)
+    with pytest.raises(ValueError):
+        abrir_roster_binario(str(invalido))
+
+
+def test_csv_indica_la_linea_invalida(tmp_path):
+    ruta = tmp_path / "roster.csv"
+    ruta.write_text(
+        "id_empleado,salario,fecha_inicio,fecha_fin\n"
+        "1,1300000,2024-01-01,2024-12-31\n"
+        "2,abc,2024-01-01,2024-12-31\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="Línea 3"):
+        leer_roster_csv(str(ruta))
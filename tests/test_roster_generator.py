@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del generador de rosters sintéticos (src/core/roster_generator.py)."""
+
+import datetime
+import hashlib
+import json
+
+import pytest
+
+from src.core import roster_generator
+from src.core.constants import BANDERA_APRENDIZ, CODIGOS_TIPO_CONTRATO
+from src.core.roster import COLUMNAS_ROSTER, Roster, abrir_roster_binario, leer_roster_csv, registro_roster
+from src.core.roster_generator import escribir_roster_sintetico, generar_roster
+from src.utils.date_helpers import fecha_a_serial_360
+
+
+def _columnas(roster):
+    return {nombre: list(roster[nombre]) for nombre, _ in COLUMNAS_ROSTER}
+
+
+def _huella(ruta):
+    with open(ruta, "rb") as archivo:
+        return hashlib.sha256(archivo.read()).hexdigest()
+
+
+def test_determinista_por_semilla():
+    assert _columnas(generar_roster(500, semilla=3)) == _columnas(generar_roster(500, semilla=3))
+    assert _columnas(generar_roster(500, semilla=3)) != _columnas(generar_roster(500, semilla=4))
+
+
+def test_prefijo_estable_entre_tamanos(monkeypatch):
+    monkeypatch.setattr(roster_generator, "TAMANO_BLOQUE_GENERADOR", 100)
+    corto, largo = generar_roster(250, semilla=1), generar_roster(420, semilla=1)
+    assert {nombre: columna[:250] for nombre, columna in _columnas(largo).items()} == _columnas(corto)
+
+
+def test_filas_validas():
+    roster = generar_roster(2000, semilla=2)
+    assert list(roster["id_empleado"]) == list(range(1, 2001))
+    for fila in range(len(roster)):
+        assert roster["serial_inicio"][fila] <= roster["serial_fin"][fila]
+        assert roster["ordinal_inicio"][fila] <= roster["ordinal_fin"][fila]
+        assert roster["serial_inicio"][fila] == fecha_a_serial_360(datetime.date.fromordinal(roster["ordinal_inicio"][fila]))
+        assert roster["serial_fin"][fila] == fecha_a_serial_360(datetime.date.fromordinal(roster["ordinal_fin"][fila]))
+        if roster["banderas"][fila] & BANDERA_APRENDIZ:
+            assert CODIGOS_TIPO_CONTRATO[roster["tipo_contrato"][fila]] != "SERVICIOS"
+    assert any(datetime.date.fromordinal(o).day == 31 for o in roster["ordinal_fin"])
+
+
+@pytest.mark.parametrize("formato", ["csv", "jsonl", "bin"])
+def test_formatos_equivalentes_y_deterministas(tmp_path, formato):
+    ruta = str(tmp_path / f"roster.{formato}")
+    otra = str(tmp_path / f"otra.{formato}")
+    assert escribir_roster_sintetico(ruta, 300, semilla=5) == 300
+    escribir_roster_sintetico(otra, 300, semilla=5)
+    assert _huella(ruta) == _huella(otra)
+
+    esperado = _columnas(generar_roster(300, semilla=5))
+    if formato == "csv":
+        leido = leer_roster_csv(ruta)
+    elif formato == "jsonl":
+        with open(ruta, encoding="utf-8") as archivo:
+            leido = Roster.desde_registros(registro_roster(json.loads(linea)) for linea in archivo)
+    else:
+        leido = abrir_roster_binario(ruta)
+    assert _columnas(leido) == esperado
+    leido.cerrar()
+
+
+def test_parametros_invalidos(tmp_path):
+    with pytest.raises(ValueError):
+        generar_roster(-1)
+    with pytest.raises(ValueError):
+        escribir_roster_sintetico(str(tmp_path / "roster.xml"), 10)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la carga y el cálculo por bloques del roster (src/controllers/roster_results.py) sin Tk."""
+
+import datetime
+import time
+
+from src.controllers.roster_results import CargaRoster
+from src.core.roster import Roster, escribir_roster_binario
+from src.utils.date_helpers import calcular_dias_liquidacion
+
+
+class _WidgetFalso:
+    """Reemplaza after() de Tk: los callbacks se ejecutan a mano."""
+
+    def __init__(self):
+        self.pendientes = []
+
+    def after(self, ms, funcion, *args):
+        self.pendientes.append((funcion, args))
+        return f"after#{len(self.pendientes)}"
+
+    def ejecutar_uno(self):
+        funcion, args = self.pendientes.pop(0)
+        funcion(*args)
+
+    def vaciar(self, limite=5.0):
+        fin = time.monotonic() + limite
+        while self.pendientes:
+            assert time.monotonic() < fin, "los callbacks no terminaron"
+            self.ejecutar_uno()
+            time.sleep(0.001)
+
+
+def _escribir_csv(ruta, n):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("id_empleado,salario,fecha_inicio,fecha_fin\n")
+        for i in range(n):
+            archivo.write(f"{i + 1},{1_300_000 + i},2024-01-{1 + i % 28:02d},2024-12-31\n")
+
+
+def _carga(widget, tamano_bloque=4):
+    cargados, errores = [], []
+    carga = CargaRoster(widget, lambda ruta, resultados: cargados.append((ruta, resultados)),
+                        lambda ruta, mensaje: errores.append((ruta, mensaje)), lambda: None,
+                        tamano_bloque=tamano_bloque)
+    return carga, cargados, errores
+
+
+def test_carga_csv_con_primer_bloque_calculado(tmp_path):
+    ruta = str(tmp_path / "roster.csv")
+    _escribir_csv(ruta, 10)
+    widget = _WidgetFalso()
+    carga, cargados, errores = _carga(widget)
+    carga.cargar(ruta)
+    while not cargados and not errores:
+        widget.ejecutar_uno()
+        time.sleep(0.001)
+
+    assert errores == []
+    (_, resultados), = cargados
+    assert len(resultados) == 10
+    # Solo el primer bloque está listo al mostrar la tabla
+    assert resultados.bloques_calculados == 1
+    fila = resultados.obtener_fila(0)
+    assert fila[:2] == ("1", str(calcular_dias_liquidacion(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))))
+    assert resultados.obtener_fila(5) is None  # Segundo bloque: se calcula al pedirlo
+    widget.vaciar()
+    assert resultados.obtener_fila(5) is not None
+    resultados.cerrar()
+
+
+def test_carga_binario(tmp_path):
+    roster = Roster.vacio()
+    roster.agregar(7, 2_000_000.0, datetime.date(2024, 1, 1), datetime.date(2024, 6, 30))
+    ruta = str(tmp_path / "roster.bin")
+    escribir_roster_binario(ruta, roster)
+    widget = _WidgetFalso()
+    carga, cargados, errores = _carga(widget)
+    carga.cargar(ruta)
+    widget.vaciar()
+    (_, resultados), = cargados
+    assert resultados.obtener_fila(0)[:2] == ("7", "180")
+    resultados.cerrar()
+
+
+def test_error_de_lectura_se_reporta(tmp_path):
+    ruta = str(tmp_path / "roster.csv")
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("id_empleado,salario,fecha_inicio,fecha_fin\n1,abc,2024-01-01,2024-12-31\n")
+    widget = _WidgetFalso()
+    carga, cargados, errores = _carga(widget)
+    carga.cargar(ruta)
+    carga.cargar(str(tmp_path / "no_existe.csv"))
+    widget.vaciar()
+    assert cargados == []
+    # Solo se reporta la carga más reciente
+    assert [ruta for ruta, _ in errores] == [str(tmp_path / "no_existe.csv")]
+
+
+def test_carga_anterior_se_descarta(tmp_path):
+    primera, segunda = str(tmp_path / "a.csv"), str(tmp_path / "b.csv")
+    _escribir_csv(primera, 3)
+    _escribir_csv(segunda, 5)
+    widget = _WidgetFalso()
+    carga, cargados, errores = _carga(widget)
+    carga.cargar(primera)
+    carga.cargar(segunda)
+    widget.vaciar()
+    assert [(ruta, len(resultados)) for ruta, resultados in cargados] == [(segunda, 5)]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la liquidación por reglas de tipo de contrato y banderas (src/core/batch.py)."""
+
+import random
+
+import pytest
+
+from src.core import batch
+from src.core.batch import (
+    ReglaLiquidacion,
+    agrupar_por_regla,
+    calcular_liquidacion_lote,
+    registrar_regla,
+)
+from src.core.constants import BANDERA_APRENDIZ, BANDERA_SALARIO_INTEGRAL, CODIGOS_TIPO_CONTRATO
+
+SERVICIOS = CODIGOS_TIPO_CONTRATO.index("SERVICIOS")
+
+
+@pytest.fixture
+def reglas_restauradas():
+    originales = list(batch.REGLAS_LIQUIDACION)
+    yield
+    batch.REGLAS_LIQUIDACION[:] = originales
+
+
+def _lote(n=400, semilla=12):
+    rng = random.Random(semilla)
+    salarios = [float(rng.randrange(1_300_000, 20_000_000)) for _ in range(n)]
+    inicio = [2024 * 360 + rng.randrange(300) for _ in range(n)]
+    fin = [2024 * 360 + 359] * n
+    tipos = [rng.randrange(len(CODIGOS_TIPO_CONTRATO)) for _ in range(n)]
+    banderas = [rng.choice((0, 0, 0, BANDERA_APRENDIZ, BANDERA_SALARIO_INTEGRAL, 3)) for _ in range(n)]
+    return salarios, inicio, fin, tipos, banderas
+
+
+def _regla_de_fila(tipo, bandera):
+    if tipo == SERVICIOS:
+        return "servicios"
+    if bandera & BANDERA_APRENDIZ:
+        return "aprendiz"
+    if bandera & BANDERA_SALARIO_INTEGRAL:
+        return "salario_integral"
+    return "general"
+
+
+def test_agrupar_por_regla():
+    _, _, _, tipos, banderas = _lote()
+    grupos = agrupar_por_regla(tipos, banderas)
+    assert sorted(fila for filas in grupos.values() for fila in filas) == list(range(len(tipos)))
+    for regla, filas in grupos.items():
+        assert all(_regla_de_fila(tipos[fila], banderas[fila]) == regla.nombre for fila in filas)
+
+
+def test_liquidacion_por_reglas_contra_fila_a_fila():
+    salarios, inicio, fin, tipos, banderas = _lote()
+    mixto = calcular_liquidacion_lote(salarios, inicio, fin, tipos_contrato=tipos, banderas=banderas)
+    general = calcular_liquidacion_lote(salarios, inicio, fin)
+    for fila in range(len(salarios)):
+        liquida = _regla_de_fila(tipos[fila], banderas[fila]) == "general"
+        for nombre in ("cesantias", "intereses", "prima_semestre_1", "prima_semestre_2"):
+            esperado = getattr(general, nombre)[fila] if liquida else 0.0
+            assert getattr(mixto, nombre)[fila] == esperado, (fila, nombre)
+        assert mixto.dias[fila] == general.dias[fila]
+
+
+def test_regla_registrada_con_conceptos_parciales(reglas_restauradas):
+    salarios, inicio, fin, tipos, banderas = _lote(50)
+    tipos = [CODIGOS_TIPO_CONTRATO.index("OBRA_LABOR")] * 50
+    banderas = [0] * 50
+    registrar_regla(ReglaLiquidacion("obra_solo_intereses", lambda tipo, bandera: tipo == tipos[0], frozenset({"intereses"})))
+    mixto = calcular_liquidacion_lote(salarios, inicio, fin, tipos_contrato=tipos, banderas=banderas)
+    general = calcular_liquidacion_lote(salarios, inicio, fin)
+    # Los intereses se calculan sobre las cesantías aunque la regla no las liquide
+    assert list(mixto.intereses) == list(general.intereses)
+    assert set(mixto.cesantias) == {0.0}
+    assert set(mixto.prima_semestre_2) == {0.0}
+    assert batch.REGLAS_LIQUIDACION[-1].nombre == "general"
+
+
+def test_errores():
+    with pytest.raises(ValueError):
+        registrar_regla(ReglaLiquidacion("vacaciones", lambda tipo, bandera: True, frozenset({"vacaciones"})))
+    with pytest.raises(ValueError):
+        agrupar_por_regla([len(CODIGOS_TIPO_CONTRATO)], [0])
+    with pytest.raises(ValueError):
+        agrupar_por_regla([0, 0], [0])
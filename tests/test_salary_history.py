@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de los promedios de salario variable (src/core/salary_history.py)."""
+
+import datetime
+import random
+
+import pytest
+
+from src.core import calculator
+from src.core.batch import calcular_liquidacion_lote
+from src.core.salary_history import HistorialSalarial, HistorialesSalarialesLote, ventana_promedio
+from src.utils.date_helpers import fecha_a_serial_360
+
+
+def _promedio_dia_a_dia(historial, serial_inicio, serial_fin):
+    total = sum(historial.salarios[serial // 30 - historial.mes_inicial] for serial in range(serial_inicio, serial_fin + 1))
+    return total / (serial_fin - serial_inicio + 1)
+
+
+def test_promedio_contra_suma_dia_a_dia():
+    rng = random.Random(5)
+    historial = HistorialSalarial(2022, 3, [rng.randrange(1_000_000, 5_000_000) for _ in range(30)])
+    base = historial.mes_inicial * 30
+    for _ in range(300):
+        inicio = base + rng.randrange(30 * 30)
+        fin = min(base + 30 * 30 - 1, inicio + rng.randrange(400))
+        assert historial.promedio_serial(inicio, fin) == pytest.approx(_promedio_dia_a_dia(historial, inicio, fin))
+
+
+def test_desde_cambios():
+    historial = HistorialSalarial.desde_cambios(
+        [(datetime.date(2024, 4, 15), 2_000_000.0), (datetime.date(2024, 1, 1), 1_500_000.0)],
+        hasta=datetime.date(2024, 6, 30),
+    )
+    assert list(historial.salarios) == [1_500_000.0] * 3 + [2_000_000.0] * 3
+    assert historial.promedio(datetime.date(2024, 1, 1), datetime.date(2024, 6, 30)) == pytest.approx(1_750_000.0)
+
+
+def test_periodo_fuera_del_historial():
+    historial = HistorialSalarial(2024, 1, [1_000_000.0] * 12)
+    with pytest.raises(ValueError):
+        historial.promedio(datetime.date(2023, 12, 1), datetime.date(2024, 6, 30))
+    with pytest.raises(ValueError):
+        HistorialSalarial(2024, 1, [-1.0])
+
+
+def test_ventana_ultimo_anio():
+    inicio, fin = fecha_a_serial_360(datetime.date(2020, 1, 1)), fecha_a_serial_360(datetime.date(2024, 12, 31))
+    assert ventana_promedio(inicio, fin) == (fecha_a_serial_360(datetime.date(2024, 1, 1)), fin)
+    assert ventana_promedio(fin - 10, fin) == (fin - 10, fin)
+
+
+def test_lote_igual_a_escalar():
+    inicio, fin = datetime.date(2023, 7, 1), datetime.date(2024, 12, 31)
+    historiales = [
+        HistorialSalarial(2023, 7, [1_800_000.0 + 50_000 * k for k in range(18)]),
+        None,
+        HistorialSalarial.desde_cambios([(datetime.date(2023, 1, 1), 3_000_000.0), (datetime.date(2024, 9, 1), 3_600_000.0)], fin),
+    ]
+    salarios = [0.0, 2_200_000.0, 0.0]
+    lote = calcular_liquidacion_lote(
+        salarios, [fecha_a_serial_360(inicio)] * 3, [fecha_a_serial_360(fin)] * 3,
+        historiales=HistorialesSalarialesLote(historiales),
+    )
+    for fila, (salario, historial) in enumerate(zip(salarios, historiales)):
+        assert lote.cesantias[fila] == calculator.calcular_cesantias(salario, inicio, fin, historial_salarial=historial)
+        prima = calculator.calcular_prima_servicios(salario, inicio, fin, historial_salarial=historial)
+        assert lote.prima_semestre_2[fila] == prima["prima_semestre_2"]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del planificador de trabajos de liquidación (src/core/scheduler.py)."""
+
+import os
+
+import pytest
+
+from src.core import scheduler
+from src.core.roster import escribir_roster_binario
+from src.core.roster_generator import generar_roster
+from src.core.scheduler import PlanificadorLiquidaciones, _bloquear_despachador
+
+_ejecutar_original = scheduler._ejecutar_trabajo
+
+
+@pytest.fixture
+def roster_binario(tmp_path):
+    ruta = str(tmp_path / "roster.bin")
+    escribir_roster_binario(ruta, generar_roster(500, semilla=4))
+    return ruta
+
+
+def _muere_la_primera_vez(ruta_bd, id_trabajo, ruta_roster, ruta_salida, intervalo_punto_control):
+    """Simula un proceso de trabajo que muere (p. ej. por falta de memoria) en el primer intento."""
+    marca = f"{ruta_salida}.intento"
+    if not os.path.exists(marca):
+        open(marca, "w").close()
+        os._exit(1)
+    return _ejecutar_original(ruta_bd, id_trabajo, ruta_roster, ruta_salida, intervalo_punto_control)
+
+
+def _siempre_muere(*args):
+    os._exit(1)
+
+
+def test_ejecuta_la_cola(tmp_path, roster_binario):
+    with PlanificadorLiquidaciones(str(tmp_path / "cola.db"), trabajadores=2, intervalo_punto_control=100) as plan:
+        ids = [plan.enviar(empresa, roster_binario, str(tmp_path / f"{empresa}.csv")) for empresa in ("A", "B")]
+        metricas = plan.ejecutar()
+        assert metricas.terminados == 2
+        assert all(plan.estado(id_trabajo).filas_procesadas == 500 for id_trabajo in ids)
+
+
+def test_trabajo_en_curso_vuelve_a_la_cola_al_reiniciar(tmp_path, roster_binario, capsys):
+    ruta_bd = str(tmp_path / "cola.db")
+    with PlanificadorLiquidaciones(ruta_bd) as plan:
+        id_trabajo = plan.enviar("A", roster_binario, str(tmp_path / "a.csv"))
+        # Caída del despachador con el trabajo en curso
+        plan._conexion.execute("UPDATE trabajos SET estado = 'EN_CURSO', intentos = 1 WHERE id = ?", (id_trabajo,))
+    with PlanificadorLiquidaciones(ruta_bd, trabajadores=1) as plan:
+        plan.ejecutar()
+        estado = plan.estado(id_trabajo)
+    assert "vuelven a la cola" in capsys.readouterr().out
+    assert (estado.estado, estado.intentos) == ("TERMINADO", 2)
+
+
+def test_proceso_de_trabajo_muerto_se_reencola(tmp_path, roster_binario, monkeypatch):
+    monkeypatch.setattr(scheduler, "_ejecutar_trabajo", _muere_la_primera_vez)
+    with PlanificadorLiquidaciones(str(tmp_path / "cola.db"), trabajadores=1) as plan:
+        id_trabajo = plan.enviar("A", roster_binario, str(tmp_path / "a.csv"))
+        plan.ejecutar()
+        estado = plan.estado(id_trabajo)
+    assert (estado.estado, estado.intentos, estado.error) == ("TERMINADO", 2, None)
+
+
+def test_proceso_que_siempre_muere_falla_tras_max_intentos(tmp_path, roster_binario, monkeypatch):
+    monkeypatch.setattr(scheduler, "_ejecutar_trabajo", _siempre_muere)
+    with PlanificadorLiquidaciones(str(tmp_path / "cola.db"), trabajadores=1) as plan:
+        id_trabajo = plan.enviar("A", roster_binario, str(tmp_path / "a.csv"))
+        plan.ejecutar()
+        estado = plan.estado(id_trabajo)
+    assert (estado.estado, estado.intentos) == ("FALLIDO", scheduler.MAX_INTENTOS_TRABAJO)
+
+
+@pytest.mark.skipif(scheduler.fcntl is None, reason="requiere fcntl")
+def test_un_solo_despachador_por_cola(tmp_path, roster_binario):
+    ruta_bd = str(tmp_path / "cola.db")
+    with PlanificadorLiquidaciones(ruta_bd) as plan:
+        id_trabajo = plan.enviar("A", roster_binario, str(tmp_path / "a.csv"))
+        plan._conexion.execute("UPDATE trabajos SET estado = 'EN_CURSO' WHERE id = ?", (id_trabajo,))
+        bloqueo = _bloquear_despachador(ruta_bd)
+        try:
+            with pytest.raises(ValueError):
+                plan.ejecutar()
+            # El trabajo del otro despachador no se tocó
+            assert plan.estado(id_trabajo).estado == "EN_CURSO"
+        finally:
+            bloqueo.close()
+        plan.ejecutar()
+        assert plan.estado(id_trabajo).estado == "TERMINADO"
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de la generación de comprobantes (src/utils/slips.py)."""
+
+import datetime
+import os
+import zipfile
+
+import pytest
+
+from src.core.batch import calcular_liquidacion_lote
+from src.core.constants import BANDERA_APRENDIZ
+from src.core.roster import Roster, abrir_roster_binario, escribir_roster_binario
+from src.utils.formatting import formatear_moneda
+from src.utils.slips import PlantillaCompilada, generar_comprobantes
+
+
+def _roster():
+    roster = Roster.vacio()
+    roster.agregar(1, 1_300_000.0, datetime.date(2020, 5, 28), datetime.date(2021, 3, 31))
+    roster.agregar(2, 5_000_000.0, datetime.date(2024, 1, 31), datetime.date(2024, 12, 31))
+    roster.agregar(3, 2_000_000.0, datetime.date(2024, 2, 29), datetime.date(2024, 8, 15))
+    return roster
+
+
+def _liquidar(roster):
+    return calcular_liquidacion_lote(roster["salario"], roster["serial_inicio"], roster["serial_fin"])
+
+
+def _leer(directorio, nombre):
+    with open(os.path.join(directorio, nombre), encoding="utf-8") as archivo:
+        return archivo.read()
+
+
+def test_fechas_reales_y_salario(tmp_path):
+    roster = _roster()
+    generados = generar_comprobantes(roster, _liquidar(roster), str(tmp_path), formato="texto", procesos=1)
+    assert generados == 3
+    texto = _leer(tmp_path, "comprobante_1.txt")
+    assert "28/05/2020 - 31/03/2021" in texto
+    # El salario del roster, sin el auxilio de transporte (que depende del contrato)
+    assert f"Salario mensual:     {formatear_moneda(1_300_000.0)}\n" in texto
+    assert "31/01/2024 - 31/12/2024" in _leer(tmp_path, "comprobante_2.txt")
+    assert formatear_moneda(5_000_000.0) in _leer(tmp_path, "comprobante_2.txt")
+    assert "29/02/2024 - 15/08/2024" in _leer(tmp_path, "comprobante_3.txt")
+
+
+def test_aprendiz_sin_auxilio(tmp_path):
+    roster = Roster.vacio()
+    roster.agregar(7, 1_300_000.0, datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), banderas=BANDERA_APRENDIZ)
+    resultado = calcular_liquidacion_lote(roster["salario"], roster["serial_inicio"], roster["serial_fin"],
+                                          tipos_contrato=roster["tipo_contrato"], banderas=roster["banderas"])
+    generar_comprobantes(roster, resultado, str(tmp_path), formato="texto", procesos=1)
+    texto = _leer(tmp_path, "comprobante_7.txt")
+    assert f"Salario mensual:     {formatear_moneda(1_300_000.0)}\n" in texto
+    assert f"TOTAL:               {formatear_moneda(0.0)}\n" in texto
+
+
+def test_roster_binario_conserva_fechas(tmp_path):
+    ruta = str(tmp_path / "roster.bin")
+    escribir_roster_binario(ruta, _roster())
+    with abrir_roster_binario(ruta) as roster:
+        generar_comprobantes(roster, _liquidar(roster), str(tmp_path / "salida"), formato="texto", procesos=1)
+    assert "28/05/2020 - 31/03/2021" in _leer(tmp_path / "salida", "comprobante_1.txt")
+
+
+def test_zip_en_paralelo_igual_a_secuencial(tmp_path):
+    roster = _roster()
+    resultado = _liquidar(roster)
+    generar_comprobantes(roster, resultado, str(tmp_path / "a.zip"), procesos=1, tamano_bloque=2)
+    generar_comprobantes(roster, resultado, str(tmp_path / "b.zip"), procesos=2, tamano_bloque=2)
+    with zipfile.ZipFile(tmp_path / "a.zip") as a, zipfile.ZipFile(tmp_path / "b.zip") as b:
+        assert sorted(a.namelist()) == sorted(b.namelist()) == [f"comprobante_{i}.html" for i in (1, 2, 3)]
+        for nombre in a.namelist():
+            assert a.read(nombre) == b.read(nombre)
+
+
+def test_errores():
+    roster = _roster()
+    resultado = _liquidar(roster)
+    with pytest.raises(ValueError):
+        generar_comprobantes(roster, resultado, "salida", formato="docx")
+    otro = Roster.vacio()
+    otro.agregar(9, 1.0, datetime.date(2024, 1, 1), datetime.date(2024, 1, 2))
+    with pytest.raises(ValueError):
+        generar_comprobantes(otro, resultado, "salida")
+
+
+def test_plantilla_compilada():
+    plantilla = PlantillaCompilada("<p>$nombre cuesta $$${valor}</p>", escapar=lambda texto: texto.replace("<", "&lt;"))
+    assert plantilla.campos == ("nombre", "valor")
+    assert plantilla.renderizar({"nombre": "<b>", "valor": "5"}) == "<p>&lt;b> cuesta $5</p>"
+    with pytest.raises(KeyError):
+        plantilla.renderizar({"nombre": "x"})
+    with pytest.raises(ValueError):
+        PlantillaCompilada("$ suelto")
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas de las utilidades de validación (src/utils/validation.py)."""
+
+import datetime
+
+import pytest
+
+from src.utils.validation import validar_fecha, validar_fechas_periodo, validar_valor_numerico
+
+
+def test_validar_fecha():
+    assert validar_fecha(datetime.date(2024, 2, 29)) == (True, None)
+    es_valido, mensaje = validar_fecha("2024-02-29")
+    assert not es_valido and mensaje
+
+
+def test_validar_fechas_periodo():
+    assert validar_fechas_periodo(datetime.date(2024, 1, 1), datetime.date(2024, 1, 1)) == (True, None)
+    es_valido, mensaje = validar_fechas_periodo(datetime.date(2024, 1, 2), datetime.date(2024, 1, 1))
+    assert not es_valido and "anterior" in mensaje
+
+
+@pytest.mark.parametrize("valor", ["1300000", " $1,300,000 ", 0, 2.5])
+def test_validar_valor_numerico_valido(valor):
+    assert validar_valor_numerico(valor) == (True, None)
+
+
+@pytest.mark.parametrize("valor, fragmento", [("abc", "número válido"), (None, "número válido"), ("-1", "mayor o igual")])
+def test_validar_valor_numerico_invalido(valor, fragmento):
+    es_valido, mensaje = validar_valor_numerico(valor, campo="salario")
+    assert not es_valido
+    assert fragmento in mensaje and "salario" in mensaje
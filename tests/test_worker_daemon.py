@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""Pruebas del servicio local de liquidación (src/core/worker_daemon.py) sin crear trabajadores."""
+
+import json
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+import cliente_liquidacion
+from src.core import worker_daemon
+
+
+@pytest.fixture
+def sin_variables_socket(monkeypatch, tmp_path):
+    monkeypatch.delenv(worker_daemon.VARIABLE_ENTORNO_SOCKET, raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(worker_daemon.tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def test_ruta_en_xdg_runtime_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv(worker_daemon.VARIABLE_ENTORNO_SOCKET, raising=False)
+    directorio = tmp_path / "runtime"
+    directorio.mkdir(mode=0o700)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(directorio))
+    assert worker_daemon.ruta_socket_por_defecto() == str(directorio / worker_daemon.NOMBRE_SOCKET)
+
+
+def test_directorio_privado_en_temporal(sin_variables_socket):
+    ruta = worker_daemon.ruta_socket_por_defecto()
+    directorio = os.path.dirname(ruta)
+    assert os.path.dirname(directorio) == str(sin_variables_socket)
+    assert stat.S_IMODE(os.stat(directorio).st_mode) == 0o700
+
+
+def test_directorio_compartido_se_rechaza(sin_variables_socket):
+    directorio = sin_variables_socket / f"liquidaciones-{os.getuid()}"
+    directorio.mkdir()
+    os.chmod(directorio, 0o777)
+    with pytest.raises(ValueError):
+        worker_daemon.ruta_socket_por_defecto()
+
+
+def test_socket_es_propio(tmp_path):
+    ruta = str(tmp_path / "s.sock")
+    assert not worker_daemon.socket_es_propio(ruta)
+    servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    servidor.bind(ruta)
+    try:
+        assert worker_daemon.socket_es_propio(ruta)
+        assert cliente_liquidacion.socket_es_propio(ruta)
+    finally:
+        servidor.close()
+    archivo = tmp_path / "no_es_socket"
+    archivo.write_text("")
+    assert not worker_daemon.socket_es_propio(str(archivo))
+    assert not cliente_liquidacion.socket_es_propio(str(archivo))
+
+
+def test_servir_no_reemplaza_archivo_ajeno(tmp_path):
+    ruta = tmp_path / "liquidaciones.sock"
+    ruta.write_text("no es un socket")
+    with pytest.raises(ValueError):
+        worker_daemon.servir(str(ruta), trabajadores=1)
+    assert ruta.read_text() == "no es un socket"
+
+
+def test_conexion_persistente_respeta_max_solicitudes():
+    servidor, cliente = socket.socketpair()
+    solicitud = json.dumps({"argv": ["dias", "2024-01-01", "2024-12-31"]}).encode("utf-8") + b"\n"
+    cliente.sendall(solicitud * 5)
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(worker_daemon._atender_conexion(servidor, 2)))
+    hilo.start()
+    with cliente, cliente.makefile("rb") as lector:
+        respuestas = [json.loads(linea) for linea in lector]
+    hilo.join(5)
+    assert resultado == [2]
+    assert [respuesta["salida"] for respuesta in respuestas] == [json.dumps({"dias": 360})] * 2